@@ -9,7 +9,7 @@ import { useReportHistory } from "./hooks/useReportHistory.ts";
 import { useResearch } from "./hooks/useResearch.ts";
 
 export default function App() {
-  const { isLoading, progressMessages, report, error, startResearch, stopResearch } =
+  const { isLoading, progressMessages, draft, report, error, startResearch, stopResearch } =
     useResearch();
 
   const {
@@ -65,6 +65,10 @@ export default function App() {
           <ProgressLog messages={progressMessages} isActive={isLoading} />
         )}
 
+        {isLoading && !report && !selectedReport && (
+          <ReportViewer content={draft} filename="" />
+        )}
+
         {displayedReport && (
           <ReportViewer
             content={displayedReport.content}
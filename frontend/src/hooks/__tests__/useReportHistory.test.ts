@@ -32,6 +32,7 @@ describe("useReportHistory", () => {
   it("fetches reports on mount", async () => {
     globalThis.fetch = vi.fn().mockResolvedValue({
       ok: true,
+      headers: new Headers(),
       json: () => Promise.resolve(MOCK_SUMMARIES),
     });
 
@@ -65,6 +66,7 @@ describe("useReportHistory", () => {
       .fn()
       .mockResolvedValueOnce({
         ok: true,
+        headers: new Headers(),
         json: () => Promise.resolve(MOCK_SUMMARIES),
       })
       .mockResolvedValueOnce({
@@ -91,6 +93,7 @@ describe("useReportHistory", () => {
       .fn()
       .mockResolvedValueOnce({
         ok: true,
+        headers: new Headers(),
         json: () => Promise.resolve(MOCK_SUMMARIES),
       })
       .mockResolvedValueOnce({
@@ -114,6 +117,7 @@ describe("useReportHistory", () => {
   it("adds new report to history via addReport", async () => {
     globalThis.fetch = vi.fn().mockResolvedValue({
       ok: true,
+      headers: new Headers(),
       json: () => Promise.resolve(MOCK_SUMMARIES),
     });
 
@@ -142,6 +146,7 @@ describe("useReportHistory", () => {
       .fn()
       .mockResolvedValueOnce({
         ok: true,
+        headers: new Headers(),
         json: () => Promise.resolve(MOCK_SUMMARIES),
       })
       .mockResolvedValueOnce({
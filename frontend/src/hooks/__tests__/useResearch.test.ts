@@ -6,6 +6,9 @@
  * - startResearch transitions to loading
  * - Progress events are accumulated
  * - Result event sets report content
+ * - Delta events build a draft, restarting on a new message
+ * - A dropped stream resumes from the last event id
+ * - Queue events are shown as progress and a full queue reports Retry-After
  * - Error event sets error message
  * - stopResearch aborts and returns to idle
  */
@@ -28,6 +31,13 @@ function mockSSEResponse(lines: string[]): Response {
   });
 }
 
+/** Helper to create a mock SSE response for a research job. */
+function mockJobResponse(lines: string[], jobId: string): Response {
+  const response = mockSSEResponse(lines);
+  response.headers.set("X-Job-Id", jobId);
+  return response;
+}
+
 describe("useResearch", () => {
   afterEach(() => {
     vi.restoreAllMocks();
@@ -98,6 +108,81 @@ describe("useResearch", () => {
     expect(result.current.isLoading).toBe(false);
   });
 
+  it("builds a draft from delta events", async () => {
+    globalThis.fetch = vi.fn().mockResolvedValue(
+      mockSSEResponse([
+        'data: {"type":"delta","data":"Let me search","message_id":"a"}',
+        'data: {"type":"delta","data":"# Final","message_id":"b"}',
+        'data: {"type":"delta","data":" Report","message_id":"b"}',
+      ]),
+    );
+
+    const { result } = renderHook(() => useResearch());
+
+    await act(async () => {
+      await result.current.startResearch("test");
+    });
+
+    expect(result.current.draft).toBe("# Final Report");
+    expect(result.current.report).toBeNull();
+  });
+
+  it("resumes a dropped stream from the last event id", async () => {
+    globalThis.fetch = vi
+      .fn()
+      .mockResolvedValueOnce(
+        mockJobResponse(['id: 1\ndata: {"type":"progress","data":"Planning..."}'], "job-1"),
+      )
+      .mockResolvedValueOnce(
+        mockSSEResponse([
+          'id: 2\ndata: {"type":"result","data":"# Resumed","filename":"r.md"}',
+        ]),
+      );
+
+    const { result } = renderHook(() => useResearch());
+
+    await act(async () => {
+      await result.current.startResearch("test");
+    });
+
+    expect(globalThis.fetch).toHaveBeenCalledTimes(2);
+    const [url, init] = (globalThis.fetch as ReturnType<typeof vi.fn>).mock.calls[1];
+    expect(url).toContain("/research/jobs/job-1/events");
+    expect(init.headers).toEqual({ "Last-Event-ID": "1" });
+    expect(result.current.report).toEqual({ content: "# Resumed", filename: "r.md" });
+  });
+
+  it("shows queue position events as progress", async () => {
+    globalThis.fetch = vi.fn().mockResolvedValue(
+      mockSSEResponse([
+        'data: {"type":"queued","data":"Waiting for a research slot: position 1 in queue","queue_position":1}',
+        'data: {"type":"result","data":"# Report","filename":"test.md"}',
+      ]),
+    );
+
+    const { result } = renderHook(() => useResearch());
+
+    await act(async () => {
+      await result.current.startResearch("test");
+    });
+
+    expect(result.current.progressMessages[0]).toContain("position 1");
+  });
+
+  it("reports Retry-After when the queue is full", async () => {
+    globalThis.fetch = vi.fn().mockResolvedValue(
+      new Response("{}", { status: 503, headers: { "Retry-After": "30" } }),
+    );
+
+    const { result } = renderHook(() => useResearch());
+
+    await act(async () => {
+      await result.current.startResearch("test");
+    });
+
+    expect(result.current.error).toContain("30 seconds");
+  });
+
   it("sets error on error event", async () => {
     globalThis.fetch = vi.fn().mockResolvedValue(
       mockSSEResponse([
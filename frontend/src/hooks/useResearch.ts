@@ -2,15 +2,26 @@
 
 import { useCallback, useRef, useState } from "react";
 import {
+  EVENT_TYPE_CANCELLED,
+  EVENT_TYPE_DELTA,
   EVENT_TYPE_ERROR,
   EVENT_TYPE_PROGRESS,
+  EVENT_TYPE_QUEUED,
   EVENT_TYPE_RESULT,
+  JOB_ID_HEADER,
+  LAST_EVENT_ID_HEADER,
+  RETRY_AFTER_HEADER,
+  buildJobEventsUrl,
   buildResearchUrl,
   parseSSEEvent,
+  parseSSEEventId,
 } from "../lib/research-api.ts";
 
 const ABORT_ERROR_NAME = "AbortError";
 const UNKNOWN_ERROR_MESSAGE = "An unexpected error occurred";
+const MAX_RECONNECT_ATTEMPTS = 3;
+const RECONNECT_DELAY_MS = 1000;
+const HTTP_SERVICE_UNAVAILABLE = 503;
 
 export interface ResearchReport {
   content: string;
@@ -20,6 +31,8 @@ export interface ResearchReport {
 interface ResearchState {
   isLoading: boolean;
   progressMessages: string[];
+  draft: string;
+  draftMessageId: string | null;
   report: ResearchReport | null;
   error: string | null;
 }
@@ -27,16 +40,31 @@ interface ResearchState {
 const INITIAL_STATE: ResearchState = {
   isLoading: false,
   progressMessages: [],
+  draft: "",
+  draftMessageId: null,
   report: null,
   error: null,
 };
 
+interface StreamHandlers {
+  onProgress: (msg: string) => void;
+  onDelta: (text: string, messageId: string | null) => void;
+  onResult: (report: ResearchReport) => void;
+  onError: (msg: string) => void;
+}
+
+interface StreamPosition {
+  lastEventId: string | null;
+  finished: boolean;
+}
+
+/** Read SSE events until the stream ends, tracking the last event id seen. */
 async function processSSEStream(
   reader: ReadableStreamDefaultReader<Uint8Array>,
-  onProgress: (msg: string) => void,
-  onResult: (report: ResearchReport) => void,
-  onError: (msg: string) => void,
+  handlers: StreamHandlers,
+  position: StreamPosition,
 ): Promise<void> {
+  const { onProgress, onDelta, onResult, onError } = handlers;
   const decoder = new TextDecoder();
   let buffer = "";
 
@@ -52,20 +80,70 @@ async function processSSEStream(
       const trimmed = line.trim();
       if (!trimmed) continue;
 
+      const eventId = parseSSEEventId(trimmed);
+      if (eventId !== null) {
+        position.lastEventId = eventId;
+        continue;
+      }
+
       const event = parseSSEEvent(trimmed);
       if (!event) continue;
 
-      if (event.type === EVENT_TYPE_PROGRESS) {
+      if (event.type === EVENT_TYPE_PROGRESS || event.type === EVENT_TYPE_QUEUED) {
         onProgress(event.data);
+      } else if (event.type === EVENT_TYPE_DELTA) {
+        onDelta(event.data, event.message_id ?? null);
       } else if (event.type === EVENT_TYPE_RESULT) {
+        position.finished = true;
         onResult({ content: event.data, filename: event.filename ?? "" });
-      } else if (event.type === EVENT_TYPE_ERROR) {
+      } else if (event.type === EVENT_TYPE_ERROR || event.type === EVENT_TYPE_CANCELLED) {
+        position.finished = true;
         onError(event.data);
       }
     }
   }
 }
 
+/**
+ * Read a research stream, resuming from the last event id after a dropped
+ * connection. The run keeps going on the server, so a reconnect replays
+ * only the events that were missed.
+ */
+async function readWithResume(
+  body: ReadableStream<Uint8Array>,
+  jobId: string | null,
+  handlers: StreamHandlers,
+  position: StreamPosition,
+  signal: AbortSignal,
+): Promise<void> {
+  let stream: ReadableStream<Uint8Array> | null = body;
+  let attempts = 0;
+
+  while (true) {
+    try {
+      if (stream) {
+        await processSSEStream(stream.getReader(), handlers, position);
+      }
+    } catch (err) {
+      if (signal.aborted || !jobId || attempts >= MAX_RECONNECT_ATTEMPTS) throw err;
+    }
+    if (position.finished || !jobId || attempts >= MAX_RECONNECT_ATTEMPTS) return;
+
+    attempts += 1;
+    await new Promise((resolve) => setTimeout(resolve, RECONNECT_DELAY_MS));
+    const headers: Record<string, string> = position.lastEventId
+      ? { [LAST_EVENT_ID_HEADER]: position.lastEventId }
+      : {};
+    try {
+      const response = await fetch(buildJobEventsUrl(jobId), { headers, signal });
+      stream = response.ok ? response.body : null;
+    } catch (err) {
+      if (signal.aborted) throw err;
+      stream = null;
+    }
+  }
+}
+
 export function useResearch() {
   const [state, setState] = useState<ResearchState>(INITIAL_STATE);
   const abortRef = useRef<AbortController | null>(null);
@@ -75,12 +153,7 @@ export function useResearch() {
     const controller = new AbortController();
     abortRef.current = controller;
 
-    setState({
-      isLoading: true,
-      progressMessages: [],
-      report: null,
-      error: null,
-    });
+    setState({ ...INITIAL_STATE, isLoading: true });
 
     try {
       const response = await fetch(buildResearchUrl(), {
@@ -94,33 +167,43 @@ export function useResearch() {
         setState((prev) => ({
           ...prev,
           isLoading: false,
-          error: `Request failed with status ${response.status}`,
+          error:
+            response.status === HTTP_SERVICE_UNAVAILABLE
+              ? `Research queue is full. Try again in ${response.headers.get(RETRY_AFTER_HEADER) ?? "a few"} seconds.`
+              : `Request failed with status ${response.status}`,
         }));
         return;
       }
 
-      const reader = response.body.getReader();
-
-      await processSSEStream(
-        reader,
-        (msg) =>
+      const handlers: StreamHandlers = {
+        onProgress: (msg) =>
           setState((prev) => ({
             ...prev,
             progressMessages: [...prev.progressMessages, msg],
           })),
-        (report) =>
+        onDelta: (text, messageId) =>
+          setState((prev) => ({
+            ...prev,
+            draft: messageId === prev.draftMessageId ? prev.draft + text : text,
+            draftMessageId: messageId,
+          })),
+        onResult: (report) =>
           setState((prev) => ({
             ...prev,
             isLoading: false,
             report,
           })),
-        (errorMsg) =>
+        onError: (errorMsg) =>
           setState((prev) => ({
             ...prev,
             isLoading: false,
             error: errorMsg,
           })),
-      );
+      };
+      const position: StreamPosition = { lastEventId: null, finished: false };
+      const jobId = response.headers.get(JOB_ID_HEADER);
+
+      await readWithResume(response.body, jobId, handlers, position, controller.signal);
 
       setState((prev) => ({ ...prev, isLoading: false }));
     } catch (err) {
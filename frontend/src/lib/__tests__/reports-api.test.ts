@@ -3,6 +3,7 @@
  *
  * Tests cover:
  * - fetchReports returns list of report summaries
+ * - fetchReports follows X-Next-Cursor until every page is loaded
  * - fetchReports returns empty array on error
  * - fetchReportById returns full report detail
  * - fetchReportById returns null on 404
@@ -33,12 +34,37 @@ describe("fetchReports", () => {
   it("fetches and returns list of report summaries", async () => {
     globalThis.fetch = vi.fn().mockResolvedValue({
       ok: true,
+      headers: new Headers(),
       json: () => Promise.resolve(MOCK_REPORTS),
     });
 
     const result = await fetchReports();
     expect(result).toEqual(MOCK_REPORTS);
-    expect(globalThis.fetch).toHaveBeenCalledWith(`${API_BASE_URL}/reports`);
+    expect(globalThis.fetch).toHaveBeenCalledWith(
+      `${API_BASE_URL}/reports?limit=500`,
+    );
+  });
+
+  it("follows the next-page cursor until every page is loaded", async () => {
+    globalThis.fetch = vi
+      .fn()
+      .mockResolvedValueOnce({
+        ok: true,
+        headers: new Headers({ "X-Next-Cursor": "page-2" }),
+        json: () => Promise.resolve([MOCK_REPORTS[0]]),
+      })
+      .mockResolvedValueOnce({
+        ok: true,
+        headers: new Headers(),
+        json: () => Promise.resolve([MOCK_REPORTS[1]]),
+      });
+
+    const result = await fetchReports();
+    expect(result).toEqual(MOCK_REPORTS);
+    expect(globalThis.fetch).toHaveBeenCalledTimes(2);
+    expect(globalThis.fetch).toHaveBeenLastCalledWith(
+      `${API_BASE_URL}/reports?limit=500&cursor=page-2`,
+    );
   });
 
   it("returns empty array on network error", async () => {
@@ -4,10 +4,11 @@
  * Tests cover:
  * - parseSSEEvent parses valid SSE data lines
  * - parseSSEEvent returns null for non-data lines
+ * - parseSSEEventId reads SSE id lines
  * - StreamEvent type definitions
  */
 import type { StreamEvent } from "../research-api";
-import { parseSSEEvent } from "../research-api";
+import { parseSSEEvent, parseSSEEventId } from "../research-api";
 
 describe("parseSSEEvent", () => {
   it("parses a valid SSE data line", () => {
@@ -48,13 +49,24 @@ describe("parseSSEEvent", () => {
   });
 });
 
+describe("parseSSEEventId", () => {
+  it("parses an id line", () => {
+    expect(parseSSEEventId("id: 42")).toBe("42");
+  });
+
+  it("returns null for data lines", () => {
+    expect(parseSSEEventId('data: {"type":"progress","data":"x"}')).toBeNull();
+  });
+});
+
 describe("StreamEvent type", () => {
-  it("accepts progress, result, and error types", () => {
+  it("accepts progress, delta, result, and error types", () => {
     const events: StreamEvent[] = [
       { type: "progress", data: "Working..." },
+      { type: "delta", data: "# Rep", message_id: "run-1" },
       { type: "result", data: "# Report", filename: "report.md" },
       { type: "error", data: "Failed" },
     ];
-    expect(events).toHaveLength(3);
+    expect(events).toHaveLength(4);
   });
 });
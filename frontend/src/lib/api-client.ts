@@ -11,6 +11,7 @@ export interface HealthResponse {
     orchestrator: string;
     medical: string;
   };
+  age_us?: number | null;
 }
 
 export async function fetchHealth(): Promise<HealthResponse | null> {
@@ -3,6 +3,8 @@
 import { API_BASE_URL } from "./api-client.ts";
 
 const REPORTS_ENDPOINT = "/reports";
+const REPORTS_PAGE_SIZE = 500;
+export const NEXT_CURSOR_HEADER = "X-Next-Cursor";
 
 export interface ReportSummary {
   id: string;
@@ -18,13 +20,26 @@ export interface ReportDetail {
   models_used: string[] | null;
 }
 
+/** Fetch every saved report summary, following X-Next-Cursor across pages. */
 export async function fetchReports(): Promise<ReportSummary[]> {
+  const reports: ReportSummary[] = [];
+  let cursor: string | null = null;
   try {
-    const response = await fetch(`${API_BASE_URL}${REPORTS_ENDPOINT}`);
-    if (!response.ok) {
-      return [];
-    }
-    return (await response.json()) as ReportSummary[];
+    do {
+      const params = new URLSearchParams({ limit: String(REPORTS_PAGE_SIZE) });
+      if (cursor !== null) {
+        params.set("cursor", cursor);
+      }
+      const response = await fetch(
+        `${API_BASE_URL}${REPORTS_ENDPOINT}?${params.toString()}`,
+      );
+      if (!response.ok) {
+        return [];
+      }
+      reports.push(...((await response.json()) as ReportSummary[]));
+      cursor = response.headers.get(NEXT_CURSOR_HEADER);
+    } while (cursor !== null);
+    return reports;
   } catch {
     return [];
   }
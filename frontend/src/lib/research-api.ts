@@ -3,16 +3,34 @@
 import { API_BASE_URL } from "./api-client.ts";
 
 const SSE_DATA_PREFIX = "data: ";
+const SSE_ID_PREFIX = "id:";
 const RESEARCH_ENDPOINT = "/research";
+const RESEARCH_JOBS_ENDPOINT = "/research/jobs";
+
+export const JOB_ID_HEADER = "X-Job-Id";
+export const LAST_EVENT_ID_HEADER = "Last-Event-ID";
+export const RETRY_AFTER_HEADER = "Retry-After";
 
 export const EVENT_TYPE_PROGRESS = "progress" as const;
 export const EVENT_TYPE_RESULT = "result" as const;
 export const EVENT_TYPE_ERROR = "error" as const;
+export const EVENT_TYPE_CANCELLED = "cancelled" as const;
+export const EVENT_TYPE_DELTA = "delta" as const;
+export const EVENT_TYPE_QUEUED = "queued" as const;
 
 export interface StreamEvent {
-  type: typeof EVENT_TYPE_PROGRESS | typeof EVENT_TYPE_RESULT | typeof EVENT_TYPE_ERROR;
+  type:
+    | typeof EVENT_TYPE_PROGRESS
+    | typeof EVENT_TYPE_RESULT
+    | typeof EVENT_TYPE_ERROR
+    | typeof EVENT_TYPE_CANCELLED
+    | typeof EVENT_TYPE_DELTA
+    | typeof EVENT_TYPE_QUEUED;
   data: string;
   filename?: string;
+  message_id?: string | null;
+  queue_position?: number | null;
+  estimated_wait_seconds?: number | null;
 }
 
 export function parseSSEEvent(line: string): StreamEvent | null {
@@ -28,6 +46,17 @@ export function parseSSEEvent(line: string): StreamEvent | null {
   }
 }
 
+export function parseSSEEventId(line: string): string | null {
+  if (!line.startsWith(SSE_ID_PREFIX)) {
+    return null;
+  }
+  return line.slice(SSE_ID_PREFIX.length).trim();
+}
+
 export function buildResearchUrl(): string {
   return `${API_BASE_URL}${RESEARCH_ENDPOINT}`;
 }
+
+export function buildJobEventsUrl(jobId: string): string {
+  return `${API_BASE_URL}${RESEARCH_JOBS_ENDPOINT}/${encodeURIComponent(jobId)}/events`;
+}
@@ -2,35 +2,69 @@
 
 Creates a LangGraph-based research agent that plans multi-step research,
 searches the web via Tavily, and consults MedGemma for medical analysis.
+Also provides the report synthesizer used when a run's budget runs out:
+one tool-free orchestrator call that writes the report from the findings
+gathered so far.
 """
 
 import logging
+from collections.abc import Callable, Sequence
 from functools import partial
 from typing import Any
 
 from deepagents import create_deep_agent
 from langchain_core.language_models import BaseChatModel
-from langchain_core.tools import BaseTool, tool
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.tools import BaseTool, StructuredTool
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph.state import CompiledStateGraph
 
 from src.config.settings import Settings
-from src.models.clients import create_medical_llm_with_fallback, create_orchestrator_llm
-from src.tools.medical import consult_medical_expert
-from src.tools.search import create_search_tool
+from src.models.circuit_breaker import CircuitBreaker
+from src.models.clients import (
+    create_medical_hedger,
+    create_medical_llm_with_fallback,
+    create_orchestrator_llm,
+)
+from src.models.hedging import LatencyHedger
+from src.models.load_balancer import OllamaHostPool
+from src.services.disk_cache import DiskCache
+from src.services.instrumentation import timed_invoke
+from src.services.tool_concurrency import ConcurrencyLimiter
+from src.services.tool_memo import current_tool_memo
+from src.tools.medical import (
+    MEDICAL_QUERY_TIMEOUT_SECONDS,
+    MedicalResponseCache,
+    aconsult_medical_expert,
+    consult_medical_expert,
+    create_medical_cache,
+    is_primary_answer,
+)
+from src.tools.search import (
+    asafe_batch_search,
+    asafe_search,
+    create_search_cache,
+    create_search_tool,
+    is_failed_search,
+    safe_batch_search,
+    safe_search,
+)
 
 logger = logging.getLogger(__name__)
 
 # ---- Constants ----
 
 AGENT_NAME = "medical-research-agent"
-MAX_AGENT_ITERATIONS = 20
+MAX_SYNTHESIS_FINDINGS_CHARS = 24_000
+MEDICAL_TOOL_NAME = "consult_medical_expert_tool"
 
 RESEARCH_SYSTEM_PROMPT = (
     "You are a medical research agent. Your role is to conduct thorough, "
     "evidence-based research on medical and biomedical topics.\n\n"
     "## Research Workflow\n"
     "1. Break the research question into sub-questions\n"
-    "2. Search for relevant information using the search tool\n"
+    "2. Search for relevant information using the search tool. When you have "
+    "several sub-questions, search them together with the batch search tool\n"
     "3. Consult the medical expert tool for domain-specific analysis\n"
     "4. Synthesize findings into a structured report\n\n"
     "## Output Format\n"
@@ -55,15 +89,84 @@ RESEARCH_SYSTEM_PROMPT = (
     "'This analysis is for research purposes only and does not constitute medical advice.'\n"
 )
 
+SYNTHESIS_PROMPT = (
+    "Research query: {query}\n\n"
+    "The research budget is exhausted ({reason}). Do not search or call any "
+    "tools. Write the final report now, in the required output format, using "
+    "only the findings gathered so far below. State clearly which parts of "
+    "the question could not be fully researched.\n\n"
+    "## Findings So Far\n{findings}"
+)
+
+ReportSynthesizer = Callable[[str, Sequence[BaseMessage], str], str]
+
+
+def _build_search_tool(
+    search_tool: BaseTool,
+    cache: DiskCache | None,
+) -> StructuredTool:
+    """Build a LangChain tool that wraps safe_search, or asafe_search when awaited."""
+
+    def tavily_search(query: str) -> str:
+        """Search the web for medical literature and trusted health sources.
+
+        Use this tool to find recent research, clinical studies, reviews,
+        and guidelines. Returns numbered results with title, URL, and
+        a content snippet for each source.
+        """
+        return safe_search(search_tool, query, cache=cache)
+
+    async def atavily_search(query: str) -> str:
+        return await asafe_search(search_tool, query, cache=cache)
+
+    return StructuredTool.from_function(func=tavily_search, coroutine=atavily_search)
+
+
+def _build_batch_search_tool(
+    search_tool: BaseTool,
+    cache: DiskCache | None,
+    max_workers: int,
+) -> StructuredTool:
+    """Build a LangChain tool that runs several searches concurrently via safe_batch_search.
+
+    Awaited, the tool runs asafe_batch_search instead.
+    """
+
+    def tavily_batch_search(queries: list[str]) -> str:
+        """Search the web for several sub-questions at once.
+
+        Use this tool instead of repeated single searches when you have
+        more than one sub-question. The queries run in parallel and the
+        merged results list each source URL only once.
+        """
+        return safe_batch_search(search_tool, queries, cache=cache, max_workers=max_workers)
+
+    async def atavily_batch_search(queries: list[str]) -> str:
+        return await asafe_batch_search(search_tool, queries, cache=cache, max_workers=max_workers)
+
+    return StructuredTool.from_function(func=tavily_batch_search, coroutine=atavily_batch_search)
+
 
 def _build_medical_tool(
     medical_llm: BaseChatModel,
     fallback_llm: BaseChatModel,
-) -> BaseTool:
-    """Build a LangChain tool that wraps consult_medical_expert."""
-    bound = partial(consult_medical_expert, medical_llm=medical_llm, fallback_llm=fallback_llm)
+    breaker: CircuitBreaker | None = None,
+    timeout_seconds: float = MEDICAL_QUERY_TIMEOUT_SECONDS,
+    hedger: LatencyHedger | None = None,
+    cache: MedicalResponseCache | None = None,
+) -> StructuredTool:
+    """Build a LangChain tool that wraps consult_medical_expert, or its async variant."""
+    options: dict[str, Any] = {
+        "medical_llm": medical_llm,
+        "fallback_llm": fallback_llm,
+        "breaker": breaker,
+        "timeout_seconds": timeout_seconds,
+        "hedger": hedger,
+        "cache": cache,
+    }
+    bound = partial(consult_medical_expert, **options)
+    abound = partial(aconsult_medical_expert, **options)
 
-    @tool
     def consult_medical_expert_tool(query: str) -> str:
         """Consult the medical specialist model for domain-specific medical analysis.
 
@@ -73,30 +176,211 @@ def _build_medical_tool(
         """
         return bound(query=query)
 
-    return consult_medical_expert_tool
+    async def aconsult_medical_expert_tool(query: str) -> str:
+        return await abound(query=query)
+
+    return StructuredTool.from_function(
+        func=consult_medical_expert_tool, coroutine=aconsult_medical_expert_tool
+    )
+
+
+def _limit_tool(tool: StructuredTool, limiter: ConcurrencyLimiter) -> StructuredTool:
+    """Rebuild tool so that every call, sync or awaited, holds a slot of limiter."""
+    func = tool.func
+    coroutine = tool.coroutine
+    if func is None or coroutine is None:
+        msg = f"Tool '{tool.name}' needs both a sync and an async implementation"
+        raise ValueError(msg)
+
+    def limited(**kwargs: Any) -> Any:
+        with limiter.hold():
+            return func(**kwargs)
 
+    async def alimited(**kwargs: Any) -> Any:
+        async with limiter.ahold():
+            return await coroutine(**kwargs)
 
-def create_research_agent(settings: Settings) -> CompiledStateGraph[Any, Any]:
+    return StructuredTool(
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        func=limited,
+        coroutine=alimited,
+    )
+
+
+def _search_succeeded(output: str) -> bool:
+    """Return True if a search tool output can be reused for the rest of a run."""
+    return not is_failed_search(output)
+
+
+def _memoize_tool(tool: StructuredTool, reusable: Callable[[str], bool]) -> StructuredTool:
+    """Rebuild tool so that a repeated call within a research run reuses the earlier result.
+
+    Only results that reusable accepts are remembered, so failed calls are
+    retried. Outside a run's tool_memo_scope every call runs normally.
+    """
+    func = tool.func
+    coroutine = tool.coroutine
+    if func is None or coroutine is None:
+        msg = f"Tool '{tool.name}' needs both a sync and an async implementation"
+        raise ValueError(msg)
+
+    def memoized(**kwargs: Any) -> Any:
+        memo = current_tool_memo()
+        if memo is None:
+            return func(**kwargs)
+        earlier = memo.lookup(tool.name, kwargs)
+        if earlier is not None:
+            return earlier
+        result = func(**kwargs)
+        if isinstance(result, str) and reusable(result):
+            memo.store(tool.name, kwargs, result)
+        return result
+
+    async def amemoized(**kwargs: Any) -> Any:
+        memo = current_tool_memo()
+        if memo is None:
+            return await coroutine(**kwargs)
+        earlier = memo.lookup(tool.name, kwargs)
+        if earlier is not None:
+            return earlier
+        result = await coroutine(**kwargs)
+        if isinstance(result, str) and reusable(result):
+            memo.store(tool.name, kwargs, result)
+        return result
+
+    return StructuredTool(
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        func=memoized,
+        coroutine=amemoized,
+    )
+
+
+def _create_tool_limiters(
+    settings: Settings,
+    tool_names: Sequence[str],
+    ollama_pool: OllamaHostPool | None = None,
+) -> dict[str, ConcurrencyLimiter]:
+    """Create a limiter for each tool named in settings.tool_concurrency_limits.
+
+    The medical tool's limit is multiplied by the number of pooled hosts
+    serving the medical model, so it caps concurrent calls per host.
+    """
+    limiters: dict[str, ConcurrencyLimiter] = {}
+    for name, limit in settings.tool_concurrency_limits.items():
+        if name not in tool_names:
+            logger.warning("Ignoring concurrency limit for unknown tool '%s'", name)
+            continue
+        if name == MEDICAL_TOOL_NAME and ollama_pool is not None:
+            limit *= max(1, len(ollama_pool.hosts_for(settings.medical_model)))
+        limiters[name] = ConcurrencyLimiter(name, limit)
+        logger.info("Limiting tool '%s' to %d concurrent calls", name, limit)
+    return limiters
+
+
+def create_research_agent(
+    settings: Settings,
+    medical_breaker: CircuitBreaker | None = None,
+    checkpointer: BaseCheckpointSaver[Any] | None = None,
+    ollama_pool: OllamaHostPool | None = None,
+) -> CompiledStateGraph[Any, Any]:
     """Create the deep research agent with search and medical tools.
 
     Assembles a LangGraph agent using create_deep_agent with:
     - Qwen3 as the orchestrator model (supports tool calling)
-    - Tavily search tool for web research
-    - Medical consultation tool backed by MedGemma with Qwen3 fallback
+    - Tavily search tools (single and concurrent batch), backed by the result cache
+    - Medical consultation tool backed by MedGemma with Qwen3 fallback,
+      guarded by medical_breaker when given, under a per-call deadline and
+      optionally hedged to Qwen3 when MedGemma is slow, and backed by the
+      medical answer cache
+    - checkpointer, when given, persisting every step under the run's thread_id
+    - both models balanced across ollama_pool, when given
+    - concurrent calls of each tool capped by settings.tool_concurrency_limits;
+      the tool calls of one turn otherwise run concurrently, with results
+      returned in call order
+    - repeated identical tool calls within a run answered from the run's
+      tool memo, when the run sets one with tool_memo_scope
     """
-    orchestrator_llm = create_orchestrator_llm(settings)
-    medical_llm = create_medical_llm_with_fallback(settings, orchestrator_llm)
-    search_tool = create_search_tool(settings)
+    orchestrator_llm = create_orchestrator_llm(settings, ollama_pool)
+    medical_llm = create_medical_llm_with_fallback(settings, orchestrator_llm, ollama_pool)
+    base_search_tool = create_search_tool(settings)
+    search_cache = create_search_cache(settings)
+    search_tool = _build_search_tool(search_tool=base_search_tool, cache=search_cache)
+    batch_search_tool = _build_batch_search_tool(
+        search_tool=base_search_tool,
+        cache=search_cache,
+        max_workers=settings.search_batch_max_workers,
+    )
     medical_tool = _build_medical_tool(
         medical_llm=medical_llm,
         fallback_llm=orchestrator_llm,
+        breaker=medical_breaker,
+        timeout_seconds=settings.medical_query_timeout_seconds,
+        hedger=create_medical_hedger(settings),
+        cache=create_medical_cache(settings),
     )
 
+    tools = [search_tool, batch_search_tool, medical_tool]
+    limiters = _create_tool_limiters(settings, [tool.name for tool in tools], ollama_pool)
+    tools = [
+        _limit_tool(tool, limiters[tool.name]) if tool.name in limiters else tool for tool in tools
+    ]
+    tools = [
+        _memoize_tool(
+            tool, is_primary_answer if tool.name == MEDICAL_TOOL_NAME else _search_succeeded
+        )
+        for tool in tools
+    ]
+
     logger.info("Creating research agent '%s' with Qwen3 orchestrator", AGENT_NAME)
 
     return create_deep_agent(
         model=orchestrator_llm,
-        tools=[search_tool, medical_tool],
+        tools=tools,
         system_prompt=RESEARCH_SYSTEM_PROMPT,
         name=AGENT_NAME,
+        checkpointer=checkpointer,
     )
+
+
+def _format_findings(messages: Sequence[BaseMessage]) -> str:
+    """Render tool results and orchestrator notes as text, keeping the most recent."""
+    parts = []
+    for message in messages:
+        text = message.text.strip()
+        if not text:
+            continue
+        if isinstance(message, ToolMessage):
+            parts.append(f"### Result from {message.name or 'tool'}\n{text}")
+        elif isinstance(message, AIMessage):
+            parts.append(f"### Research notes\n{text}")
+    findings = "\n\n".join(parts)
+    if len(findings) > MAX_SYNTHESIS_FINDINGS_CHARS:
+        findings = findings[-MAX_SYNTHESIS_FINDINGS_CHARS:]
+    return findings or "No findings were gathered."
+
+
+def synthesize_report(
+    llm: BaseChatModel,
+    query: str,
+    messages: Sequence[BaseMessage],
+    reason: str,
+) -> str:
+    """Write the final report from the messages of a run stopped by its budget."""
+    prompt = SYNTHESIS_PROMPT.format(
+        query=query, reason=reason, findings=_format_findings(messages)
+    )
+    response = timed_invoke(
+        llm, [SystemMessage(content=RESEARCH_SYSTEM_PROMPT), HumanMessage(prompt)]
+    )
+    return str(response.text)
+
+
+def create_report_synthesizer(
+    settings: Settings, ollama_pool: OllamaHostPool | None = None
+) -> ReportSynthesizer:
+    """Create the synthesizer that forces a final report with the orchestrator model."""
+    return partial(synthesize_report, create_orchestrator_llm(settings, ollama_pool))
@@ -4,17 +4,28 @@ Provides the main application factory with CORS configuration,
 settings validation, health check, and research API routing.
 """
 
+import asyncio
+import contextlib
 import logging
 import sys
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
 
-import httpx
 from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 
-from src.agent.research_agent import create_research_agent
-from src.api.routes.reports import create_reports_router
-from src.api.routes.research import create_research_router
+from src.agent.research_agent import create_report_synthesizer, create_research_agent
+from src.api.routes.reports import NEXT_CURSOR_HEADER, create_reports_router
+from src.api.routes.research import JOB_ID_HEADER, create_research_router
 from src.config.settings import Settings, configure_logging, load_settings
+from src.models.circuit_breaker import CircuitBreaker
+from src.models.clients import create_medical_circuit_breaker
+from src.models.load_balancer import OllamaHostPool, create_ollama_pool
+from src.models.warmup import ModelWarmup, create_model_warmup
+from src.services.checkpoints import create_checkpoint_store
+from src.services.health_monitor import HealthSnapshot, OllamaHealthMonitor, create_health_monitor
+from src.services.metrics import PROMETHEUS_CONTENT_TYPE, REGISTRY
 
 logger = logging.getLogger(__name__)
 
@@ -25,55 +36,129 @@ API_PREFIX = "/api"
 STATUS_HEALTHY = "healthy"
 STATUS_DEGRADED = "degraded"
 MODEL_UNAVAILABLE = "unavailable"
-OLLAMA_HEALTH_TIMEOUT_SECONDS = 5
-
-
-def _check_ollama_connectivity(base_url: str) -> bool:
-    """Check whether Ollama is reachable."""
-    try:
-        response = httpx.get(base_url, timeout=OLLAMA_HEALTH_TIMEOUT_SECONDS)
-        return response.status_code == 200
-    except httpx.HTTPError:
-        return False
-
-
-def _build_health_response(settings: Settings, ollama_available: bool) -> dict[str, object]:
-    """Build the health check response payload."""
-    if ollama_available:
-        return {
-            "status": STATUS_HEALTHY,
-            "models": {
-                "orchestrator": settings.orchestrator_model,
-                "medical": settings.medical_model,
-            },
-        }
-    return {
-        "status": STATUS_DEGRADED,
-        "models": {
-            "orchestrator": MODEL_UNAVAILABLE,
-            "medical": MODEL_UNAVAILABLE,
-        },
+STATUS_READY = "ready"
+STATUS_NOT_READY = "not_ready"
+HTTP_503_SERVICE_UNAVAILABLE = 503
+
+
+def _build_health_response(
+    settings: Settings,
+    snapshot: HealthSnapshot,
+    medical_breaker: CircuitBreaker | None = None,
+    ollama_pool: OllamaHostPool | None = None,
+) -> dict[str, object]:
+    """Build the health check response payload from a cached snapshot.
+
+    Each model is reported by name if Ollama has it installed, otherwise
+    as unavailable; the status is healthy only when both are available.
+    With a host pool, each host's load and ejection state is included
+    alongside whether its last health check reached it and found the
+    models placed on it.
+    """
+    configured = {
+        "orchestrator": settings.orchestrator_model,
+        "medical": settings.medical_model,
+    }
+    models = {
+        role: model if snapshot.models_available.get(role, False) else MODEL_UNAVAILABLE
+        for role, model in configured.items()
+    }
+    healthy = snapshot.ollama_available and MODEL_UNAVAILABLE not in models.values()
+    response: dict[str, object] = {
+        "status": STATUS_HEALTHY if healthy else STATUS_DEGRADED,
+        "models": models,
+        "age_us": snapshot.age_us(),
     }
 
-
-def _create_health_router(settings: Settings) -> APIRouter:
+    if medical_breaker is not None:
+        response["circuit_breakers"] = {medical_breaker.name: medical_breaker.snapshot()}
+    if ollama_pool is not None:
+        hosts = ollama_pool.snapshot()
+        for url, host in hosts.items():
+            health = snapshot.hosts.get(url, {})
+            host["available"] = health.get("available", False)
+            host["models_available"] = health.get("models", {})
+        response["ollama_hosts"] = hosts
+    return response
+
+
+def _create_health_router(
+    settings: Settings,
+    health_monitor: OllamaHealthMonitor,
+    medical_breaker: CircuitBreaker | None = None,
+    ollama_pool: OllamaHostPool | None = None,
+) -> APIRouter:
     """Create the health check API router."""
     router = APIRouter()
 
     @router.get("/health")
-    def health_check() -> dict[str, object]:
-        """Return application health status with model availability."""
-        ollama_available = _check_ollama_connectivity(settings.ollama_base_url)
-        return _build_health_response(settings, ollama_available)
+    async def health_check() -> dict[str, object]:
+        """Return the cached health snapshot with model availability and its age."""
+        return _build_health_response(
+            settings, health_monitor.snapshot(), medical_breaker, ollama_pool
+        )
+
+    return router
+
+
+def _create_readiness_router(warmup: ModelWarmup) -> APIRouter:
+    """Create the readiness API router reporting model residency."""
+    router = APIRouter()
+
+    @router.get("/ready")
+    async def readiness_check() -> JSONResponse:
+        """Return 200 once every configured model is resident in Ollama, else 503."""
+        models = await warmup.readiness()
+        ready = all(entry["resident"] for entry in models.values())
+        return JSONResponse(
+            status_code=200 if ready else HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": STATUS_READY if ready else STATUS_NOT_READY, "models": models},
+        )
 
     return router
 
 
+def _create_metrics_router() -> APIRouter:
+    """Create the metrics API router serving the in-process registry."""
+    router = APIRouter()
+
+    @router.get("/metrics")
+    def metrics() -> Response:
+        """Return every recorded metric in the Prometheus text format."""
+        return Response(content=REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    return router
+
+
+def _create_lifespan(
+    settings: Settings,
+    warmup: ModelWarmup,
+    health_monitor: OllamaHealthMonitor,
+) -> Callable[[FastAPI], AbstractAsyncContextManager[None]]:
+    """Create the app lifespan, which runs model warm-up and health polling."""
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+        tasks = [asyncio.create_task(health_monitor.run())]
+        if settings.model_warmup_enabled:
+            tasks.append(asyncio.create_task(warmup.warm_up()))
+        yield
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    return lifespan
+
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application.
 
     Loads settings, configures CORS and logging, and mounts
-    health check, research, and reports endpoints under /api.
+    health check, readiness, metrics, research, and reports endpoints under /api.
+    Both models are preloaded and Ollama health is polled in the
+    background once the app starts.
     """
     settings = load_settings()
     if settings is None:
@@ -83,25 +168,47 @@ def create_app() -> FastAPI:
     configure_logging(settings)
     logger.info("Starting application with orchestrator=%s", settings.orchestrator_model)
 
-    app = FastAPI(title="Deep Medical Research Agent")
+    warmup = create_model_warmup(settings)
+    health_monitor = create_health_monitor(settings)
+    app = FastAPI(
+        title="Deep Medical Research Agent",
+        lifespan=_create_lifespan(settings, warmup, health_monitor),
+    )
     app.add_middleware(
         CORSMiddleware,
         allow_origins=[FRONTEND_ORIGIN],
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, JOB_ID_HEADER],
     )
 
-    health_router = _create_health_router(settings)
+    medical_breaker = create_medical_circuit_breaker(settings)
+    ollama_pool = create_ollama_pool(settings)
+
+    health_router = _create_health_router(settings, health_monitor, medical_breaker, ollama_pool)
     app.include_router(health_router, prefix=API_PREFIX)
+    app.include_router(_create_readiness_router(warmup), prefix=API_PREFIX)
+    app.include_router(_create_metrics_router(), prefix=API_PREFIX)
 
     reports_router = create_reports_router(settings=settings)
     app.include_router(reports_router, prefix=API_PREFIX)
     logger.info("Reports endpoint mounted at %s/reports", API_PREFIX)
 
     try:
-        agent = create_research_agent(settings)
-        research_router = create_research_router(settings=settings, agent=agent)
+        checkpoints = create_checkpoint_store(settings)
+        agent = create_research_agent(
+            settings,
+            medical_breaker=medical_breaker,
+            checkpointer=checkpoints.saver if checkpoints is not None else None,
+            ollama_pool=ollama_pool,
+        )
+        research_router = create_research_router(
+            settings=settings,
+            agent=agent,
+            checkpoints=checkpoints,
+            synthesizer=create_report_synthesizer(settings, ollama_pool),
+        )
         app.include_router(research_router, prefix=API_PREFIX)
         logger.info("Research endpoint mounted at %s/research", API_PREFIX)
     except Exception as exc:
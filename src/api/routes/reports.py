@@ -1,21 +1,27 @@
 """Reports API endpoints for listing and retrieving saved research reports.
 
-Provides GET /reports and GET /reports/{report_id} endpoints
-backed by the report persistence service.
+Provides GET /reports, GET /reports/search, and GET /reports/{report_id}
+endpoints backed by the report persistence service. GET /reports is
+cursor paginated: it returns one page as a JSON array and the cursor for
+the next page in the X-Next-Cursor header.
 """
 
 import logging
+from datetime import datetime
 from pathlib import Path
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 from pydantic import BaseModel
 
 from src.config.settings import Settings
+from src.services.report_index import InvalidCursorError
 from src.services.report_service import (
     FRONT_MATTER_DELIMITER,
     ReportNotFoundError,
     get_report,
-    list_reports,
+    list_report_page,
+    search_reports,
 )
 from src.services.report_service import _parse_front_matter as parse_front_matter
 
@@ -24,7 +30,13 @@ logger = logging.getLogger(__name__)
 # ---- Constants ----
 
 REPORT_FILE_EXTENSION = ".md"
+HTTP_400_BAD_REQUEST = 400
 HTTP_404_NOT_FOUND = 404
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
 
 
 # ---- Pydantic Schemas ----
@@ -48,6 +60,16 @@ class ReportDetail(BaseModel):
     models_used: list[str] | None = None
 
 
+class ReportSearchHit(BaseModel):
+    """A ranked full-text search hit with a highlighted snippet."""
+
+    id: str
+    query: str
+    timestamp: str
+    score: float
+    snippet: str
+
+
 # ---- Helpers ----
 
 
@@ -81,10 +103,37 @@ def create_reports_router(settings: Settings) -> APIRouter:
     router = APIRouter()
 
     @router.get("/reports", response_model=list[ReportSummary])
-    def list_all_reports() -> list[ReportSummary]:
-        """List all saved research reports with metadata."""
+    def list_all_reports(
+        response: Response,
+        limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        q: str | None = None,
+        order: Literal["asc", "desc"] = "desc",
+    ) -> list[ReportSummary]:
+        """List one page of saved research reports with metadata.
+
+        Filters by timestamp range (since inclusive, until exclusive) and
+        by a case-insensitive substring of the query. When more reports
+        match, the X-Next-Cursor header carries the cursor for the next page.
+        """
         logger.info("Listing reports from %s", settings.output_dir)
-        raw_reports = list_reports(settings.output_dir)
+        try:
+            raw_reports, next_cursor = list_report_page(
+                settings.output_dir,
+                limit=limit,
+                cursor=cursor,
+                since=since,
+                until=until,
+                query_contains=q,
+                order=order,
+            )
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(exc)) from None
+
+        if next_cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         return [
             ReportSummary(
                 id=_filename_to_id(r["filename"]),
@@ -94,6 +143,29 @@ def create_reports_router(settings: Settings) -> APIRouter:
             for r in raw_reports
         ]
 
+    @router.get("/reports/search", response_model=list[ReportSearchHit])
+    def search_all_reports(
+        q: Annotated[str, Query(min_length=1)],
+        limit: Annotated[int, Query(ge=1, le=MAX_SEARCH_LIMIT)] = DEFAULT_SEARCH_LIMIT,
+    ) -> list[ReportSearchHit]:
+        """Search report queries and bodies, best matches first.
+
+        Scores are FTS5 bm25 values, where lower is better. Snippets wrap
+        matched terms in <mark> tags.
+        """
+        logger.info("Searching reports in %s for '%s'", settings.output_dir, q)
+        hits = search_reports(settings.output_dir, q, limit)
+        return [
+            ReportSearchHit(
+                id=_filename_to_id(hit["filename"]),
+                query=hit["query"],
+                timestamp=hit["timestamp"],
+                score=hit["score"],
+                snippet=hit["snippet"],
+            )
+            for hit in hits
+        ]
+
     @router.get("/reports/{report_id}", response_model=ReportDetail)
     def get_report_by_id(report_id: str) -> ReportDetail:
         """Retrieve a full report by its ID."""
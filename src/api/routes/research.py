@@ -1,21 +1,62 @@
-"""Research API endpoint with Server-Sent Events streaming.
+"""Research API endpoints with Server-Sent Events streaming.
 
-Provides a POST /research endpoint that streams research progress
-from the deep research agent via SSE, then auto-saves the report.
+Each research request runs as a job on the research job queue, which
+streams the agent's progress as SSE events and saves the final report.
+Clients can submit, poll, and re-attach to jobs by id.
 """
 
+import asyncio
+import contextlib
 import logging
-from collections.abc import Generator
-from typing import Any
-
-from fastapi import APIRouter
-from fastapi.responses import StreamingResponse
-from langchain_core.messages import HumanMessage
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Iterator
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Annotated, Any, cast
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.errors import GraphRecursionError
 from langgraph.graph.state import CompiledStateGraph
-from pydantic import BaseModel, field_validator
+from langgraph.types import StreamMode
+from pydantic import BaseModel, Field, field_validator
 
+from src.agent.research_agent import ReportSynthesizer
 from src.config.settings import Settings
-from src.services.report_service import save_report
+from src.services.budgets import (
+    BUDGET_STEPS,
+    BudgetCallbackHandler,
+    BudgetExhaustedError,
+    BudgetLimits,
+    RunBudget,
+    create_budget_limits,
+)
+from src.services.cancellation import CancellationCallbackHandler, cancel_scope
+from src.services.checkpoints import (
+    LEASE_RENEWALS_PER_PERIOD,
+    ResearchCheckpointStore,
+    RunState,
+    thread_config,
+)
+from src.services.instrumentation import LLMMetricsCallbackHandler
+from src.services.metrics import (
+    RESEARCH_BUDGET_EXHAUSTED,
+    RESEARCH_CACHE_LOOKUPS,
+    RESEARCH_NODE_DURATION,
+    RESEARCH_RUNS_CANCELLED,
+)
+from src.services.report_service import find_recent_report, save_report
+from src.services.research_jobs import (
+    AsyncJobRunner,
+    JobRunner,
+    ResearchJob,
+    ResearchJobManager,
+    ResearchQueueFullError,
+)
+from src.services.tool_memo import RunToolMemo, tool_memo_scope
 
 logger = logging.getLogger(__name__)
 
@@ -24,16 +65,53 @@ logger = logging.getLogger(__name__)
 EVENT_TYPE_PROGRESS = "progress"
 EVENT_TYPE_RESULT = "result"
 EVENT_TYPE_ERROR = "error"
+EVENT_TYPE_CANCELLED = "cancelled"
+EVENT_TYPE_DELTA = "delta"
+STREAM_MODE_UPDATES: StreamMode = "updates"
+STREAM_MODE_MESSAGES: StreamMode = "messages"
+ORCHESTRATOR_NODE = "model"
+SYNTHESIS_NODE = "synthesis"
+CHECKPOINT_NS_SEPARATOR = "|"
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
 SSE_CONTENT_TYPE = "text/event-stream"
+SSE_HEARTBEAT = ": keep-alive\n\n"
+SSE_HEARTBEAT_SECONDS = 15.0
+PARTIAL_REPORT_NOTE = "> Partial report: research was cancelled before completion.\n\n"
+BUDGET_REPORT_NOTE = (
+    "> Research stopped early ({reason}); this report was written from the "
+    "findings gathered so far.\n\n"
+)
+JOB_ID_HEADER = "X-Job-Id"
+LAST_EVENT_ID_HEADER = "Last-Event-ID"
+RETRY_AFTER_HEADER = "Retry-After"
+HTTP_202_ACCEPTED = 202
+HTTP_404_NOT_FOUND = 404
+HTTP_503_SERVICE_UNAVAILABLE = 503
+REPORTS_PATH = "/api/reports"
+
+
+def _monotonic() -> float:
+    """Return monotonic time in seconds. Patchable for testing."""
+    return time.monotonic()
 
 
 # ---- Pydantic Schemas ----
 
 
 class ResearchRequest(BaseModel):
-    """Request body for the research endpoint."""
+    """Request body for the research endpoint.
+
+    force_refresh runs the agent even when a recent report for the same
+    query is cached. max_iterations, max_seconds and max_tokens lower the
+    run's budget below the configured limits; they cannot raise it.
+    """
 
     query: str
+    force_refresh: bool = False
+    max_iterations: int | None = Field(default=None, gt=0)
+    max_seconds: float | None = Field(default=None, gt=0)
+    max_tokens: int | None = Field(default=None, gt=0)
 
     @field_validator("query")
     @classmethod
@@ -46,19 +124,51 @@ class ResearchRequest(BaseModel):
 
 
 class StreamEvent(BaseModel):
-    """A single SSE event payload."""
+    """A single SSE event payload.
+
+    Delta events carry the id of the orchestrator message they extend;
+    a new id means the orchestrator started a new message. Queued events
+    carry the job's position in the wait queue and its estimated wait.
+    Result events served from the report cache are marked cached.
+    """
 
     type: str
     data: str
     filename: str | None = None
+    cached: bool = False
+    message_id: str | None = None
+    queue_position: int | None = None
+    estimated_wait_seconds: float | None = None
+
+
+class JobStatusResponse(BaseModel):
+    """Status of a research job, linking to its report once saved."""
+
+    job_id: str
+    query: str
+    status: str
+    created_at: str
+    started_at: str | None = None
+    finished_at: str | None = None
+    filename: str | None = None
+    report_url: str | None = None
+    error: str | None = None
+    cancel_reason: str | None = None
+    queue_position: int | None = None
+    cached: bool = False
+    resumed: bool = False
+    budget_exhausted: str | None = None
+    deduplicated_tool_calls: int = 0
+    event_count: int = 0
 
 
 # ---- SSE Helpers ----
 
 
-def _format_sse_event(event: StreamEvent) -> str:
-    """Format a StreamEvent as an SSE data line."""
-    return f"data: {event.model_dump_json()}\n\n"
+def _format_sse_event(event: StreamEvent, event_id: int | None = None) -> str:
+    """Format a StreamEvent as an SSE data line, preceded by its id line if given."""
+    id_line = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{id_line}data: {event.model_dump_json()}\n\n"
 
 
 def _unwrap_messages(raw: Any) -> list[Any]:
@@ -93,73 +203,697 @@ def _extract_final_content(chunk: dict[str, Any]) -> str:
     return ""
 
 
-# ---- Stream Generator ----
+def _split_stream_part(part: Any) -> tuple[str, Any]:
+    """Split a stream item into (mode, payload).
+
+    LangGraph yields (mode, payload) pairs when several stream modes are
+    requested; any other item is treated as an update chunk.
+    """
+    if isinstance(part, tuple) and len(part) == 2 and isinstance(part[0], str):
+        return part[0], part[1]
+    return STREAM_MODE_UPDATES, part
+
 
+def _extract_delta(payload: Any) -> StreamEvent | None:
+    """Build a delta event from a messages-mode payload, if it is orchestrator text.
+
+    Only token chunks written by the top-level orchestrator node are
+    streamed; tool results, sub-agent models and the medical model are not.
+    """
+    message, metadata = payload
+    if not isinstance(message, AIMessageChunk) or not isinstance(metadata, dict):
+        return None
+    if metadata.get("langgraph_node") != ORCHESTRATOR_NODE:
+        return None
+    if CHECKPOINT_NS_SEPARATOR in str(metadata.get("langgraph_checkpoint_ns", "")):
+        return None
+    text = message.text
+    if not text:
+        return None
+    return StreamEvent(type=EVENT_TYPE_DELTA, data=text, message_id=message.id)
 
-def _research_stream_generator(
-    query: str,
+
+# ---- Job Runner ----
+
+
+@dataclass
+class _RunProgress:
+    """What a run has produced so far, kept across the stream and its error paths."""
+
+    final_content: str = ""
+    messages: list[BaseMessage] = field(default_factory=list)
+    budget_stopped: bool = False
+    step_started: float = 0.0
+    usage_unsaved: bool = False
+
+
+@dataclass
+class _RunSetup:
+    """How one run streams the agent: its budget, graph config, input, tool memo and store."""
+
+    budget: RunBudget
+    config: RunnableConfig
+    agent_input: dict[str, Any] | None
+    tool_memo: RunToolMemo = field(default_factory=RunToolMemo)
+    checkpoints: ResearchCheckpointStore | None = None
+
+
+def _run_research(
+    job: ResearchJob,
     agent: CompiledStateGraph[Any, Any],
     settings: Settings,
-) -> Generator[str, None, None]:
-    """Generate SSE events from the research agent stream.
-
-    Yields progress events during research, a result event with
-    the final report, and saves the report to disk.
+    checkpoints: ResearchCheckpointStore | None = None,
+    synthesizer: ReportSynthesizer | None = None,
+) -> str | None:
+    """Run the research agent for a job, publishing its events.
+
+    Publishes progress events for each node, delta events with the
+    orchestrator's text as it is generated, and a result event with
+    the final report, saves the report to disk, and returns its filename.
+    Errors are published as an error event and re-raised. Once the job's
+    cancellation is requested the run stops at the next node boundary,
+    and new model and tool calls are refused. With checkpoints, the run
+    uses its job id as thread_id and its outcome is recorded in the store;
+    a resumed job with a saved step continues from it. Once the run's
+    budget is spent it stops the same way, and synthesizer writes the
+    report from the findings gathered so far. Time spent in each graph
+    node and every LLM call the run makes are recorded as metrics.
     """
-    yield _format_sse_event(StreamEvent(type=EVENT_TYPE_PROGRESS, data="Starting research..."))
+    setup = _begin_run(job, settings, checkpoints)
+    progress = _RunProgress()
+    try:
+        try:
+            with _run_scope(job, setup):
+                _stream_agent(job, agent, setup, progress)
+        except (BudgetExhaustedError, GraphRecursionError):
+            if job.cancel_requested:
+                raise
+            _stop_for_budget(setup, progress)
+        return _complete_run(job, agent, settings, checkpoints, synthesizer, setup, progress)
+    except Exception as exc:
+        return _fail_run(job, settings, checkpoints, progress, exc)
 
+
+async def _arun_research(
+    job: ResearchJob,
+    agent: CompiledStateGraph[Any, Any],
+    settings: Settings,
+    checkpoints: ResearchCheckpointStore | None = None,
+    synthesizer: ReportSynthesizer | None = None,
+) -> str | None:
+    """Async variant of _run_research that streams the agent with astream.
+
+    Model and tool calls are awaited on the event loop. The blocking
+    steps around the stream (checkpoint bookkeeping, the forced
+    synthesis and saving the report) run on a worker thread.
+    """
+    setup = await asyncio.to_thread(_begin_run, job, settings, checkpoints)
+    progress = _RunProgress()
     try:
-        final_content = ""
-        for chunk in agent.stream({"messages": [HumanMessage(content=query)]}):
-            node_names = list(chunk.keys())
-            for node_name in node_names:
-                yield _format_sse_event(
-                    StreamEvent(type=EVENT_TYPE_PROGRESS, data=f"Processing: {node_name}")
-                )
-            extracted = _extract_final_content(chunk)
-            if extracted:
-                final_content = extracted
-
-        if not final_content:
-            final_content = "No results produced by the research agent."
-
-        report_path = save_report(
-            query=query,
-            content=final_content,
-            output_dir=settings.output_dir,
-            models_used=[settings.orchestrator_model, settings.medical_model],
+        try:
+            with _run_scope(job, setup):
+                await _astream_agent(job, agent, setup, progress)
+        except (BudgetExhaustedError, GraphRecursionError):
+            if job.cancel_requested:
+                raise
+            _stop_for_budget(setup, progress)
+        return await asyncio.to_thread(
+            _complete_run, job, agent, settings, checkpoints, synthesizer, setup, progress
+        )
+    except Exception as exc:
+        return await asyncio.to_thread(_fail_run, job, settings, checkpoints, progress, exc)
+
+
+def _begin_run(
+    job: ResearchJob, settings: Settings, checkpoints: ResearchCheckpointStore | None
+) -> _RunSetup:
+    """Set up a run's budget and graph config, record it as started, and announce it.
+
+    A resumed job's budget starts from the usage it recorded before the restart.
+    """
+    budget = RunBudget(
+        job.limits if job.limits is not None else create_budget_limits(settings),
+        job.budget_used,
+    )
+    config: RunnableConfig = {
+        "callbacks": [
+            CancellationCallbackHandler(job.cancel_event),
+            BudgetCallbackHandler(budget),
+            LLMMetricsCallbackHandler(),
+        ]
+    }
+    recursion_limit = budget.limits.recursion_limit()
+    if recursion_limit is not None:
+        config["recursion_limit"] = recursion_limit
+    agent_input: dict[str, Any] | None = {"messages": [HumanMessage(content=job.query)]}
+    if checkpoints is not None:
+        config["configurable"] = thread_config(job.id)
+        if job.resumed and checkpoints.has_checkpoint(job.id):
+            agent_input = None
+        checkpoints.start_run(job.id, job.query, job.limits, job.cancel_on_disconnect)
+    status = "Resuming research..." if agent_input is None else "Starting research..."
+    job.publish(StreamEvent(type=EVENT_TYPE_PROGRESS, data=status).model_dump())
+    return _RunSetup(budget=budget, config=config, agent_input=agent_input, checkpoints=checkpoints)
+
+
+@contextlib.contextmanager
+def _run_scope(job: ResearchJob, setup: _RunSetup) -> Iterator[None]:
+    """Scope the agent stream to the job's cancellation signal and tool memo.
+
+    On leaving, the number of repeated tool calls the memo answered is
+    recorded on the job.
+    """
+    with cancel_scope(job.cancel_event), tool_memo_scope(setup.tool_memo):
+        try:
+            yield
+        finally:
+            job.deduplicated_tool_calls = setup.tool_memo.deduplicated
+
+
+def _stop_for_budget(setup: _RunSetup, progress: _RunProgress) -> None:
+    """Record that the graph refused further steps because the budget ran out."""
+    setup.budget.exhaust(BUDGET_STEPS)
+    progress.budget_stopped = True
+
+
+def _complete_run(
+    job: ResearchJob,
+    agent: CompiledStateGraph[Any, Any],
+    settings: Settings,
+    checkpoints: ResearchCheckpointStore | None,
+    synthesizer: ReportSynthesizer | None,
+    setup: _RunSetup,
+    progress: _RunProgress,
+) -> str | None:
+    """Save and publish the report of a run whose stream has ended."""
+    if job.cancel_requested:
+        _record_run(checkpoints, job, RunState.CANCELLED)
+        return _finish_cancelled(job, progress.final_content, settings)
+
+    final_content = progress.final_content
+    if progress.budget_stopped:
+        messages = (
+            _checkpointed_messages(agent, setup.config)
+            if checkpoints is not None
+            else progress.messages
         )
+        final_content = _force_final_report(job, setup.budget, messages, final_content, synthesizer)
+    if not final_content and setup.agent_input is None:
+        final_content = _checkpointed_final_content(agent, setup.config)
+    if not final_content:
+        final_content = "No results produced by the research agent."
+
+    report_path = save_report(
+        query=job.query,
+        content=final_content,
+        output_dir=settings.output_dir,
+        models_used=[settings.orchestrator_model, settings.medical_model],
+        partial=progress.budget_stopped,
+    )
+
+    job.publish(
+        StreamEvent(
+            type=EVENT_TYPE_RESULT,
+            data=final_content,
+            filename=report_path.name,
+        ).model_dump()
+    )
+    _record_run(checkpoints, job, RunState.SUCCEEDED)
+    return report_path.name
+
+
+def _fail_run(
+    job: ResearchJob,
+    settings: Settings,
+    checkpoints: ResearchCheckpointStore | None,
+    progress: _RunProgress,
+    exc: Exception,
+) -> str | None:
+    """Handle an error from a run: finish it cancelled, or publish the error and re-raise."""
+    if job.cancel_requested:
+        _record_run(checkpoints, job, RunState.CANCELLED)
+        return _finish_cancelled(job, progress.final_content, settings)
+    _record_run(checkpoints, job, RunState.FAILED)
+    logger.error("Research failed for query '%s': %s", job.query, exc)
+    job.publish(StreamEvent(type=EVENT_TYPE_ERROR, data=f"Research failed: {exc}").model_dump())
+    raise exc
+
+
+def _stream_agent(
+    job: ResearchJob,
+    agent: CompiledStateGraph[Any, Any],
+    setup: _RunSetup,
+    progress: _RunProgress,
+) -> None:
+    """Stream the agent into job events until it ends, is cancelled, or spends its budget.
 
-        yield _format_sse_event(
-            StreamEvent(
-                type=EVENT_TYPE_RESULT,
-                data=final_content,
-                filename=report_path.name,
+    Leaving the loop closes the stream, so the graph stops before its next step.
+    """
+    parts = agent.stream(
+        setup.agent_input,
+        config=setup.config,
+        stream_mode=[STREAM_MODE_UPDATES, STREAM_MODE_MESSAGES],
+    )
+    progress.step_started = _monotonic()
+    for part in parts:
+        stop = job.cancel_requested or _handle_stream_part(job, part, setup.budget, progress)
+        if progress.usage_unsaved:
+            _save_usage(job, setup, progress)
+        if stop:
+            return
+
+
+async def _astream_agent(
+    job: ResearchJob,
+    agent: CompiledStateGraph[Any, Any],
+    setup: _RunSetup,
+    progress: _RunProgress,
+) -> None:
+    """Async variant of _stream_agent using agent.astream."""
+    parts = cast(
+        AsyncGenerator[Any, None],
+        agent.astream(
+            setup.agent_input,
+            config=setup.config,
+            stream_mode=[STREAM_MODE_UPDATES, STREAM_MODE_MESSAGES],
+        ),
+    )
+    progress.step_started = _monotonic()
+    async with contextlib.aclosing(parts):
+        async for part in parts:
+            stop = job.cancel_requested or _handle_stream_part(job, part, setup.budget, progress)
+            if progress.usage_unsaved:
+                await asyncio.to_thread(_save_usage, job, setup, progress)
+            if stop:
+                return
+
+
+def _save_usage(job: ResearchJob, setup: _RunSetup, progress: _RunProgress) -> None:
+    """Record the budget used so far in the checkpoint store, so a resume continues from it."""
+    progress.usage_unsaved = False
+    if setup.checkpoints is not None:
+        setup.checkpoints.record_usage(job.id, setup.budget.usage())
+
+
+def _handle_stream_part(
+    job: ResearchJob, part: Any, budget: RunBudget, progress: _RunProgress
+) -> bool:
+    """Publish one stream part; return True once the run should stop for its budget.
+
+    The time since the previous update is recorded as the duration of the
+    nodes in each update.
+    """
+    mode, payload = _split_stream_part(part)
+    if mode == STREAM_MODE_MESSAGES:
+        delta = _extract_delta(payload)
+        if delta is not None:
+            job.publish(delta.model_dump())
+    elif mode == STREAM_MODE_UPDATES:
+        now = _monotonic()
+        for node_name in payload:
+            RESEARCH_NODE_DURATION.observe(now - progress.step_started, node=node_name)
+        progress.step_started = now
+        progress.final_content = _publish_chunk(job, payload) or progress.final_content
+        progress.messages.extend(_chunk_messages(payload))
+        if ORCHESTRATOR_NODE in payload:
+            budget.record_iteration()
+            progress.usage_unsaved = True
+        if _wants_more_steps(payload) and budget.exhausted() is not None:
+            progress.budget_stopped = True
+            return True
+    return False
+
+
+def _chunk_messages(chunk: dict[str, Any]) -> list[BaseMessage]:
+    """Return the messages added by the nodes of an update chunk."""
+    messages: list[BaseMessage] = []
+    for node_val in chunk.values():
+        if isinstance(node_val, dict) and node_val.get("messages") is not None:
+            messages.extend(
+                message
+                for message in _unwrap_messages(node_val["messages"])
+                if isinstance(message, BaseMessage)
             )
+    return messages
+
+
+def _wants_more_steps(chunk: dict[str, Any]) -> bool:
+    """False only for an orchestrator update that answered without calling tools.
+
+    Such an update is the run's final report, so a budget spent by it
+    does not need a forced synthesis.
+    """
+    node_val = chunk.get(ORCHESTRATOR_NODE)
+    if not isinstance(node_val, dict) or node_val.get("messages") is None:
+        return True
+    messages = _unwrap_messages(node_val["messages"])
+    if not messages or not isinstance(messages[-1], AIMessage):
+        return True
+    return bool(messages[-1].tool_calls)
+
+
+def _force_final_report(
+    job: ResearchJob,
+    budget: RunBudget,
+    messages: list[BaseMessage],
+    final_content: str,
+    synthesizer: ReportSynthesizer | None,
+) -> str:
+    """Write the report of a run stopped by its budget, from its findings so far.
+
+    Without a synthesizer the last content the agent produced is used.
+    """
+    reason = budget.describe()
+    job.budget_exhausted = budget.exhausted()
+    RESEARCH_BUDGET_EXHAUSTED.inc(budget=job.budget_exhausted or BUDGET_STEPS)
+    logger.info("Research for query '%s' stopped early: %s", job.query, reason)
+    job.publish(
+        StreamEvent(
+            type=EVENT_TYPE_PROGRESS,
+            data=f"Research stopped early ({reason}); writing the report from findings so far...",
+        ).model_dump()
+    )
+    with RESEARCH_NODE_DURATION.time(node=SYNTHESIS_NODE):
+        body = (
+            synthesizer(job.query, messages, reason) if synthesizer is not None else final_content
         )
+    return BUDGET_REPORT_NOTE.format(reason=reason) + (body or "No findings were gathered.")
+
+
+def _checkpointed_messages(
+    agent: CompiledStateGraph[Any, Any], config: RunnableConfig
+) -> list[BaseMessage]:
+    """Return every message in a run's latest checkpoint, including steps before a resume."""
+    return list(_unwrap_messages(agent.get_state(config).values.get("messages", [])))
 
-    except Exception as exc:
-        logger.error("Research failed for query '%s': %s", query, exc)
-        yield _format_sse_event(StreamEvent(type=EVENT_TYPE_ERROR, data=f"Research failed: {exc}"))
+
+def _checkpointed_final_content(agent: CompiledStateGraph[Any, Any], config: RunnableConfig) -> str:
+    """Return the final content saved in a run's latest checkpoint.
+
+    A run interrupted after its last step but before its report was saved
+    resumes with nothing left to stream; its report is in the saved state.
+    """
+    return _extract_final_content({ORCHESTRATOR_NODE: agent.get_state(config).values})
+
+
+def _record_run(
+    checkpoints: ResearchCheckpointStore | None, job: ResearchJob, state: RunState
+) -> None:
+    """Record a run's outcome in the checkpoint store, if there is one."""
+    if checkpoints is not None:
+        checkpoints.finish_run(job.id, state)
+
+
+def _publish_chunk(job: ResearchJob, chunk: dict[str, Any]) -> str:
+    """Publish progress for each node in a stream chunk and return its final content."""
+    for node_name in chunk:
+        job.publish(
+            StreamEvent(type=EVENT_TYPE_PROGRESS, data=f"Processing: {node_name}").model_dump()
+        )
+    return _extract_final_content(chunk)
+
+
+def _finish_cancelled(job: ResearchJob, partial_content: str, settings: Settings) -> str | None:
+    """Record a cancelled run, saving its partial report if enabled.
+
+    Returns the partial report's filename, or None if none was saved.
+    """
+    reason = job.cancel_reason or "unknown"
+    RESEARCH_RUNS_CANCELLED.inc(reason=reason)
+    logger.info("Research cancelled for query '%s' (%s)", job.query, reason)
+
+    filename: str | None = None
+    if settings.research_save_partial_reports and partial_content:
+        filename = save_report(
+            query=job.query,
+            content=PARTIAL_REPORT_NOTE + partial_content,
+            output_dir=settings.output_dir,
+            models_used=[settings.orchestrator_model, settings.medical_model],
+            partial=True,
+        ).name
+
+    job.publish(
+        StreamEvent(
+            type=EVENT_TYPE_CANCELLED, data=f"Research cancelled: {reason}", filename=filename
+        ).model_dump()
+    )
+    return filename
+
+
+# ---- Stream Generator ----
+
+
+async def _research_stream_generator(
+    job: ResearchJob, last_event_id: int = 0
+) -> AsyncGenerator[str, None]:
+    """Generate SSE events for a job, replaying past events and then following live ones.
+
+    Replay starts after last_event_id, so a resuming client only
+    receives the events it missed. The stream counts as a job subscriber
+    while it is open. Idle periods are filled with heartbeat comments so
+    a closed connection is detected, and the subscriber released, without
+    waiting for the run.
+    """
+    job.attach()
+    try:
+        after_id = last_event_id
+        while True:
+            events, finished = await job.next_events(after_id, SSE_HEARTBEAT_SECONDS)
+            for event_id, event in events:
+                after_id = event_id
+                yield _format_sse_event(StreamEvent(**event), event_id)
+            if finished and not events:
+                return
+            if not events:
+                yield SSE_HEARTBEAT
+    finally:
+        job.detach()
+
+
+def _job_status(job: ResearchJob) -> JobStatusResponse:
+    """Build the status response for a job."""
+    status = JobStatusResponse(**job.to_dict())
+    if status.filename is not None:
+        status.report_url = f"{REPORTS_PATH}/{Path(status.filename).stem}"
+    return status
 
 
 # ---- Router Factory ----
 
 
+def create_job_manager(
+    settings: Settings,
+    agent: CompiledStateGraph[Any, Any],
+    checkpoints: ResearchCheckpointStore | None = None,
+    synthesizer: ReportSynthesizer | None = None,
+) -> ResearchJobManager:
+    """Create the research job queue that runs the agent.
+
+    With research_async_runs the agent is streamed with astream by async
+    workers. Runs interrupted by a previous process are queued again by
+    resume_interrupted_runs, which the research router calls on startup.
+    """
+    runner: JobRunner | AsyncJobRunner
+    if settings.research_async_runs:
+
+        async def runner(job: ResearchJob) -> str | None:
+            return await _arun_research(job, agent, settings, checkpoints, synthesizer)
+
+    else:
+
+        def runner(job: ResearchJob) -> str | None:
+            return _run_research(job, agent, settings, checkpoints, synthesizer)
+
+    jobs = ResearchJobManager(
+        runner=runner,
+        max_workers=settings.research_max_workers,
+        max_jobs_retained=settings.research_job_retention,
+        disconnect_grace_seconds=settings.research_disconnect_grace_seconds,
+        event_buffer_size=settings.research_event_buffer_size,
+        coalesce=settings.research_coalesce_queries,
+        max_queued=settings.research_max_queued_jobs,
+    )
+    return jobs
+
+
+def resume_interrupted_runs(
+    jobs: ResearchJobManager, checkpoints: ResearchCheckpointStore
+) -> list[ResearchJob]:
+    """Prune expired checkpoints and queue again the runs this process claims.
+
+    Each run keeps its original limits and cancel_on_disconnect, and
+    continues from the budget it had used.
+    """
+    checkpoints.prune()
+    resumed = [
+        jobs.resume(
+            run.thread_id,
+            run.query,
+            cancel_on_disconnect=run.cancel_on_disconnect,
+            limits=run.limits,
+            budget_used=run.used,
+        )
+        for run in checkpoints.claim_interrupted_runs()
+    ]
+    if resumed:
+        logger.info("Resumed %d interrupted research runs", len(resumed))
+    return resumed
+
+
+async def _maintain_run_leases(
+    jobs: ResearchJobManager, checkpoints: ResearchCheckpointStore
+) -> None:
+    """Renew this process's run leases and resume runs whose lease lapsed, until cancelled.
+
+    Leases are renewed several times per lease period, so runs stay owned
+    through long model calls, and runs of a process that crashed are
+    picked up once their lease expires rather than only at startup.
+    """
+    interval = checkpoints.lease_seconds / LEASE_RENEWALS_PER_PERIOD
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(checkpoints.renew_leases)
+            await asyncio.to_thread(resume_interrupted_runs, jobs, checkpoints)
+        except Exception:
+            logger.exception("Research run lease renewal failed")
+
+
+def _resume_lifespan(
+    jobs: ResearchJobManager, checkpoints: ResearchCheckpointStore
+) -> Callable[[Any], AbstractAsyncContextManager[None]]:
+    """Create a lifespan that resumes interrupted runs and keeps run leases alive."""
+
+    @contextlib.asynccontextmanager
+    async def lifespan(_app: Any) -> AsyncIterator[None]:
+        await asyncio.to_thread(resume_interrupted_runs, jobs, checkpoints)
+        task = asyncio.create_task(_maintain_run_leases(jobs, checkpoints))
+        yield
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    return lifespan
+
+
 def create_research_router(
     settings: Settings,
     agent: CompiledStateGraph[Any, Any],
+    job_manager: ResearchJobManager | None = None,
+    checkpoints: ResearchCheckpointStore | None = None,
+    synthesizer: ReportSynthesizer | None = None,
 ) -> APIRouter:
-    """Create the research API router with the agent bound."""
-    router = APIRouter()
+    """Create the research API router with the agent bound.
+
+    With a checkpoint store, interrupted runs are resumed in the router's
+    lifespan, when the app serving it starts, rather than when it is created.
+    """
+    jobs = (
+        job_manager
+        if job_manager is not None
+        else create_job_manager(settings, agent, checkpoints, synthesizer)
+    )
+    router = APIRouter(
+        lifespan=_resume_lifespan(jobs, checkpoints) if checkpoints is not None else None
+    )
+    default_limits = create_budget_limits(settings)
+
+    def _get_job(job_id: str) -> ResearchJob:
+        job = jobs.get(job_id)
+        if job is None:
+            raise HTTPException(
+                status_code=HTTP_404_NOT_FOUND, detail=f"Research job not found: {job_id}"
+            )
+        return job
+
+    def _cached_job(request: ResearchRequest) -> ResearchJob | None:
+        report = find_recent_report(
+            settings.output_dir, request.query, settings.research_cache_max_age_seconds
+        )
+        RESEARCH_CACHE_LOOKUPS.inc(result=CACHE_HIT if report is not None else CACHE_MISS)
+        if report is None:
+            return None
+        result = StreamEvent(
+            type=EVENT_TYPE_RESULT,
+            data=report["content"],
+            filename=report["filename"],
+            cached=True,
+        )
+        return jobs.add_cached(request.query, result.model_dump(), report["filename"])
+
+    def _request_limits(request: ResearchRequest) -> BudgetLimits | None:
+        overrides = BudgetLimits(
+            max_iterations=request.max_iterations,
+            max_seconds=request.max_seconds,
+            max_tokens=request.max_tokens,
+        )
+        if overrides == BudgetLimits():
+            return None
+        return default_limits.tightened(overrides)
+
+    async def _submit(request: ResearchRequest, cancel_on_disconnect: bool) -> ResearchJob:
+        """Answer from a recent saved report unless force_refresh is set, else queue a run.
+
+        A full queue is answered with 503 and a Retry-After estimate.
+        """
+        if settings.research_cache_enabled and not request.force_refresh:
+            cached = await asyncio.to_thread(_cached_job, request)
+            if cached is not None:
+                return cached
+        try:
+            return jobs.submit(
+                request.query,
+                cancel_on_disconnect=cancel_on_disconnect,
+                limits=_request_limits(request),
+            )
+        except ResearchQueueFullError as exc:
+            raise HTTPException(
+                status_code=HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(exc),
+                headers={RETRY_AFTER_HEADER: str(exc.retry_after_seconds)},
+            ) from exc
 
     @router.post("/research")
-    def start_research(request: ResearchRequest) -> StreamingResponse:
-        """Start a research session, streaming SSE progress events."""
+    async def start_research(request: ResearchRequest) -> StreamingResponse:
+        """Start a research job, streaming its SSE progress events.
+
+        With research_cancel_on_disconnect, the run is cancelled at its next
+        agent step once no stream has been attached for the grace period.
+        """
         logger.info("Research request received: %s", request.query)
+        job = await _submit(request, cancel_on_disconnect=settings.research_cancel_on_disconnect)
+        return StreamingResponse(
+            _research_stream_generator(job),
+            media_type=SSE_CONTENT_TYPE,
+            headers={JOB_ID_HEADER: job.id},
+        )
+
+    @router.post("/research/jobs", response_model=JobStatusResponse)
+    async def submit_research_job(request: ResearchRequest) -> JSONResponse:
+        """Queue a research job and return its id without streaming."""
+        logger.info("Research job submitted: %s", request.query)
+        job = await _submit(request, cancel_on_disconnect=False)
+        return JSONResponse(status_code=HTTP_202_ACCEPTED, content=_job_status(job).model_dump())
+
+    @router.get("/research/jobs/{job_id}", response_model=JobStatusResponse)
+    async def get_research_job(job_id: str) -> JobStatusResponse:
+        """Return the status of a research job."""
+        return _job_status(_get_job(job_id))
+
+    @router.get("/research/jobs/{job_id}/events")
+    async def stream_research_job(
+        job_id: str,
+        last_event_id: Annotated[int, Header(alias=LAST_EVENT_ID_HEADER, ge=0)] = 0,
+    ) -> StreamingResponse:
+        """Attach to a job's SSE stream: past events are replayed, then live ones follow.
+
+        With a Last-Event-ID header, only events after that id are replayed.
+        """
+        job = _get_job(job_id)
         return StreamingResponse(
-            _research_stream_generator(request.query, agent, settings),
+            _research_stream_generator(job, last_event_id),
             media_type=SSE_CONTENT_TYPE,
+            headers={JOB_ID_HEADER: job.id},
         )
 
     return router
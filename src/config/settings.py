@@ -5,8 +5,9 @@ All secrets come from environment variables or .env files — never hardcoded.
 """
 
 import logging
+from typing import Final, Literal, Self
 
-from pydantic import ValidationError
+from pydantic import BaseModel, Field, PositiveInt, ValidationError, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 logger = logging.getLogger(__name__)
@@ -18,9 +19,53 @@ DEFAULT_OUTPUT_DIR = "output"
 DEFAULT_LOG_LEVEL = "INFO"
 DEFAULT_ORCHESTRATOR_MODEL = "qwen3:latest"
 DEFAULT_MEDICAL_MODEL = "MedAIBase/MedGemma1.0:4b"
+DEFAULT_OLLAMA_KEEP_ALIVE = "30m"
+DEFAULT_OLLAMA_HOST_WEIGHT = 1.0
+DEFAULT_OLLAMA_HOST_FAILURE_THRESHOLD = 3
+DEFAULT_OLLAMA_HOST_EJECTION_SECONDS = 30.0
+DEFAULT_TOOL_CONCURRENCY_LIMITS: Final = {"consult_medical_expert_tool": 2}
+DEFAULT_HEALTH_CHECK_INTERVAL_SECONDS = 15.0
+DEFAULT_RESEARCH_MAX_WORKERS = 2
+DEFAULT_RESEARCH_JOB_RETENTION = 200
+DEFAULT_RESEARCH_DISCONNECT_GRACE_SECONDS = 30.0
+DEFAULT_RESEARCH_EVENT_BUFFER_SIZE = 2000
+DEFAULT_RESEARCH_MAX_QUEUED_JOBS = 10
+DEFAULT_RESEARCH_CACHE_MAX_AGE_SECONDS = 24 * 60 * 60
+DEFAULT_RESEARCH_MAX_ITERATIONS = 20
+DEFAULT_RESEARCH_MAX_SECONDS = 15 * 60.0
+DEFAULT_RESEARCH_CHECKPOINT_PATH = ".cache/research_checkpoints.sqlite3"
+DEFAULT_RESEARCH_CHECKPOINT_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_RESEARCH_CHECKPOINT_LEASE_SECONDS = 60.0
+DEFAULT_SEARCH_CACHE_PATH = ".cache/search_cache.sqlite3"
+DEFAULT_SEARCH_CACHE_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_SEARCH_CACHE_MAX_ENTRIES = 10_000
+DEFAULT_SEARCH_BATCH_MAX_WORKERS = 4
+SEARCH_BACKEND_TAVILY: Final = "tavily"
+SEARCH_BACKEND_LOCAL: Final = "local"
+DEFAULT_LOCAL_SEARCH_INDEX_PATH = "data/pubmed_index.sqlite3"
+DEFAULT_MEDICAL_BREAKER_FAILURE_THRESHOLD = 3
+DEFAULT_MEDICAL_BREAKER_COOLDOWN_SECONDS = 60.0
+DEFAULT_MEDICAL_QUERY_TIMEOUT_SECONDS = 120.0
+DEFAULT_MEDICAL_HEDGE_PERCENTILE = 0.95
+DEFAULT_MEDICAL_HEDGE_MIN_SAMPLES = 20
+DEFAULT_MEDICAL_CACHE_PATH = ".cache/medical_cache.sqlite3"
+DEFAULT_MEDICAL_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MEDICAL_CACHE_MAX_ENTRIES = 5000
+DEFAULT_MEDICAL_CACHE_MEMORY_ENTRIES = 256
 LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
 
 
+class OllamaHostSettings(BaseModel):
+    """One Ollama server in the inference pool.
+
+    models lists the models placed on this host; None means it serves all of them.
+    """
+
+    url: str
+    weight: float = Field(default=DEFAULT_OLLAMA_HOST_WEIGHT, gt=0)
+    models: list[str] | None = None
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
@@ -30,8 +75,8 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
-    # Required
-    tavily_api_key: str
+    # Required when search_backend is "tavily"
+    tavily_api_key: str = ""
 
     # Optional with defaults
     ollama_base_url: str = DEFAULT_OLLAMA_BASE_URL
@@ -41,6 +86,83 @@ class Settings(BaseSettings):
     medical_model: str = DEFAULT_MEDICAL_MODEL
     tavily_include_domains: list[str] | None = None
 
+    # Model residency: how long Ollama keeps models loaded, and startup preload
+    ollama_keep_alive: str = DEFAULT_OLLAMA_KEEP_ALIVE
+    model_warmup_enabled: bool = True
+    health_check_interval_seconds: float = DEFAULT_HEALTH_CHECK_INTERVAL_SECONDS
+
+    # Ollama host pool: when set, calls are balanced across these hosts instead of
+    # ollama_base_url; hosts failing repeatedly are ejected for a while
+    ollama_hosts: list[OllamaHostSettings] = Field(default_factory=list)
+    ollama_host_failure_threshold: int = DEFAULT_OLLAMA_HOST_FAILURE_THRESHOLD
+    ollama_host_ejection_seconds: float = DEFAULT_OLLAMA_HOST_EJECTION_SECONDS
+
+    # Concurrent calls allowed per agent tool, by tool name; the medical tool's
+    # limit applies per Ollama host serving the medical model
+    tool_concurrency_limits: dict[str, PositiveInt] = Field(
+        default_factory=lambda: dict(DEFAULT_TOOL_CONCURRENCY_LIMITS)
+    )
+
+    # Research job queue
+    research_max_workers: int = DEFAULT_RESEARCH_MAX_WORKERS
+    research_job_retention: int = DEFAULT_RESEARCH_JOB_RETENTION
+    research_cancel_on_disconnect: bool = True
+    research_disconnect_grace_seconds: float = DEFAULT_RESEARCH_DISCONNECT_GRACE_SECONDS
+    research_save_partial_reports: bool = False
+    research_event_buffer_size: int = DEFAULT_RESEARCH_EVENT_BUFFER_SIZE
+    research_coalesce_queries: bool = True
+    research_max_queued_jobs: int = DEFAULT_RESEARCH_MAX_QUEUED_JOBS
+    research_async_runs: bool = True
+    research_cache_enabled: bool = False
+    research_cache_max_age_seconds: float = DEFAULT_RESEARCH_CACHE_MAX_AGE_SECONDS
+
+    # Per-run budgets: orchestrator turns, wall-clock seconds, total LLM tokens (None = no cap)
+    research_max_iterations: int = DEFAULT_RESEARCH_MAX_ITERATIONS
+    research_max_seconds: float = DEFAULT_RESEARCH_MAX_SECONDS
+    research_max_tokens: int | None = None
+
+    # Durable agent checkpoints: resume interrupted runs after a restart
+    research_checkpoints_enabled: bool = True
+    research_checkpoint_path: str = DEFAULT_RESEARCH_CHECKPOINT_PATH
+    research_checkpoint_max_age_seconds: float = DEFAULT_RESEARCH_CHECKPOINT_MAX_AGE_SECONDS
+    research_checkpoint_lease_seconds: float = DEFAULT_RESEARCH_CHECKPOINT_LEASE_SECONDS
+
+    # Search backend: "tavily" (web) or "local" (offline BM25 index)
+    search_backend: Literal["tavily", "local"] = SEARCH_BACKEND_TAVILY
+    local_search_index_path: str = DEFAULT_LOCAL_SEARCH_INDEX_PATH
+
+    # Search result cache
+    search_cache_enabled: bool = True
+    search_cache_path: str = DEFAULT_SEARCH_CACHE_PATH
+    search_cache_ttl_seconds: int = DEFAULT_SEARCH_CACHE_TTL_SECONDS
+    search_cache_max_entries: int = DEFAULT_SEARCH_CACHE_MAX_ENTRIES
+    search_batch_max_workers: int = DEFAULT_SEARCH_BATCH_MAX_WORKERS
+
+    # Medical model circuit breaker
+    medical_breaker_failure_threshold: int = DEFAULT_MEDICAL_BREAKER_FAILURE_THRESHOLD
+    medical_breaker_cooldown_seconds: float = DEFAULT_MEDICAL_BREAKER_COOLDOWN_SECONDS
+
+    # Medical model deadline and hedged fallback requests
+    medical_query_timeout_seconds: float = DEFAULT_MEDICAL_QUERY_TIMEOUT_SECONDS
+    medical_hedging_enabled: bool = False
+    medical_hedge_percentile: float = DEFAULT_MEDICAL_HEDGE_PERCENTILE
+    medical_hedge_min_samples: int = DEFAULT_MEDICAL_HEDGE_MIN_SAMPLES
+
+    # Medical answer cache: in-memory LRU in front of a SQLite file
+    medical_cache_enabled: bool = True
+    medical_cache_path: str = DEFAULT_MEDICAL_CACHE_PATH
+    medical_cache_ttl_seconds: int = DEFAULT_MEDICAL_CACHE_TTL_SECONDS
+    medical_cache_max_entries: int = DEFAULT_MEDICAL_CACHE_MAX_ENTRIES
+    medical_cache_memory_entries: int = DEFAULT_MEDICAL_CACHE_MEMORY_ENTRIES
+
+    @model_validator(mode="after")
+    def tavily_key_required_for_tavily_backend(self) -> Self:
+        """Require tavily_api_key unless the offline search backend is selected."""
+        if self.search_backend == SEARCH_BACKEND_TAVILY and not self.tavily_api_key:
+            msg = "tavily_api_key is required when search_backend is 'tavily'"
+            raise ValueError(msg)
+        return self
+
 
 def load_settings() -> Settings | None:
     """Load settings, returning None if validation fails.
@@ -49,7 +171,7 @@ def load_settings() -> Settings | None:
     raw Pydantic tracebacks reach the user.
     """
     try:
-        return Settings()  # type: ignore[call-arg]
+        return Settings()
     except ValidationError as exc:
         logger.error(
             "Configuration error: %s. "
@@ -0,0 +1,149 @@
+"""Circuit breaker for model calls that fail repeatedly.
+
+Tracks consecutive failures of a dependency (e.g. the MedGemma model).
+After too many failures the circuit opens and callers skip the
+dependency entirely; after a cooldown, a limited number of probe calls
+are let through to test whether it has recovered.
+"""
+
+import logging
+import threading
+import time
+from enum import StrEnum
+
+logger = logging.getLogger(__name__)
+
+# ---- Constants ----
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_COOLDOWN_SECONDS = 60.0
+DEFAULT_HALF_OPEN_MAX_CALLS = 1
+
+
+class CircuitState(StrEnum):
+    """States of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def _monotonic() -> float:
+    """Return monotonic time in seconds. Patchable for testing."""
+    return time.monotonic()
+
+
+class CircuitBreaker:
+    """Thread-safe closed/open/half-open circuit breaker.
+
+    - closed: calls pass through; consecutive failures are counted.
+    - open: calls are rejected until cooldown_seconds have elapsed.
+    - half_open: up to half_open_max_calls probes are allowed; a success
+      closes the circuit, a failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown_seconds: float = DEFAULT_COOLDOWN_SECONDS,
+        half_open_max_calls: int = DEFAULT_HALF_OPEN_MAX_CALLS,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open once the cooldown elapses."""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a call to the protected dependency may proceed."""
+        with self._lock:
+            self._maybe_half_open()
+
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.OPEN:
+                return False
+            if self._probes_in_flight < self.half_open_max_calls:
+                self._probes_in_flight += 1
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit if it was probing."""
+        with self._lock:
+            self._consecutive_failures = 0
+            self._probes_in_flight = 0
+            if self._state != CircuitState.CLOSED:
+                self._transition(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit past the failure threshold."""
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == CircuitState.HALF_OPEN:
+                self._probes_in_flight = 0
+                self._open()
+            elif (
+                self._state == CircuitState.CLOSED
+                and self._consecutive_failures >= self.failure_threshold
+            ):
+                self._open()
+
+    def record_abandoned(self) -> None:
+        """Record a call that ended without a verdict, freeing its half-open probe slot."""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN and self._probes_in_flight > 0:
+                self._probes_in_flight -= 1
+
+    def snapshot(self) -> dict[str, object]:
+        """Return a JSON-serializable view of the breaker for health reporting."""
+        with self._lock:
+            self._maybe_half_open()
+            retry_in = 0.0
+            if self._state == CircuitState.OPEN:
+                retry_in = max(0.0, self._opened_at + self.cooldown_seconds - _monotonic())
+            return {
+                "state": str(self._state),
+                "consecutive_failures": self._consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "retry_in_seconds": round(retry_in, 1),
+            }
+
+    def _open(self) -> None:
+        """Open the circuit and start the cooldown. Caller holds the lock."""
+        self._opened_at = _monotonic()
+        self._transition(CircuitState.OPEN)
+
+    def _maybe_half_open(self) -> None:
+        """Move from open to half-open once the cooldown has elapsed. Caller holds the lock."""
+        if (
+            self._state == CircuitState.OPEN
+            and _monotonic() - self._opened_at >= self.cooldown_seconds
+        ):
+            self._probes_in_flight = 0
+            self._transition(CircuitState.HALF_OPEN)
+
+    def _transition(self, new_state: CircuitState) -> None:
+        """Change state and log the transition. Caller holds the lock."""
+        old_state = self._state
+        self._state = new_state
+        log = logger.warning if new_state == CircuitState.OPEN else logger.info
+        log(
+            "Circuit breaker '%s' %s -> %s (consecutive failures: %d)",
+            self.name,
+            old_state,
+            new_state,
+            self._consecutive_failures,
+        )
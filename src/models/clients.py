@@ -2,7 +2,9 @@
 
 Provides factory functions for creating ChatOllama instances
 for the orchestrator (Qwen3) and medical specialist (MedGemma) models.
-Includes graceful degradation when MedGemma is unavailable.
+Given an Ollama host pool, the models balance their calls across it
+instead of using ollama_base_url. Includes graceful degradation when
+MedGemma is unavailable.
 """
 
 import logging
@@ -10,6 +12,10 @@ import logging
 from langchain_ollama import ChatOllama
 
 from src.config.settings import Settings
+from src.models.circuit_breaker import CircuitBreaker
+from src.models.hedging import LatencyHedger
+from src.models.load_balancer import BalancedChatOllama, OllamaHostPool
+from src.services.instrumentation import timed_ainvoke, timed_invoke
 
 logger = logging.getLogger(__name__)
 
@@ -20,60 +26,103 @@ OLLAMA_NOT_RUNNING_MSG = (
 OLLAMA_TIMEOUT_MSG = (
     "Ollama request timed out. The model may be loading or the request is too complex."
 )
+MEDICAL_BREAKER_NAME = "medical"
 
 
 class ModelConnectionError(Exception):
     """Raised when an Ollama model connection or invocation fails."""
 
 
-def create_orchestrator_llm(settings: Settings) -> ChatOllama:
+def _create_chat_ollama(settings: Settings, model: str, pool: OllamaHostPool | None) -> ChatOllama:
+    """Create a ChatOllama for model on ollama_base_url, or balanced across pool."""
+    if pool is not None:
+        return BalancedChatOllama(pool, model=model, keep_alive=settings.ollama_keep_alive)
+    return ChatOllama(
+        model=model,
+        base_url=settings.ollama_base_url,
+        keep_alive=settings.ollama_keep_alive,
+    )
+
+
+def create_orchestrator_llm(settings: Settings, pool: OllamaHostPool | None = None) -> ChatOllama:
     """Create a ChatOllama instance for the orchestrator model (Qwen3).
 
     The orchestrator supports function/tool calling and is used
     as the main agent model in the deep agent framework.
     """
-    return ChatOllama(
-        model=settings.orchestrator_model,
-        base_url=settings.ollama_base_url,
-    )
+    return _create_chat_ollama(settings, settings.orchestrator_model, pool)
 
 
-def create_medical_llm(settings: Settings) -> ChatOllama:
+def create_medical_llm(settings: Settings, pool: OllamaHostPool | None = None) -> ChatOllama:
     """Create a ChatOllama instance for the medical model (MedGemma).
 
     MedGemma is used for medical text analysis only — it does NOT
     support tool calling and should never have tools bound to it.
     """
-    return ChatOllama(
-        model=settings.medical_model,
-        base_url=settings.ollama_base_url,
-    )
+    return _create_chat_ollama(settings, settings.medical_model, pool)
 
 
 def create_medical_llm_with_fallback(
     settings: Settings,
     orchestrator_llm: ChatOllama,
+    pool: OllamaHostPool | None = None,
 ) -> ChatOllama:
     """Create the medical LLM, falling back to orchestrator if unavailable.
 
-    When MedGemma cannot be initialized, logs a warning and returns
-    the orchestrator LLM as a fallback for medical analysis.
+    When MedGemma cannot be initialized (including when no pooled host
+    serves it), logs a warning and returns the orchestrator LLM as a
+    fallback for medical analysis.
     """
     try:
-        return create_medical_llm(settings)
+        return create_medical_llm(settings, pool)
     except Exception:
         logger.warning("MedGemma unavailable, medical analysis will use Qwen3 as fallback")
         return orchestrator_llm
 
 
+def create_medical_circuit_breaker(settings: Settings) -> CircuitBreaker:
+    """Create the circuit breaker guarding calls to the medical model."""
+    return CircuitBreaker(
+        name=MEDICAL_BREAKER_NAME,
+        failure_threshold=settings.medical_breaker_failure_threshold,
+        cooldown_seconds=settings.medical_breaker_cooldown_seconds,
+    )
+
+
+def create_medical_hedger(settings: Settings) -> LatencyHedger | None:
+    """Create the latency tracker for hedged medical requests, or None if disabled."""
+    if not settings.medical_hedging_enabled:
+        return None
+    return LatencyHedger(
+        percentile=settings.medical_hedge_percentile,
+        min_samples=settings.medical_hedge_min_samples,
+    )
+
+
 def invoke_llm(llm: ChatOllama, prompt: str) -> object:
     """Invoke an Ollama LLM with error handling.
 
     Wraps connection and timeout errors into ModelConnectionError
-    with actionable messages.
+    with actionable messages. Latency and token usage are recorded
+    in the LLM metrics.
+    """
+    try:
+        return timed_invoke(llm, prompt)
+    except ConnectionError as exc:
+        logger.error("Ollama connection error: %s", exc)
+        raise ModelConnectionError(OLLAMA_NOT_RUNNING_MSG) from exc
+    except TimeoutError as exc:
+        logger.error("Ollama request timed out: %s", exc)
+        raise ModelConnectionError(OLLAMA_TIMEOUT_MSG) from exc
+
+
+async def ainvoke_llm(llm: ChatOllama, prompt: str) -> object:
+    """Invoke an Ollama LLM asynchronously with the error handling of invoke_llm.
+
+    The request is awaited on the event loop instead of holding a thread.
     """
     try:
-        return llm.invoke(prompt)
+        return await timed_ainvoke(llm, prompt)
     except ConnectionError as exc:
         logger.error("Ollama connection error: %s", exc)
         raise ModelConnectionError(OLLAMA_NOT_RUNNING_MSG) from exc
@@ -0,0 +1,50 @@
+"""Latency tracking for hedged model requests.
+
+Keeps a sliding window of observed call latencies and derives the
+hedge delay: how long to wait for the primary model before starting
+a backup request to another model.
+"""
+
+import math
+import threading
+from collections import deque
+
+# ---- Constants ----
+
+DEFAULT_HEDGE_PERCENTILE = 0.95
+DEFAULT_HEDGE_MIN_SAMPLES = 20
+DEFAULT_LATENCY_WINDOW = 200
+
+
+class LatencyHedger:
+    """Sliding-window latency tracker that yields a percentile-based hedge delay.
+
+    No hedge delay is reported until min_samples latencies have been
+    recorded, so hedging only starts once the baseline is known.
+    """
+
+    def __init__(
+        self,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        min_samples: int = DEFAULT_HEDGE_MIN_SAMPLES,
+        window: int = DEFAULT_LATENCY_WINDOW,
+    ) -> None:
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency_seconds: float) -> None:
+        """Record the latency of a successful primary call."""
+        with self._lock:
+            self._latencies.append(latency_seconds)
+
+    def hedge_delay(self) -> float | None:
+        """Return the configured latency percentile, or None with too few samples."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+
+        rank = max(0, math.ceil(self.percentile * len(ordered)) - 1)
+        return ordered[rank]
@@ -0,0 +1,269 @@
+"""Load balancing of Ollama calls across a pool of hosts.
+
+Each host has a weight and, optionally, the models placed on it. A call
+for a model goes to the host serving that model with the fewest
+in-flight requests relative to its weight. Health is tracked passively
+from call outcomes: every host has a circuit breaker, so a host failing
+repeatedly is ejected for a cooldown and re-admitted once a probe call
+succeeds. If every host serving a model is ejected, calls are spread
+over all of them anyway rather than failing outright.
+"""
+
+import logging
+import threading
+from collections.abc import AsyncIterator, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_ollama import ChatOllama
+from ollama import ResponseError
+from pydantic import PrivateAttr
+
+from src.config.settings import Settings
+from src.models.circuit_breaker import CircuitBreaker, CircuitState
+from src.models.warmup import normalize_model_name
+from src.services.metrics import OLLAMA_HOST_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# ---- Constants ----
+
+HOST_BREAKER_PREFIX = "ollama"
+HTTP_SERVER_ERROR = 500
+RESULT_SUCCESS = "success"
+RESULT_FAILURE = "failure"
+RESULT_ABANDONED = "abandoned"
+
+
+class NoOllamaHostError(Exception):
+    """Raised when no host in the pool serves the requested model."""
+
+
+@dataclass(frozen=True)
+class OllamaHost:
+    """One Ollama server. models=None means every model is placed on it."""
+
+    url: str
+    weight: float = 1.0
+    models: frozenset[str] | None = None
+
+    def serves(self, model: str) -> bool:
+        """Return True if model is placed on this host."""
+        return self.models is None or normalize_model_name(model) in self.models
+
+
+def is_host_failure(exc: BaseException) -> bool:
+    """Return True if exc means the host is unhealthy rather than the request bad.
+
+    Connection errors, timeouts and 5xx responses count against the host;
+    any other error still shows the host answered.
+    """
+    if isinstance(exc, ResponseError):
+        return exc.status_code >= HTTP_SERVER_ERROR
+    return isinstance(exc, ConnectionError | TimeoutError | httpx.TransportError)
+
+
+class OllamaHostPool:
+    """Thread-safe weighted least-outstanding-requests routing over Ollama hosts."""
+
+    def __init__(
+        self,
+        hosts: Sequence[OllamaHost],
+        failure_threshold: int,
+        ejection_seconds: float,
+    ) -> None:
+        self.hosts = list(hosts)
+        self._breakers = {
+            host.url: CircuitBreaker(
+                name=f"{HOST_BREAKER_PREFIX}:{host.url}",
+                failure_threshold=failure_threshold,
+                cooldown_seconds=ejection_seconds,
+            )
+            for host in self.hosts
+        }
+        self._in_flight = dict.fromkeys((host.url for host in self.hosts), 0)
+        self._turn = 0
+        self._lock = threading.Lock()
+
+    def hosts_for(self, model: str) -> list[OllamaHost]:
+        """Hosts the model is placed on, in configuration order."""
+        return [host for host in self.hosts if host.serves(model)]
+
+    def acquire(self, model: str) -> OllamaHost:
+        """Pick the host for one call to model and count the call as in flight.
+
+        Healthy hosts are ranked by in-flight requests over weight, with
+        ties rotated between calls. Ejected hosts are skipped unless every
+        host serving the model is ejected.
+        """
+        candidates = self.hosts_for(model)
+        if not candidates:
+            msg = f"No Ollama host in the pool serves model '{model}'"
+            raise NoOllamaHostError(msg)
+        with self._lock:
+            self._turn += 1
+            ranked = sorted(
+                range(len(candidates)),
+                key=lambda i: (
+                    (self._in_flight[candidates[i].url] + 1) / candidates[i].weight,
+                    (i - self._turn) % len(candidates),
+                ),
+            )
+            host = next(
+                (
+                    candidates[i]
+                    for i in ranked
+                    if self._breakers[candidates[i].url].allow_request()
+                ),
+                None,
+            )
+            if host is None:
+                host = candidates[ranked[0]]
+                logger.warning(
+                    "Every Ollama host serving '%s' is ejected, routing to %s anyway",
+                    model,
+                    host.url,
+                )
+            self._in_flight[host.url] += 1
+        return host
+
+    def release(self, host: OllamaHost, model: str, result: str) -> None:
+        """Finish a call from acquire and feed its outcome to the host's health."""
+        with self._lock:
+            self._in_flight[host.url] -= 1
+        breaker = self._breakers[host.url]
+        if result == RESULT_SUCCESS:
+            breaker.record_success()
+        elif result == RESULT_FAILURE:
+            breaker.record_failure()
+        else:
+            breaker.record_abandoned()
+        OLLAMA_HOST_REQUESTS.inc(host=host.url, model=model, result=result)
+
+    @contextmanager
+    def lease(self, model: str) -> Iterator[OllamaHost]:
+        """Hold a host for the duration of one call to model."""
+        host = self.acquire(model)
+        result = RESULT_ABANDONED
+        try:
+            yield host
+            result = RESULT_SUCCESS
+        except Exception as exc:
+            result = RESULT_FAILURE if is_host_failure(exc) else RESULT_SUCCESS
+            if result == RESULT_FAILURE:
+                logger.warning("Ollama call to %s failed: %s", host.url, exc)
+            raise
+        finally:
+            self.release(host, model, result)
+
+    def snapshot(self) -> dict[str, dict[str, object]]:
+        """Return a JSON-serializable view of every host for health reporting."""
+        with self._lock:
+            in_flight = dict(self._in_flight)
+        report: dict[str, dict[str, object]] = {}
+        for host in self.hosts:
+            breaker = self._breakers[host.url].snapshot()
+            report[host.url] = {
+                "weight": host.weight,
+                "models": sorted(host.models) if host.models is not None else None,
+                "in_flight": in_flight[host.url],
+                "ejected": breaker["state"] == CircuitState.OPEN,
+                "consecutive_failures": breaker["consecutive_failures"],
+                "retry_in_seconds": breaker["retry_in_seconds"],
+            }
+        return report
+
+
+class BalancedChatOllama(ChatOllama):
+    """ChatOllama that sends every call to a host chosen by an OllamaHostPool.
+
+    One ChatOllama client is kept per host serving the model; the
+    balanced model behaves like a single ChatOllama otherwise, so tools
+    can be bound to it as usual.
+    """
+
+    _pool: OllamaHostPool = PrivateAttr()
+    _host_llms: dict[str, ChatOllama] = PrivateAttr()
+
+    def __init__(self, pool: OllamaHostPool, **kwargs: Any) -> None:
+        hosts = pool.hosts_for(kwargs["model"])
+        if not hosts:
+            msg = f"No Ollama host in the pool serves model '{kwargs['model']}'"
+            raise NoOllamaHostError(msg)
+        super().__init__(**{**kwargs, "base_url": hosts[0].url})
+        self._pool = pool
+        self._host_llms = {
+            host.url: ChatOllama(**{**kwargs, "base_url": host.url}) for host in hosts
+        }
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        with self._pool.lease(self.model) as host:
+            return self._host_llms[host.url]._generate(messages, stop, run_manager, **kwargs)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        with self._pool.lease(self.model) as host:
+            return await self._host_llms[host.url]._agenerate(messages, stop, run_manager, **kwargs)
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        with self._pool.lease(self.model) as host:
+            yield from self._host_llms[host.url]._stream(messages, stop, run_manager, **kwargs)
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        with self._pool.lease(self.model) as host:
+            async for chunk in self._host_llms[host.url]._astream(
+                messages, stop, run_manager, **kwargs
+            ):
+                yield chunk
+
+
+def create_ollama_pool(settings: Settings) -> OllamaHostPool | None:
+    """Create the Ollama host pool, or None when no ollama_hosts are configured."""
+    if not settings.ollama_hosts:
+        return None
+    hosts = [
+        OllamaHost(
+            url=entry.url,
+            weight=entry.weight,
+            models=(
+                frozenset(normalize_model_name(model) for model in entry.models)
+                if entry.models is not None
+                else None
+            ),
+        )
+        for entry in settings.ollama_hosts
+    ]
+    logger.info("Balancing Ollama calls across %d hosts", len(hosts))
+    return OllamaHostPool(
+        hosts,
+        failure_threshold=settings.ollama_host_failure_threshold,
+        ejection_seconds=settings.ollama_host_ejection_seconds,
+    )
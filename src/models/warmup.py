@@ -0,0 +1,222 @@
+"""Ollama model warm-up and residency tracking.
+
+Preloads the configured models at application startup so the first
+research request does not pay the cost of Ollama loading weights, and
+reports which models are currently resident in memory via /api/ps.
+With a host pool, every host is warmed up and checked for the models
+placed on it.
+"""
+
+import asyncio
+import logging
+from enum import StrEnum
+
+import httpx
+
+from src.config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# ---- Constants ----
+
+OLLAMA_GENERATE_PATH = "/api/generate"
+OLLAMA_PS_PATH = "/api/ps"
+DEFAULT_MODEL_TAG = "latest"
+WARMUP_TIMEOUT_SECONDS = 300.0
+RESIDENCY_TIMEOUT_SECONDS = 2.0
+NO_HOST_ERROR = "No Ollama host serves this model"
+
+
+class WarmupState(StrEnum):
+    """Warm-up progress of a single model."""
+
+    PENDING = "pending"
+    LOADING = "loading"
+    LOADED = "loaded"
+    FAILED = "failed"
+
+
+# Most advanced first: a model loaded on any host counts as loaded.
+_STATE_PRECEDENCE = (
+    WarmupState.LOADED,
+    WarmupState.LOADING,
+    WarmupState.PENDING,
+    WarmupState.FAILED,
+)
+
+
+def normalize_model_name(name: str) -> str:
+    """Return the model name with Ollama's implicit ':latest' tag made explicit."""
+    last_segment = name.rsplit("/", 1)[-1]
+    return name if ":" in last_segment else f"{name}:{DEFAULT_MODEL_TAG}"
+
+
+def model_placements(settings: Settings) -> dict[str, dict[str, str]]:
+    """Map each Ollama host URL to the models, by role, whose calls it serves.
+
+    Without ollama_hosts both models are on ollama_base_url. With them,
+    each pooled host has the models placed on it, as the load balancer
+    routes calls; hosts without a models list serve every model.
+    """
+    models = {"orchestrator": settings.orchestrator_model, "medical": settings.medical_model}
+    if not settings.ollama_hosts:
+        return {settings.ollama_base_url: models}
+
+    placements: dict[str, dict[str, str]] = {}
+    for host in settings.ollama_hosts:
+        placed = (
+            {normalize_model_name(model) for model in host.models}
+            if host.models is not None
+            else None
+        )
+        placements[host.url] = {
+            role: model
+            for role, model in models.items()
+            if placed is None or normalize_model_name(model) in placed
+        }
+    return placements
+
+
+class ModelWarmup:
+    """Preloads Ollama models and reports whether each is resident.
+
+    A warm-up is an empty /api/generate request, which makes Ollama load
+    the model and keep it in memory for keep_alive. hosts maps each host
+    URL to the roles placed on it; by default every model is on base_url.
+    A model counts as resident once any host serving it has it loaded,
+    and the readiness report lists its state on every host.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        models: dict[str, str],
+        keep_alive: str,
+        transport: httpx.AsyncBaseTransport | None = None,
+        hosts: dict[str, dict[str, str]] | None = None,
+    ) -> None:
+        self.base_url = base_url
+        self.models = models
+        self.hosts = hosts if hosts is not None else {base_url: models}
+        self.keep_alive = keep_alive
+        self._transport = transport
+        self._states = {
+            (url, role): WarmupState.PENDING
+            for url, placed in self.hosts.items()
+            for role in placed
+        }
+        self._errors: dict[tuple[str, str], str] = {}
+
+    async def warm_up(self) -> None:
+        """Load every model on every host serving it, concurrently.
+
+        Failures are logged, not raised.
+        """
+        await asyncio.gather(*(self._warm_up_host(url) for url in self.hosts))
+
+    async def resident_models(self, url: str | None = None) -> set[str] | None:
+        """Return the normalized names of models loaded on a host (base_url by default).
+
+        Returns None if the host is unreachable.
+        """
+        try:
+            async with self._client(url or self.base_url, RESIDENCY_TIMEOUT_SECONDS) as client:
+                response = await client.get(OLLAMA_PS_PATH)
+                response.raise_for_status()
+                loaded = response.json().get("models", [])
+        except (httpx.HTTPError, ValueError) as exc:
+            logger.warning("Could not query resident Ollama models on %s: %s", url, exc)
+            return None
+        return {normalize_model_name(entry.get("name", "")) for entry in loaded}
+
+    async def readiness(self) -> dict[str, dict[str, object]]:
+        """Return the warm-up state and residency of each model role, overall and per host.
+
+        The overall warm-up state is the most advanced one among the
+        role's hosts, and its error is reported once every host failed.
+        """
+        urls = list(self.hosts)
+        residency = dict(
+            zip(
+                urls,
+                await asyncio.gather(*(self.resident_models(url) for url in urls)),
+                strict=True,
+            )
+        )
+        report: dict[str, dict[str, object]] = {}
+        for role, model in self.models.items():
+            per_host: dict[str, dict[str, object]] = {}
+            for url, placed in self.hosts.items():
+                if role not in placed:
+                    continue
+                resident = residency[url]
+                host_entry: dict[str, object] = {
+                    "warmup": str(self._states[(url, role)]),
+                    "resident": resident is not None and normalize_model_name(model) in resident,
+                }
+                if (url, role) in self._errors:
+                    host_entry["error"] = self._errors[(url, role)]
+                per_host[url] = host_entry
+            states = [self._states[(url, role)] for url in per_host]
+            entry: dict[str, object] = {
+                "model": model,
+                "warmup": str(
+                    next((s for s in _STATE_PRECEDENCE if s in states), WarmupState.FAILED)
+                ),
+                "resident": any(host["resident"] for host in per_host.values()),
+                "hosts": per_host,
+            }
+            errors = [host["error"] for host in per_host.values() if "error" in host]
+            if entry["warmup"] == WarmupState.FAILED:
+                entry["error"] = errors[0] if errors else NO_HOST_ERROR
+            report[role] = entry
+        return report
+
+    def _client(self, url: str, timeout: float) -> httpx.AsyncClient:
+        return httpx.AsyncClient(base_url=url, timeout=timeout, transport=self._transport)
+
+    async def _warm_up_host(self, url: str) -> None:
+        async with self._client(url, WARMUP_TIMEOUT_SECONDS) as client:
+            await asyncio.gather(
+                *(
+                    self._warm_up_one(client, url, role, model)
+                    for role, model in self.hosts[url].items()
+                )
+            )
+
+    async def _warm_up_one(
+        self, client: httpx.AsyncClient, url: str, role: str, model: str
+    ) -> None:
+        key = (url, role)
+        self._states[key] = WarmupState.LOADING
+        logger.info(
+            "Warming up %s model '%s' on %s (keep_alive=%s)", role, model, url, self.keep_alive
+        )
+        try:
+            response = await client.post(
+                OLLAMA_GENERATE_PATH,
+                json={"model": model, "keep_alive": self.keep_alive},
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            self._states[key] = WarmupState.FAILED
+            self._errors[key] = str(exc) or type(exc).__name__
+            logger.warning("Warm-up of %s model '%s' on %s failed: %s", role, model, url, exc)
+            return
+
+        self._states[key] = WarmupState.LOADED
+        self._errors.pop(key, None)
+        logger.info("%s model '%s' loaded on %s", role.capitalize(), model, url)
+
+
+def create_model_warmup(settings: Settings) -> ModelWarmup:
+    """Create the warm-up manager for the orchestrator and medical models on every host."""
+    return ModelWarmup(
+        base_url=settings.ollama_base_url,
+        models={
+            "orchestrator": settings.orchestrator_model,
+            "medical": settings.medical_model,
+        },
+        keep_alive=settings.ollama_keep_alive,
+        hosts=model_placements(settings),
+    )
@@ -0,0 +1,214 @@
+"""Per-run research budgets: orchestrator steps, wall-clock time and tokens.
+
+A RunBudget tracks one run against its limits. The research runner
+counts orchestrator turns from the stream, and a LangChain callback
+handler adds the tokens reported by every model call and refuses to
+start new model or tool calls once any limit is spent. The graph's
+recursion limit is set a little above the step budget as a backstop.
+A run resumed after a restart starts from the usage it had recorded, so
+its budget covers the whole run rather than each process's share.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from src.config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# ---- Constants ----
+
+BUDGET_STEPS = "steps"
+BUDGET_TIME = "time"
+BUDGET_TOKENS = "tokens"
+# Each orchestrator iteration is a model step followed by a tools step;
+# the deep agent adds one setup step and the final model step.
+GRAPH_STEPS_PER_ITERATION = 2
+GRAPH_STEPS_OVERHEAD = 2
+
+
+def _monotonic() -> float:
+    """Return monotonic time in seconds. Patchable for testing."""
+    return time.monotonic()
+
+
+class BudgetExhaustedError(Exception):
+    """Raised inside a research run once one of its budgets is spent."""
+
+
+@dataclass(frozen=True)
+class BudgetLimits:
+    """Limits for one research run. None means unlimited."""
+
+    max_iterations: int | None = None
+    max_seconds: float | None = None
+    max_tokens: int | None = None
+
+    def tightened(self, overrides: "BudgetLimits") -> "BudgetLimits":
+        """Return these limits lowered by overrides; overrides cannot raise a limit."""
+        return BudgetLimits(
+            max_iterations=min(
+                (v for v in (self.max_iterations, overrides.max_iterations) if v is not None),
+                default=None,
+            ),
+            max_seconds=min(
+                (v for v in (self.max_seconds, overrides.max_seconds) if v is not None),
+                default=None,
+            ),
+            max_tokens=min(
+                (v for v in (self.max_tokens, overrides.max_tokens) if v is not None),
+                default=None,
+            ),
+        )
+
+    def recursion_limit(self) -> int | None:
+        """Graph recursion limit that backs up the step budget, or None if unlimited."""
+        if self.max_iterations is None:
+            return None
+        return self.max_iterations * GRAPH_STEPS_PER_ITERATION + GRAPH_STEPS_OVERHEAD
+
+
+@dataclass(frozen=True)
+class BudgetUsage:
+    """What a run has consumed of its budget so far."""
+
+    iterations: int = 0
+    tokens: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def create_budget_limits(settings: Settings) -> BudgetLimits:
+    """Return the configured default budget for research runs."""
+    return BudgetLimits(
+        max_iterations=settings.research_max_iterations,
+        max_seconds=settings.research_max_seconds,
+        max_tokens=settings.research_max_tokens,
+    )
+
+
+class RunBudget:
+    """Steps, elapsed time and tokens used by one run, checked against its limits.
+
+    The first limit found spent is remembered as the exhausted budget.
+    A resumed run passes the usage recorded before its restart as used.
+    """
+
+    def __init__(self, limits: BudgetLimits, used: BudgetUsage | None = None) -> None:
+        used = used if used is not None else BudgetUsage()
+        self.limits = limits
+        self.iterations = used.iterations
+        self.tokens = used.tokens
+        self._started = _monotonic() - used.elapsed_seconds
+        self._exhausted: str | None = None
+        self._lock = threading.Lock()
+
+    def record_iteration(self) -> None:
+        """Count one orchestrator turn."""
+        with self._lock:
+            self.iterations += 1
+
+    def record_tokens(self, tokens: int) -> None:
+        """Add tokens used by a model call."""
+        with self._lock:
+            self.tokens += tokens
+
+    def exhaust(self, reason: str) -> None:
+        """Mark the budget spent for reason unless another budget already ran out."""
+        with self._lock:
+            if self._exhausted is None:
+                self._exhausted = reason
+
+    def elapsed_seconds(self) -> float:
+        """Seconds the run has spent running, including any time before a resume."""
+        return _monotonic() - self._started
+
+    def usage(self) -> BudgetUsage:
+        """Return the steps, tokens and time used so far."""
+        with self._lock:
+            return BudgetUsage(self.iterations, self.tokens, self.elapsed_seconds())
+
+    def exhausted(self) -> str | None:
+        """Return the name of the spent budget, or None while all remain."""
+        with self._lock:
+            if self._exhausted is None:
+                self._exhausted = self._spent()
+                if self._exhausted is not None:
+                    logger.info(
+                        "Research budget exhausted: %s (iterations=%d, tokens=%d)",
+                        self._exhausted,
+                        self.iterations,
+                        self.tokens,
+                    )
+            return self._exhausted
+
+    def _spent(self) -> str | None:
+        limits = self.limits
+        if limits.max_iterations is not None and self.iterations >= limits.max_iterations:
+            return BUDGET_STEPS
+        if limits.max_seconds is not None and self.elapsed_seconds() >= limits.max_seconds:
+            return BUDGET_TIME
+        if limits.max_tokens is not None and self.tokens >= limits.max_tokens:
+            return BUDGET_TOKENS
+        return None
+
+    def describe(self) -> str:
+        """Describe the exhausted budget for a report note or event."""
+        reason = self.exhausted()
+        limits = self.limits
+        if reason == BUDGET_STEPS:
+            return f"step budget of {limits.max_iterations} orchestrator turns reached"
+        if reason == BUDGET_TIME:
+            return f"time budget of {limits.max_seconds:g}s reached"
+        if reason == BUDGET_TOKENS:
+            return f"token budget of {limits.max_tokens} tokens reached"
+        return "budget not exhausted"
+
+
+def _usage_tokens(response: LLMResult) -> int:
+    """Total tokens reported for a model call, from message usage or llm_output."""
+    total = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                total += int(usage.get("total_tokens", 0))
+    if total:
+        return total
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    return int(token_usage.get("total_tokens", 0))
+
+
+class BudgetCallbackHandler(BaseCallbackHandler):
+    """Counts model tokens and stops new model and tool calls once the budget is spent."""
+
+    raise_error = True
+
+    def __init__(self, budget: RunBudget) -> None:
+        self._budget = budget
+
+    def _check(self) -> None:
+        reason = self._budget.exhausted()
+        if reason is not None:
+            raise BudgetExhaustedError(f"Research {reason} budget exhausted")
+
+    def on_chat_model_start(self, *args: Any, **kwargs: Any) -> None:
+        """Refuse to start a chat model call."""
+        self._check()
+
+    def on_llm_start(self, *args: Any, **kwargs: Any) -> None:
+        """Refuse to start an LLM call."""
+        self._check()
+
+    def on_tool_start(self, *args: Any, **kwargs: Any) -> None:
+        """Refuse to start a tool call."""
+        self._check()
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        """Add the call's reported tokens to the budget."""
+        self._budget.record_tokens(_usage_tokens(response))
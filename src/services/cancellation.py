@@ -0,0 +1,78 @@
+"""Cooperative cancellation of research runs.
+
+A run is cancelled by setting its threading.Event. The event is made
+visible to code running inside the agent graph through a context
+variable, and a LangChain callback handler refuses to start new model
+or tool calls (and aborts streamed generations) once it is set.
+"""
+
+import contextlib
+import threading
+from collections.abc import Iterator
+from contextvars import ContextVar
+from typing import Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+# ---- Constants ----
+
+CANCELLED_MSG = "Research run was cancelled"
+
+_current_cancel_event: ContextVar[threading.Event | None] = ContextVar(
+    "current_cancel_event", default=None
+)
+
+
+class RunCancelledError(Exception):
+    """Raised inside a research run once the run has been cancelled."""
+
+
+@contextlib.contextmanager
+def cancel_scope(event: threading.Event) -> Iterator[None]:
+    """Make event the cancellation signal for code running in this context."""
+    token = _current_cancel_event.set(event)
+    try:
+        yield
+    finally:
+        _current_cancel_event.reset(token)
+
+
+def is_cancelled() -> bool:
+    """Return True if the run executing in this context has been cancelled."""
+    event = _current_cancel_event.get()
+    return event is not None and event.is_set()
+
+
+def raise_if_cancelled() -> None:
+    """Raise RunCancelledError if the run executing in this context has been cancelled."""
+    if is_cancelled():
+        raise RunCancelledError(CANCELLED_MSG)
+
+
+class CancellationCallbackHandler(BaseCallbackHandler):
+    """Stops new model and tool calls, and streamed generations, after cancellation."""
+
+    raise_error = True
+
+    def __init__(self, event: threading.Event) -> None:
+        self._event = event
+
+    def _check(self) -> None:
+        if self._event.is_set():
+            raise RunCancelledError(CANCELLED_MSG)
+
+    def on_chat_model_start(self, *args: Any, **kwargs: Any) -> None:
+        """Refuse to start a chat model call."""
+        self._check()
+
+    def on_llm_start(self, *args: Any, **kwargs: Any) -> None:
+        """Refuse to start an LLM call."""
+        self._check()
+
+    def on_llm_new_token(self, *args: Any, **kwargs: Any) -> None:
+        """Abort a streamed generation between tokens."""
+        self._check()
+
+    def on_tool_start(self, *args: Any, **kwargs: Any) -> None:
+        """Refuse to start a tool call."""
+        self._check()
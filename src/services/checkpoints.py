@@ -0,0 +1,351 @@
+"""Durable LangGraph checkpoints for research runs.
+
+The research agent is compiled with a SQLite checkpointer, and each run
+uses its job id as the LangGraph thread_id, so every completed agent step
+is persisted. A small run table beside the checkpoints records which runs
+were still in progress; after a restart those runs are resumed from their
+last completed step instead of starting over. Runs whose last activity is
+older than the retention window are deleted together with their
+checkpoints, and interrupted runs that old are abandoned. The saver also
+serves LangGraph's async checkpointer API, so runs streamed with
+agent.astream are checkpointed the same way.
+
+Each run row also keeps the run's budget limits, whether it is cancelled
+on disconnect, and the budget it has used, updated after every
+orchestrator turn, so a resumed run continues under the same terms.
+Several worker processes can share one file. Each store holds a lease
+on the runs it owns, renewed on a heartbeat, and a run is only claimed
+once its lease has expired or been released, by exactly one process.
+"""
+
+import asyncio
+import dataclasses
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from src.config.settings import DEFAULT_RESEARCH_CHECKPOINT_LEASE_SECONDS, Settings
+from src.services.budgets import BudgetLimits, BudgetUsage
+
+logger = logging.getLogger(__name__)
+
+# ---- Constants ----
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS research_runs (
+    thread_id TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_research_runs_updated ON research_runs (updated_at);
+"""
+# Columns added after the first release; missing ones are added on open.
+_RUN_COLUMNS = {
+    "owner": "TEXT",
+    "limits": "TEXT",
+    "cancel_on_disconnect": "INTEGER NOT NULL DEFAULT 0",
+    "iterations": "INTEGER NOT NULL DEFAULT 0",
+    "tokens": "INTEGER NOT NULL DEFAULT 0",
+    "elapsed_seconds": "REAL NOT NULL DEFAULT 0",
+}
+# Lease renewals per lease period, so a missed heartbeat does not lose the lease.
+LEASE_RENEWALS_PER_PERIOD = 3
+
+
+class RunState(StrEnum):
+    """Lifecycle of a checkpointed research run."""
+
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+def _now() -> float:
+    """Return the current epoch time in seconds. Patchable for testing."""
+    return time.time()
+
+
+@dataclass(frozen=True)
+class InterruptedRun:
+    """A run left running by a previous process, with what it needs to resume."""
+
+    thread_id: str
+    query: str
+    limits: BudgetLimits | None
+    cancel_on_disconnect: bool
+    used: BudgetUsage
+
+
+def _dump_limits(limits: BudgetLimits | None) -> str | None:
+    return json.dumps(dataclasses.asdict(limits)) if limits is not None else None
+
+
+def _load_limits(value: str | None) -> BudgetLimits | None:
+    return BudgetLimits(**json.loads(value)) if value is not None else None
+
+
+def thread_config(thread_id: str) -> dict[str, Any]:
+    """Return the configurable section that selects a run's checkpoint thread."""
+    return {"thread_id": thread_id}
+
+
+class ThreadedSqliteSaver(SqliteSaver):
+    """SqliteSaver that also implements the async checkpointer methods.
+
+    Each async method runs its sync counterpart on a worker thread; the
+    saver's lock already serializes use of its connection.
+    """
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Get a checkpoint tuple without blocking the event loop."""
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """List checkpoints without blocking the event loop."""
+        checkpoints = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint in checkpoints:
+            yield checkpoint
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Save a checkpoint without blocking the event loop."""
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Save intermediate writes without blocking the event loop."""
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Delete a thread's checkpoints without blocking the event loop."""
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+class ResearchCheckpointStore:
+    """SQLite file holding LangGraph checkpoints and the research run table.
+
+    ``saver`` is the checkpointer to compile the agent with. The run
+    table is written by the research runner: start_run when a run
+    begins, record_usage after each orchestrator turn and finish_run
+    when it ends. Rows are owned by the store that started or claimed
+    them, for as long as it renews their lease every lease_seconds; a
+    running row whose lease lapsed belongs to a process that crashed.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_age_seconds: float,
+        lease_seconds: float = DEFAULT_RESEARCH_CHECKPOINT_LEASE_SECONDS,
+    ) -> None:
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        self.lease_seconds = lease_seconds
+        self.owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(research_runs)")}
+        for column, definition in _RUN_COLUMNS.items():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE research_runs ADD COLUMN {column} {definition}")
+        self._conn.commit()
+        # The saver serializes its own writes, so it gets a separate connection.
+        self._saver_conn = sqlite3.connect(path, check_same_thread=False)
+        self.saver = ThreadedSqliteSaver(self._saver_conn)
+        self.saver.setup()
+
+    def start_run(
+        self,
+        thread_id: str,
+        query: str,
+        limits: BudgetLimits | None = None,
+        cancel_on_disconnect: bool = False,
+    ) -> None:
+        """Record that a run is in progress, creating or reviving its row.
+
+        A revived row keeps the budget usage recorded so far.
+        """
+        now = _now()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO research_runs (thread_id, query, status, created_at, updated_at, "
+                "owner, limits, cancel_on_disconnect) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(thread_id) DO UPDATE SET status = excluded.status, "
+                "updated_at = excluded.updated_at, owner = excluded.owner, "
+                "limits = excluded.limits, cancel_on_disconnect = excluded.cancel_on_disconnect",
+                (
+                    thread_id,
+                    query,
+                    RunState.RUNNING,
+                    now,
+                    now,
+                    self.owner,
+                    _dump_limits(limits),
+                    cancel_on_disconnect,
+                ),
+            )
+            self._conn.commit()
+
+    def record_usage(self, thread_id: str, used: BudgetUsage) -> None:
+        """Save the budget a run has used so far."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE research_runs SET iterations = ?, tokens = ?, elapsed_seconds = ?, "
+                "updated_at = ? WHERE thread_id = ?",
+                (used.iterations, used.tokens, used.elapsed_seconds, _now(), thread_id),
+            )
+            self._conn.commit()
+
+    def renew_leases(self) -> int:
+        """Extend the lease on every running run this store owns. Returns the count."""
+        with self._lock:
+            count = self._conn.execute(
+                "UPDATE research_runs SET updated_at = ? WHERE owner = ? AND status = ?",
+                (_now(), self.owner, RunState.RUNNING),
+            ).rowcount
+            self._conn.commit()
+        return count
+
+    def finish_run(self, thread_id: str, state: RunState) -> None:
+        """Record a run's outcome and prune runs past the retention window."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE research_runs SET status = ?, updated_at = ? WHERE thread_id = ?",
+                (state, _now(), thread_id),
+            )
+            self._conn.commit()
+        self.prune()
+
+    def has_checkpoint(self, thread_id: str) -> bool:
+        """Return True if the run saved at least one step."""
+        return self.saver.get_tuple({"configurable": thread_config(thread_id)}) is not None
+
+    def claim_interrupted_runs(self) -> list[InterruptedRun]:
+        """Take ownership of runs whose owner is gone, oldest first.
+
+        A run qualifies if it is marked running, is owned by another store,
+        and that owner released it or has not renewed its lease for
+        lease_seconds, so runs of live processes sharing the file are left
+        alone even during a long model call. The claim is a single UPDATE,
+        so each run goes to exactly one claiming process.
+        """
+        now = _now()
+        with self._lock:
+            rows = self._conn.execute(
+                "UPDATE research_runs SET owner = ?, updated_at = ? "
+                "WHERE status = ? AND owner IS NOT ? AND (owner IS NULL OR updated_at < ?) "
+                "RETURNING thread_id, query, limits, cancel_on_disconnect, iterations, tokens, "
+                "elapsed_seconds, created_at",
+                (self.owner, now, RunState.RUNNING, self.owner, now - self.lease_seconds),
+            ).fetchall()
+            self._conn.commit()
+        rows.sort(key=lambda row: row[-1])
+        return [
+            InterruptedRun(
+                thread_id=thread_id,
+                query=query,
+                limits=_load_limits(limits),
+                cancel_on_disconnect=bool(cancel_on_disconnect),
+                used=BudgetUsage(iterations, tokens, elapsed_seconds),
+            )
+            for (
+                thread_id,
+                query,
+                limits,
+                cancel_on_disconnect,
+                iterations,
+                tokens,
+                elapsed_seconds,
+                _created_at,
+            ) in rows
+        ]
+
+    def prune(self) -> int:
+        """Delete runs, and their checkpoints, idle longer than max_age_seconds.
+
+        Returns the number of runs deleted.
+        """
+        cutoff = _now() - self.max_age_seconds
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT thread_id FROM research_runs WHERE updated_at < ?", (cutoff,)
+            ).fetchall()
+        for (thread_id,) in rows:
+            self.saver.delete_thread(thread_id)
+            with self._lock:
+                self._conn.execute("DELETE FROM research_runs WHERE thread_id = ?", (thread_id,))
+                self._conn.commit()
+        if rows:
+            logger.info("Pruned checkpoints of %d research runs", len(rows))
+        return len(rows)
+
+    def close(self) -> None:
+        """Release this store's running runs and close the database connections.
+
+        A closed store can no longer checkpoint its runs, so they are left
+        for another process to claim at once.
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE research_runs SET owner = NULL WHERE owner = ? AND status = ?",
+                (self.owner, RunState.RUNNING),
+            )
+            self._conn.commit()
+            self._conn.close()
+        with self.saver.lock:
+            self._saver_conn.close()
+
+
+def create_checkpoint_store(settings: Settings) -> ResearchCheckpointStore | None:
+    """Create the research checkpoint store, or None when checkpointing is disabled."""
+    if not settings.research_checkpoints_enabled:
+        return None
+
+    return ResearchCheckpointStore(
+        path=settings.research_checkpoint_path,
+        max_age_seconds=settings.research_checkpoint_max_age_seconds,
+        lease_seconds=settings.research_checkpoint_lease_seconds,
+    )
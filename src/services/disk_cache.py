@@ -0,0 +1,227 @@
+"""Disk-backed key/value cache with TTL expiry and LRU eviction.
+
+Stores JSON-serializable values in a local SQLite file so cached
+results survive restarts and can be shared between worker processes.
+TieredCache puts a small in-memory LRU in front of a DiskCache for
+values that are read often within one process.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# ---- Constants ----
+
+DEFAULT_NAMESPACE = "default"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed
+    ON cache_entries (namespace, accessed_at);
+"""
+
+
+def _now() -> float:
+    """Return the current epoch time in seconds. Patchable for testing."""
+    return time.time()
+
+
+class DiskCache:
+    """SQLite-backed cache with a TTL and a least-recently-used size cap.
+
+    Entries older than ``ttl_seconds`` are treated as misses and removed.
+    When the namespace holds more than ``max_entries`` rows, the least
+    recently accessed entries are evicted. Hit and miss counters are kept
+    per instance.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float,
+        max_entries: int,
+        namespace: str = DEFAULT_NAMESPACE,
+    ) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for key, or None on a miss or expiry."""
+        entry = self.get_entry(key)
+        return None if entry is None else entry[0]
+
+    def get_entry(self, key: str) -> tuple[Any, float] | None:
+        """Return (value, created_at) for key, or None on a miss or expiry."""
+        now = _now()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                )
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key),
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(value), created_at
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value, evicting old entries if over capacity."""
+        now = _now()
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(namespace, key, value, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, payload, now, now),
+            )
+            self._evict_over_capacity()
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every entry in this cache's namespace."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+
+    def stats(self) -> dict[str, int]:
+        """Return hit, miss, and entry counts for this namespace."""
+        with self._lock:
+            (entries,) = self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?",
+                (self.namespace,),
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _evict_over_capacity(self) -> None:
+        """Delete least-recently-accessed entries beyond max_entries. Caller holds the lock."""
+        (count,) = self._conn.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?",
+            (self.namespace,),
+        ).fetchone()
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+            "SELECT key FROM cache_entries WHERE namespace = ? "
+            "ORDER BY accessed_at ASC LIMIT ?)",
+            (self.namespace, self.namespace, overflow),
+        )
+        logger.debug("Evicted %d entries from cache namespace '%s'", overflow, self.namespace)
+
+
+class TieredCache:
+    """In-memory LRU tier in front of a DiskCache.
+
+    Lookups try the memory tier first and promote disk hits into it.
+    Memory entries keep the creation time of the disk entry, so they
+    expire on the same TTL; the memory tier holds at most
+    ``memory_max_entries`` values.
+    """
+
+    def __init__(self, disk: DiskCache, memory_max_entries: int) -> None:
+        self.disk = disk
+        self.memory_max_entries = memory_max_entries
+        self.memory_hits = 0
+        self._memory: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for key from memory or disk, or None on a miss."""
+        now = _now()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[1] <= self.disk.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[0]
+                del self._memory[key]
+
+        disk_entry = self.disk.get_entry(key)
+        if disk_entry is None:
+            return None
+        self._remember(key, disk_entry)
+        return disk_entry[0]
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value in both tiers."""
+        self.disk.set(key, value)
+        self._remember(key, (value, _now()))
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        self.disk.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return the disk tier's stats plus memory hits and entries."""
+        with self._lock:
+            memory = {"memory_hits": self.memory_hits, "memory_entries": len(self._memory)}
+        return {**self.disk.stats(), **memory}
+
+    def close(self) -> None:
+        """Drop the memory tier and close the disk tier."""
+        with self._lock:
+            self._memory.clear()
+        self.disk.close()
+
+    def _remember(self, key: str, entry: tuple[Any, float]) -> None:
+        """Put an entry in the memory tier, evicting the least recently used."""
+        if self.memory_max_entries <= 0:
+            return
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_max_entries:
+                self._memory.popitem(last=False)
@@ -0,0 +1,142 @@
+"""Background Ollama health monitoring for the health endpoint.
+
+A single async task polls Ollama's /api/tags on an interval and records
+which of the configured models are available on each host. The health
+endpoint reads the cached snapshot instead of calling Ollama on every
+request.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+from src.config.settings import Settings
+from src.models.warmup import model_placements, normalize_model_name
+
+logger = logging.getLogger(__name__)
+
+# ---- Constants ----
+
+OLLAMA_TAGS_PATH = "/api/tags"
+OLLAMA_HEALTH_TIMEOUT_SECONDS = 5.0
+NANOSECONDS_PER_MICROSECOND = 1_000
+
+
+def _monotonic_ns() -> int:
+    """Return monotonic time in nanoseconds. Patchable for testing."""
+    return time.monotonic_ns()
+
+
+@dataclass(frozen=True)
+class HealthSnapshot:
+    """Result of one Ollama health check.
+
+    ollama_available and models_available are true when at least one
+    host is reachable or has the model installed; hosts holds the result
+    for each host, as {"available": bool, "models": {role: bool}}.
+    """
+
+    ollama_available: bool
+    models_available: dict[str, bool] = field(default_factory=dict)
+    checked_at_ns: int | None = None
+    hosts: dict[str, dict[str, object]] = field(default_factory=dict)
+
+    def age_us(self) -> int | None:
+        """Microseconds since the check ran, or None if no check has run yet."""
+        if self.checked_at_ns is None:
+            return None
+        return (_monotonic_ns() - self.checked_at_ns) // NANOSECONDS_PER_MICROSECOND
+
+
+class OllamaHealthMonitor:
+    """Keeps a cached snapshot of Ollama and per-model availability.
+
+    hosts maps each host URL to the roles placed on it; by default every
+    model is on base_url. Until the first refresh completes, the snapshot
+    reports Ollama as unavailable with no check time.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        models: dict[str, str],
+        interval_seconds: float,
+        transport: httpx.AsyncBaseTransport | None = None,
+        hosts: dict[str, dict[str, str]] | None = None,
+    ) -> None:
+        self.base_url = base_url
+        self.models = models
+        self.hosts = hosts if hosts is not None else {base_url: models}
+        self.interval_seconds = interval_seconds
+        self._transport = transport
+        self._snapshot = HealthSnapshot(
+            ollama_available=False,
+            models_available=dict.fromkeys(models, False),
+        )
+
+    def snapshot(self) -> HealthSnapshot:
+        """Return the most recent snapshot without touching the network."""
+        return self._snapshot
+
+    async def refresh(self) -> HealthSnapshot:
+        """Query /api/tags on every host once and replace the cached snapshot."""
+        urls = list(self.hosts)
+        results = await asyncio.gather(*(self._fetch_installed_models(url) for url in urls))
+        hosts: dict[str, dict[str, object]] = {}
+        models_available = dict.fromkeys(self.models, False)
+        for url, installed in zip(urls, results, strict=True):
+            available = {
+                role: installed is not None and normalize_model_name(model) in installed
+                for role, model in self.hosts[url].items()
+            }
+            for role, is_available in available.items():
+                models_available[role] = models_available[role] or is_available
+            hosts[url] = {"available": installed is not None, "models": available}
+        self._snapshot = HealthSnapshot(
+            ollama_available=any(installed is not None for installed in results),
+            models_available=models_available,
+            checked_at_ns=_monotonic_ns(),
+            hosts=hosts,
+        )
+        return self._snapshot
+
+    async def run(self) -> None:
+        """Refresh the snapshot every interval_seconds until cancelled."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Ollama health refresh failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def _fetch_installed_models(self, url: str) -> set[str] | None:
+        """Return normalized names of models installed on a host, or None if it is unreachable."""
+        try:
+            async with httpx.AsyncClient(
+                base_url=url,
+                timeout=OLLAMA_HEALTH_TIMEOUT_SECONDS,
+                transport=self._transport,
+            ) as client:
+                response = await client.get(OLLAMA_TAGS_PATH)
+                response.raise_for_status()
+                models = response.json().get("models", [])
+        except (httpx.HTTPError, ValueError) as exc:
+            logger.debug("Ollama health check of %s failed: %s", url, exc)
+            return None
+        return {normalize_model_name(entry.get("name", "")) for entry in models}
+
+
+def create_health_monitor(settings: Settings) -> OllamaHealthMonitor:
+    """Create the health monitor for the orchestrator and medical models on every host."""
+    return OllamaHealthMonitor(
+        base_url=settings.ollama_base_url,
+        models={
+            "orchestrator": settings.orchestrator_model,
+            "medical": settings.medical_model,
+        },
+        interval_seconds=settings.health_check_interval_seconds,
+        hosts=model_placements(settings),
+    )
@@ -0,0 +1,155 @@
+"""LLM call instrumentation.
+
+Records per-model latency, token counts, generation speed and errors
+into the metrics registry. Calls made inside the agent graph are seen
+by a LangChain callback handler attached to the run; calls made outside
+it (the forced synthesis, invoke_llm) go through timed_invoke, or
+timed_ainvoke on the async path. Those helpers record nothing themselves
+when the run's callback handler already sees the call, so each call is
+counted once.
+"""
+
+import threading
+import time
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler, BaseCallbackManager
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables import ensure_config
+
+from src.services.metrics import (
+    LLM_CALL_DURATION,
+    LLM_CALL_ERRORS,
+    LLM_CALL_TOKENS,
+    LLM_OUTPUT_TOKENS_PER_SECOND,
+    LLM_TOKENS,
+)
+
+# ---- Constants ----
+
+UNKNOWN_MODEL = "unknown"
+TOKENS_INPUT = "input"
+TOKENS_OUTPUT = "output"
+
+
+def _monotonic() -> float:
+    """Return monotonic time in seconds. Patchable for testing."""
+    return time.monotonic()
+
+
+def model_label(llm: Any) -> str:
+    """Return the model name of a chat model for metric labels."""
+    model = getattr(llm, "model", None)
+    return model if isinstance(model, str) and model else UNKNOWN_MODEL
+
+
+def record_llm_call(model: str, seconds: float, response: Any) -> None:
+    """Record the latency and token usage of one completed LLM call.
+
+    Token metrics are skipped when the response carries no usage metadata.
+    """
+    LLM_CALL_DURATION.observe(seconds, model=model)
+    usage = getattr(response, "usage_metadata", None)
+    if not isinstance(usage, dict):
+        return
+    input_tokens = int(usage.get("input_tokens", 0))
+    output_tokens = int(usage.get("output_tokens", 0))
+    LLM_TOKENS.inc(input_tokens, model=model, kind=TOKENS_INPUT)
+    LLM_TOKENS.inc(output_tokens, model=model, kind=TOKENS_OUTPUT)
+    LLM_CALL_TOKENS.observe(
+        int(usage.get("total_tokens", input_tokens + output_tokens)), model=model
+    )
+    if seconds > 0 and output_tokens:
+        LLM_OUTPUT_TOKENS_PER_SECOND.observe(output_tokens / seconds, model=model)
+
+
+def _handler_attached() -> bool:
+    """Return True if an LLMMetricsCallbackHandler is inherited by calls made in this context."""
+    callbacks = ensure_config().get("callbacks")
+    handlers = callbacks.handlers if isinstance(callbacks, BaseCallbackManager) else callbacks
+    return any(isinstance(handler, LLMMetricsCallbackHandler) for handler in handlers or [])
+
+
+def timed_invoke(llm: Any, messages: Any) -> Any:
+    """Invoke llm with messages, recording the call's metrics unless a run handler will."""
+    if _handler_attached():
+        return llm.invoke(messages)
+    model = model_label(llm)
+    started = _monotonic()
+    try:
+        response = llm.invoke(messages)
+    except Exception:
+        LLM_CALL_ERRORS.inc(model=model)
+        raise
+    record_llm_call(model, _monotonic() - started, response)
+    return response
+
+
+async def timed_ainvoke(llm: Any, messages: Any) -> Any:
+    """Async variant of timed_invoke."""
+    if _handler_attached():
+        return await llm.ainvoke(messages)
+    model = model_label(llm)
+    started = _monotonic()
+    try:
+        response = await llm.ainvoke(messages)
+    except Exception:
+        LLM_CALL_ERRORS.inc(model=model)
+        raise
+    record_llm_call(model, _monotonic() - started, response)
+    return response
+
+
+def _invocation_model(kwargs: dict[str, Any]) -> str:
+    """Model name from a callback's invocation params or LangSmith metadata."""
+    params = kwargs.get("invocation_params") or {}
+    metadata = kwargs.get("metadata") or {}
+    model = params.get("model") or params.get("model_name") or metadata.get("ls_model_name")
+    return model if isinstance(model, str) and model else UNKNOWN_MODEL
+
+
+class LLMMetricsCallbackHandler(BaseCallbackHandler):
+    """Records metrics for every LLM call made inside a run.
+
+    Metric errors never interrupt the run.
+    """
+
+    def __init__(self) -> None:
+        self._started: dict[UUID, tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id: UUID, kwargs: dict[str, Any]) -> None:
+        with self._lock:
+            self._started[run_id] = (_invocation_model(kwargs), _monotonic())
+
+    def _finish(self, run_id: UUID) -> tuple[str, float] | None:
+        with self._lock:
+            started = self._started.pop(run_id, None)
+        if started is None:
+            return None
+        model, at = started
+        return model, _monotonic() - at
+
+    def on_chat_model_start(self, *args: Any, run_id: UUID, **kwargs: Any) -> None:
+        """Remember when and for which model a chat model call started."""
+        self._start(run_id, kwargs)
+
+    def on_llm_start(self, *args: Any, run_id: UUID, **kwargs: Any) -> None:
+        """Remember when and for which model an LLM call started."""
+        self._start(run_id, kwargs)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        """Record the finished call's latency and token usage."""
+        finished = self._finish(run_id)
+        if finished is None:
+            return
+        model, seconds = finished
+        generation = response.generations[0][0] if response.generations else None
+        record_llm_call(model, seconds, getattr(generation, "message", None))
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        """Count the failed call."""
+        finished = self._finish(run_id)
+        if finished is not None:
+            LLM_CALL_ERRORS.inc(model=finished[0])
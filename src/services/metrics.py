@@ -0,0 +1,339 @@
+"""In-process application metrics.
+
+Minimal counters and histograms with labels, kept in a module-level
+registry so any module can record events without an external collector.
+The registry renders every metric in the Prometheus text exposition
+format for the /api/metrics endpoint.
+"""
+
+import contextlib
+import math
+import threading
+import time
+from collections.abc import Iterator, Sequence
+
+# ---- Constants ----
+
+LabelValues = tuple[str, ...]
+
+TYPE_COUNTER = "counter"
+TYPE_HISTOGRAM = "histogram"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+TOKEN_BUCKETS = (16, 64, 256, 512, 1024, 2048, 4096, 8192, 16384)
+TOKEN_RATE_BUCKETS = (1, 2, 5, 10, 20, 40, 80, 160)
+
+
+def _monotonic() -> float:
+    """Return monotonic time in seconds. Patchable for testing."""
+    return time.monotonic()
+
+
+def _check_labels(name: str, labelnames: LabelValues, labels: dict[str, str]) -> LabelValues:
+    if set(labels) != set(labelnames):
+        msg = f"{name} expects labels {labelnames}, got {tuple(labels)}"
+        raise ValueError(msg)
+    return tuple(labels[label] for label in labelnames)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str]) -> str:
+    if not labelnames:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape_label_value(value)}"'
+        for name, value in zip(labelnames, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonically increasing counter with optional labels."""
+
+    type = TYPE_COUNTER
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the counter for the given label values."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Return the current value for the given label values."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> dict[LabelValues, float]:
+        """Return a copy of all label values and their counts."""
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> list[str]:
+        """Return the sample lines in Prometheus text format."""
+        samples = self.samples()
+        if not samples and not self.labelnames:
+            samples = {(): 0.0}
+        return [
+            f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}"
+            for values, value in sorted(samples.items())
+        ]
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        return _check_labels(self.name, self.labelnames, labels)
+
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets, with labels.
+
+    Each label set keeps a count per bucket upper bound, plus the sum and
+    count of all observations; the implicit +Inf bucket equals the count.
+    """
+
+    type = TYPE_HISTOGRAM
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DURATION_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation for the given label values."""
+        key = _check_labels(self.name, self.labelnames, labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            counts[-1] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextlib.contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the with-block in seconds, even if it raises."""
+        started = _monotonic()
+        try:
+            yield
+        finally:
+            self.observe(_monotonic() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        """Return the number of observations for the given label values."""
+        key = _check_labels(self.name, self.labelnames, labels)
+        with self._lock:
+            return self._counts.get(key, [0])[-1]
+
+    def sum(self, **labels: str) -> float:
+        """Return the sum of observations for the given label values."""
+        key = _check_labels(self.name, self.labelnames, labels)
+        with self._lock:
+            return self._sums.get(key, 0.0)
+
+    def render(self) -> list[str]:
+        """Return the bucket, sum and count lines in Prometheus text format."""
+        with self._lock:
+            snapshot = {
+                key: (list(counts), self._sums[key]) for key, counts in self._counts.items()
+            }
+        lines: list[str] = []
+        bucket_labels = (*self.labelnames, "le")
+        for values, (counts, total) in sorted(snapshot.items()):
+            bounds = [*self.buckets, math.inf]
+            for bound, count in zip(bounds, counts, strict=True):
+                labels = _format_labels(bucket_labels, (*values, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {counts[-1]}")
+        return lines
+
+
+Metric = Counter | Histogram
+
+
+class MetricsRegistry:
+    """Holds metrics by name; registering an existing name returns the same metric."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Return the counter called name, creating it on first use."""
+        with self._lock:
+            metric = self._metrics.setdefault(name, Counter(name, documentation, labelnames))
+        if not isinstance(metric, Counter):
+            msg = f"{name} is already registered as a {metric.type}"
+            raise ValueError(msg)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DURATION_BUCKETS,
+    ) -> Histogram:
+        """Return the histogram called name, creating it on first use."""
+        with self._lock:
+            metric = self._metrics.setdefault(
+                name, Histogram(name, documentation, labelnames, buckets)
+            )
+        if not isinstance(metric, Histogram):
+            msg = f"{name} is already registered as a {metric.type}"
+            raise ValueError(msg)
+        return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines: list[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+RESEARCH_RUNS_CANCELLED = REGISTRY.counter(
+    "research_runs_cancelled_total",
+    "Research runs stopped before completion",
+    ("reason",),
+)
+
+RESEARCH_RUNS_COALESCED = REGISTRY.counter(
+    "research_runs_coalesced_total",
+    "Research requests that joined an in-flight run for the same query",
+)
+
+RESEARCH_REQUESTS_REJECTED = REGISTRY.counter(
+    "research_requests_rejected_total",
+    "Research requests rejected because the run queue was full",
+)
+
+RESEARCH_BUDGET_EXHAUSTED = REGISTRY.counter(
+    "research_budget_exhausted_total",
+    "Research runs stopped early by a step, time or token budget",
+    ("budget",),
+)
+
+RESEARCH_CACHE_LOOKUPS = REGISTRY.counter(
+    "research_cache_lookups_total",
+    "Whole-query report cache lookups by outcome",
+    ("result",),
+)
+
+SEARCH_CACHE_LOOKUPS = REGISTRY.counter(
+    "search_cache_lookups_total",
+    "Search result cache lookups by outcome",
+    ("result",),
+)
+
+MEDICAL_CACHE_LOOKUPS = REGISTRY.counter(
+    "medical_cache_lookups_total",
+    "Medical expert answer cache lookups by answering model kind and outcome",
+    ("answer", "result"),
+)
+
+RESEARCH_RUN_DURATION = REGISTRY.histogram(
+    "research_run_duration_seconds",
+    "Duration of research runs by final job status",
+    ("status",),
+    buckets=(10.0, 30.0, 60.0, 120.0, 180.0, 240.0, 300.0, 600.0, 900.0, 1800.0),
+)
+
+RESEARCH_NODE_DURATION = REGISTRY.histogram(
+    "research_node_duration_seconds",
+    "Time spent in each agent graph node, and in the forced final synthesis",
+    ("node",),
+)
+
+TOOL_CALL_DURATION = REGISTRY.histogram(
+    "tool_call_duration_seconds",
+    "Duration of agent tool calls",
+    ("tool",),
+)
+
+TOOL_CALL_ERRORS = REGISTRY.counter(
+    "tool_call_errors_total",
+    "Agent tool calls that failed or fell back",
+    ("tool",),
+)
+
+LLM_CALL_DURATION = REGISTRY.histogram(
+    "llm_call_duration_seconds",
+    "Duration of LLM calls by model",
+    ("model",),
+)
+
+LLM_CALL_TOKENS = REGISTRY.histogram(
+    "llm_call_tokens",
+    "Total tokens per LLM call by model",
+    ("model",),
+    buckets=TOKEN_BUCKETS,
+)
+
+LLM_OUTPUT_TOKENS_PER_SECOND = REGISTRY.histogram(
+    "llm_output_tokens_per_second",
+    "Generation speed of LLM calls by model",
+    ("model",),
+    buckets=TOKEN_RATE_BUCKETS,
+)
+
+LLM_TOKENS = REGISTRY.counter(
+    "llm_tokens_total",
+    "LLM tokens by model and kind (input or output)",
+    ("model", "kind"),
+)
+
+LLM_CALL_ERRORS = REGISTRY.counter(
+    "llm_call_errors_total",
+    "LLM calls that raised, by model",
+    ("model",),
+)
+
+OLLAMA_HOST_REQUESTS = REGISTRY.counter(
+    "ollama_host_requests_total",
+    "Model calls routed to each pooled Ollama host by model and outcome",
+    ("host", "model", "result"),
+)
+
+TOOL_CONCURRENCY_WAIT = REGISTRY.histogram(
+    "tool_concurrency_wait_seconds",
+    "Time agent tool calls waited for a slot under their tool's concurrency limit",
+    ("tool",),
+)
+
+TOOL_CALLS_DEDUPLICATED = REGISTRY.counter(
+    "tool_calls_deduplicated_total",
+    "Repeated agent tool calls answered from the run's earlier result",
+    ("tool",),
+)
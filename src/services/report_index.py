@@ -0,0 +1,489 @@
+"""SQLite metadata and full-text index for saved research reports.
+
+Keeps one row per report file (filename, query, timestamp, models used,
+and source count) so listings do not have to read every report, plus the
+normalized query so repeated questions can find a recent report, and an
+FTS5 index over each report's query and body for ranked search with
+highlighted snippets, keyed by the report's rowid. The index lives in a hidden subdirectory of the
+output directory. It is updated by save_report and reconciled with the
+directory whenever the directory's modification time changes, which
+catches reports added or removed by other means.
+
+Rebuild the index for existing output directories with:
+
+    python -m src.services.report_index rebuild output
+"""
+
+import argparse
+import base64
+import binascii
+import json
+import logging
+import re
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Literal
+
+logger = logging.getLogger(__name__)
+
+# ---- Constants ----
+
+INDEX_DIRNAME = ".index"
+INDEX_FILENAME = "reports.sqlite3"
+REPORT_GLOB = "*.md"
+FRONT_MATTER_DELIMITER = "---"
+MAX_FRONT_MATTER_LINES = 200
+META_DIR_MTIME = "dir_mtime_ns"
+SORT_DESC: Literal["desc"] = "desc"
+SORT_ASC: Literal["asc"] = "asc"
+LIKE_ESCAPE = "\\"
+SCHEMA_VERSION = "4"
+META_SCHEMA_VERSION = "schema_version"
+SEARCH_TERM_PATTERN = re.compile(r"\w+")
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_TOKENS = 24
+# bm25 column weights for (query, body): matches in the query count double
+FTS_COLUMN_WEIGHTS = (2.0, 1.0)
+QUERY_TRAILING_PUNCTUATION = "?!. "
+PARTIAL_FLAG = "true"
+
+_META_SCHEMA = """
+CREATE TABLE IF NOT EXISTS index_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    filename TEXT NOT NULL UNIQUE,
+    query TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    models_used TEXT NOT NULL,
+    sources_count INTEGER NOT NULL,
+    query_key TEXT NOT NULL,
+    partial INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reports_timestamp ON reports (timestamp, filename);
+CREATE INDEX IF NOT EXISTS idx_reports_query_key ON reports (query_key, timestamp);
+CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts USING fts5(
+    query,
+    body,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+"""
+
+_DROP_TABLES = """
+DROP TABLE IF EXISTS reports;
+DROP TABLE IF EXISTS reports_fts;
+"""
+
+_indexes: dict[Path, "ReportIndex"] = {}
+_indexes_lock = threading.Lock()
+
+
+def normalize_query(query: str) -> str:
+    """Return the key identifying repeats of a query: case-folded, single-spaced, no trailing ?!."""
+    return " ".join(query.casefold().split()).rstrip(QUERY_TRAILING_PUNCTUATION)
+
+
+class InvalidCursorError(Exception):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(timestamp: str, filename: str) -> str:
+    """Encode the (timestamp, filename) position of a report as an opaque cursor."""
+    raw = json.dumps([timestamp, filename], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Decode a cursor from encode_cursor. Raises InvalidCursorError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, filename = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from exc
+    if not isinstance(timestamp, str) or not isinstance(filename, str):
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+    return timestamp, filename
+
+
+def _escape_like(text: str) -> str:
+    return (
+        text.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+
+
+def parse_report_metadata(front_matter_lines: list[str]) -> dict[str, Any] | None:
+    """Parse report front matter lines (without delimiters) into index metadata.
+
+    Returns None when the lines carry no key/value pairs.
+    """
+    fields: dict[str, str] = {}
+    models_used: list[str] = []
+    for raw_line in front_matter_lines:
+        line = raw_line.strip()
+        if line.startswith("- "):
+            models_used.append(line[2:].strip())
+        elif ": " in line:
+            key, value = line.split(": ", 1)
+            fields[key] = value
+
+    if not fields:
+        return None
+
+    try:
+        sources_count = int(fields.get("sources_count", "0"))
+    except ValueError:
+        sources_count = 0
+
+    return {
+        "query": fields.get("query", ""),
+        "timestamp": fields.get("timestamp", ""),
+        "models_used": models_used,
+        "sources_count": sources_count,
+        "partial": fields.get("partial") == PARTIAL_FLAG,
+    }
+
+
+def read_report_document(path: Path) -> tuple[dict[str, Any], str] | None:
+    """Read a report file and return its parsed front matter and markdown body.
+
+    Returns None for files without a complete front matter block.
+    """
+    with path.open(encoding="utf-8") as handle:
+        if handle.readline().rstrip("\n") != FRONT_MATTER_DELIMITER:
+            return None
+        lines: list[str] = []
+        for _ in range(MAX_FRONT_MATTER_LINES):
+            line = handle.readline()
+            if not line:
+                return None
+            if line.rstrip("\n") == FRONT_MATTER_DELIMITER:
+                metadata = parse_report_metadata(lines)
+                return None if metadata is None else (metadata, handle.read())
+            lines.append(line)
+    return None
+
+
+def _match_expression(text: str) -> str | None:
+    """Build an FTS5 MATCH expression requiring every word in text, or None if there are none."""
+    terms = SEARCH_TERM_PATTERN.findall(text)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def _dir_mtime_ns(output_dir: Path) -> int:
+    return output_dir.stat().st_mtime_ns
+
+
+class ReportIndex:
+    """Metadata index over the report files of one output directory."""
+
+    def __init__(self, output_dir: str) -> None:
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / INDEX_DIRNAME / INDEX_FILENAME
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_META_SCHEMA)
+        self._migrate()
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def upsert(
+        self,
+        filename: str,
+        query: str,
+        timestamp: str,
+        models_used: list[str] | None = None,
+        sources_count: int = 0,
+        body: str = "",
+        partial: bool = False,
+    ) -> None:
+        """Insert or replace the metadata and full-text rows for a report file."""
+        with self._lock:
+            self._upsert_row(
+                filename, query, timestamp, models_used or [], sources_count, body, partial
+            )
+            self._record_dir_mtime()
+            self._conn.commit()
+
+    def list_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        query_contains: str | None = None,
+        order: Literal["asc", "desc"] = SORT_DESC,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Return one page of reports and the cursor for the next page, if any.
+
+        Reports are ordered by (timestamp, filename) so cursors stay stable
+        while new reports arrive. since is inclusive and until exclusive;
+        query_contains is a case-insensitive substring match on the query.
+        The page is read by walking the timestamp index, so its cost grows
+        with limit rather than with the number of reports.
+        """
+        self.sync_if_stale()
+
+        clauses: list[str] = []
+        params: list[object] = []
+        if cursor is not None:
+            comparison = "<" if order == SORT_DESC else ">"
+            clauses.append(f"(timestamp, filename) {comparison} (?, ?)")
+            params.extend(decode_cursor(cursor))
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        if query_contains:
+            clauses.append(f"query LIKE ? ESCAPE '{LIKE_ESCAPE}'")
+            params.append(f"%{_escape_like(query_contains)}%")
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        direction = "DESC" if order == SORT_DESC else "ASC"
+        sql = (
+            "SELECT filename, query, timestamp, models_used, sources_count FROM reports "
+            f"{where} ORDER BY timestamp {direction}, filename {direction} LIMIT ?"
+        )
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        page = [self._row_to_dict(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_cursor = encode_cursor(last["timestamp"], last["filename"])
+        return page, next_cursor
+
+    def search(self, text: str, limit: int) -> list[dict[str, Any]]:
+        """Full-text search over report queries and bodies, best matches first.
+
+        Every word in text must match (with stemming). Each hit carries
+        the report metadata, a bm25 score (lower is better, as in FTS5),
+        and a snippet with matches wrapped in SNIPPET_START/SNIPPET_END.
+        """
+        expression = _match_expression(text)
+        if expression is None:
+            return []
+
+        self.sync_if_stale()
+        weights = ", ".join(str(weight) for weight in FTS_COLUMN_WEIGHTS)
+        sql = (
+            "SELECT r.filename, r.query, r.timestamp, r.models_used, r.sources_count, "
+            f"bm25(reports_fts, {weights}) AS score, "
+            "snippet(reports_fts, -1, ?, ?, ?, ?) AS snippet "
+            "FROM reports_fts JOIN reports r ON r.id = reports_fts.rowid "
+            "WHERE reports_fts MATCH ? ORDER BY score LIMIT ?"
+        )
+        params = (SNIPPET_START, SNIPPET_END, SNIPPET_ELLIPSIS, SNIPPET_TOKENS, expression, limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        return [
+            {**self._row_to_dict(row), "score": row["score"], "snippet": row["snippet"]}
+            for row in rows
+        ]
+
+    def find_recent(self, query: str, since: str) -> dict[str, Any] | None:
+        """Return the newest complete report for query saved at or after since.
+
+        Queries match after normalize_query; partial reports never match.
+        """
+        self.sync_if_stale()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT filename, query, timestamp, models_used, sources_count FROM reports "
+                "WHERE query_key = ? AND timestamp >= ? AND partial = 0 "
+                "ORDER BY timestamp DESC, filename DESC LIMIT 1",
+                (normalize_query(query), since),
+            ).fetchone()
+        return None if row is None else self._row_to_dict(row)
+
+    def sync_if_stale(self) -> bool:
+        """Reconcile with the directory if its mtime changed since the last sync."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM index_meta WHERE key = ?", (META_DIR_MTIME,)
+            ).fetchone()
+            if row is not None and int(row["value"]) == _dir_mtime_ns(self.output_dir):
+                return False
+            self._sync()
+            return True
+
+    def rebuild(self) -> int:
+        """Drop all rows and index every report in the directory. Returns the count."""
+        with self._lock:
+            self._conn.execute("DELETE FROM reports")
+            self._conn.execute("DELETE FROM reports_fts")
+            self._sync()
+            count: int = self._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+        return count
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _sync(self) -> None:
+        """Index new report files and drop rows for deleted ones. Caller holds the lock."""
+        mtime = _dir_mtime_ns(self.output_dir)
+        on_disk = {path.name for path in self.output_dir.glob(REPORT_GLOB)}
+        indexed = {row[0] for row in self._conn.execute("SELECT filename FROM reports")}
+
+        removed = indexed - on_disk
+        for name in removed:
+            row = self._conn.execute(
+                "DELETE FROM reports WHERE filename = ? RETURNING id", (name,)
+            ).fetchone()
+            self._conn.execute("DELETE FROM reports_fts WHERE rowid = ?", (row["id"],))
+
+        added = 0
+        for name in sorted(on_disk - indexed):
+            try:
+                document = read_report_document(self.output_dir / name)
+            except (OSError, UnicodeDecodeError) as exc:
+                logger.warning("Failed to read report %s: %s", name, exc)
+                continue
+            if document is None:
+                logger.warning("Skipping report without front matter: %s", name)
+                continue
+            metadata, body = document
+            self._upsert_row(name, body=body, **metadata)
+            added += 1
+
+        self._conn.execute(
+            "INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)",
+            (META_DIR_MTIME, str(mtime)),
+        )
+        self._conn.commit()
+        if added or removed:
+            logger.info(
+                "Report index synced for %s: %d added, %d removed",
+                self.output_dir,
+                added,
+                len(removed),
+            )
+
+    def _upsert_row(
+        self,
+        filename: str,
+        query: str,
+        timestamp: str,
+        models_used: list[str],
+        sources_count: int,
+        body: str,
+        partial: bool = False,
+    ) -> None:
+        """Write the metadata and full-text rows for one report. Caller holds the lock.
+
+        The report keeps its rowid when overwritten, so its full-text row
+        is found and replaced by rowid.
+        """
+        row = self._conn.execute(
+            "INSERT INTO reports "
+            "(filename, query, timestamp, models_used, sources_count, query_key, partial) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (filename) DO UPDATE SET query = excluded.query, "
+            "timestamp = excluded.timestamp, models_used = excluded.models_used, "
+            "sources_count = excluded.sources_count, query_key = excluded.query_key, "
+            "partial = excluded.partial RETURNING id",
+            (
+                filename,
+                query,
+                timestamp,
+                json.dumps(models_used),
+                sources_count,
+                normalize_query(query),
+                int(partial),
+            ),
+        ).fetchone()
+        self._conn.execute("DELETE FROM reports_fts WHERE rowid = ?", (row["id"],))
+        self._conn.execute(
+            "INSERT INTO reports_fts (rowid, query, body) VALUES (?, ?, ?)",
+            (row["id"], query, body),
+        )
+
+    def _migrate(self) -> None:
+        """Drop the report tables for re-creation when built by an older schema version."""
+        row = self._conn.execute(
+            "SELECT value FROM index_meta WHERE key = ?", (META_SCHEMA_VERSION,)
+        ).fetchone()
+        if row is not None and row["value"] == SCHEMA_VERSION:
+            return
+        self._conn.executescript(_DROP_TABLES)
+        self._conn.execute("DELETE FROM index_meta WHERE key = ?", (META_DIR_MTIME,))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)",
+            (META_SCHEMA_VERSION, SCHEMA_VERSION),
+        )
+
+    def _record_dir_mtime(self) -> None:
+        """Remember the directory mtime after a write we indexed ourselves. Caller holds the lock."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)",
+            (META_DIR_MTIME, str(_dir_mtime_ns(self.output_dir))),
+        )
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> dict[str, Any]:
+        return {
+            "filename": row["filename"],
+            "query": row["query"],
+            "timestamp": row["timestamp"],
+            "models_used": json.loads(row["models_used"]),
+            "sources_count": row["sources_count"],
+        }
+
+
+def get_report_index(output_dir: str) -> ReportIndex:
+    """Return the shared index for output_dir, opening it on first use."""
+    key = Path(output_dir).resolve()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None or not index.path.exists():
+            index = ReportIndex(str(key))
+            _indexes[key] = index
+        return index
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point for rebuilding report indexes."""
+    parser = argparse.ArgumentParser(prog="python -m src.services.report_index")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild_parser = subcommands.add_parser("rebuild", help="Re-index existing report directories")
+    rebuild_parser.add_argument("output_dirs", nargs="+", help="Report output directories")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    for output_dir in args.output_dirs:
+        if not Path(output_dir).is_dir():
+            print(f"Not a directory: {output_dir}", file=sys.stderr)
+            return 1
+        count = get_report_index(output_dir).rebuild()
+        print(f"Indexed {count} reports in {output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,21 @@
 """Report persistence service for saving and retrieving research reports.
 
 Saves markdown reports with YAML front matter metadata, supports
-listing and retrieving saved reports by filename.
+listing and retrieving saved reports by filename, and finds a recent
+report for a repeated query. Listings are served from the SQLite
+metadata index in src.services.report_index.
 """
 
 import logging
-from datetime import UTC, datetime
+import sqlite3
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
+from typing import Any, Literal
 
 from slugify import slugify
 
+from src.services.report_index import PARTIAL_FLAG, get_report_index, read_report_document
+
 logger = logging.getLogger(__name__)
 
 # ---- Constants ----
@@ -17,6 +23,7 @@ logger = logging.getLogger(__name__)
 MAX_SLUG_LENGTH = 80
 REPORT_DATE_FORMAT = "%Y-%m-%d"
 FRONT_MATTER_DELIMITER = "---"
+LIST_ALL_PAGE_SIZE = 500
 
 
 class ReportNotFoundError(Exception):
@@ -40,6 +47,7 @@ def _build_front_matter(
     timestamp: datetime,
     models_used: list[str] | None = None,
     sources_count: int = 0,
+    partial: bool = False,
 ) -> str:
     """Build YAML front matter string for a report."""
     lines = [
@@ -56,6 +64,8 @@ def _build_front_matter(
         lines.append("models_used: []")
 
     lines.append(f"sources_count: {sources_count}")
+    if partial:
+        lines.append(f"partial: {PARTIAL_FLAG}")
     lines.append(FRONT_MATTER_DELIMITER)
 
     return "\n".join(lines) + "\n"
@@ -87,11 +97,13 @@ def save_report(
     output_dir: str,
     models_used: list[str] | None = None,
     sources_count: int = 0,
+    partial: bool = False,
 ) -> Path:
     """Save a research report as a markdown file with YAML front matter.
 
     Creates the output directory if it doesn't exist. Returns the
-    path to the saved file.
+    path to the saved file. Partial reports are flagged in the front
+    matter and never served as a recent report for their query.
     """
     timestamp = _now()
     filename = _build_filename(query, timestamp)
@@ -103,44 +115,126 @@ def save_report(
         timestamp=timestamp,
         models_used=models_used,
         sources_count=sources_count,
+        partial=partial,
     )
 
     file_path = dir_path / filename
     file_path.write_text(front_matter + content)
     logger.info("Report saved: %s", file_path)
 
+    try:
+        get_report_index(output_dir).upsert(
+            filename=filename,
+            query=query,
+            timestamp=timestamp.isoformat(),
+            models_used=models_used,
+            sources_count=sources_count,
+            body=content,
+            partial=partial,
+        )
+    except sqlite3.Error as exc:
+        logger.warning(
+            "Failed to index report %s, it will be picked up on the next sync: %s", filename, exc
+        )
+
     return file_path
 
 
 def list_reports(output_dir: str) -> list[dict[str, str]]:
     """List all saved reports with metadata, sorted newest first.
 
-    Returns a list of dicts with filename, query, and timestamp.
-    Only includes .md files with valid front matter.
+    Returns a list of dicts with filename, query, and timestamp. Reads
+    every page of list_report_page.
     """
-    dir_path = Path(output_dir)
+    reports: list[dict[str, str]] = []
+    cursor: str | None = None
+    while True:
+        page, cursor = list_report_page(output_dir, limit=LIST_ALL_PAGE_SIZE, cursor=cursor)
+        reports.extend(
+            {
+                "filename": report["filename"],
+                "query": report["query"],
+                "timestamp": report["timestamp"],
+            }
+            for report in page
+        )
+        if cursor is None:
+            return reports
+
+
+def list_report_page(
+    output_dir: str,
+    limit: int,
+    cursor: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    query_contains: str | None = None,
+    order: Literal["asc", "desc"] = "desc",
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Return one page of report metadata and the cursor for the next page.
+
+    Dates are compared in UTC; naive datetimes are treated as UTC.
+    Raises InvalidCursorError for a malformed cursor.
+    """
+    if not Path(output_dir).exists():
+        return [], None
+
+    return get_report_index(output_dir).list_page(
+        limit=limit,
+        cursor=cursor,
+        since=_to_utc_isoformat(since),
+        until=_to_utc_isoformat(until),
+        query_contains=query_contains,
+        order=order,
+    )
+
 
-    if not dir_path.exists():
+def _to_utc_isoformat(value: datetime | None) -> str | None:
+    """Convert a datetime to the UTC ISO format used in report timestamps."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.astimezone(UTC).isoformat()
+
+
+def search_reports(output_dir: str, text: str, limit: int) -> list[dict[str, Any]]:
+    """Full-text search over saved reports, returning ranked hits with snippets."""
+    if not Path(output_dir).exists():
         return []
 
-    reports: list[dict[str, str]] = []
-    for md_file in dir_path.glob("*.md"):
-        try:
-            text = md_file.read_text()
-            metadata = _parse_front_matter(text)
-            if metadata:
-                reports.append(
-                    {
-                        "filename": md_file.name,
-                        "query": metadata.get("query", ""),
-                        "timestamp": metadata.get("timestamp", ""),
-                    }
-                )
-        except Exception:
-            logger.warning("Failed to parse report: %s", md_file.name)
-
-    reports.sort(key=lambda r: r["timestamp"], reverse=True)
-    return reports
+    return get_report_index(output_dir).search(text, limit)
+
+
+def find_recent_report(
+    output_dir: str, query: str, max_age_seconds: float
+) -> dict[str, Any] | None:
+    """Return the newest complete report for a repeat of query, if fresh enough.
+
+    The result carries the report metadata plus its markdown content
+    (without front matter). Returns None when no report for the
+    normalized query was saved within max_age_seconds.
+    """
+    if not Path(output_dir).exists():
+        return None
+
+    since = (_now() - timedelta(seconds=max_age_seconds)).astimezone(UTC).isoformat()
+    try:
+        report = get_report_index(output_dir).find_recent(query, since)
+    except sqlite3.Error as exc:
+        logger.warning("Report cache lookup failed for query '%s': %s", query, exc)
+        return None
+    if report is None:
+        return None
+
+    try:
+        document = read_report_document(Path(output_dir) / report["filename"])
+    except (OSError, UnicodeDecodeError) as exc:
+        logger.warning("Failed to read cached report %s: %s", report["filename"], exc)
+        return None
+    if document is None:
+        return None
+    return {**report, "content": document[1]}
 
 
 def get_report(report_id: str, output_dir: str) -> str:
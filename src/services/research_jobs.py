@@ -0,0 +1,651 @@
+"""In-process job queue for research runs.
+
+Research runs are submitted as jobs and executed by a bounded pool of
+workers, independently of any HTTP connection. Each job records the
+events its run publishes, so clients can attach to its stream, resume
+after the last event id they saw, and poll its status.
+"""
+
+import asyncio
+import contextlib
+import heapq
+import inspect
+import itertools
+import logging
+import math
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from enum import StrEnum
+from typing import Any, cast
+
+from src.services.budgets import BudgetLimits, BudgetUsage
+from src.services.metrics import (
+    RESEARCH_REQUESTS_REJECTED,
+    RESEARCH_RUN_DURATION,
+    RESEARCH_RUNS_COALESCED,
+)
+from src.services.report_index import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# ---- Constants ----
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_JOB_RETENTION = 200
+DEFAULT_DISCONNECT_GRACE_SECONDS = 0.0
+DEFAULT_EVENT_BUFFER_SIZE = 2000
+DEFAULT_MAX_QUEUED = 10
+DEFAULT_RUN_DURATION_SECONDS = 180.0
+RUN_DURATION_WINDOW = 50
+MIN_RETRY_AFTER_SECONDS = 1
+EVENT_TYPE_QUEUED = "queued"
+CANCEL_REASON_DISCONNECT = "client_disconnected"
+WORKER_THREAD_PREFIX = "research-worker"
+EVENT_LOOP_THREAD_NAME = "research-event-loop"
+
+JobEvent = dict[str, Any]
+NumberedEvent = tuple[int, JobEvent]
+JobRunner = Callable[["ResearchJob"], str | None]
+AsyncJobRunner = Callable[["ResearchJob"], Awaitable[str | None]]
+
+
+class JobStatus(StrEnum):
+    """Lifecycle states of a research job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATUSES = frozenset({JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED})
+
+
+class ResearchQueueFullError(Exception):
+    """Raised when a research run cannot be admitted because the wait queue is full."""
+
+    def __init__(self, retry_after_seconds: int) -> None:
+        super().__init__(f"Research queue is full, retry in {retry_after_seconds}s")
+        self.retry_after_seconds = retry_after_seconds
+
+
+def _now() -> datetime:
+    """Return the current UTC datetime. Patchable for testing."""
+    return datetime.now(tz=UTC)
+
+
+def _monotonic() -> float:
+    """Return monotonic time in seconds. Patchable for testing."""
+    return time.monotonic()
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+class ResearchJob:
+    """One research run: its status, its result, and the events it published.
+
+    Events are numbered from 1 and only the latest event_buffer_size are
+    kept. limits overrides the runner's default budget; a resumed job
+    reuses its run's id, with budget_used as the budget already spent.
+    """
+
+    def __init__(
+        self,
+        query: str,
+        cancel_on_disconnect: bool = False,
+        disconnect_grace_seconds: float = DEFAULT_DISCONNECT_GRACE_SECONDS,
+        event_buffer_size: int = DEFAULT_EVENT_BUFFER_SIZE,
+        job_id: str | None = None,
+        resumed: bool = False,
+        limits: BudgetLimits | None = None,
+        budget_used: BudgetUsage | None = None,
+    ) -> None:
+        self.id = job_id if job_id is not None else uuid.uuid4().hex
+        self.resumed = resumed
+        self.limits = limits
+        self.budget_used = budget_used
+        self.budget_exhausted: str | None = None
+        self.deduplicated_tool_calls = 0
+        self.query = query
+        self.key = normalize_query(query)
+        self.status = JobStatus.QUEUED
+        self.created_at = _now()
+        self.started_at: datetime | None = None
+        self.finished_at: datetime | None = None
+        self.filename: str | None = None
+        self.error: str | None = None
+        self.cancel_on_disconnect = cancel_on_disconnect
+        self.disconnect_grace_seconds = disconnect_grace_seconds
+        self.cancel_event = threading.Event()
+        self.cancel_reason: str | None = None
+        self.queue_position: int | None = None
+        self.cached = False
+        self._events: deque[NumberedEvent] = deque(maxlen=event_buffer_size)
+        self._last_event_id = 0
+        self._cond = threading.Condition()
+        self._subscribers = 0
+        self._async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+
+    @property
+    def is_finished(self) -> bool:
+        """True once the job has succeeded, failed, or been cancelled."""
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def cancel_requested(self) -> bool:
+        """True once cancellation of the run has been requested."""
+        return self.cancel_event.is_set()
+
+    def request_cancel(self, reason: str) -> None:
+        """Ask the run to stop at its next checkpoint. The first reason given is kept."""
+        with self._cond:
+            if self.is_finished or self.cancel_event.is_set():
+                return
+            self.cancel_reason = reason
+            self.cancel_event.set()
+        logger.info("Research job %s cancellation requested: %s", self.id, reason)
+
+    def attach(self) -> None:
+        """Register a connected stream subscriber."""
+        with self._cond:
+            self._subscribers += 1
+
+    def detach(self) -> None:
+        """Unregister a subscriber, scheduling cancellation if it was the last one.
+
+        With cancel_on_disconnect, the job is cancelled unless a subscriber
+        re-attaches within disconnect_grace_seconds.
+        """
+        with self._cond:
+            self._subscribers -= 1
+            orphaned = self._subscribers == 0 and self.cancel_on_disconnect
+            if not orphaned or self.is_finished:
+                return
+        if self.disconnect_grace_seconds <= 0:
+            self.request_cancel(CANCEL_REASON_DISCONNECT)
+            return
+        timer = threading.Timer(self.disconnect_grace_seconds, self._cancel_if_orphaned)
+        timer.daemon = True
+        timer.start()
+
+    def _cancel_if_orphaned(self) -> None:
+        with self._cond:
+            orphaned = self._subscribers == 0
+        if orphaned:
+            self.request_cancel(CANCEL_REASON_DISCONNECT)
+
+    @property
+    def last_event_id(self) -> int:
+        """Id of the most recently published event, or 0 if none."""
+        with self._cond:
+            return self._last_event_id
+
+    def publish(self, event: JobEvent) -> int:
+        """Append an event, wake every attached stream, and return the event's id."""
+        with self._cond:
+            self._last_event_id += 1
+            self._events.append((self._last_event_id, event))
+            self._notify()
+            return self._last_event_id
+
+    def _events_after(self, after_id: int) -> list[NumberedEvent]:
+        """Return buffered events with ids above after_id. Caller holds the condition.
+
+        An after_id older than the buffer continues from the oldest buffered event.
+        """
+        if not self._events:
+            return []
+        skip = max(0, after_id - self._events[0][0] + 1)
+        return list(itertools.islice(self._events, skip, None))
+
+    def _notify(self) -> None:
+        """Wake sync and async waiters. Caller holds the condition."""
+        self._cond.notify_all()
+        for loop, waiter in self._async_waiters:
+            loop.call_soon_threadsafe(waiter.set)
+        self._async_waiters.clear()
+
+    async def next_events(self, after_id: int, timeout: float) -> tuple[list[NumberedEvent], bool]:
+        """Wait up to timeout for events after after_id without blocking a thread.
+
+        Returns (events, finished) with events as (id, event) pairs. An
+        empty list with finished False means the timeout passed with
+        nothing new.
+        """
+        waiter = asyncio.Event()
+        with self._cond:
+            if after_id < self._last_event_id or self.is_finished:
+                return self._events_after(after_id), self.is_finished
+            self._async_waiters.append((asyncio.get_running_loop(), waiter))
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(waiter.wait(), timeout)
+        with self._cond:
+            entry = (asyncio.get_running_loop(), waiter)
+            if entry in self._async_waiters:
+                self._async_waiters.remove(entry)
+            return self._events_after(after_id), self.is_finished
+
+    def mark_running(self) -> None:
+        """Record that a worker has started the run."""
+        with self._cond:
+            self.status = JobStatus.RUNNING
+            self.started_at = _now()
+
+    def finish(
+        self,
+        status: JobStatus,
+        filename: str | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Record the final status and release every attached stream."""
+        with self._cond:
+            self.status = status
+            self.filename = filename
+            self.error = error
+            self.finished_at = _now()
+            self._notify()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable status summary."""
+        with self._cond:
+            return {
+                "job_id": self.id,
+                "query": self.query,
+                "status": str(self.status),
+                "created_at": _isoformat(self.created_at),
+                "started_at": _isoformat(self.started_at),
+                "finished_at": _isoformat(self.finished_at),
+                "filename": self.filename,
+                "error": self.error,
+                "cancel_reason": self.cancel_reason,
+                "queue_position": self.queue_position,
+                "cached": self.cached,
+                "resumed": self.resumed,
+                "budget_exhausted": self.budget_exhausted,
+                "deduplicated_tool_calls": self.deduplicated_tool_calls,
+                "event_count": self._last_event_id,
+            }
+
+
+class ResearchJobManager:
+    """Queue of research jobs served by a pool of daemon worker threads.
+
+    The runner executes one job: it publishes the job's events and
+    returns the saved report filename. An exception from the runner
+    marks the job failed, unless cancellation was requested, in which
+    case the job is cancelled. Workers start on the first submission.
+    Only the most recent max_jobs_retained finished jobs are kept. With
+    coalesce, a submission whose normalized query matches an unfinished,
+    uncancelled job returns that job, so every requester shares one run
+    and one report. Once max_queued jobs are waiting behind busy
+    workers, submit raises ResearchQueueFullError. A coroutine-function
+    runner runs on async workers sharing one event loop thread.
+    """
+
+    def __init__(
+        self,
+        runner: JobRunner | AsyncJobRunner,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_jobs_retained: int = DEFAULT_JOB_RETENTION,
+        disconnect_grace_seconds: float = DEFAULT_DISCONNECT_GRACE_SECONDS,
+        event_buffer_size: int = DEFAULT_EVENT_BUFFER_SIZE,
+        coalesce: bool = False,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+    ) -> None:
+        self._runner: JobRunner | None = None
+        self._async_runner: AsyncJobRunner | None = None
+        if inspect.iscoroutinefunction(runner):
+            self._async_runner = cast(AsyncJobRunner, runner)
+        else:
+            self._runner = cast(JobRunner, runner)
+        self.max_workers = max_workers
+        self.max_jobs_retained = max_jobs_retained
+        self.disconnect_grace_seconds = disconnect_grace_seconds
+        self.event_buffer_size = event_buffer_size
+        self.coalesce = coalesce
+        self.max_queued = max_queued
+        self._in_flight: dict[str, ResearchJob] = {}
+        self._waiting: list[ResearchJob] = []
+        self._running: dict[str, float] = {}
+        self._durations: deque[float] = deque(maxlen=RUN_DURATION_WINDOW)
+        self._queue: queue.Queue[ResearchJob] = queue.Queue()
+        self._jobs: OrderedDict[str, ResearchJob] = OrderedDict()
+        self._lock = threading.Lock()
+        self._workers: list[threading.Thread] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._async_queue: asyncio.Queue[ResearchJob] = asyncio.Queue()
+
+    def submit(
+        self,
+        query: str,
+        cancel_on_disconnect: bool = False,
+        limits: BudgetLimits | None = None,
+    ) -> ResearchJob:
+        """Queue a research run for query and return its job.
+
+        Returns the in-flight job for the same normalized query and
+        limits instead, when coalescing is enabled. A joined job is only cancelled on
+        disconnect if every requester asked for that. Raises
+        ResearchQueueFullError when no slot or queue place is free.
+        """
+        with self._lock:
+            existing = self._in_flight.get(normalize_query(query)) if self.coalesce else None
+            if (
+                existing is not None
+                and existing.limits == limits
+                and not (existing.is_finished or existing.cancel_requested)
+            ):
+                existing.cancel_on_disconnect = (
+                    existing.cancel_on_disconnect and cancel_on_disconnect
+                )
+                RESEARCH_RUNS_COALESCED.inc()
+                logger.info("Query '%s' joined in-flight research job %s", query, existing.id)
+                return existing
+
+            idle_slots = self.max_workers - len(self._running)
+            if len(self._waiting) - idle_slots >= self.max_queued:
+                retry_after = self._retry_after()
+                RESEARCH_REQUESTS_REJECTED.inc()
+                logger.warning("Research queue full, rejecting query '%s'", query)
+                raise ResearchQueueFullError(retry_after)
+
+            job = ResearchJob(
+                query,
+                cancel_on_disconnect=cancel_on_disconnect,
+                disconnect_grace_seconds=self.disconnect_grace_seconds,
+                event_buffer_size=self.event_buffer_size,
+                limits=limits,
+            )
+            self._jobs[job.id] = job
+            if self.coalesce:
+                self._in_flight[job.key] = job
+            self._waiting.append(job)
+            must_wait = len(self._waiting) > idle_slots
+            updates = self._queue_updates()[-1:] if must_wait else []
+            self._prune_finished()
+            self._ensure_workers()
+        self._publish_queue_updates(updates)
+        self._enqueue(job)
+        logger.info("Research job %s queued for query '%s'", job.id, query)
+        return job
+
+    def resume(
+        self,
+        job_id: str,
+        query: str,
+        cancel_on_disconnect: bool = False,
+        limits: BudgetLimits | None = None,
+        budget_used: BudgetUsage | None = None,
+    ) -> ResearchJob:
+        """Queue an interrupted run again under its original job id.
+
+        The run keeps the limits and cancel_on_disconnect it was submitted
+        with, and continues from the budget_used it had recorded.
+        Resumed runs bypass the admission limit: they were admitted
+        before the restart. They still coalesce with later submissions.
+        """
+        job = ResearchJob(
+            query,
+            cancel_on_disconnect=cancel_on_disconnect,
+            disconnect_grace_seconds=self.disconnect_grace_seconds,
+            event_buffer_size=self.event_buffer_size,
+            job_id=job_id,
+            resumed=True,
+            limits=limits,
+            budget_used=budget_used,
+        )
+        with self._lock:
+            self._jobs[job.id] = job
+            if self.coalesce:
+                self._in_flight.setdefault(job.key, job)
+            self._waiting.append(job)
+            self._ensure_workers()
+        self._enqueue(job)
+        logger.info("Research job %s resumed for query '%s'", job.id, query)
+        return job
+
+    def _average_run_seconds(self) -> float:
+        if not self._durations:
+            return DEFAULT_RUN_DURATION_SECONDS
+        return sum(self._durations) / len(self._durations)
+
+    def _estimated_starts(self, extra: int = 0) -> list[float]:
+        """Seconds until each waiting job (plus extra hypothetical ones) starts.
+
+        Simulates the worker slots: running jobs free their slot after
+        the average run duration, then each waiting job in order takes
+        the earliest free slot. Caller holds the lock.
+        """
+        average = self._average_run_seconds()
+        now = _monotonic()
+        free_at = [max(0.0, average - (now - started)) for started in self._running.values()]
+        free_at += [0.0] * max(0, self.max_workers - len(free_at))
+        heapq.heapify(free_at)
+        starts = []
+        for _ in range(len(self._waiting) + extra):
+            start = heapq.heappop(free_at)
+            starts.append(start)
+            heapq.heappush(free_at, start + average)
+        return starts
+
+    def _retry_after(self) -> int:
+        """Seconds until a queue place is expected to free up. Caller holds the lock."""
+        starts = self._estimated_starts()
+        first_start = starts[0] if starts else 0.0
+        return max(MIN_RETRY_AFTER_SECONDS, math.ceil(first_start))
+
+    def _queue_updates(self) -> list[tuple[ResearchJob, int, float]]:
+        """(job, position, estimated wait) for every waiting job. Caller holds the lock."""
+        updates = []
+        for position, (job, wait) in enumerate(
+            zip(self._waiting, self._estimated_starts(), strict=True), start=1
+        ):
+            job.queue_position = position
+            updates.append((job, position, wait))
+        return updates
+
+    def _publish_queue_updates(self, updates: list[tuple[ResearchJob, int, float]]) -> None:
+        """Publish a queue-position event to each waiting job."""
+        for job, position, wait in updates:
+            job.publish(
+                {
+                    "type": EVENT_TYPE_QUEUED,
+                    "data": (
+                        f"Waiting for a research slot: position {position} in queue, "
+                        f"estimated wait {math.ceil(wait)}s"
+                    ),
+                    "queue_position": position,
+                    "estimated_wait_seconds": round(wait, 1),
+                }
+            )
+
+    def add_cached(self, query: str, result_event: JobEvent, filename: str) -> ResearchJob:
+        """Record a job answered from a saved report, without running the agent."""
+        job = ResearchJob(query, event_buffer_size=self.event_buffer_size)
+        job.cached = True
+        job.mark_running()
+        job.publish(result_event)
+        job.finish(JobStatus.SUCCEEDED, filename=filename)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune_finished()
+        logger.info("Research job %s served from cached report %s", job.id, filename)
+        return job
+
+    def get(self, job_id: str) -> ResearchJob | None:
+        """Return the job with job_id, or None if unknown or pruned."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _enqueue(self, job: ResearchJob) -> None:
+        """Hand a job to the workers."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._async_queue.put_nowait, job)
+        else:
+            self._queue.put(job)
+
+    def _ensure_workers(self) -> None:
+        """Start worker threads up to max_workers. Caller holds the lock.
+
+        With an async runner, start the event loop thread and its
+        max_workers async workers instead, so a slot waiting on model or
+        search I/O holds no thread.
+        """
+        if self._async_runner is not None:
+            self._ensure_event_loop()
+            return
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._work,
+                name=f"{WORKER_THREAD_PREFIX}-{len(self._workers)}",
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def _ensure_event_loop(self) -> None:
+        """Start the event loop thread running the async workers. Caller holds the lock."""
+        if self._loop is not None:
+            return
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(
+            target=loop.run_until_complete,
+            args=(self._aserve(),),
+            name=EVENT_LOOP_THREAD_NAME,
+            daemon=True,
+        )
+        thread.start()
+        self._workers.append(thread)
+        self._loop = loop
+
+    def _prune_finished(self) -> None:
+        """Drop the oldest finished jobs beyond the retention limit. Caller holds the lock."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[: max(0, len(finished) - self.max_jobs_retained)]:
+            del self._jobs[job_id]
+
+    def _work(self) -> None:
+        """Worker loop: run queued jobs one at a time."""
+        while True:
+            job = self._queue.get()
+            try:
+                self._start(job)
+                self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _start(self, job: ResearchJob) -> None:
+        """Move a job from the wait queue to the running set and update the others."""
+        with self._lock:
+            if job in self._waiting:
+                self._waiting.remove(job)
+            job.queue_position = None
+            self._running[job.id] = _monotonic()
+            waiting_behind_busy = len(self._waiting) + len(self._running) > self.max_workers
+            updates = self._queue_updates() if waiting_behind_busy else []
+        self._publish_queue_updates(updates)
+
+    async def _aserve(self) -> None:
+        """Run max_workers async workers on the event loop thread."""
+        await asyncio.gather(*(self._awork() for _ in range(self.max_workers)))
+
+    async def _awork(self) -> None:
+        """Async worker loop: run queued jobs one at a time on the event loop."""
+        while True:
+            job = await self._async_queue.get()
+            try:
+                self._start(job)
+                await self._arun(job)
+            finally:
+                self._async_queue.task_done()
+
+    def _run(self, job: ResearchJob) -> None:
+        """Run one job, record its outcome, and stop routing new submissions to it."""
+        try:
+            self._execute(job)
+        finally:
+            self._release(job)
+
+    async def _arun(self, job: ResearchJob) -> None:
+        """Async variant of _run for coroutine-function runners."""
+        try:
+            await self._aexecute(job)
+        finally:
+            self._release(job)
+
+    def _release(self, job: ResearchJob) -> None:
+        """Free a finished job's slot and stop routing new submissions to it."""
+        with self._lock:
+            started = self._running.pop(job.id, None)
+            if started is not None:
+                RESEARCH_RUN_DURATION.observe(_monotonic() - started, status=str(job.status))
+            if self._in_flight.get(job.key) is job:
+                del self._in_flight[job.key]
+
+    def _execute(self, job: ResearchJob) -> None:
+        """Run one job and record its outcome."""
+        if not self._begin(job):
+            return
+        assert self._runner is not None
+        try:
+            filename = self._runner(job)
+        except Exception as exc:
+            self._fail(job, exc)
+            return
+        self._succeed(job, filename)
+
+    async def _aexecute(self, job: ResearchJob) -> None:
+        """Run one job with the async runner and record its outcome."""
+        if not self._begin(job):
+            return
+        assert self._async_runner is not None
+        try:
+            filename = await self._async_runner(job)
+        except Exception as exc:
+            self._fail(job, exc)
+            return
+        self._succeed(job, filename)
+
+    def _begin(self, job: ResearchJob) -> bool:
+        """Mark a job running, or finish it cancelled if cancelled while queued."""
+        if job.cancel_requested:
+            job.finish(JobStatus.CANCELLED)
+            logger.info("Research job %s cancelled before it started", job.id)
+            return False
+        job.mark_running()
+        logger.info("Research job %s started", job.id)
+        return True
+
+    def _fail(self, job: ResearchJob, exc: Exception) -> None:
+        """Record a runner error: cancelled if cancellation was requested, else failed."""
+        if job.cancel_requested:
+            job.finish(JobStatus.CANCELLED)
+            logger.info("Research job %s cancelled", job.id)
+            return
+        job.finish(JobStatus.FAILED, error=str(exc))
+        logger.info("Research job %s failed", job.id)
+
+    def _succeed(self, job: ResearchJob, filename: str | None) -> None:
+        """Record a completed run, as cancelled if cancellation came in at the end."""
+        if job.cancel_requested:
+            job.finish(JobStatus.CANCELLED, filename=filename)
+            logger.info("Research job %s cancelled", job.id)
+            return
+        self._record_duration(job)
+        job.finish(JobStatus.SUCCEEDED, filename=filename)
+        logger.info("Research job %s finished: %s", job.id, filename)
+
+    def _record_duration(self, job: ResearchJob) -> None:
+        """Add a successful run's duration to the wait-estimate window."""
+        with self._lock:
+            started = self._running.get(job.id)
+            if started is not None:
+                self._durations.append(_monotonic() - started)
@@ -0,0 +1,118 @@
+"""Per-tool concurrency limits for agent tool calls.
+
+The agent graph runs every tool call of one orchestrator turn at once.
+A ConcurrencyLimiter caps how many calls of one tool run at the same
+time, across all research runs in the process, so that a turn asking
+for many medical consultations does not flood the Ollama hosts. Calls
+over the cap wait for a slot, in worker threads or on an event loop,
+and give up once their run is cancelled.
+"""
+
+import asyncio
+import contextlib
+import logging
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+
+from src.services.cancellation import raise_if_cancelled
+from src.services.metrics import TOOL_CONCURRENCY_WAIT
+
+logger = logging.getLogger(__name__)
+
+# ---- Constants ----
+
+CANCEL_POLL_SECONDS = 0.5
+
+_AsyncWaiter = tuple[asyncio.AbstractEventLoop, asyncio.Event]
+
+
+def _monotonic() -> float:
+    """Return monotonic time in seconds. Patchable for testing."""
+    return time.monotonic()
+
+
+class ConcurrencyLimiter:
+    """Thread-safe cap on concurrent calls of one tool, for sync and async callers."""
+
+    def __init__(self, name: str, max_concurrent: int) -> None:
+        if max_concurrent < 1:
+            msg = f"max_concurrent for '{name}' must be at least 1, got {max_concurrent}"
+            raise ValueError(msg)
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self._active = 0
+        self._condition = threading.Condition()
+        self._async_waiters: set[_AsyncWaiter] = set()
+
+    @property
+    def active(self) -> int:
+        """Number of calls currently holding a slot."""
+        with self._condition:
+            return self._active
+
+    def _try_acquire(self) -> bool:
+        """Take a slot if one is free. The caller holds the condition."""
+        if self._active >= self.max_concurrent:
+            return False
+        self._active += 1
+        return True
+
+    def _release(self) -> None:
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+            waiters = list(self._async_waiters)
+        for loop, event in waiters:
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(event.set)
+
+    def _record_wait(self, started: float) -> None:
+        waited = _monotonic() - started
+        TOOL_CONCURRENCY_WAIT.observe(waited, tool=self.name)
+        if waited >= CANCEL_POLL_SECONDS:
+            logger.debug("Tool '%s' waited %.2fs for a concurrency slot", self.name, waited)
+
+    @contextlib.contextmanager
+    def hold(self) -> Iterator[None]:
+        """Hold a slot for the duration of one call, blocking until one is free.
+
+        Raises RunCancelledError if the calling run is cancelled while waiting.
+        """
+        started = _monotonic()
+        with self._condition:
+            while not self._try_acquire():
+                raise_if_cancelled()
+                self._condition.wait(CANCEL_POLL_SECONDS)
+        self._record_wait(started)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @contextlib.asynccontextmanager
+    async def ahold(self) -> AsyncIterator[None]:
+        """Hold a slot for the duration of one awaited call, without blocking the loop.
+
+        Raises RunCancelledError if the calling run is cancelled while waiting.
+        """
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        started = _monotonic()
+        while True:
+            with self._condition:
+                if self._try_acquire():
+                    break
+                waiter[1].clear()
+                self._async_waiters.add(waiter)
+            try:
+                raise_if_cancelled()
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(waiter[1].wait(), CANCEL_POLL_SECONDS)
+            finally:
+                with self._condition:
+                    self._async_waiters.discard(waiter)
+        self._record_wait(started)
+        try:
+            yield
+        finally:
+            self._release()
@@ -0,0 +1,98 @@
+"""Per-run memoization of identical agent tool calls.
+
+As a run's message history grows, the orchestrator sometimes repeats a
+search or medical question it already asked. Each run gets a RunToolMemo,
+made visible to the tools through a context variable like the run's
+cancellation signal. A repeated call is answered from the memo with a
+note that the result was already retrieved, and is counted both in the
+run's status and in the metrics registry.
+"""
+
+import contextlib
+import json
+import logging
+import threading
+from collections.abc import Iterator, Mapping
+from contextvars import ContextVar
+from typing import Any
+
+from src.services.metrics import TOOL_CALLS_DEDUPLICATED
+from src.services.report_index import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# ---- Constants ----
+
+REPEATED_CALL_NOTE = (
+    "Note: this call repeats an earlier one in this research run, so the result "
+    "already retrieved is shown again. Use it rather than asking again.\n\n"
+)
+
+_current_tool_memo: ContextVar["RunToolMemo | None"] = ContextVar("current_tool_memo", default=None)
+
+
+def _normalize_arg(value: Any) -> Any:
+    """Normalize a tool argument so trivially different spellings match.
+
+    Strings are normalized like research queries; lists of strings are
+    compared as sets, since their order does not change the answer.
+    """
+    if isinstance(value, str):
+        return normalize_query(value)
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return sorted({normalize_query(item) for item in value if item.strip()})
+    return value
+
+
+def build_tool_call_key(tool: str, args: Mapping[str, Any]) -> str:
+    """Build the memo key of one call from the tool name and normalized arguments."""
+    normalized = {name: _normalize_arg(value) for name, value in args.items()}
+    return json.dumps({"tool": tool, "args": normalized}, sort_keys=True, default=str)
+
+
+class RunToolMemo:
+    """Results of the tool calls made so far in one research run. Thread-safe."""
+
+    def __init__(self) -> None:
+        self._results: dict[str, str] = {}
+        self._deduplicated = 0
+        self._lock = threading.Lock()
+
+    @property
+    def deduplicated(self) -> int:
+        """Number of calls answered from the memo."""
+        with self._lock:
+            return self._deduplicated
+
+    def lookup(self, tool: str, args: Mapping[str, Any]) -> str | None:
+        """Return the earlier result of an identical call, with a note, or None."""
+        key = build_tool_call_key(tool, args)
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                return None
+            self._deduplicated += 1
+        TOOL_CALLS_DEDUPLICATED.inc(tool=tool)
+        logger.info("Reusing the earlier result of a repeated '%s' call", tool)
+        return REPEATED_CALL_NOTE + result
+
+    def store(self, tool: str, args: Mapping[str, Any], result: str) -> None:
+        """Remember the result of a call for the rest of the run."""
+        key = build_tool_call_key(tool, args)
+        with self._lock:
+            self._results[key] = result
+
+
+@contextlib.contextmanager
+def tool_memo_scope(memo: RunToolMemo) -> Iterator[None]:
+    """Make memo the tool call memo for code running in this context."""
+    token = _current_tool_memo.set(memo)
+    try:
+        yield
+    finally:
+        _current_tool_memo.reset(token)
+
+
+def current_tool_memo() -> RunToolMemo | None:
+    """Return the memo of the run executing in this context, if any."""
+    return _current_tool_memo.get()
@@ -0,0 +1,429 @@
+"""Offline BM25 search over a local biomedical abstract corpus.
+
+Builds an on-disk inverted index (SQLite FTS5 plus a term statistics
+table) from a PubMed/PMC abstract dump in JSONL format, and exposes it
+as a LangChain tool that returns results in the same shape as
+TavilySearch, so it can stand in for web search on air-gapped deployments.
+
+Queries run in two stages to keep latency flat on multi-million
+document corpora: the FTS5 index selects a small candidate pool, led by
+documents matching every query term, then every query term is scored
+with BM25 over that pool.
+
+Build an index with:
+
+    python -m src.tools.local_search build pubmed.jsonl data/pubmed_index.sqlite3
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+import unicodedata
+from collections import Counter
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+# ---- Constants ----
+
+LOCAL_SEARCH_DEPTH = "bm25"
+DEFAULT_LOCAL_MAX_RESULTS = 5
+SNIPPET_MAX_CHARS = 600
+BUILD_BATCH_SIZE = 10_000
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2.0
+CANDIDATE_POOL_SIZE = 100
+CANDIDATE_DF_BUDGET = 20_000
+
+PUBMED_URL_TEMPLATE = "https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
+TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+STOPWORDS = frozenset(
+    {
+        "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how",
+        "in", "is", "it", "of", "on", "or", "that", "the", "to", "what", "which",
+        "with",
+    }
+)  # fmt: skip
+
+_SCHEMA = """
+CREATE TABLE documents (
+    id INTEGER PRIMARY KEY,
+    doc_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    abstract TEXT NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE documents_fts USING fts5(
+    title,
+    abstract,
+    content='documents',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TABLE term_stats (
+    term TEXT PRIMARY KEY,
+    df INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE index_meta (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+
+class LocalIndexNotFoundError(Exception):
+    """Raised when the local search index file does not exist."""
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase, diacritic-free tokens matching the FTS5 tokenizer."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return TOKEN_PATTERN.findall(stripped)
+
+
+# ---- Index Build ----
+
+
+def _document_url(record: dict[str, Any]) -> str:
+    """Return the record's URL, deriving a PubMed URL from its PMID if needed."""
+    if record.get("url"):
+        return str(record["url"])
+    pmid = record.get("pmid") or record.get("id")
+    return PUBMED_URL_TEMPLATE.format(pmid=pmid) if pmid else ""
+
+
+def _iter_corpus(corpus_path: Path) -> Iterator[tuple[str, str, str, str]]:
+    """Yield (doc_id, title, url, abstract) tuples from a JSONL abstract dump.
+
+    Each line needs a title and an abstract (or text). Malformed lines
+    are logged and skipped.
+    """
+    with corpus_path.open(encoding="utf-8") as corpus:
+        for line_number, line in enumerate(corpus, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("Skipping malformed corpus line %d", line_number)
+                continue
+
+            title = str(record.get("title") or "").strip()
+            abstract = str(record.get("abstract") or record.get("text") or "").strip()
+            if not title and not abstract:
+                continue
+
+            doc_id = str(record.get("pmid") or record.get("id") or line_number)
+            yield doc_id, title or "Untitled", _document_url(record), abstract
+
+
+def _insert_batch(conn: sqlite3.Connection, batch: list[tuple[str, str, str, str]]) -> int:
+    """Insert a batch of documents into the content and FTS tables."""
+    for doc_id, title, url, abstract in batch:
+        length = len(tokenize(title)) + len(tokenize(abstract))
+        cursor = conn.execute(
+            "INSERT INTO documents (doc_id, title, url, abstract, length) VALUES (?, ?, ?, ?, ?)",
+            (doc_id, title, url, abstract, length),
+        )
+        conn.execute(
+            "INSERT INTO documents_fts (rowid, title, abstract) VALUES (?, ?, ?)",
+            (cursor.lastrowid, title, abstract),
+        )
+    conn.commit()
+    return len(batch)
+
+
+def _write_statistics(conn: sqlite3.Connection) -> None:
+    """Store per-term document frequencies and corpus size statistics."""
+    conn.execute("CREATE VIRTUAL TABLE temp.fts_vocab USING fts5vocab(main, documents_fts, 'row')")
+    conn.execute("INSERT INTO term_stats (term, df) SELECT term, doc FROM temp.fts_vocab")
+    doc_count, avg_length = conn.execute("SELECT COUNT(*), AVG(length) FROM documents").fetchone()
+    conn.executemany(
+        "INSERT INTO index_meta (key, value) VALUES (?, ?)",
+        [("doc_count", doc_count), ("avg_length", avg_length or 0.0)],
+    )
+    conn.execute("INSERT INTO documents_fts(documents_fts) VALUES ('optimize')")
+    conn.commit()
+
+
+def build_local_index(corpus_path: str, index_path: str) -> int:
+    """Build (or rebuild) the BM25 index from a JSONL corpus.
+
+    The index is built in a temporary file next to index_path and moved
+    into place with os.replace once complete, so an existing index keeps
+    serving queries during the build and survives a failed one.
+    Returns the number of indexed documents.
+    """
+    target = Path(index_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    os.close(fd)
+
+    try:
+        conn = sqlite3.connect(temp_name)
+        try:
+            conn.execute("PRAGMA journal_mode=OFF")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.executescript(_SCHEMA)
+
+            count = 0
+            batch: list[tuple[str, str, str, str]] = []
+            for row in _iter_corpus(Path(corpus_path)):
+                batch.append(row)
+                if len(batch) >= BUILD_BATCH_SIZE:
+                    count += _insert_batch(conn, batch)
+                    batch = []
+                    logger.info("Indexed %d documents", count)
+            count += _insert_batch(conn, batch)
+
+            _write_statistics(conn)
+        finally:
+            conn.close()
+        os.replace(temp_name, target)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+    logger.info("Local search index built at %s with %d documents", index_path, count)
+    return count
+
+
+# ---- Query ----
+
+
+def query_terms(query: str) -> list[str]:
+    """Return the unique query terms, dropping stopwords unless nothing else remains."""
+    terms = tokenize(query)
+    meaningful = [t for t in terms if t not in STOPWORDS] or terms
+    return list(dict.fromkeys(meaningful))
+
+
+def _match_expression(terms: list[str], operator: str = "OR") -> str:
+    """Build an FTS5 MATCH expression of quoted terms joined by operator."""
+    return f" {operator} ".join(f'"{term}"' for term in terms)
+
+
+def _candidate_ids(conn: sqlite3.Connection, document_frequencies: dict[str, int]) -> list[int]:
+    """Select a small pool of candidate documents for the BM25 rerank.
+
+    Documents matching every query term come first, best FTS5 rank
+    first. Only when fewer than CANDIDATE_POOL_SIZE of them exist is the
+    pool topped up from the rarest terms.
+    """
+    terms = list(document_frequencies)
+    sql = "SELECT rowid FROM documents_fts WHERE documents_fts MATCH ? ORDER BY rank LIMIT ?"
+    rows = conn.execute(sql, (_match_expression(terms, "AND"), CANDIDATE_POOL_SIZE)).fetchall()
+    candidates = [row[0] for row in rows]
+    if len(candidates) >= CANDIDATE_POOL_SIZE or len(terms) == 1:
+        return candidates
+
+    seen = set(candidates)
+    for rowid in _rarest_term_ids(conn, document_frequencies):
+        if len(candidates) >= CANDIDATE_POOL_SIZE:
+            break
+        if rowid not in seen:
+            seen.add(rowid)
+            candidates.append(rowid)
+    return candidates
+
+
+def _rarest_term_ids(conn: sqlite3.Connection, document_frequencies: dict[str, int]) -> list[int]:
+    """Select documents containing any of the rarest query terms.
+
+    Terms are taken rarest-first while their combined document frequency
+    fits the scan budget. When even the rarest term is too common, the
+    newest documents containing it are taken instead.
+    """
+    by_rarity = sorted(document_frequencies, key=document_frequencies.__getitem__)
+    drivers: list[str] = []
+    scanned = 0
+    for term in by_rarity:
+        if drivers and scanned + document_frequencies[term] > CANDIDATE_DF_BUDGET:
+            break
+        drivers.append(term)
+        scanned += document_frequencies[term]
+
+    if scanned <= CANDIDATE_DF_BUDGET:
+        sql = "SELECT rowid FROM documents_fts WHERE documents_fts MATCH ? ORDER BY rank LIMIT ?"
+    else:
+        sql = "SELECT rowid FROM documents_fts WHERE documents_fts MATCH ? ORDER BY rowid DESC LIMIT ?"
+
+    rows = conn.execute(sql, (_match_expression(drivers), CANDIDATE_POOL_SIZE)).fetchall()
+    return [row[0] for row in rows]
+
+
+def _bm25_score(
+    terms: list[str],
+    title: str,
+    abstract: str,
+    length: int,
+    idf: dict[str, float],
+    avg_length: float,
+) -> float:
+    """Score a document against all query terms with BM25, weighting title hits."""
+    title_counts = Counter(tokenize(title))
+    abstract_counts = Counter(tokenize(abstract))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length) if avg_length else BM25_K1
+
+    score = 0.0
+    for term in terms:
+        tf = TITLE_WEIGHT * title_counts[term] + abstract_counts[term]
+        if tf:
+            score += idf[term] * tf * (BM25_K1 + 1) / (tf + norm)
+    return score
+
+
+def _truncate(text: str, max_chars: int = SNIPPET_MAX_CHARS) -> str:
+    """Truncate text to max_chars on a word boundary."""
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + "..."
+
+
+def _search(conn: sqlite3.Connection, terms: list[str], max_results: int) -> list[dict[str, Any]]:
+    """Run the two-stage candidate selection and BM25 rerank."""
+    placeholders = ",".join("?" * len(terms))
+    document_frequencies = dict(
+        conn.execute(
+            f"SELECT term, df FROM term_stats WHERE term IN ({placeholders})", terms
+        ).fetchall()
+    )
+    if not document_frequencies:
+        return []
+
+    meta = dict(conn.execute("SELECT key, value FROM index_meta").fetchall())
+    doc_count = meta.get("doc_count", 0.0)
+    idf = {
+        term: math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+        for term, df in document_frequencies.items()
+    }
+
+    candidate_ids = _candidate_ids(conn, document_frequencies)
+    if not candidate_ids:
+        return []
+
+    placeholders = ",".join("?" * len(candidate_ids))
+    rows = conn.execute(
+        f"SELECT title, url, abstract, length FROM documents WHERE id IN ({placeholders})",
+        candidate_ids,
+    ).fetchall()
+
+    scored_terms = list(document_frequencies)
+    scored = [
+        (
+            _bm25_score(scored_terms, title, abstract, length, idf, meta.get("avg_length", 0.0)),
+            title,
+            url,
+            abstract,
+        )
+        for title, url, abstract, length in rows
+    ]
+    scored.sort(key=lambda item: item[0], reverse=True)
+
+    return [
+        {"title": title, "url": url, "content": _truncate(abstract), "score": round(score, 4)}
+        for score, title, url, abstract in scored[:max_results]
+        if score > 0
+    ]
+
+
+def search_local_index(index_path: str, query: str, max_results: int) -> dict[str, Any]:
+    """Run a BM25-ranked query and return results in TavilySearch's shape."""
+    if not Path(index_path).exists():
+        raise LocalIndexNotFoundError(f"Local search index not found: {index_path}")
+
+    started = time.perf_counter()
+    terms = query_terms(query)
+    results: list[dict[str, Any]] = []
+
+    if terms:
+        conn = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+        try:
+            results = _search(conn, terms, max_results)
+        finally:
+            conn.close()
+
+    return {
+        "query": query,
+        "results": results,
+        "response_time": round(time.perf_counter() - started, 4),
+    }
+
+
+# ---- LangChain Tool ----
+
+
+class LocalSearchInput(BaseModel):
+    """Input schema for the local search tool."""
+
+    query: str = Field(description="Search query")
+
+
+class LocalSearch(BaseTool):
+    """BM25 search over a local abstract index, returning Tavily-shaped results."""
+
+    name: str = "local_search"
+    description: str = (
+        "Search a local corpus of biomedical abstracts (PubMed/PMC). "
+        "Returns titles, URLs, and abstract snippets ranked by relevance."
+    )
+    args_schema: type[BaseModel] = LocalSearchInput
+
+    index_path: str
+    max_results: int = DEFAULT_LOCAL_MAX_RESULTS
+    search_depth: str = LOCAL_SEARCH_DEPTH
+    include_domains: list[str] | None = None
+
+    def _run(self, query: str, **kwargs: Any) -> dict[str, Any]:
+        """Query the local index."""
+        return search_local_index(self.index_path, query, self.max_results)
+
+
+# ---- CLI ----
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point for building and querying the local index."""
+    parser = argparse.ArgumentParser(prog="python -m src.tools.local_search")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subcommands.add_parser("build", help="Build the index from a JSONL dump")
+    build_parser.add_argument("corpus", help="Path to the JSONL abstract dump")
+    build_parser.add_argument("index", help="Path of the SQLite index to create")
+
+    query_parser = subcommands.add_parser("query", help="Run a query against an index")
+    query_parser.add_argument("index", help="Path to the SQLite index")
+    query_parser.add_argument("query", help="Query text")
+    query_parser.add_argument("--max-results", type=int, default=DEFAULT_LOCAL_MAX_RESULTS)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    if args.command == "build":
+        count = build_local_index(args.corpus, args.index)
+        print(f"Indexed {count} documents into {args.index}")
+        return 0
+
+    raw_results = search_local_index(args.index, args.query, args.max_results)
+    print(json.dumps(raw_results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,50 @@
 """Medical expert consultation tool using MedGemma.
 
-Provides a function that sends medical queries to the MedGemma model
-for domain-specific analysis, with fallback to Qwen3 and a disclaimer.
+Sends medical queries to the MedGemma model for domain-specific analysis
+under a deadline, falling back to Qwen3 when it fails, and appends a
+research-only disclaimer to every answer.
 """
 
+import asyncio
+import contextvars
+import hashlib
+import json
 import logging
+import time
+from collections.abc import Iterable
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
 
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 
+from src.config.settings import Settings
+from src.models.circuit_breaker import CircuitBreaker
+from src.models.hedging import LatencyHedger
+from src.services.budgets import BudgetExhaustedError
+from src.services.cancellation import RunCancelledError, raise_if_cancelled
+from src.services.disk_cache import DiskCache, TieredCache
+from src.services.instrumentation import model_label, timed_ainvoke, timed_invoke
+from src.services.metrics import MEDICAL_CACHE_LOOKUPS, TOOL_CALL_DURATION, TOOL_CALL_ERRORS
+from src.tools.search import normalize_query
+
 logger = logging.getLogger(__name__)
 
 # ---- Constants ----
 
 MEDICAL_QUERY_TIMEOUT_SECONDS = 120
+SOURCE_PRIMARY = "primary"
+SOURCE_HEDGE = "hedge"
+# The hedge answered after the medical model had already failed.
+SOURCE_HEDGE_AFTER_FAILURE = "hedge_after_failure"
+CANCEL_POLL_SECONDS = 0.5
+MEDICAL_TOOL_LABEL = "consult_medical_expert"
+MEDICAL_CACHE_NAMESPACE = "medical_expert"
+MEDICAL_FALLBACK_CACHE_NAMESPACE = "medical_expert_fallback"
+ANSWER_PRIMARY = "primary"
+ANSWER_FALLBACK = "fallback"
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
 
 MEDICAL_SYSTEM_PROMPT = (
     "You are a medical research assistant with expertise in clinical medicine, "
@@ -32,65 +63,647 @@ FALLBACK_WARNING = (
     "Note: Medical specialist model unavailable. Analysis provided by general-purpose model.\n\n"
 )
 
+MEDICAL_FAILED_PREFIX = "Medical analysis failed"
+
 TIMEOUT_ERROR_MSG = (
     "Medical analysis timed out. The query may be too complex. "
     "Try breaking it into smaller, more specific questions."
 )
 
 
+class HedgeFailedError(Exception):
+    """Raised when neither the medical model nor its hedged fallback answered."""
+
+    def __init__(self, message: str, timed_out: bool) -> None:
+        super().__init__(message)
+        self.timed_out = timed_out
+
+
+def build_medical_cache_key(model: str, system_prompt: str, query: str) -> str:
+    """Build a cache key from the model name, system prompt hash and normalized query."""
+    key_parts = {
+        "model": model,
+        "system_prompt": hashlib.sha256(system_prompt.encode("utf-8")).hexdigest(),
+        "query": normalize_query(query),
+    }
+    encoded = json.dumps(key_parts, sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class MedicalResponseCache:
+    """Formatted medical answers, keyed by model, system prompt and question.
+
+    Answers from the fallback model are kept in a separate tier so a
+    degraded answer is never served where a MedGemma answer is expected.
+    """
+
+    def __init__(self, answers: TieredCache, fallback_answers: TieredCache) -> None:
+        self.answers = answers
+        self.fallback_answers = fallback_answers
+
+    def _tier(self, fallback: bool) -> TieredCache:
+        return self.fallback_answers if fallback else self.answers
+
+    def get(self, llm: BaseChatModel, query: str, fallback: bool = False) -> str | None:
+        """Return the cached answer of llm to query, or None on a miss."""
+        key = build_medical_cache_key(model_label(llm), MEDICAL_SYSTEM_PROMPT, query)
+        cached = self._tier(fallback).get(key)
+        MEDICAL_CACHE_LOOKUPS.inc(
+            answer=ANSWER_FALLBACK if fallback else ANSWER_PRIMARY,
+            result=CACHE_HIT if cached is not None else CACHE_MISS,
+        )
+        return None if cached is None else str(cached)
+
+    def set(self, llm: BaseChatModel, query: str, answer: str, fallback: bool = False) -> None:
+        """Store llm's formatted answer to query."""
+        key = build_medical_cache_key(model_label(llm), MEDICAL_SYSTEM_PROMPT, query)
+        self._tier(fallback).set(key, answer)
+
+    def close(self) -> None:
+        """Close both tiers."""
+        self.answers.close()
+        self.fallback_answers.close()
+
+
+def create_medical_cache(settings: Settings) -> MedicalResponseCache | None:
+    """Create the medical answer cache, or None when disabled."""
+    if not settings.medical_cache_enabled:
+        return None
+
+    def tier(namespace: str) -> TieredCache:
+        disk = DiskCache(
+            path=settings.medical_cache_path,
+            ttl_seconds=settings.medical_cache_ttl_seconds,
+            max_entries=settings.medical_cache_max_entries,
+            namespace=namespace,
+        )
+        return TieredCache(disk, memory_max_entries=settings.medical_cache_memory_entries)
+
+    return MedicalResponseCache(
+        answers=tier(MEDICAL_CACHE_NAMESPACE),
+        fallback_answers=tier(MEDICAL_FALLBACK_CACHE_NAMESPACE),
+    )
+
+
 def consult_medical_expert(
     query: str,
     medical_llm: BaseChatModel,
     fallback_llm: BaseChatModel,
+    breaker: CircuitBreaker | None = None,
+    timeout_seconds: float = MEDICAL_QUERY_TIMEOUT_SECONDS,
+    hedger: LatencyHedger | None = None,
+    cache: MedicalResponseCache | None = None,
 ) -> str:
     """Consult the medical expert model for domain-specific analysis.
 
     Sends the query to MedGemma with a medical system prompt.
-    Falls back to the orchestrator LLM if MedGemma is unavailable.
-    Always appends a medical disclaimer.
+    Falls back to the orchestrator LLM if MedGemma is unavailable or
+    misses its timeout_seconds deadline, or immediately when the breaker
+    reports the circuit is open. With a hedger, a backup request to the
+    fallback model starts once MedGemma exceeds its usual latency, and
+    whichever answers first wins. Always appends a medical disclaimer.
+    With a cache, a cached MedGemma answer is returned without any model
+    call, and fallback answers are reused only when falling back. The
+    consultation's duration and MedGemma failures are recorded as tool
+    metrics, and every model call as LLM metrics.
+    Raises RunCancelledError if the research run is cancelled meanwhile,
+    and BudgetExhaustedError if its budget refuses the model call.
+    """
+    with TOOL_CALL_DURATION.time(tool=MEDICAL_TOOL_LABEL):
+        return _consult(query, medical_llm, fallback_llm, breaker, timeout_seconds, hedger, cache)
+
+
+def _consult(
+    query: str,
+    medical_llm: BaseChatModel,
+    fallback_llm: BaseChatModel,
+    breaker: CircuitBreaker | None,
+    timeout_seconds: float,
+    hedger: LatencyHedger | None,
+    cache: MedicalResponseCache | None,
+) -> str:
+    """Run one consultation for consult_medical_expert."""
+    if cache is not None:
+        cached = cache.get(medical_llm, query)
+        if cached is not None:
+            logger.debug("Medical cache hit for query '%s'", query)
+            return cached
+
+    messages: list[BaseMessage] = [
+        SystemMessage(content=MEDICAL_SYSTEM_PROMPT),
+        HumanMessage(content=query),
+    ]
+
+    if breaker is not None and not breaker.allow_request():
+        logger.info("Medical model circuit is open, routing query '%s' to fallback", query)
+        return _handle_fallback(query, fallback_llm, messages, timeout_seconds, cache)
+
+    try:
+        if hedger is None:
+            source = SOURCE_PRIMARY
+            response = _invoke_with_deadline(medical_llm, messages, timeout_seconds)
+        else:
+            source, response = _invoke_hedged(
+                medical_llm, fallback_llm, messages, timeout_seconds, hedger
+            )
+    except (RunCancelledError, BudgetExhaustedError, asyncio.CancelledError):
+        _release_probe(breaker)
+        raise
+    except HedgeFailedError as exc:
+        _record_failure(breaker)
+        return _hedge_failed_answer(query, exc)
+    except TimeoutError:
+        _record_failure(breaker)
+        return _handle_timeout(query, fallback_llm, messages, timeout_seconds, cache)
+    except Exception:
+        _record_failure(breaker)
+        return _handle_fallback(query, fallback_llm, messages, timeout_seconds, cache)
+
+    answer = _accept_answer(query, source, response, breaker)
+    if cache is not None:
+        _cache_answer(cache, query, source, answer, medical_llm, fallback_llm)
+    return answer
+
+
+async def aconsult_medical_expert(
+    query: str,
+    medical_llm: BaseChatModel,
+    fallback_llm: BaseChatModel,
+    breaker: CircuitBreaker | None = None,
+    timeout_seconds: float = MEDICAL_QUERY_TIMEOUT_SECONDS,
+    hedger: LatencyHedger | None = None,
+    cache: MedicalResponseCache | None = None,
+) -> str:
+    """Async variant of consult_medical_expert.
+
+    Model calls are awaited with ainvoke under the same deadline, breaker,
+    hedging and fallback rules, so a waiting consultation holds no thread.
+    Cache lookups and writes run on a worker thread.
     """
+    with TOOL_CALL_DURATION.time(tool=MEDICAL_TOOL_LABEL):
+        return await _aconsult(
+            query, medical_llm, fallback_llm, breaker, timeout_seconds, hedger, cache
+        )
+
+
+async def _aconsult(
+    query: str,
+    medical_llm: BaseChatModel,
+    fallback_llm: BaseChatModel,
+    breaker: CircuitBreaker | None,
+    timeout_seconds: float,
+    hedger: LatencyHedger | None,
+    cache: MedicalResponseCache | None,
+) -> str:
+    """Run one consultation for aconsult_medical_expert."""
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, medical_llm, query)
+        if cached is not None:
+            logger.debug("Medical cache hit for query '%s'", query)
+            return cached
+
     messages: list[BaseMessage] = [
         SystemMessage(content=MEDICAL_SYSTEM_PROMPT),
         HumanMessage(content=query),
     ]
 
+    if breaker is not None and not breaker.allow_request():
+        logger.info("Medical model circuit is open, routing query '%s' to fallback", query)
+        return await _ahandle_fallback(query, fallback_llm, messages, timeout_seconds, cache)
+
     try:
-        response = medical_llm.invoke(messages)
-        return _format_response(str(response.content))
+        if hedger is None:
+            source = SOURCE_PRIMARY
+            response = await _ainvoke_with_deadline(medical_llm, messages, timeout_seconds)
+        else:
+            source, response = await _ainvoke_hedged(
+                medical_llm, fallback_llm, messages, timeout_seconds, hedger
+            )
+    except (RunCancelledError, BudgetExhaustedError, asyncio.CancelledError):
+        _release_probe(breaker)
+        raise
+    except HedgeFailedError as exc:
+        _record_failure(breaker)
+        return _hedge_failed_answer(query, exc)
     except TimeoutError:
-        return _handle_timeout(query, fallback_llm, messages)
+        _record_failure(breaker)
+        return await _ahandle_timeout(query, fallback_llm, messages, timeout_seconds, cache)
     except Exception:
-        return _handle_fallback(query, fallback_llm, messages)
+        _record_failure(breaker)
+        return await _ahandle_fallback(query, fallback_llm, messages, timeout_seconds, cache)
+
+    answer = _accept_answer(query, source, response, breaker)
+    if cache is not None:
+        await asyncio.to_thread(
+            _cache_answer, cache, query, source, answer, medical_llm, fallback_llm
+        )
+    return answer
+
+
+def _accept_answer(query: str, source: str, response: Any, breaker: CircuitBreaker | None) -> str:
+    """Format the winning response; a MedGemma answer closes the breaker.
+
+    A hedge that won a race says nothing about MedGemma, so a half-open
+    probe it raced is released without a verdict and the next call probes
+    again. A hedge that answered after MedGemma failed records the failure.
+    """
+    if source == SOURCE_HEDGE_AFTER_FAILURE:
+        logger.warning("Medical model failed for query '%s', hedged fallback answered", query)
+        _record_failure(breaker)
+        return _format_fallback_response(str(response.content))
+    if source == SOURCE_HEDGE:
+        logger.info("Hedged fallback answered first for query '%s'", query)
+        if breaker is not None:
+            breaker.record_abandoned()
+        return _format_fallback_response(str(response.content))
+
+    if breaker is not None:
+        breaker.record_success()
+    return _format_response(str(response.content))
+
+
+def _cache_answer(
+    cache: MedicalResponseCache,
+    query: str,
+    source: str,
+    answer: str,
+    medical_llm: BaseChatModel,
+    fallback_llm: BaseChatModel,
+) -> None:
+    """Store an answer in the tier of the model that wrote it."""
+    if source != SOURCE_PRIMARY:
+        cache.set(fallback_llm, query, answer, fallback=True)
+    else:
+        cache.set(medical_llm, query, answer)
+
+
+def _submit_in_context(
+    executor: ThreadPoolExecutor, llm: BaseChatModel, messages: list[BaseMessage]
+) -> Future[Any]:
+    """Submit a timed model call that runs in a copy of the caller's context.
+
+    The copy carries the run's callbacks, so the call counts against the
+    run's budget and metrics and is refused once the run is cancelled,
+    as it is on the async path.
+    """
+    return executor.submit(contextvars.copy_context().run, timed_invoke, llm, messages)
+
+
+def _invoke_with_deadline(
+    llm: BaseChatModel,
+    messages: list[BaseMessage],
+    timeout_seconds: float,
+) -> Any:
+    """Invoke the model, raising TimeoutError if it has not answered in time.
+
+    The call runs on a worker thread so the caller is released at the
+    deadline, or on cancellation; the abandoned request is left to the
+    client's own timeout.
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="medical-llm")
+    try:
+        future = _submit_in_context(executor, llm, messages)
+        done = _wait_cancellable([future], timeout_seconds, ALL_COMPLETED)
+        if not done:
+            raise TimeoutError(f"Model did not answer within {timeout_seconds}s")
+        return future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _invoke_hedged(
+    medical_llm: BaseChatModel,
+    fallback_llm: BaseChatModel,
+    messages: list[BaseMessage],
+    timeout_seconds: float,
+    hedger: LatencyHedger,
+) -> tuple[str, Any]:
+    """Invoke the medical model, hedging to the fallback past the hedge delay.
+
+    Returns (source, response) for the first successful answer, where
+    source is SOURCE_PRIMARY, SOURCE_HEDGE, or SOURCE_HEDGE_AFTER_FAILURE
+    when the hedge answered after the medical model raised. The losing
+    request is cancelled. Before the hedge starts, errors and timeouts are
+    raised as they are; once it has started, HedgeFailedError is raised if
+    neither answers, so the caller does not try the fallback a second time.
+    """
+    started = time.monotonic()
+    deadline = started + timeout_seconds
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="medical-hedge")
+
+    def _record_latency(future: Future[Any]) -> None:
+        if not future.cancelled() and future.exception() is None:
+            hedger.record(time.monotonic() - started)
+
+    try:
+        primary = _submit_in_context(executor, medical_llm, messages)
+        primary.add_done_callback(_record_latency)
+
+        delay = hedger.hedge_delay()
+        if delay is None or delay >= timeout_seconds:
+            if not _wait_cancellable([primary], timeout_seconds, ALL_COMPLETED):
+                raise TimeoutError(f"Model did not answer within {timeout_seconds}s")
+            return SOURCE_PRIMARY, primary.result()
+
+        if _wait_cancellable([primary], delay, ALL_COMPLETED):
+            return SOURCE_PRIMARY, primary.result()
+
+        logger.info("Medical model slower than %.1fs, starting hedged fallback request", delay)
+        pending = {
+            primary: SOURCE_PRIMARY,
+            _submit_in_context(executor, fallback_llm, messages): SOURCE_HEDGE,
+        }
+        last_error: BaseException | None = None
+        while pending:
+            done = _wait_cancellable(
+                list(pending), max(0.0, deadline - time.monotonic()), FIRST_COMPLETED
+            )
+            if not done:
+                raise HedgeFailedError(
+                    f"No model answered within {timeout_seconds}s", timed_out=True
+                )
+            for future in done:
+                source = pending.pop(future)
+                error = future.exception()
+                if error is None:
+                    return _hedge_source(source, last_error), future.result()
+                last_error = error
+
+        assert last_error is not None
+        raise HedgeFailedError(str(last_error), timed_out=False) from last_error
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _hedge_source(source: str, primary_error: BaseException | None) -> str:
+    """Return the source of a hedged answer, noting a hedge that won after the primary failed.
+
+    Only one request can have failed before the other answered, so an
+    error seen before a hedge answer is always the medical model's.
+    """
+    if source == SOURCE_HEDGE and primary_error is not None:
+        return SOURCE_HEDGE_AFTER_FAILURE
+    return source
+
+
+def _wait_cancellable(
+    futures: Iterable[Future[Any]],
+    timeout_seconds: float,
+    return_when: str,
+) -> set[Future[Any]]:
+    """Wait like concurrent.futures.wait, checking for run cancellation while waiting.
+
+    Returns the completed futures, or an empty set on timeout. Raises
+    RunCancelledError as soon as the research run is cancelled.
+    """
+    pending = list(futures)
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        raise_if_cancelled()
+        remaining = deadline - time.monotonic()
+        done, _ = wait(
+            pending, timeout=max(0.0, min(remaining, CANCEL_POLL_SECONDS)), return_when=return_when
+        )
+        if done and (return_when == FIRST_COMPLETED or len(done) == len(pending)):
+            return done
+        if remaining <= CANCEL_POLL_SECONDS:
+            return set()
+
+
+async def _ainvoke_with_deadline(
+    llm: BaseChatModel,
+    messages: list[BaseMessage],
+    timeout_seconds: float,
+) -> Any:
+    """Async variant of _invoke_with_deadline; the request is cancelled when abandoned."""
+    task = asyncio.ensure_future(timed_ainvoke(llm, messages))
+    try:
+        if not await _await_cancellable([task], timeout_seconds, ALL_COMPLETED):
+            raise TimeoutError(f"Model did not answer within {timeout_seconds}s")
+        return task.result()
+    finally:
+        task.cancel()
+
+
+async def _ainvoke_hedged(
+    medical_llm: BaseChatModel,
+    fallback_llm: BaseChatModel,
+    messages: list[BaseMessage],
+    timeout_seconds: float,
+    hedger: LatencyHedger,
+) -> tuple[str, Any]:
+    """Async variant of _invoke_hedged, with the same result and errors."""
+    started = time.monotonic()
+    deadline = started + timeout_seconds
+
+    def _record_latency(task: asyncio.Future[Any]) -> None:
+        if not task.cancelled() and task.exception() is None:
+            hedger.record(time.monotonic() - started)
+
+    primary = asyncio.ensure_future(timed_ainvoke(medical_llm, messages))
+    primary.add_done_callback(_record_latency)
+    tasks: list[asyncio.Future[Any]] = [primary]
+    try:
+        delay = hedger.hedge_delay()
+        if delay is None or delay >= timeout_seconds:
+            if not await _await_cancellable([primary], timeout_seconds, ALL_COMPLETED):
+                raise TimeoutError(f"Model did not answer within {timeout_seconds}s")
+            return SOURCE_PRIMARY, primary.result()
+
+        if await _await_cancellable([primary], delay, ALL_COMPLETED):
+            return SOURCE_PRIMARY, primary.result()
+
+        logger.info("Medical model slower than %.1fs, starting hedged fallback request", delay)
+        hedge = asyncio.ensure_future(timed_ainvoke(fallback_llm, messages))
+        tasks.append(hedge)
+        pending: dict[asyncio.Future[Any], str] = {primary: SOURCE_PRIMARY, hedge: SOURCE_HEDGE}
+        last_error: BaseException | None = None
+        while pending:
+            done = await _await_cancellable(
+                list(pending), max(0.0, deadline - time.monotonic()), FIRST_COMPLETED
+            )
+            if not done:
+                raise HedgeFailedError(
+                    f"No model answered within {timeout_seconds}s", timed_out=True
+                )
+            for task in done:
+                source = pending.pop(task)
+                error = task.exception()
+                if error is None:
+                    return _hedge_source(source, last_error), task.result()
+                last_error = error
+
+        assert last_error is not None
+        raise HedgeFailedError(str(last_error), timed_out=False) from last_error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _await_cancellable(
+    tasks: Iterable[asyncio.Future[Any]],
+    timeout_seconds: float,
+    return_when: str,
+) -> set[asyncio.Future[Any]]:
+    """Async variant of _wait_cancellable."""
+    pending = list(tasks)
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        raise_if_cancelled()
+        remaining = deadline - time.monotonic()
+        done, _ = await asyncio.wait(
+            pending, timeout=max(0.0, min(remaining, CANCEL_POLL_SECONDS)), return_when=return_when
+        )
+        if done and (return_when == FIRST_COMPLETED or len(done) == len(pending)):
+            return done
+        if remaining <= CANCEL_POLL_SECONDS:
+            return set()
+
+
+def _hedge_failed_answer(query: str, exc: HedgeFailedError) -> str:
+    """Answer a hedged consultation neither model answered.
+
+    The fallback already ran as the hedge under the same deadline, so it
+    is not called again.
+    """
+    if exc.timed_out:
+        logger.error("Both models timed out for query '%s': %s", query, exc)
+        return TIMEOUT_ERROR_MSG
+    logger.error("Medical model and hedged fallback failed for query '%s': %s", query, exc)
+    return f"{MEDICAL_FAILED_PREFIX}: {exc}\n\n{MEDICAL_DISCLAIMER}"
+
+
+def _release_probe(breaker: CircuitBreaker | None) -> None:
+    """Free a half-open probe slot held by a call abandoned because its run stopped."""
+    if breaker is not None:
+        breaker.record_abandoned()
+
+
+def _record_failure(breaker: CircuitBreaker | None) -> None:
+    """Count a medical model failure, and record it on the breaker if one is configured."""
+    TOOL_CALL_ERRORS.inc(tool=MEDICAL_TOOL_LABEL)
+    if breaker is not None:
+        breaker.record_failure()
+
+
+def _fallback_answer(
+    query: str,
+    fallback_llm: BaseChatModel,
+    messages: list[BaseMessage],
+    timeout_seconds: float,
+    cache: MedicalResponseCache | None,
+) -> str:
+    """Answer with the fallback model, reusing and storing fallback-tier cache entries."""
+    if cache is not None:
+        cached = cache.get(fallback_llm, query, fallback=True)
+        if cached is not None:
+            logger.debug("Medical fallback cache hit for query '%s'", query)
+            return cached
+
+    response = _invoke_with_deadline(fallback_llm, messages, timeout_seconds)
+    answer = _format_fallback_response(str(response.content))
+    if cache is not None:
+        cache.set(fallback_llm, query, answer, fallback=True)
+    return answer
 
 
 def _handle_fallback(
     query: str,
     fallback_llm: BaseChatModel,
     messages: list[BaseMessage],
+    timeout_seconds: float = MEDICAL_QUERY_TIMEOUT_SECONDS,
+    cache: MedicalResponseCache | None = None,
 ) -> str:
     """Handle MedGemma failure by falling back to Qwen3."""
     logger.warning("Medical model unavailable for query '%s', using fallback", query)
     try:
-        response = fallback_llm.invoke(messages)
-        return FALLBACK_WARNING + str(response.content) + "\n\n" + MEDICAL_DISCLAIMER
+        return _fallback_answer(query, fallback_llm, messages, timeout_seconds, cache)
+    except (RunCancelledError, BudgetExhaustedError):
+        raise
     except TimeoutError as exc:
         logger.error("Fallback model timed out for query '%s': %s", query, exc)
         return TIMEOUT_ERROR_MSG
     except Exception as exc:
         logger.error("Fallback model failed for query '%s': %s", query, exc)
-        return f"Medical analysis failed: {exc}\n\n{MEDICAL_DISCLAIMER}"
+        return f"{MEDICAL_FAILED_PREFIX}: {exc}\n\n{MEDICAL_DISCLAIMER}"
 
 
 def _handle_timeout(
     query: str,
     fallback_llm: BaseChatModel,
     messages: list[BaseMessage],
+    timeout_seconds: float = MEDICAL_QUERY_TIMEOUT_SECONDS,
+    cache: MedicalResponseCache | None = None,
 ) -> str:
     """Handle timeout from medical model, try fallback."""
     logger.warning("Medical model timed out for query '%s', trying fallback", query)
     try:
-        response = fallback_llm.invoke(messages)
-        return FALLBACK_WARNING + str(response.content) + "\n\n" + MEDICAL_DISCLAIMER
+        return _fallback_answer(query, fallback_llm, messages, timeout_seconds, cache)
+    except (RunCancelledError, BudgetExhaustedError):
+        raise
+    except TimeoutError as exc:
+        logger.error("Both models timed out for query '%s': %s", query, exc)
+        return TIMEOUT_ERROR_MSG
+    except Exception as exc:
+        logger.error("Fallback model failed for query '%s': %s", query, exc)
+        return TIMEOUT_ERROR_MSG
+
+
+async def _afallback_answer(
+    query: str,
+    fallback_llm: BaseChatModel,
+    messages: list[BaseMessage],
+    timeout_seconds: float,
+    cache: MedicalResponseCache | None,
+) -> str:
+    """Async variant of _fallback_answer."""
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, fallback_llm, query, True)
+        if cached is not None:
+            logger.debug("Medical fallback cache hit for query '%s'", query)
+            return cached
+
+    response = await _ainvoke_with_deadline(fallback_llm, messages, timeout_seconds)
+    answer = _format_fallback_response(str(response.content))
+    if cache is not None:
+        await asyncio.to_thread(cache.set, fallback_llm, query, answer, True)
+    return answer
+
+
+async def _ahandle_fallback(
+    query: str,
+    fallback_llm: BaseChatModel,
+    messages: list[BaseMessage],
+    timeout_seconds: float,
+    cache: MedicalResponseCache | None,
+) -> str:
+    """Async variant of _handle_fallback."""
+    logger.warning("Medical model unavailable for query '%s', using fallback", query)
+    try:
+        return await _afallback_answer(query, fallback_llm, messages, timeout_seconds, cache)
+    except (RunCancelledError, BudgetExhaustedError):
+        raise
+    except TimeoutError as exc:
+        logger.error("Fallback model timed out for query '%s': %s", query, exc)
+        return TIMEOUT_ERROR_MSG
+    except Exception as exc:
+        logger.error("Fallback model failed for query '%s': %s", query, exc)
+        return f"{MEDICAL_FAILED_PREFIX}: {exc}\n\n{MEDICAL_DISCLAIMER}"
+
+
+async def _ahandle_timeout(
+    query: str,
+    fallback_llm: BaseChatModel,
+    messages: list[BaseMessage],
+    timeout_seconds: float,
+    cache: MedicalResponseCache | None,
+) -> str:
+    """Async variant of _handle_timeout."""
+    logger.warning("Medical model timed out for query '%s', trying fallback", query)
+    try:
+        return await _afallback_answer(query, fallback_llm, messages, timeout_seconds, cache)
+    except (RunCancelledError, BudgetExhaustedError):
+        raise
     except TimeoutError as exc:
         logger.error("Both models timed out for query '%s': %s", query, exc)
         return TIMEOUT_ERROR_MSG
@@ -99,6 +712,20 @@ def _handle_timeout(
         return TIMEOUT_ERROR_MSG
 
 
+def is_primary_answer(output: str) -> bool:
+    """Return True if a consultation output is a MedGemma answer, not a fallback or error."""
+    return not (
+        output == TIMEOUT_ERROR_MSG
+        or output.startswith(MEDICAL_FAILED_PREFIX)
+        or output.startswith(FALLBACK_WARNING)
+    )
+
+
 def _format_response(content: str) -> str:
     """Format a successful medical response with disclaimer."""
     return content + "\n\n" + MEDICAL_DISCLAIMER
+
+
+def _format_fallback_response(content: str) -> str:
+    """Format a fallback-model response with the warning note and disclaimer."""
+    return FALLBACK_WARNING + content + "\n\n" + MEDICAL_DISCLAIMER
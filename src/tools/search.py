@@ -1,15 +1,24 @@
 """Tavily web search tool with medical domain filtering.
 
-Provides a factory for creating a TavilySearch tool configured for
-medical research, plus helpers for formatting results and error handling.
+Provides a factory for the search tool (Tavily, or the offline index
+from local_search.py) and cached, error-safe helpers that format its
+results for the agent, each with an async variant.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+from langchain_core.tools import BaseTool
 from langchain_tavily import TavilySearch
 
-from src.config.settings import Settings
+from src.config.settings import SEARCH_BACKEND_LOCAL, Settings
+from src.services.disk_cache import DiskCache
+from src.services.metrics import SEARCH_CACHE_LOOKUPS, TOOL_CALL_DURATION, TOOL_CALL_ERRORS
+from src.tools.local_search import LocalSearch
 
 logger = logging.getLogger(__name__)
 
@@ -28,14 +37,45 @@ DEFAULT_MEDICAL_DOMAINS = [
     "jamanetwork.com",
 ]
 NO_RESULTS_MESSAGE = "Search returned no results for the query."
+SEARCH_FAILED_PREFIX = "Search failed"
+SEARCH_CACHE_NAMESPACE = "tavily_search"
+DEFAULT_BATCH_MAX_WORKERS = 4
+SEARCH_TOOL_LABEL = "tavily_search"
+BATCH_SEARCH_TOOL_LABEL = "tavily_batch_search"
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
 
 
-def create_search_tool(settings: Settings) -> TavilySearch:
-    """Create a TavilySearch tool configured for medical research.
+class SearchOutput(str):
+    """Formatted search tool output, flagged when any of its searches failed.
 
-    Uses custom domain list from settings if provided,
-    otherwise falls back to DEFAULT_MEDICAL_DOMAINS.
+    A raised exception and an error payload returned by the search tool
+    both count as failures.
     """
+
+    failed: bool
+
+    def __new__(cls, text: str, failed: bool = False) -> "SearchOutput":
+        output = super().__new__(cls, text)
+        output.failed = failed
+        return output
+
+
+def create_search_tool(settings: Settings) -> BaseTool:
+    """Create the search tool configured for medical research.
+
+    Returns a TavilySearch tool, using the custom domain list from
+    settings if provided and otherwise DEFAULT_MEDICAL_DOMAINS. When
+    search_backend is "local", returns the offline BM25 index tool,
+    which produces results in the same shape.
+    """
+    if settings.search_backend == SEARCH_BACKEND_LOCAL:
+        logger.info("Using local search index at %s", settings.local_search_index_path)
+        return LocalSearch(
+            index_path=settings.local_search_index_path,
+            max_results=DEFAULT_MAX_RESULTS,
+        )
+
     domains = settings.tavily_include_domains or DEFAULT_MEDICAL_DOMAINS
 
     return TavilySearch(
@@ -46,8 +86,110 @@ def create_search_tool(settings: Settings) -> TavilySearch:
     )
 
 
+def create_search_cache(settings: Settings) -> DiskCache | None:
+    """Create the on-disk search result cache, or None when disabled.
+
+    The local backend is never cached: its queries are cheaper than
+    a cache round-trip.
+    """
+    if not settings.search_cache_enabled or settings.search_backend == SEARCH_BACKEND_LOCAL:
+        return None
+
+    return DiskCache(
+        path=settings.search_cache_path,
+        ttl_seconds=settings.search_cache_ttl_seconds,
+        max_entries=settings.search_cache_max_entries,
+        namespace=SEARCH_CACHE_NAMESPACE,
+    )
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query for cache lookups (case and whitespace)."""
+    return " ".join(query.casefold().split())
+
+
+def build_search_cache_key(
+    query: str,
+    include_domains: list[str] | None,
+    search_depth: str | None,
+    max_results: int | None,
+) -> str:
+    """Build a cache key from the normalized query and effective search options."""
+    key_parts = {
+        "query": normalize_query(query),
+        "include_domains": sorted(include_domains or []),
+        "search_depth": search_depth,
+        "max_results": max_results,
+    }
+    encoded = json.dumps(key_parts, sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _search_cache_key_for_tool(tool: BaseTool, query: str) -> str:
+    """Build the cache key for a query using the tool's configured options."""
+    return build_search_cache_key(
+        query=query,
+        include_domains=getattr(tool, "include_domains", None),
+        search_depth=getattr(tool, "search_depth", None),
+        max_results=getattr(tool, "max_results", None),
+    )
+
+
+def fetch_search_results(
+    tool: BaseTool,
+    query: str,
+    cache: DiskCache | None = None,
+) -> dict[str, Any]:
+    """Return raw search results, serving from the cache when possible.
+
+    Successful responses are written to the cache. Errors, including
+    the error payloads TavilySearch returns instead of raising, are
+    never cached.
+    """
+    if cache is None:
+        return dict(tool.invoke({"query": query}))
+
+    key = _search_cache_key_for_tool(tool, query)
+    cached = cache.get(key)
+    SEARCH_CACHE_LOOKUPS.inc(result=CACHE_HIT if cached is not None else CACHE_MISS)
+    if cached is not None:
+        logger.debug("Search cache hit for query '%s'", query)
+        return dict(cached)
+
+    raw_results = dict(tool.invoke({"query": query}))
+    if "error" not in raw_results:
+        cache.set(key, raw_results)
+    return raw_results
+
+
+async def afetch_search_results(
+    tool: BaseTool,
+    query: str,
+    cache: DiskCache | None = None,
+) -> dict[str, Any]:
+    """Async variant of fetch_search_results.
+
+    The search is awaited with tool.ainvoke; cache reads and writes run
+    on a worker thread so SQLite never blocks the event loop.
+    """
+    if cache is None:
+        return dict(await tool.ainvoke({"query": query}))
+
+    key = _search_cache_key_for_tool(tool, query)
+    cached = await asyncio.to_thread(cache.get, key)
+    SEARCH_CACHE_LOOKUPS.inc(result=CACHE_HIT if cached is not None else CACHE_MISS)
+    if cached is not None:
+        logger.debug("Search cache hit for query '%s'", query)
+        return dict(cached)
+
+    raw_results = dict(await tool.ainvoke({"query": query}))
+    if "error" not in raw_results:
+        await asyncio.to_thread(cache.set, key, raw_results)
+    return raw_results
+
+
 def format_search_results(raw_results: dict[str, Any]) -> str:
-    """Format raw Tavily search results into an LLM-consumable string.
+    """Format raw search results into an LLM-consumable string.
 
     Each result is formatted with title, URL, and content snippet.
     Returns a 'no results' message if results are empty.
@@ -67,15 +209,186 @@ def format_search_results(raw_results: dict[str, Any]) -> str:
     return "\n\n".join(formatted_parts)
 
 
-def safe_search(tool: TavilySearch, query: str) -> str:
-    """Invoke the search tool with error handling.
+def safe_search(tool: BaseTool, query: str, cache: DiskCache | None = None) -> SearchOutput:
+    """Invoke the search tool with caching and error handling.
 
-    Returns formatted results on success, or an error message
-    string on failure (never raises).
+    Returns formatted results on success, or a failed output with an
+    error message when the search raises or returns an error payload
+    (never raises). When a cache is given, hits are served without
+    calling the search API. Durations, failures and cache lookups are
+    recorded as metrics.
     """
-    try:
-        raw_results = tool.invoke({"query": query})
-        return format_search_results(raw_results)
-    except Exception as exc:
-        logger.error("Tavily search failed for query '%s': %s", query, exc)
-        return f"Search failed: {exc}. Please try again or refine your query."
+    with TOOL_CALL_DURATION.time(tool=SEARCH_TOOL_LABEL):
+        try:
+            raw_results = fetch_search_results(tool, query, cache)
+        except Exception as exc:
+            return _search_failed(query, exc)
+        return _search_output(query, raw_results)
+
+
+async def asafe_search(tool: BaseTool, query: str, cache: DiskCache | None = None) -> SearchOutput:
+    """Async variant of safe_search (never raises)."""
+    with TOOL_CALL_DURATION.time(tool=SEARCH_TOOL_LABEL):
+        try:
+            raw_results = await afetch_search_results(tool, query, cache)
+        except Exception as exc:
+            return _search_failed(query, exc)
+        return _search_output(query, raw_results)
+
+
+def _payload_error(raw_results: dict[str, Any]) -> str | None:
+    """Return the error of an error payload, even an empty one, or None for results."""
+    if "error" not in raw_results:
+        return None
+    return str(raw_results["error"] or "unknown error")
+
+
+def _search_output(query: str, raw_results: dict[str, Any]) -> SearchOutput:
+    """Format a single search's results, reporting an error payload as a failure."""
+    error = _payload_error(raw_results)
+    if error is not None:
+        return _search_failed(query, error)
+    return SearchOutput(format_search_results(raw_results))
+
+
+def _search_failed(query: str, error: Exception | str) -> SearchOutput:
+    """Count and log a failed single search and return the message shown to the agent."""
+    TOOL_CALL_ERRORS.inc(tool=SEARCH_TOOL_LABEL)
+    logger.error("Tavily search failed for query '%s': %s", query, error)
+    return SearchOutput(
+        f"{SEARCH_FAILED_PREFIX}: {error}. Please try again or refine your query.", failed=True
+    )
+
+
+def is_failed_search(output: str) -> bool:
+    """Return True if a search tool output reports a failed search, in whole or in part.
+
+    Only a SearchOutput can vouch for its searches; any other output counts as failed.
+    """
+    return not isinstance(output, SearchOutput) or output.failed
+
+
+def _normalize_url(url: str) -> str:
+    """Normalize a result URL for duplicate detection."""
+    return url.strip().rstrip("/").lower()
+
+
+def merge_search_results(result_sets: list[dict[str, Any]]) -> dict[str, Any]:
+    """Merge several raw result sets, keeping the first occurrence of each URL.
+
+    Results are kept in query order, then in each query's ranking order.
+    Results without a URL are always kept.
+    """
+    seen_urls: set[str] = set()
+    merged: list[dict[str, Any]] = []
+
+    for raw_results in result_sets:
+        for result in raw_results.get("results", []):
+            url = _normalize_url(str(result.get("url", "")))
+            if url and url in seen_urls:
+                continue
+            if url:
+                seen_urls.add(url)
+            merged.append(result)
+
+    return {"results": merged}
+
+
+def safe_batch_search(
+    tool: BaseTool,
+    queries: list[str],
+    cache: DiskCache | None = None,
+    max_workers: int = DEFAULT_BATCH_MAX_WORKERS,
+) -> SearchOutput:
+    """Run several searches concurrently and format the merged, de-duplicated results.
+
+    Queries that normalize to the same text are searched once. Each query
+    runs on a bounded thread pool; a failing query, raised or returned as
+    an error payload, is reported in the output without affecting the
+    others, and marks the output failed (never raises).
+    """
+    with TOOL_CALL_DURATION.time(tool=BATCH_SEARCH_TOOL_LABEL):
+        return _batch_search(tool, queries, cache, max_workers)
+
+
+async def asafe_batch_search(
+    tool: BaseTool,
+    queries: list[str],
+    cache: DiskCache | None = None,
+    max_workers: int = DEFAULT_BATCH_MAX_WORKERS,
+) -> SearchOutput:
+    """Async variant of safe_batch_search.
+
+    The searches are awaited concurrently, at most max_workers at a time,
+    instead of each holding a pool thread (never raises).
+    """
+    with TOOL_CALL_DURATION.time(tool=BATCH_SEARCH_TOOL_LABEL):
+        unique_queries = _unique_queries(queries)
+        if not unique_queries:
+            return SearchOutput(NO_RESULTS_MESSAGE)
+
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+
+        async def bounded(query: str) -> dict[str, Any]:
+            async with semaphore:
+                return await afetch_search_results(tool, query, cache)
+
+        outcomes = await asyncio.gather(
+            *(bounded(query) for query in unique_queries), return_exceptions=True
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+                raise outcome
+        return _format_batch(unique_queries, outcomes)
+
+
+def _unique_queries(queries: list[str]) -> list[str]:
+    """Drop blank queries and queries that normalize to an earlier one."""
+    return list({normalize_query(q): q for q in queries if q.strip()}.values())
+
+
+def _batch_search(
+    tool: BaseTool,
+    queries: list[str],
+    cache: DiskCache | None,
+    max_workers: int,
+) -> SearchOutput:
+    """Run the searches of one safe_batch_search call."""
+    unique_queries = _unique_queries(queries)
+    if not unique_queries:
+        return SearchOutput(NO_RESULTS_MESSAGE)
+
+    workers = max(1, min(max_workers, len(unique_queries)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tavily-batch") as executor:
+        futures = [
+            executor.submit(fetch_search_results, tool, query, cache) for query in unique_queries
+        ]
+
+    outcomes: list[dict[str, Any] | BaseException] = []
+    for future in futures:
+        try:
+            outcomes.append(future.result())
+        except Exception as exc:
+            outcomes.append(exc)
+    return _format_batch(unique_queries, outcomes)
+
+
+def _format_batch(
+    queries: list[str], outcomes: list[dict[str, Any] | BaseException]
+) -> SearchOutput:
+    """Merge the result sets of a batch and list the queries that failed."""
+    result_sets: list[dict[str, Any]] = []
+    failures: list[str] = []
+    for query, outcome in zip(queries, outcomes, strict=True):
+        if isinstance(outcome, dict) and _payload_error(outcome) is None:
+            result_sets.append(outcome)
+            continue
+        error = _payload_error(outcome) if isinstance(outcome, dict) else outcome
+        TOOL_CALL_ERRORS.inc(tool=BATCH_SEARCH_TOOL_LABEL)
+        logger.error("Tavily search failed for query '%s': %s", query, error)
+        failures.append(f"{SEARCH_FAILED_PREFIX} for '{query}': {error}")
+
+    formatted = format_search_results(merge_search_results(result_sets))
+    if failures:
+        formatted += "\n\n" + "\n".join(failures)
+    return SearchOutput(formatted, failed=bool(failures))
@@ -6,6 +6,8 @@ See .claude/skills/testing/SKILL.md for fixture patterns.
 
 from __future__ import annotations
 
+import asyncio
+from typing import Any
 from unittest.mock import MagicMock
 
 import pytest
@@ -51,6 +53,10 @@ TEST_OUTPUT_DIR = "/tmp/test-reports"
 TEST_LOG_LEVEL = "INFO"
 TEST_ORCHESTRATOR_MODEL = "qwen3:latest"
 TEST_MEDICAL_MODEL = "MedAIBase/MedGemma1.0:4b"
+TEST_SEARCH_CACHE_PATH = "/tmp/test-cache/search_cache.sqlite3"
+TEST_RESEARCH_CHECKPOINT_PATH = "/tmp/test-cache/research_checkpoints.sqlite3"
+TEST_LOCAL_SEARCH_INDEX_PATH = "/tmp/test-cache/pubmed_index.sqlite3"
+TEST_MEDICAL_CACHE_PATH = "/tmp/test-cache/medical_cache.sqlite3"
 
 
 def make_mock_settings() -> MagicMock:
@@ -67,6 +73,49 @@ def make_mock_settings() -> MagicMock:
     settings.orchestrator_model = TEST_ORCHESTRATOR_MODEL
     settings.medical_model = TEST_MEDICAL_MODEL
     settings.tavily_include_domains = None
+    settings.ollama_keep_alive = "30m"
+    settings.model_warmup_enabled = True
+    settings.health_check_interval_seconds = 15.0
+    settings.ollama_hosts = []
+    settings.ollama_host_failure_threshold = 3
+    settings.ollama_host_ejection_seconds = 30.0
+    settings.tool_concurrency_limits = {"consult_medical_expert_tool": 2}
+    settings.research_max_workers = 2
+    settings.research_job_retention = 200
+    settings.research_cancel_on_disconnect = True
+    settings.research_disconnect_grace_seconds = 30.0
+    settings.research_save_partial_reports = False
+    settings.research_event_buffer_size = 2000
+    settings.research_coalesce_queries = True
+    settings.research_max_queued_jobs = 10
+    settings.research_async_runs = False
+    settings.research_cache_enabled = False
+    settings.research_cache_max_age_seconds = 86400.0
+    settings.research_max_iterations = 20
+    settings.research_max_seconds = 900.0
+    settings.research_max_tokens = None
+    settings.research_checkpoints_enabled = False
+    settings.research_checkpoint_path = TEST_RESEARCH_CHECKPOINT_PATH
+    settings.research_checkpoint_max_age_seconds = 604800.0
+    settings.research_checkpoint_lease_seconds = 60.0
+    settings.search_backend = "tavily"
+    settings.local_search_index_path = TEST_LOCAL_SEARCH_INDEX_PATH
+    settings.search_cache_enabled = False
+    settings.search_cache_path = TEST_SEARCH_CACHE_PATH
+    settings.search_cache_ttl_seconds = 3600
+    settings.search_cache_max_entries = 100
+    settings.search_batch_max_workers = 2
+    settings.medical_breaker_failure_threshold = 3
+    settings.medical_breaker_cooldown_seconds = 60.0
+    settings.medical_query_timeout_seconds = 120.0
+    settings.medical_hedging_enabled = False
+    settings.medical_hedge_percentile = 0.95
+    settings.medical_hedge_min_samples = 20
+    settings.medical_cache_enabled = False
+    settings.medical_cache_path = TEST_MEDICAL_CACHE_PATH
+    settings.medical_cache_ttl_seconds = 3600
+    settings.medical_cache_max_entries = 100
+    settings.medical_cache_memory_entries = 10
     return settings
 
 
@@ -74,3 +123,28 @@ def make_mock_settings() -> MagicMock:
 def settings_fixture() -> MagicMock:
     """Create a mock Settings object with default test values."""
     return make_mock_settings()
+
+
+# ---- Research job helpers ----
+
+
+def collect_job_events(job: Any, after_id: int = 0, count: int | None = None) -> list[Any]:
+    """Wait for a research job's events after after_id through its async API.
+
+    Returns once the job has finished and every event was read, or once
+    count events have arrived.
+    """
+
+    async def collect() -> list[Any]:
+        events: list[Any] = []
+        last_id = after_id
+        while count is None or len(events) < count:
+            batch, finished = await job.next_events(last_id, timeout=1.0)
+            if not batch and finished:
+                break
+            if batch:
+                last_id = batch[-1][0]
+                events.extend(event for _, event in batch)
+        return events if count is None else events[:count]
+
+    return asyncio.run(collect())
@@ -5,13 +5,40 @@ Tests cover:
 - AC-2: Health endpoint returns status with model info
 - AC-3: Health endpoint handles Ollama unavailability (degraded)
 - AC-4: Startup errors handled cleanly (missing TAVILY_API_KEY)
+- Models are warmed up at startup and /api/ready reports residency
+- /api/health serves a cached snapshot refreshed in the background
+- /api/metrics exposes counters and histograms in Prometheus format
 """
 
-from unittest.mock import patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
-from tests.conftest import make_mock_settings
+from tests.conftest import TEST_MEDICAL_MODEL, TEST_ORCHESTRATOR_MODEL, make_mock_settings
+
+
+def _health_monitor(ollama_up: bool, installed: tuple[str, ...] | None = None):
+    """Return a health monitor refreshed once against a fake Ollama."""
+    from src.services.health_monitor import OllamaHealthMonitor
+
+    names = installed if installed is not None else (TEST_ORCHESTRATOR_MODEL, TEST_MEDICAL_MODEL)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if not ollama_up:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={"models": [{"name": name} for name in names]})
+
+    monitor = OllamaHealthMonitor(
+        base_url="http://ollama:11434",
+        models={"orchestrator": TEST_ORCHESTRATOR_MODEL, "medical": TEST_MEDICAL_MODEL},
+        interval_seconds=15.0,
+        transport=httpx.MockTransport(handler),
+    )
+    asyncio.run(monitor.refresh())
+    return monitor
+
 
 # ---- AC-1: FastAPI app initializes with CORS and settings ----
 
@@ -75,7 +102,7 @@ class TestHealthEndpoint:
             patch("src.api.app.load_settings", return_value=make_mock_settings()),
             patch("src.api.app.configure_logging"),
             patch("src.api.app.create_research_agent"),
-            patch("src.api.app._check_ollama_connectivity", return_value=True),
+            patch("src.api.app.create_health_monitor", return_value=_health_monitor(True)),
         ):
             app = create_app()
             client = TestClient(app)
@@ -93,7 +120,7 @@ class TestHealthEndpoint:
             patch("src.api.app.load_settings", return_value=make_mock_settings()),
             patch("src.api.app.configure_logging"),
             patch("src.api.app.create_research_agent"),
-            patch("src.api.app._check_ollama_connectivity", return_value=True),
+            patch("src.api.app.create_health_monitor", return_value=_health_monitor(True)),
         ):
             app = create_app()
             client = TestClient(app)
@@ -111,7 +138,7 @@ class TestHealthEndpoint:
             patch("src.api.app.load_settings", return_value=make_mock_settings()),
             patch("src.api.app.configure_logging"),
             patch("src.api.app.create_research_agent"),
-            patch("src.api.app._check_ollama_connectivity", return_value=True),
+            patch("src.api.app.create_health_monitor", return_value=_health_monitor(True)),
         ):
             app = create_app()
             client = TestClient(app)
@@ -130,7 +157,7 @@ class TestHealthEndpoint:
             patch("src.api.app.load_settings", return_value=make_mock_settings()),
             patch("src.api.app.configure_logging"),
             patch("src.api.app.create_research_agent"),
-            patch("src.api.app._check_ollama_connectivity", return_value=True),
+            patch("src.api.app.create_health_monitor", return_value=_health_monitor(True)),
         ):
             app = create_app()
             client = TestClient(app)
@@ -155,7 +182,7 @@ class TestHealthDegradedMode:
             patch("src.api.app.load_settings", return_value=make_mock_settings()),
             patch("src.api.app.configure_logging"),
             patch("src.api.app.create_research_agent"),
-            patch("src.api.app._check_ollama_connectivity", return_value=False),
+            patch("src.api.app.create_health_monitor", return_value=_health_monitor(False)),
         ):
             app = create_app()
             client = TestClient(app)
@@ -173,7 +200,7 @@ class TestHealthDegradedMode:
             patch("src.api.app.load_settings", return_value=make_mock_settings()),
             patch("src.api.app.configure_logging"),
             patch("src.api.app.create_research_agent"),
-            patch("src.api.app._check_ollama_connectivity", return_value=False),
+            patch("src.api.app.create_health_monitor", return_value=_health_monitor(False)),
         ):
             app = create_app()
             client = TestClient(app)
@@ -191,7 +218,7 @@ class TestHealthDegradedMode:
             patch("src.api.app.load_settings", return_value=make_mock_settings()),
             patch("src.api.app.configure_logging"),
             patch("src.api.app.create_research_agent"),
-            patch("src.api.app._check_ollama_connectivity", return_value=False),
+            patch("src.api.app.create_health_monitor", return_value=_health_monitor(False)),
         ):
             app = create_app()
             client = TestClient(app)
@@ -201,6 +228,193 @@ class TestHealthDegradedMode:
         assert data["models"]["medical"] == "unavailable"
 
 
+@pytest.mark.unit
+class TestCachedHealth:
+    """/api/health reads the background snapshot instead of calling Ollama."""
+
+    def _get_health(self, monitor) -> dict[str, object]:
+        from fastapi.testclient import TestClient
+
+        from src.api.app import create_app
+
+        with (
+            patch("src.api.app.load_settings", return_value=make_mock_settings()),
+            patch("src.api.app.configure_logging"),
+            patch("src.api.app.create_research_agent"),
+            patch("src.api.app.create_health_monitor", return_value=monitor),
+        ):
+            app = create_app()
+            return TestClient(app).get("/api/health").json()
+
+    def test_missing_model_degrades_only_that_model(self) -> None:
+        """A model absent from /api/tags is reported unavailable."""
+        monitor = _health_monitor(True, installed=(TEST_ORCHESTRATOR_MODEL,))
+
+        data = self._get_health(monitor)
+
+        assert data["status"] == "degraded"
+        assert data["models"]["orchestrator"] == TEST_ORCHESTRATOR_MODEL
+        assert data["models"]["medical"] == "unavailable"
+
+    def test_reports_snapshot_age_in_microseconds(self) -> None:
+        """age_us is the time since the cached check ran."""
+        monitor = _health_monitor(True)
+        checked_at = monitor.snapshot().checked_at_ns
+
+        with patch(
+            "src.services.health_monitor._monotonic_ns", return_value=checked_at + 2_500_000
+        ):
+            data = self._get_health(monitor)
+
+        assert data["age_us"] == 2_500
+
+    def test_request_does_not_call_ollama(self) -> None:
+        """Serving health never triggers a refresh."""
+        monitor = _health_monitor(True)
+
+        with patch.object(monitor, "refresh", new=AsyncMock()) as mock_refresh:
+            self._get_health(monitor)
+
+        mock_refresh.assert_not_awaited()
+
+    def test_before_first_check_reports_degraded(self) -> None:
+        """A cold cache is degraded with no age."""
+        from src.services.health_monitor import OllamaHealthMonitor
+
+        monitor = OllamaHealthMonitor("http://ollama:11434", {"orchestrator": "q"}, 15.0)
+
+        data = self._get_health(monitor)
+
+        assert data["status"] == "degraded"
+        assert data["age_us"] is None
+
+
+@pytest.mark.unit
+class TestHealthCircuitBreakers:
+    """Circuit breaker state is visible in /api/health."""
+
+    def test_health_includes_medical_circuit_state(self) -> None:
+        """Health response reports the medical circuit breaker."""
+        from fastapi.testclient import TestClient
+
+        from src.api.app import create_app
+
+        with (
+            patch("src.api.app.load_settings", return_value=make_mock_settings()),
+            patch("src.api.app.configure_logging"),
+            patch("src.api.app.create_research_agent"),
+            patch("src.api.app.create_health_monitor", return_value=_health_monitor(True)),
+        ):
+            app = create_app()
+            client = TestClient(app)
+            data = client.get("/api/health").json()
+
+        assert data["circuit_breakers"]["medical"]["state"] == "closed"
+
+    def test_agent_shares_breaker_with_health(self) -> None:
+        """The breaker passed to the agent is the one reported by health."""
+        from fastapi.testclient import TestClient
+
+        from src.api.app import create_app
+
+        with (
+            patch("src.api.app.load_settings", return_value=make_mock_settings()),
+            patch("src.api.app.configure_logging"),
+            patch("src.api.app.create_research_agent") as mock_create_agent,
+            patch("src.api.app.create_health_monitor", return_value=_health_monitor(True)),
+        ):
+            app = create_app()
+            breaker = mock_create_agent.call_args.kwargs["medical_breaker"]
+            for _ in range(breaker.failure_threshold):
+                breaker.record_failure()
+            data = TestClient(app).get("/api/health").json()
+
+        assert data["circuit_breakers"]["medical"]["state"] == "open"
+
+
+def _mock_warmup(resident: bool = True) -> MagicMock:
+    warmup = MagicMock()
+    warmup.warm_up = AsyncMock()
+    warmup.readiness = AsyncMock(
+        return_value={
+            "orchestrator": {"model": "qwen3:latest", "warmup": "loaded", "resident": True},
+            "medical": {"model": "medgemma", "warmup": "loading", "resident": resident},
+        }
+    )
+    return warmup
+
+
+@pytest.mark.unit
+class TestModelWarmupAndReadiness:
+    """Models are preloaded at startup and readiness reports residency."""
+
+    def setup_method(self) -> None:
+        self.health_monitor = MagicMock()
+        self.health_monitor.run = AsyncMock()
+
+    def _create_app(self, warmup: MagicMock, warmup_enabled: bool = True):
+        from src.api.app import create_app
+
+        settings = make_mock_settings()
+        settings.model_warmup_enabled = warmup_enabled
+        with (
+            patch("src.api.app.load_settings", return_value=settings),
+            patch("src.api.app.configure_logging"),
+            patch("src.api.app.create_research_agent"),
+            patch("src.api.app.create_model_warmup", return_value=warmup),
+            patch("src.api.app.create_health_monitor", return_value=self.health_monitor),
+        ):
+            return create_app()
+
+    def test_ready_when_all_models_resident(self) -> None:
+        """GET /api/ready returns 200 with per-model state once all are loaded."""
+        from fastapi.testclient import TestClient
+
+        app = self._create_app(_mock_warmup(resident=True))
+
+        response = TestClient(app).get("/api/ready")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+        assert response.json()["models"]["medical"]["resident"] is True
+
+    def test_not_ready_returns_503(self) -> None:
+        """A model that is not resident makes readiness fail."""
+        from fastapi.testclient import TestClient
+
+        app = self._create_app(_mock_warmup(resident=False))
+
+        response = TestClient(app).get("/api/ready")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "not_ready"
+
+    def test_startup_warms_up_models(self) -> None:
+        """The lifespan starts the warm-up in the background."""
+        from fastapi.testclient import TestClient
+
+        warmup = _mock_warmup()
+        app = self._create_app(warmup)
+
+        with TestClient(app):
+            pass
+
+        warmup.warm_up.assert_awaited_once()
+        self.health_monitor.run.assert_awaited_once()
+
+    def test_warmup_can_be_disabled(self) -> None:
+        """MODEL_WARMUP_ENABLED=false skips the preload."""
+        from fastapi.testclient import TestClient
+
+        warmup = _mock_warmup()
+        app = self._create_app(warmup, warmup_enabled=False)
+
+        with TestClient(app):
+            pass
+
+        warmup.warm_up.assert_not_called()
+
+
 # ---- AC-4: Startup errors handled cleanly ----
 
 
@@ -240,6 +454,30 @@ class TestStartupErrorHandling:
 # ---- Constants ----
 
 
+@pytest.mark.unit
+class TestMetricsEndpoint:
+    """Metrics are exposed for Prometheus scraping."""
+
+    def test_metrics_returns_prometheus_text(self) -> None:
+        """GET /api/metrics renders the registry in the text exposition format."""
+        from fastapi.testclient import TestClient
+
+        from src.api.app import create_app
+
+        with (
+            patch("src.api.app.load_settings", return_value=make_mock_settings()),
+            patch("src.api.app.configure_logging"),
+            patch("src.api.app.create_research_agent"),
+            patch("src.api.app.create_health_monitor", return_value=_health_monitor(True)),
+        ):
+            response = TestClient(create_app()).get("/api/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE tool_call_duration_seconds histogram" in response.text
+        assert "# TYPE research_runs_cancelled_total counter" in response.text
+
+
 @pytest.mark.unit
 class TestAppConstants:
     """Verify application constants."""
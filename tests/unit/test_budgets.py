@@ -0,0 +1,182 @@
+"""Unit tests for per-run research budgets.
+
+Tests cover:
+- Request overrides can lower but not raise the configured limits
+- The recursion limit backs up the step budget
+- Step, time and token budgets are detected and the first one is kept
+- A resumed run's budget starts from the usage recorded before the restart
+- The callback handler counts reported tokens and refuses new calls once spent
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from tests.conftest import make_mock_settings
+
+
+@pytest.mark.unit
+class TestBudgetLimits:
+    """Limits resolve from settings and request overrides."""
+
+    def test_overrides_only_lower_limits(self) -> None:
+        """Each limit is the lower of the two; None on either side defers to the other."""
+        from src.services.budgets import BudgetLimits
+
+        defaults = BudgetLimits(max_iterations=20, max_seconds=900.0, max_tokens=None)
+        overrides = BudgetLimits(max_iterations=50, max_seconds=60.0, max_tokens=1000)
+
+        assert defaults.tightened(overrides) == BudgetLimits(
+            max_iterations=20, max_seconds=60.0, max_tokens=1000
+        )
+        assert defaults.tightened(BudgetLimits()) == defaults
+
+    def test_recursion_limit_follows_step_budget(self) -> None:
+        """The recursion limit allows a model and tools step per turn, plus overhead."""
+        from src.services.budgets import (
+            GRAPH_STEPS_OVERHEAD,
+            GRAPH_STEPS_PER_ITERATION,
+            BudgetLimits,
+        )
+
+        assert BudgetLimits(max_iterations=5).recursion_limit() == (
+            5 * GRAPH_STEPS_PER_ITERATION + GRAPH_STEPS_OVERHEAD
+        )
+        assert BudgetLimits().recursion_limit() is None
+
+    def test_create_budget_limits_reads_settings(self) -> None:
+        """Defaults come from the research_max_* settings."""
+        from src.services.budgets import BudgetLimits, create_budget_limits
+
+        settings = make_mock_settings()
+        settings.research_max_tokens = 5000
+
+        assert create_budget_limits(settings) == BudgetLimits(
+            max_iterations=settings.research_max_iterations,
+            max_seconds=settings.research_max_seconds,
+            max_tokens=5000,
+        )
+
+
+@pytest.mark.unit
+class TestRunBudget:
+    """A run's usage is checked against its limits."""
+
+    def test_step_budget(self) -> None:
+        """The step budget is spent after max_iterations orchestrator turns."""
+        from src.services.budgets import BUDGET_STEPS, BudgetLimits, RunBudget
+
+        budget = RunBudget(BudgetLimits(max_iterations=2))
+        budget.record_iteration()
+        assert budget.exhausted() is None
+        budget.record_iteration()
+
+        assert budget.exhausted() == BUDGET_STEPS
+        assert "2 orchestrator turns" in budget.describe()
+
+    def test_time_budget(self) -> None:
+        """The time budget is spent once max_seconds have elapsed."""
+        from src.services.budgets import BUDGET_TIME, BudgetLimits, RunBudget
+
+        with patch("src.services.budgets._monotonic", return_value=100.0):
+            budget = RunBudget(BudgetLimits(max_seconds=30.0))
+        with patch("src.services.budgets._monotonic", return_value=129.0):
+            assert budget.exhausted() is None
+        with patch("src.services.budgets._monotonic", return_value=130.0):
+            assert budget.exhausted() == BUDGET_TIME
+
+    def test_first_exhausted_budget_is_kept(self) -> None:
+        """Once a budget is reported spent, the reason does not change."""
+        from src.services.budgets import BUDGET_TOKENS, BudgetLimits, RunBudget
+
+        budget = RunBudget(BudgetLimits(max_iterations=1, max_tokens=10))
+        budget.record_tokens(10)
+        assert budget.exhausted() == BUDGET_TOKENS
+        budget.record_iteration()
+
+        assert budget.exhausted() == BUDGET_TOKENS
+
+    def test_unlimited_budget_never_exhausts(self) -> None:
+        """With no limits the run is never stopped."""
+        from src.services.budgets import BudgetLimits, RunBudget
+
+        budget = RunBudget(BudgetLimits())
+        budget.record_iteration()
+        budget.record_tokens(1_000_000)
+
+        assert budget.exhausted() is None
+
+    def test_resumed_budget_starts_from_used(self) -> None:
+        """Steps, tokens and time used before a restart count against the limits."""
+        from src.services.budgets import BUDGET_TIME, BudgetLimits, BudgetUsage, RunBudget
+
+        used = BudgetUsage(iterations=2, tokens=40, elapsed_seconds=25.0)
+        with patch("src.services.budgets._monotonic", return_value=100.0):
+            budget = RunBudget(BudgetLimits(max_seconds=30.0), used)
+            assert budget.usage() == used
+        with patch("src.services.budgets._monotonic", return_value=105.0):
+            assert budget.exhausted() == BUDGET_TIME
+
+
+@pytest.mark.unit
+class TestBudgetCallbackHandler:
+    """The callback handler meters tokens and stops new calls."""
+
+    def _result(self, total_tokens: int):
+        from langchain_core.messages import AIMessage
+        from langchain_core.outputs import ChatGeneration, LLMResult
+
+        message = AIMessage(
+            content="x",
+            usage_metadata={
+                "input_tokens": total_tokens - 1,
+                "output_tokens": 1,
+                "total_tokens": total_tokens,
+            },
+        )
+        return LLMResult(generations=[[ChatGeneration(message=message)]])
+
+    def test_counts_usage_metadata_tokens(self) -> None:
+        """Tokens reported on the generated message are added to the budget."""
+        from src.services.budgets import BudgetCallbackHandler, BudgetLimits, RunBudget
+
+        budget = RunBudget(BudgetLimits())
+        handler = BudgetCallbackHandler(budget)
+        handler.on_llm_end(self._result(120))
+        handler.on_llm_end(self._result(30))
+
+        assert budget.tokens == 150
+
+    def test_counts_llm_output_token_usage(self) -> None:
+        """Models that report usage in llm_output are counted too."""
+        from langchain_core.outputs import Generation, LLMResult
+
+        from src.services.budgets import BudgetCallbackHandler, BudgetLimits, RunBudget
+
+        budget = RunBudget(BudgetLimits())
+        BudgetCallbackHandler(budget).on_llm_end(
+            LLMResult(
+                generations=[[Generation(text="x")]],
+                llm_output={"token_usage": {"total_tokens": 42}},
+            )
+        )
+
+        assert budget.tokens == 42
+
+    def test_refuses_new_calls_once_spent(self) -> None:
+        """Model and tool starts raise BudgetExhaustedError after the token budget is spent."""
+        from src.services.budgets import (
+            BudgetCallbackHandler,
+            BudgetExhaustedError,
+            BudgetLimits,
+            RunBudget,
+        )
+
+        handler = BudgetCallbackHandler(RunBudget(BudgetLimits(max_tokens=100)))
+        handler.on_chat_model_start({}, [])
+        handler.on_llm_end(self._result(100))
+
+        with pytest.raises(BudgetExhaustedError):
+            handler.on_chat_model_start({}, [])
+        with pytest.raises(BudgetExhaustedError):
+            handler.on_tool_start({}, "query")
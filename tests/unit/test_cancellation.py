@@ -0,0 +1,77 @@
+"""Unit tests for cooperative research run cancellation.
+
+Tests cover:
+- The cancel scope exposes the run's cancel event to code running in it
+- The callback handler refuses new model and tool calls after cancellation
+"""
+
+import threading
+
+import pytest
+
+
+@pytest.mark.unit
+class TestCancelScope:
+    """Cancellation state is visible inside the scope only."""
+
+    def test_outside_scope_is_never_cancelled(self) -> None:
+        """Without a scope, nothing is cancelled."""
+        from src.services.cancellation import is_cancelled, raise_if_cancelled
+
+        assert not is_cancelled()
+        raise_if_cancelled()
+
+    def test_scope_reflects_event(self) -> None:
+        """Setting the event cancels code inside the scope."""
+        from src.services.cancellation import (
+            RunCancelledError,
+            cancel_scope,
+            is_cancelled,
+            raise_if_cancelled,
+        )
+
+        event = threading.Event()
+        with cancel_scope(event):
+            assert not is_cancelled()
+            event.set()
+            assert is_cancelled()
+            with pytest.raises(RunCancelledError):
+                raise_if_cancelled()
+
+        assert not is_cancelled()
+
+
+@pytest.mark.unit
+class TestCancellationCallbackHandler:
+    """The handler aborts LangChain runs once cancelled."""
+
+    def test_allows_calls_until_cancelled(self) -> None:
+        """Start hooks pass while the event is clear and raise once set."""
+        from src.services.cancellation import CancellationCallbackHandler, RunCancelledError
+
+        event = threading.Event()
+        handler = CancellationCallbackHandler(event)
+        handler.on_chat_model_start({}, [[]])
+        handler.on_tool_start({}, "input")
+
+        event.set()
+
+        with pytest.raises(RunCancelledError):
+            handler.on_chat_model_start({}, [[]])
+        with pytest.raises(RunCancelledError):
+            handler.on_tool_start({}, "input")
+        with pytest.raises(RunCancelledError):
+            handler.on_llm_new_token("token")
+
+    def test_cancelled_model_call_raises(self) -> None:
+        """A chat model invoked with the handler refuses to run once cancelled."""
+        from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+        from src.services.cancellation import CancellationCallbackHandler, RunCancelledError
+
+        event = threading.Event()
+        event.set()
+        llm = FakeListChatModel(responses=["answer"])
+
+        with pytest.raises(RunCancelledError):
+            llm.invoke("hi", config={"callbacks": [CancellationCallbackHandler(event)]})
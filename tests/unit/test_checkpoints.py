@@ -0,0 +1,304 @@
+"""Unit tests for durable research checkpoints.
+
+Tests cover:
+- Run table records running and finished runs
+- Interrupted runs are claimed oldest first, once, with their limits and used budget
+- Runs are leased: live owners keep them by renewing, crashed owners lose them on expiry
+- Run tables written before those columns existed are migrated on open
+- Pruning deletes idle runs together with their LangGraph checkpoints
+- The store is only created when checkpointing is enabled
+- The saver also serves async graphs through its threaded async methods
+"""
+
+import asyncio
+from pathlib import Path
+from typing import TypedDict
+from unittest.mock import patch
+
+import pytest
+
+from tests.conftest import make_mock_settings
+
+
+class _CountState(TypedDict):
+    count: int
+
+
+def _checkpoint_thread(store, thread_id: str) -> None:
+    """Run a one-node graph on thread_id so it saves checkpoints."""
+    from langgraph.graph import END, START, StateGraph
+
+    from src.services.checkpoints import thread_config
+
+    graph = StateGraph(_CountState)
+    graph.add_node("step", lambda state: {"count": state["count"] + 1})
+    graph.add_edge(START, "step")
+    graph.add_edge("step", END)
+    compiled = graph.compile(checkpointer=store.saver)
+    compiled.invoke({"count": 0}, config={"configurable": thread_config(thread_id)})
+
+
+def _store(tmp_path: Path, max_age_seconds: float = 3600.0):
+    from src.services.checkpoints import ResearchCheckpointStore
+
+    return ResearchCheckpointStore(
+        str(tmp_path / "checkpoints" / "runs.sqlite3"), max_age_seconds=max_age_seconds
+    )
+
+
+def _claimed_after_restart(tmp_path: Path) -> list[str]:
+    """Thread ids a store opened after a restart claims as interrupted."""
+    store = _store(tmp_path)
+    claimed = [run.thread_id for run in store.claim_interrupted_runs()]
+    store.close()
+    return claimed
+
+
+@pytest.mark.unit
+class TestRunTable:
+    """The run table tells interrupted runs from finished ones."""
+
+    def test_running_runs_are_interrupted_after_reopen(self, tmp_path: Path) -> None:
+        """Runs never finished are claimed, oldest first, by a new store on the same file."""
+        from src.services.checkpoints import RunState
+
+        store = _store(tmp_path)
+        with patch("src.services.checkpoints._now", return_value=100.0):
+            store.start_run("b", "second")
+        with patch("src.services.checkpoints._now", return_value=50.0):
+            store.start_run("a", "first")
+        with patch("src.services.checkpoints._now", return_value=200.0):
+            store.start_run("c", "done")
+            store.finish_run("c", RunState.SUCCEEDED)
+        store.close()
+
+        reopened = _store(tmp_path)
+        runs = reopened.claim_interrupted_runs()
+        assert [(run.thread_id, run.query) for run in runs] == [("a", "first"), ("b", "second")]
+        reopened.close()
+
+    def test_restarting_a_run_marks_it_running_again(self, tmp_path: Path) -> None:
+        """start_run on a finished thread revives its row."""
+        from src.services.checkpoints import RunState
+
+        store = _store(tmp_path)
+        store.start_run("a", "q")
+        store.finish_run("a", RunState.FAILED)
+        store.start_run("a", "q")
+        store.close()
+
+        assert _claimed_after_restart(tmp_path) == ["a"]
+
+    def test_has_checkpoint_after_a_step(self, tmp_path: Path) -> None:
+        """A thread has a checkpoint once the graph completed a step on it."""
+        store = _store(tmp_path)
+
+        assert not store.has_checkpoint("a")
+        _checkpoint_thread(store, "a")
+        assert store.has_checkpoint("a")
+        store.close()
+
+
+@pytest.mark.unit
+class TestPrune:
+    """Old runs and their checkpoints are deleted."""
+
+    def test_prune_deletes_idle_runs_and_checkpoints(self, tmp_path: Path) -> None:
+        """Runs idle past max_age_seconds lose their row and checkpoints; fresh ones stay."""
+        store = _store(tmp_path, max_age_seconds=60.0)
+        with patch("src.services.checkpoints._now", return_value=1000.0):
+            store.start_run("old", "q")
+        _checkpoint_thread(store, "old")
+        with patch("src.services.checkpoints._now", return_value=1050.0):
+            store.start_run("fresh", "q")
+        _checkpoint_thread(store, "fresh")
+
+        with patch("src.services.checkpoints._now", return_value=1070.0):
+            deleted = store.prune()
+
+        assert deleted == 1
+        assert not store.has_checkpoint("old")
+        assert store.has_checkpoint("fresh")
+        store.close()
+        assert _claimed_after_restart(tmp_path) == ["fresh"]
+
+    def test_finish_run_prunes(self, tmp_path: Path) -> None:
+        """Finishing a run also removes expired runs."""
+        from src.services.checkpoints import RunState
+
+        store = _store(tmp_path, max_age_seconds=60.0)
+        with patch("src.services.checkpoints._now", return_value=1000.0):
+            store.start_run("old", "q")
+        with patch("src.services.checkpoints._now", return_value=2000.0):
+            store.start_run("new", "q")
+            store.finish_run("new", RunState.SUCCEEDED)
+        store.close()
+
+        assert _claimed_after_restart(tmp_path) == []
+
+    def test_claimed_run_keeps_limits_and_used_budget(self, tmp_path: Path) -> None:
+        """A claimed run carries the limits, disconnect flag and usage it recorded."""
+        from src.services.budgets import BudgetLimits, BudgetUsage
+
+        store = _store(tmp_path)
+        limits = BudgetLimits(max_iterations=4, max_seconds=30.0)
+        store.start_run("a", "q", limits, cancel_on_disconnect=True)
+        store.record_usage("a", BudgetUsage(iterations=2, tokens=150, elapsed_seconds=12.5))
+        store.start_run("b", "q")
+        store.close()
+
+        reopened = _store(tmp_path)
+        first, second = reopened.claim_interrupted_runs()
+        reopened.close()
+
+        assert first.limits == limits
+        assert first.cancel_on_disconnect
+        assert first.used == BudgetUsage(iterations=2, tokens=150, elapsed_seconds=12.5)
+        assert second.limits is None
+        assert not second.cancel_on_disconnect
+        assert second.used == BudgetUsage()
+
+    def test_each_run_is_claimed_once(self, tmp_path: Path) -> None:
+        """Of two processes starting on the same file, only the first claims a run."""
+        store = _store(tmp_path)
+        store.start_run("a", "q")
+        store.close()
+
+        first, second = _store(tmp_path), _store(tmp_path)
+        assert [run.thread_id for run in first.claim_interrupted_runs()] == ["a"]
+        assert second.claim_interrupted_runs() == []
+        first.close()
+        second.close()
+
+    def test_runs_of_live_processes_are_not_claimed(self, tmp_path: Path) -> None:
+        """A run another process started after this store opened is left to it."""
+        store = _store(tmp_path)
+        live = _store(tmp_path)
+        live.start_run("a", "q")
+
+        assert store.claim_interrupted_runs() == []
+        assert live.claim_interrupted_runs() == []
+        store.close()
+        live.close()
+
+    def test_long_running_run_is_kept_by_lease_renewals(self, tmp_path: Path) -> None:
+        """Two stores on one file: a renewed lease is never stolen, a lapsed one is claimed."""
+        owner, peer = _store(tmp_path), _store(tmp_path)
+        with patch("src.services.checkpoints._now", return_value=1000.0):
+            owner.start_run("a", "q")
+        for now in (1040.0, 1080.0, 1120.0):
+            with patch("src.services.checkpoints._now", return_value=now):
+                assert owner.renew_leases() == 1
+                assert peer.claim_interrupted_runs() == []
+
+        with patch("src.services.checkpoints._now", return_value=1120.0 + owner.lease_seconds):
+            assert peer.claim_interrupted_runs() == []
+        with patch("src.services.checkpoints._now", return_value=1121.0 + owner.lease_seconds):
+            assert [run.thread_id for run in peer.claim_interrupted_runs()] == ["a"]
+            assert owner.renew_leases() == 0
+            assert owner.claim_interrupted_runs() == []
+        owner.close()
+        peer.close()
+
+    def test_closed_store_releases_its_runs(self, tmp_path: Path) -> None:
+        """Runs of a store that was closed are claimable without waiting for the lease."""
+        from src.services.checkpoints import RunState
+
+        owner, peer = _store(tmp_path), _store(tmp_path)
+        owner.start_run("a", "q")
+        owner.start_run("b", "q")
+        owner.finish_run("b", RunState.SUCCEEDED)
+        assert peer.claim_interrupted_runs() == []
+
+        owner.close()
+
+        assert [run.thread_id for run in peer.claim_interrupted_runs()] == ["a"]
+        peer.close()
+
+    def test_migrates_run_table_without_new_columns(self, tmp_path: Path) -> None:
+        """A run table from before limits and usage were stored gains the columns."""
+        import sqlite3
+
+        from src.services.budgets import BudgetUsage
+
+        path = tmp_path / "checkpoints" / "runs.sqlite3"
+        path.parent.mkdir()
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE research_runs (thread_id TEXT PRIMARY KEY, query TEXT NOT NULL, "
+            "status TEXT NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        conn.execute("INSERT INTO research_runs VALUES ('a', 'q', 'running', 1.0, 1.0)")
+        conn.commit()
+        conn.close()
+
+        store = _store(tmp_path)
+        [run] = store.claim_interrupted_runs()
+        store.close()
+
+        assert (run.thread_id, run.limits, run.used) == ("a", None, BudgetUsage())
+
+
+@pytest.mark.unit
+class TestAsyncSaver:
+    """Graphs run with ainvoke checkpoint through the same saver."""
+
+    def test_async_graph_checkpoints_and_reads_back(self, tmp_path: Path) -> None:
+        """An async run saves checkpoints that the sync and async readers both see."""
+        from langgraph.graph import END, START, StateGraph
+
+        from src.services.checkpoints import thread_config
+
+        store = _store(tmp_path)
+        graph = StateGraph(_CountState)
+        graph.add_node("step", lambda state: {"count": state["count"] + 1})
+        graph.add_edge(START, "step")
+        graph.add_edge("step", END)
+        compiled = graph.compile(checkpointer=store.saver)
+        config = {"configurable": thread_config("a")}
+
+        async def run() -> tuple[dict, int]:
+            result = await compiled.ainvoke({"count": 0}, config=config)
+            history = [c async for c in store.saver.alist(config)]
+            return result, len(history)
+
+        result, checkpoints = asyncio.run(run())
+
+        assert result == {"count": 1}
+        assert checkpoints > 0
+        assert store.has_checkpoint("a")
+        assert compiled.get_state(config).values == {"count": 1}
+
+        asyncio.run(store.saver.adelete_thread("a"))
+        assert not store.has_checkpoint("a")
+        store.close()
+
+
+@pytest.mark.unit
+class TestCreateCheckpointStore:
+    """The store follows the research_checkpoints_enabled setting."""
+
+    def test_disabled_returns_none(self) -> None:
+        """No store is created when checkpointing is off."""
+        from src.services.checkpoints import create_checkpoint_store
+
+        settings = make_mock_settings()
+        settings.research_checkpoints_enabled = False
+
+        assert create_checkpoint_store(settings) is None
+
+    def test_enabled_uses_configured_path(self, tmp_path: Path) -> None:
+        """The store opens the configured file with the configured retention."""
+        from src.services.checkpoints import create_checkpoint_store
+
+        settings = make_mock_settings()
+        settings.research_checkpoints_enabled = True
+        settings.research_checkpoint_path = str(tmp_path / "runs.sqlite3")
+
+        store = create_checkpoint_store(settings)
+
+        assert store is not None
+        assert store.max_age_seconds == settings.research_checkpoint_max_age_seconds
+        assert store.lease_seconds == settings.research_checkpoint_lease_seconds
+        assert (tmp_path / "runs.sqlite3").exists()
+        store.close()
@@ -0,0 +1,144 @@
+"""Unit tests for the model circuit breaker.
+
+Tests cover:
+- Circuit opens after N consecutive failures
+- Open circuit rejects calls until the cooldown elapses
+- Half-open probes close or re-open the circuit
+- State transitions are logged and exposed via snapshot
+"""
+
+import logging
+from unittest.mock import patch
+
+import pytest
+
+
+def _make_breaker(threshold: int = 2, cooldown: float = 30.0):
+    from src.models.circuit_breaker import CircuitBreaker
+
+    return CircuitBreaker(name="medical", failure_threshold=threshold, cooldown_seconds=cooldown)
+
+
+@pytest.mark.unit
+class TestCircuitOpening:
+    """The circuit opens after consecutive failures."""
+
+    def test_starts_closed_and_allows_requests(self) -> None:
+        """A new breaker lets calls through."""
+        from src.models.circuit_breaker import CircuitState
+
+        breaker = _make_breaker()
+
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.allow_request()
+
+    def test_opens_after_threshold_failures(self) -> None:
+        """Reaching the threshold opens the circuit and rejects calls."""
+        from src.models.circuit_breaker import CircuitState
+
+        breaker = _make_breaker(threshold=2)
+
+        breaker.record_failure()
+        assert breaker.state == CircuitState.CLOSED
+        breaker.record_failure()
+
+        assert breaker.state == CircuitState.OPEN
+        assert not breaker.allow_request()
+
+    def test_success_resets_failure_count(self) -> None:
+        """Failures must be consecutive to open the circuit."""
+        from src.models.circuit_breaker import CircuitState
+
+        breaker = _make_breaker(threshold=2)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.unit
+class TestHalfOpenProbing:
+    """After the cooldown, probes test whether the dependency recovered."""
+
+    def _open_at(self, breaker, now: float) -> None:
+        with patch("src.models.circuit_breaker._monotonic", return_value=now):
+            breaker.record_failure()
+            breaker.record_failure()
+
+    def test_half_open_after_cooldown_allows_one_probe(self) -> None:
+        """Only one probe is allowed at a time while half-open."""
+        from src.models.circuit_breaker import CircuitState
+
+        breaker = _make_breaker(cooldown=30.0)
+        self._open_at(breaker, 100.0)
+
+        with patch("src.models.circuit_breaker._monotonic", return_value=131.0):
+            assert breaker.state == CircuitState.HALF_OPEN
+            assert breaker.allow_request()
+            assert not breaker.allow_request()
+
+    def test_probe_success_closes_circuit(self) -> None:
+        """A successful probe closes the circuit."""
+        from src.models.circuit_breaker import CircuitState
+
+        breaker = _make_breaker(cooldown=30.0)
+        self._open_at(breaker, 100.0)
+
+        with patch("src.models.circuit_breaker._monotonic", return_value=131.0):
+            breaker.allow_request()
+            breaker.record_success()
+
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_probe_failure_reopens_circuit(self) -> None:
+        """A failed probe re-opens the circuit for a new cooldown."""
+        from src.models.circuit_breaker import CircuitState
+
+        breaker = _make_breaker(cooldown=30.0)
+        self._open_at(breaker, 100.0)
+
+        with patch("src.models.circuit_breaker._monotonic", return_value=131.0):
+            breaker.allow_request()
+            breaker.record_failure()
+            assert breaker.state == CircuitState.OPEN
+        with patch("src.models.circuit_breaker._monotonic", return_value=150.0):
+            assert not breaker.allow_request()
+
+    def test_abandoned_probe_allows_another(self) -> None:
+        """A probe that ends without a verdict frees its slot."""
+        breaker = _make_breaker(cooldown=30.0)
+        self._open_at(breaker, 100.0)
+
+        with patch("src.models.circuit_breaker._monotonic", return_value=131.0):
+            assert breaker.allow_request()
+            breaker.record_abandoned()
+            assert breaker.allow_request()
+
+
+@pytest.mark.unit
+class TestCircuitObservability:
+    """State changes are logged and visible in snapshots."""
+
+    def test_transition_to_open_logged_at_warning(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Opening the circuit logs a warning."""
+        breaker = _make_breaker(threshold=1)
+
+        with caplog.at_level(logging.WARNING):
+            breaker.record_failure()
+
+        assert any("closed -> open" in r.getMessage() for r in caplog.records)
+
+    def test_snapshot_reports_state_and_retry(self) -> None:
+        """snapshot includes state, failures, and time until the next probe."""
+        breaker = _make_breaker(threshold=1, cooldown=30.0)
+
+        with patch("src.models.circuit_breaker._monotonic", return_value=100.0):
+            breaker.record_failure()
+        with patch("src.models.circuit_breaker._monotonic", return_value=110.0):
+            snapshot = breaker.snapshot()
+
+        assert snapshot["state"] == "open"
+        assert snapshot["consecutive_failures"] == 1
+        assert snapshot["retry_in_seconds"] == 20.0
@@ -0,0 +1,188 @@
+"""Unit tests for the disk-backed TTL/LRU cache.
+
+Tests cover:
+- Values round-trip through SQLite and survive reopening
+- Entries expire after the TTL
+- Least-recently-used entries are evicted over capacity
+- Hit and miss counters
+- The tiered cache serves from memory, promotes disk hits and honours the TTL
+"""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+
+def _make_cache(tmp_path: Path, ttl_seconds: float = 60, max_entries: int = 10):
+    from src.services.disk_cache import DiskCache
+
+    return DiskCache(
+        path=str(tmp_path / "cache" / "test.sqlite3"),
+        ttl_seconds=ttl_seconds,
+        max_entries=max_entries,
+        namespace="test",
+    )
+
+
+@pytest.mark.unit
+class TestDiskCacheStorage:
+    """Values are stored on disk and returned on lookup."""
+
+    def test_get_returns_stored_value(self, tmp_path: Path) -> None:
+        """A stored JSON value is returned unchanged."""
+        cache = _make_cache(tmp_path)
+
+        cache.set("k", {"results": [{"url": "https://example.com"}]})
+
+        assert cache.get("k") == {"results": [{"url": "https://example.com"}]}
+
+    def test_missing_key_returns_none(self, tmp_path: Path) -> None:
+        """Unknown keys are misses."""
+        cache = _make_cache(tmp_path)
+
+        assert cache.get("missing") is None
+
+    def test_values_persist_across_instances(self, tmp_path: Path) -> None:
+        """A new cache on the same file sees earlier entries."""
+        first = _make_cache(tmp_path)
+        first.set("k", "value")
+        first.close()
+
+        second = _make_cache(tmp_path)
+
+        assert second.get("k") == "value"
+
+    def test_namespaces_are_isolated(self, tmp_path: Path) -> None:
+        """Entries in one namespace are invisible to another."""
+        from src.services.disk_cache import DiskCache
+
+        path = str(tmp_path / "shared.sqlite3")
+        a = DiskCache(path=path, ttl_seconds=60, max_entries=10, namespace="a")
+        b = DiskCache(path=path, ttl_seconds=60, max_entries=10, namespace="b")
+
+        a.set("k", "from-a")
+
+        assert b.get("k") is None
+
+
+@pytest.mark.unit
+class TestDiskCacheExpiry:
+    """Entries older than the TTL are misses."""
+
+    def test_expired_entry_is_a_miss(self, tmp_path: Path) -> None:
+        """get returns None once the TTL has elapsed."""
+        cache = _make_cache(tmp_path, ttl_seconds=10)
+
+        with patch("src.services.disk_cache._now", return_value=1000.0):
+            cache.set("k", "value")
+        with patch("src.services.disk_cache._now", return_value=1011.0):
+            result = cache.get("k")
+
+        assert result is None
+        assert cache.stats()["entries"] == 0
+
+    def test_fresh_entry_is_a_hit(self, tmp_path: Path) -> None:
+        """get returns the value within the TTL."""
+        cache = _make_cache(tmp_path, ttl_seconds=10)
+
+        with patch("src.services.disk_cache._now", return_value=1000.0):
+            cache.set("k", "value")
+        with patch("src.services.disk_cache._now", return_value=1009.0):
+            result = cache.get("k")
+
+        assert result == "value"
+
+
+@pytest.mark.unit
+class TestDiskCacheEviction:
+    """The cache stays within max_entries using LRU eviction."""
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        """The entry accessed longest ago is evicted first."""
+        cache = _make_cache(tmp_path, ttl_seconds=float("inf"), max_entries=2)
+
+        with patch("src.services.disk_cache._now", return_value=1.0):
+            cache.set("a", 1)
+        with patch("src.services.disk_cache._now", return_value=2.0):
+            cache.set("b", 2)
+        with patch("src.services.disk_cache._now", return_value=3.0):
+            cache.get("a")
+        with patch("src.services.disk_cache._now", return_value=4.0):
+            cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+
+@pytest.mark.unit
+class TestDiskCacheStats:
+    """Hit and miss counters are tracked."""
+
+    def test_counts_hits_and_misses(self, tmp_path: Path) -> None:
+        """stats reports hits, misses, and entry count."""
+        cache = _make_cache(tmp_path)
+        cache.set("k", "v")
+
+        cache.get("k")
+        cache.get("k")
+        cache.get("other")
+
+        assert cache.stats() == {"hits": 2, "misses": 1, "entries": 1}
+
+
+def _make_tiered(tmp_path: Path, ttl_seconds: float = 60, memory_max_entries: int = 2):
+    from src.services.disk_cache import TieredCache
+
+    return TieredCache(_make_cache(tmp_path, ttl_seconds=ttl_seconds), memory_max_entries)
+
+
+@pytest.mark.unit
+class TestTieredCache:
+    """An in-memory LRU in front of the disk cache."""
+
+    def test_repeated_get_is_served_from_memory(self, tmp_path: Path) -> None:
+        """After a set, lookups do not touch the disk tier."""
+        cache = _make_tiered(tmp_path)
+        cache.set("k", "v")
+
+        assert cache.get("k") == "v"
+        assert cache.get("k") == "v"
+        stats = cache.stats()
+        assert stats["memory_hits"] == 2
+        assert stats["hits"] == 0
+
+    def test_disk_hit_is_promoted_to_memory(self, tmp_path: Path) -> None:
+        """A value only on disk, e.g. after a restart, is served from memory next time."""
+        _make_tiered(tmp_path).set("k", "v")
+        cache = _make_tiered(tmp_path)
+
+        assert cache.get("k") == "v"
+        assert cache.get("k") == "v"
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["memory_hits"] == 1
+
+    def test_memory_tier_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        """The memory tier keeps memory_max_entries values; evicted ones remain on disk."""
+        cache = _make_tiered(tmp_path, memory_max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.stats()["memory_entries"] == 2
+        assert cache.get("b") == 2
+        assert cache.stats()["hits"] == 1
+
+    def test_memory_entries_expire_with_disk_ttl(self, tmp_path: Path) -> None:
+        """A value past the TTL is a miss in both tiers."""
+        cache = _make_tiered(tmp_path, ttl_seconds=10)
+
+        with patch("src.services.disk_cache._now", return_value=1000.0):
+            cache.set("k", "v")
+        with patch("src.services.disk_cache._now", return_value=1011.0):
+            assert cache.get("k") is None
+
+        assert cache.stats()["memory_entries"] == 0
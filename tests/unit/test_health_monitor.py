@@ -0,0 +1,155 @@
+"""Unit tests for the background Ollama health monitor.
+
+Tests cover:
+- Per-model availability is read from /api/tags
+- Unreachable Ollama marks everything unavailable
+- Snapshot age is reported in microseconds
+- The polling loop keeps running after a failed refresh
+- Every pooled host is checked for the models placed on it
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+MODELS = {"orchestrator": "qwen3", "medical": "MedAIBase/MedGemma1.0:4b"}
+
+
+def _make_monitor(handler, interval: float = 15.0):
+    from src.services.health_monitor import OllamaHealthMonitor
+
+    return OllamaHealthMonitor(
+        base_url="http://ollama:11434",
+        models=MODELS,
+        interval_seconds=interval,
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def _tags(*names: str) -> httpx.Response:
+    return httpx.Response(200, json={"models": [{"name": name} for name in names]})
+
+
+@pytest.mark.unit
+class TestRefresh:
+    """refresh() checks /api/tags for each configured model."""
+
+    def test_all_models_installed(self) -> None:
+        """Untagged configured names match ':latest' tags."""
+        paths: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            paths.append(request.url.path)
+            return _tags("qwen3:latest", "MedAIBase/MedGemma1.0:4b")
+
+        snapshot = asyncio.run(_make_monitor(handler).refresh())
+
+        assert paths == ["/api/tags"]
+        assert snapshot.ollama_available
+        assert snapshot.models_available == {"orchestrator": True, "medical": True}
+
+    def test_missing_model_is_unavailable(self) -> None:
+        """Ollama up but a model not pulled is reported per model."""
+        snapshot = asyncio.run(_make_monitor(lambda _: _tags("qwen3:latest")).refresh())
+
+        assert snapshot.ollama_available
+        assert snapshot.models_available == {"orchestrator": True, "medical": False}
+
+    def test_unreachable_ollama(self) -> None:
+        """Connection errors mark Ollama and every model unavailable."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        monitor = _make_monitor(handler)
+        snapshot = asyncio.run(monitor.refresh())
+
+        assert not snapshot.ollama_available
+        assert not any(snapshot.models_available.values())
+        assert monitor.snapshot() is snapshot
+
+    def test_age_in_microseconds(self) -> None:
+        """age_us counts from the time the check completed."""
+        with patch("src.services.health_monitor._monotonic_ns", return_value=1_000_000):
+            snapshot = asyncio.run(_make_monitor(lambda _: _tags()).refresh())
+        with patch("src.services.health_monitor._monotonic_ns", return_value=3_500_000):
+            assert snapshot.age_us() == 2_500
+
+
+@pytest.mark.unit
+class TestPooledHosts:
+    """With a host pool, each host is checked for the models placed on it."""
+
+    def test_reports_each_host(self) -> None:
+        """A model is available while any host serving it has it installed."""
+        from src.services.health_monitor import OllamaHealthMonitor
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "gpu":
+                raise httpx.ConnectError("refused", request=request)
+            return _tags("qwen3:latest", "MedAIBase/MedGemma1.0:4b")
+
+        monitor = OllamaHealthMonitor(
+            base_url="http://ollama:11434",
+            models=MODELS,
+            interval_seconds=15.0,
+            transport=httpx.MockTransport(handler),
+            hosts={"http://gpu:11434": {"orchestrator": "qwen3"}, "http://cpu:11434": MODELS},
+        )
+        snapshot = asyncio.run(monitor.refresh())
+
+        assert snapshot.ollama_available
+        assert snapshot.models_available == {"orchestrator": True, "medical": True}
+        assert snapshot.hosts == {
+            "http://gpu:11434": {"available": False, "models": {"orchestrator": False}},
+            "http://cpu:11434": {
+                "available": True,
+                "models": {"orchestrator": True, "medical": True},
+            },
+        }
+
+    def test_all_hosts_down(self) -> None:
+        """Ollama is unavailable only when no host answers."""
+        from src.config.settings import OllamaHostSettings
+        from src.services.health_monitor import create_health_monitor
+        from tests.conftest import make_mock_settings
+
+        settings = make_mock_settings()
+        settings.ollama_hosts = [
+            OllamaHostSettings(url="http://a:11434"),
+            OllamaHostSettings(url="http://b:11434"),
+        ]
+        monitor = create_health_monitor(settings)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        monitor._transport = httpx.MockTransport(handler)
+        snapshot = asyncio.run(monitor.refresh())
+
+        assert list(monitor.hosts) == ["http://a:11434", "http://b:11434"]
+        assert not snapshot.ollama_available
+        assert not any(snapshot.models_available.values())
+        assert not any(host["available"] for host in snapshot.hosts.values())
+
+
+@pytest.mark.unit
+class TestRunLoop:
+    """run() refreshes on an interval until cancelled."""
+
+    def test_survives_refresh_errors(self) -> None:
+        """An unexpected error in one refresh does not stop polling."""
+        monitor = _make_monitor(lambda _: _tags(), interval=0)
+        monitor.refresh = AsyncMock(side_effect=[RuntimeError("boom"), MagicMock(), MagicMock()])
+
+        async def run_briefly() -> None:
+            task = asyncio.create_task(monitor.run())
+            while monitor.refresh.await_count < 3:
+                await asyncio.sleep(0)
+            task.cancel()
+
+        asyncio.run(run_briefly())
+
+        assert monitor.refresh.await_count >= 3
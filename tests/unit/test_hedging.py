@@ -0,0 +1,71 @@
+"""Unit tests for the hedged-request latency tracker.
+
+Tests cover:
+- No hedge delay until enough samples are recorded
+- Hedge delay follows the configured percentile
+- Old samples drop out of the sliding window
+- Factory returns None when hedging is disabled
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+
+@pytest.mark.unit
+class TestLatencyHedger:
+    """The hedge delay is a latency percentile over a sliding window."""
+
+    def test_no_delay_below_min_samples(self) -> None:
+        """Hedging waits for a baseline."""
+        from src.models.hedging import LatencyHedger
+
+        hedger = LatencyHedger(min_samples=3)
+        hedger.record(1.0)
+        hedger.record(2.0)
+
+        assert hedger.hedge_delay() is None
+
+    def test_delay_is_percentile(self) -> None:
+        """The p90 of 1..10 seconds is 9 seconds."""
+        from src.models.hedging import LatencyHedger
+
+        hedger = LatencyHedger(percentile=0.9, min_samples=1)
+        for latency in range(10, 0, -1):
+            hedger.record(float(latency))
+
+        assert hedger.hedge_delay() == 9.0
+
+    def test_window_drops_old_samples(self) -> None:
+        """Only the most recent window latencies count."""
+        from src.models.hedging import LatencyHedger
+
+        hedger = LatencyHedger(percentile=1.0, min_samples=1, window=2)
+        hedger.record(100.0)
+        hedger.record(1.0)
+        hedger.record(2.0)
+
+        assert hedger.hedge_delay() == 2.0
+
+
+@pytest.mark.unit
+class TestCreateMedicalHedger:
+    """The factory honours medical_hedging_enabled."""
+
+    def test_disabled_returns_none(self, settings_fixture: MagicMock) -> None:
+        """Hedging is off by default."""
+        from src.models.clients import create_medical_hedger
+
+        assert create_medical_hedger(settings_fixture) is None
+
+    def test_enabled_uses_settings(self, settings_fixture: MagicMock) -> None:
+        """Percentile and min samples come from settings."""
+        from src.models.clients import create_medical_hedger
+
+        settings_fixture.medical_hedging_enabled = True
+
+        hedger = create_medical_hedger(settings_fixture)
+
+        assert hedger is not None
+        assert hedger.percentile == 0.95
+        assert hedger.min_samples == 20
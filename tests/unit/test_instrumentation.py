@@ -0,0 +1,237 @@
+"""Unit tests for LLM call instrumentation.
+
+Tests cover:
+- Completed calls record latency, token counts and output tokens per second
+- timed_invoke counts failed calls and re-raises
+- timed_ainvoke measures awaited calls the same way
+- The callback handler times calls by run id and labels them by model
+- Calls made inside a run with the handler attached are counted once
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+
+def _message(input_tokens: int, output_tokens: int):
+    from langchain_core.messages import AIMessage
+
+    return AIMessage(
+        content="x",
+        usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        },
+    )
+
+
+def _usage_model(model: str):
+    """Return a real chat model that answers with fixed usage metadata, so callbacks fire."""
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.outputs import ChatGeneration, ChatResult
+
+    class UsageModel(BaseChatModel):
+        model: str
+
+        @property
+        def _llm_type(self) -> str:
+            return "usage"
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            return ChatResult(generations=[ChatGeneration(message=_message(10, 5))])
+
+    return UsageModel(model=model)
+
+
+def _in_run(handler, call):
+    """Await call inside a runnable whose config carries handler, as tools in a run do."""
+    from langchain_core.runnables import RunnableLambda
+
+    async def body(_input):
+        return await call()
+
+    return asyncio.run(RunnableLambda(body).ainvoke(None, {"callbacks": [handler]}))
+
+
+@pytest.mark.unit
+class TestRecordLLMCall:
+    """Metrics of one completed call."""
+
+    def test_records_tokens_and_generation_speed(self) -> None:
+        """Token counters, the per-call token histogram and tokens/s are updated."""
+        from src.services.instrumentation import record_llm_call
+        from src.services.metrics import (
+            LLM_CALL_DURATION,
+            LLM_CALL_TOKENS,
+            LLM_OUTPUT_TOKENS_PER_SECOND,
+            LLM_TOKENS,
+        )
+
+        model = f"m-{uuid4()}"
+        record_llm_call(model, 2.0, _message(30, 50))
+
+        assert LLM_CALL_DURATION.count(model=model) == 1
+        assert LLM_CALL_DURATION.sum(model=model) == 2.0
+        assert LLM_TOKENS.value(model=model, kind="input") == 30
+        assert LLM_TOKENS.value(model=model, kind="output") == 50
+        assert LLM_CALL_TOKENS.sum(model=model) == 80
+        assert LLM_OUTPUT_TOKENS_PER_SECOND.sum(model=model) == 25.0
+
+    def test_missing_usage_records_latency_only(self) -> None:
+        """Responses without usage metadata skip the token metrics."""
+        from src.services.instrumentation import record_llm_call
+        from src.services.metrics import LLM_CALL_DURATION, LLM_CALL_TOKENS
+
+        model = f"m-{uuid4()}"
+        record_llm_call(model, 1.0, "plain text")
+
+        assert LLM_CALL_DURATION.count(model=model) == 1
+        assert LLM_CALL_TOKENS.count(model=model) == 0
+
+
+@pytest.mark.unit
+class TestTimedInvoke:
+    """Direct LLM calls are measured."""
+
+    def test_returns_response_and_records_call(self) -> None:
+        """The response is returned and its duration recorded under the model name."""
+        from src.services.instrumentation import timed_invoke
+        from src.services.metrics import LLM_CALL_DURATION
+
+        model = f"m-{uuid4()}"
+        llm = MagicMock(model=model)
+        llm.invoke.return_value = _message(1, 1)
+
+        with patch("src.services.instrumentation._monotonic", side_effect=[5.0, 6.5]):
+            response = timed_invoke(llm, ["hi"])
+
+        assert response is llm.invoke.return_value
+        llm.invoke.assert_called_once_with(["hi"])
+        assert LLM_CALL_DURATION.sum(model=model) == 1.5
+
+    def test_failure_counts_error_and_reraises(self) -> None:
+        """A failed call increments the error counter."""
+        from src.services.instrumentation import timed_invoke
+        from src.services.metrics import LLM_CALL_DURATION, LLM_CALL_ERRORS
+
+        model = f"m-{uuid4()}"
+        llm = MagicMock(model=model)
+        llm.invoke.side_effect = ConnectionError("down")
+
+        with pytest.raises(ConnectionError):
+            timed_invoke(llm, ["hi"])
+
+        assert LLM_CALL_ERRORS.value(model=model) == 1
+        assert LLM_CALL_DURATION.count(model=model) == 0
+
+    def test_timed_ainvoke_records_awaited_call(self) -> None:
+        """The async variant awaits ainvoke and records the same metrics."""
+        from src.services.instrumentation import timed_ainvoke
+        from src.services.metrics import LLM_CALL_DURATION, LLM_TOKENS
+
+        model = f"m-{uuid4()}"
+        llm = MagicMock(model=model)
+        llm.ainvoke = AsyncMock(return_value=_message(2, 8))
+
+        with patch("src.services.instrumentation._monotonic", side_effect=[1.0, 3.0]):
+            response = asyncio.run(timed_ainvoke(llm, ["hi"]))
+
+        assert response is llm.ainvoke.return_value
+        assert LLM_CALL_DURATION.sum(model=model) == 2.0
+        assert LLM_TOKENS.value(model=model, kind="output") == 8
+
+    def test_timed_ainvoke_failure_counts_error(self) -> None:
+        """A failed awaited call increments the error counter and re-raises."""
+        from src.services.instrumentation import timed_ainvoke
+        from src.services.metrics import LLM_CALL_ERRORS
+
+        model = f"m-{uuid4()}"
+        llm = MagicMock(model=model)
+        llm.ainvoke = AsyncMock(side_effect=TimeoutError())
+
+        with pytest.raises(TimeoutError):
+            asyncio.run(timed_ainvoke(llm, ["hi"]))
+
+        assert LLM_CALL_ERRORS.value(model=model) == 1
+
+
+@pytest.mark.unit
+class TestLLMMetricsCallbackHandler:
+    """Calls inside the agent graph are measured from callbacks."""
+
+    def test_end_records_call_for_invocation_model(self) -> None:
+        """The model comes from invocation params and latency from start to end."""
+        from langchain_core.outputs import ChatGeneration, LLMResult
+
+        from src.services.instrumentation import LLMMetricsCallbackHandler
+        from src.services.metrics import LLM_CALL_DURATION, LLM_TOKENS
+
+        model = f"m-{uuid4()}"
+        handler = LLMMetricsCallbackHandler()
+        run_id = uuid4()
+
+        with patch("src.services.instrumentation._monotonic", side_effect=[10.0, 13.0]):
+            handler.on_chat_model_start({}, [], run_id=run_id, invocation_params={"model": model})
+            handler.on_llm_end(
+                LLMResult(generations=[[ChatGeneration(message=_message(4, 6))]]),
+                run_id=run_id,
+            )
+
+        assert LLM_CALL_DURATION.sum(model=model) == 3.0
+        assert LLM_TOKENS.value(model=model, kind="output") == 6
+
+    def test_error_counts_failed_call(self) -> None:
+        """A failed call is counted under its model."""
+        from src.services.instrumentation import LLMMetricsCallbackHandler
+        from src.services.metrics import LLM_CALL_ERRORS
+
+        model = f"m-{uuid4()}"
+        handler = LLMMetricsCallbackHandler()
+        run_id = uuid4()
+        handler.on_llm_start({}, [], run_id=run_id, metadata={"ls_model_name": model})
+        handler.on_llm_error(TimeoutError(), run_id=run_id)
+
+        assert LLM_CALL_ERRORS.value(model=model) == 1
+
+    def test_end_without_start_is_ignored(self) -> None:
+        """Unknown run ids do not record anything."""
+        from langchain_core.outputs import LLMResult
+
+        from src.services.instrumentation import UNKNOWN_MODEL, LLMMetricsCallbackHandler
+        from src.services.metrics import LLM_CALL_DURATION
+
+        before = LLM_CALL_DURATION.count(model=UNKNOWN_MODEL)
+        LLMMetricsCallbackHandler().on_llm_end(LLMResult(generations=[]), run_id=uuid4())
+
+        assert LLM_CALL_DURATION.count(model=UNKNOWN_MODEL) == before
+
+    def test_timed_ainvoke_inside_run_is_counted_once(self) -> None:
+        """With the run's handler attached, timed_ainvoke leaves the recording to it."""
+        from src.services.instrumentation import LLMMetricsCallbackHandler, timed_ainvoke
+        from src.services.metrics import LLM_CALL_DURATION, LLM_TOKENS
+
+        model = f"m-{uuid4()}"
+        llm = _usage_model(model)
+
+        _in_run(LLMMetricsCallbackHandler(), lambda: timed_ainvoke(llm, ["hi"]))
+
+        assert LLM_CALL_DURATION.count(model=model) == 1
+        assert LLM_TOKENS.value(model=model, kind="input") == 10
+        assert LLM_TOKENS.value(model=model, kind="output") == 5
+
+    def test_async_medical_consultation_is_counted_once(self) -> None:
+        """An awaited MedGemma call in a run records its tokens once, like the sync path."""
+        from src.services.instrumentation import LLMMetricsCallbackHandler
+        from src.services.metrics import LLM_TOKENS
+        from src.tools.medical import aconsult_medical_expert
+
+        model = f"m-{uuid4()}"
+        llm = _usage_model(model)
+
+        _in_run(LLMMetricsCallbackHandler(), lambda: aconsult_medical_expert("q", llm, llm))
+
+        assert LLM_TOKENS.value(model=model, kind="input") == 10
+        assert LLM_TOKENS.value(model=model, kind="output") == 5
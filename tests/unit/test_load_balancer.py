@@ -0,0 +1,333 @@
+"""Unit tests for the Ollama host load balancer.
+
+Tests cover:
+- Calls go to the host with the fewest in-flight requests relative to its weight
+- Models are only routed to hosts they are placed on
+- Failing hosts are ejected and re-admitted after a successful probe
+- Balanced chat models route real Ollama requests across hosts
+- The pool is built from settings and reported in /api/health
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from tests.conftest import TEST_MEDICAL_MODEL, TEST_ORCHESTRATOR_MODEL, make_mock_settings
+
+
+def _pool(*hosts, failure_threshold: int = 2, ejection_seconds: float = 30.0):
+    from src.models.load_balancer import OllamaHostPool
+
+    return OllamaHostPool(
+        list(hosts), failure_threshold=failure_threshold, ejection_seconds=ejection_seconds
+    )
+
+
+def _host(url: str, weight: float = 1.0, models: tuple[str, ...] | None = None):
+    from src.models.load_balancer import OllamaHost
+
+    return OllamaHost(url=url, weight=weight, models=frozenset(models) if models else None)
+
+
+@pytest.mark.unit
+class TestHostSelection:
+    """Least outstanding requests, weighted, within the model's placement."""
+
+    def test_picks_host_with_fewest_in_flight(self) -> None:
+        """A busy host is passed over until the others catch up."""
+        pool = _pool(_host("a"), _host("b"))
+
+        first = pool.acquire("m")
+        second = pool.acquire("m")
+        pool.release(first, "m", "success")
+        third = pool.acquire("m")
+
+        assert {first.url, second.url} == {"a", "b"}
+        assert third.url == first.url
+
+    def test_idle_hosts_take_turns(self) -> None:
+        """Sequential calls rotate across equally loaded hosts."""
+        pool = _pool(_host("a"), _host("b"), _host("c"))
+        urls = []
+        for _ in range(3):
+            with pool.lease("m") as host:
+                urls.append(host.url)
+
+        assert sorted(urls) == ["a", "b", "c"]
+
+    def test_weights_scale_concurrent_share(self) -> None:
+        """A host with weight 3 holds three times the in-flight requests of weight 1."""
+        pool = _pool(_host("big", weight=3.0), _host("small"))
+
+        hosts = [pool.acquire("m").url for _ in range(8)]
+
+        assert hosts.count("big") == 6
+        assert hosts.count("small") == 2
+
+    def test_models_only_go_to_hosts_they_are_placed_on(self) -> None:
+        """A host listing models never receives other models."""
+        pool = _pool(_host("gpu", models=("qwen3:latest",)), _host("cpu", models=("medgemma:4b",)))
+
+        assert {pool.acquire("qwen3").url for _ in range(4)} == {"gpu"}
+        assert {pool.acquire("medgemma:4b").url for _ in range(4)} == {"cpu"}
+
+    def test_unplaced_model_raises(self) -> None:
+        """A model no host serves cannot be routed."""
+        from src.models.load_balancer import NoOllamaHostError
+
+        pool = _pool(_host("gpu", models=("qwen3:latest",)))
+
+        with pytest.raises(NoOllamaHostError):
+            pool.acquire("medgemma:4b")
+
+
+@pytest.mark.unit
+class TestPassiveHealth:
+    """Call outcomes eject and re-admit hosts."""
+
+    def _fail(self, pool, times: int) -> None:
+        for _ in range(times):
+            with pytest.raises(ConnectionError), pool.lease("m"):
+                raise ConnectionError("refused")
+
+    def test_failing_host_is_ejected(self) -> None:
+        """After failure_threshold consecutive failures the host gets no traffic."""
+        pool = _pool(_host("a"), _host("b"), failure_threshold=1)
+
+        with patch("src.models.circuit_breaker._monotonic", return_value=100.0):
+            with pytest.raises(ConnectionError), pool.lease("m") as bad:
+                raise ConnectionError("refused")
+            other = "b" if bad.url == "a" else "a"
+            routed = {pool.acquire("m").url for _ in range(3)}
+            ejected = pool.snapshot()[bad.url]["ejected"]
+
+        assert routed == {other}
+        assert ejected
+
+    def test_ejected_host_is_readmitted_after_successful_probe(self) -> None:
+        """Once the ejection period passes, one probe call decides re-admission."""
+        pool = _pool(_host("a"), failure_threshold=2, ejection_seconds=30.0)
+
+        with patch("src.models.circuit_breaker._monotonic", return_value=100.0):
+            self._fail(pool, 2)
+        with patch("src.models.circuit_breaker._monotonic", return_value=131.0):
+            with pool.lease("m"):
+                pass
+            snapshot = pool.snapshot()["a"]
+
+        assert not snapshot["ejected"]
+        assert snapshot["consecutive_failures"] == 0
+
+    def test_all_hosts_ejected_still_routes(self) -> None:
+        """With every host ejected, calls are still sent rather than refused."""
+        pool = _pool(_host("a"), failure_threshold=1)
+
+        with patch("src.models.circuit_breaker._monotonic", return_value=100.0):
+            self._fail(pool, 1)
+            assert pool.acquire("m").url == "a"
+
+    def test_request_errors_do_not_count_against_host(self) -> None:
+        """A 4xx response or a bad request shows the host is up."""
+        from ollama import ResponseError
+
+        from src.models.load_balancer import is_host_failure
+
+        pool = _pool(_host("a"), failure_threshold=1)
+        with pytest.raises(ResponseError), pool.lease("m"):
+            raise ResponseError("model not found", 404)
+
+        assert not pool.snapshot()["a"]["ejected"]
+        assert is_host_failure(ResponseError("overloaded", 503))
+        assert is_host_failure(TimeoutError())
+        assert not is_host_failure(ValueError())
+
+    def test_abandoned_probe_frees_the_probe_slot(self) -> None:
+        """A cancelled probe lets the next call probe the host instead."""
+        pool = _pool(_host("a"), failure_threshold=1, ejection_seconds=30.0)
+
+        with patch("src.models.circuit_breaker._monotonic", return_value=100.0):
+            self._fail(pool, 1)
+        with patch("src.models.circuit_breaker._monotonic", return_value=131.0):
+            with pytest.raises(asyncio.CancelledError), pool.lease("m"):
+                raise asyncio.CancelledError
+            breaker = pool._breakers["a"]
+            assert breaker.allow_request()
+
+    def test_outcomes_are_counted_per_host(self) -> None:
+        """Every finished call is counted by host, model and result."""
+        from src.services.metrics import OLLAMA_HOST_REQUESTS
+
+        url = "http://metrics-host:11434"
+        pool = _pool(_host(url), failure_threshold=5)
+        with pool.lease("m"):
+            pass
+        self._fail(pool, 1)
+
+        assert OLLAMA_HOST_REQUESTS.value(host=url, model="m", result="success") == 1
+        assert OLLAMA_HOST_REQUESTS.value(host=url, model="m", result="failure") == 1
+
+
+def _fake_ollama(seen: list[str], down: frozenset[str] = frozenset()) -> httpx.MockTransport:
+    """Transport answering Ollama chat requests with the name of the host that served them."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.host)
+        if request.url.host in down:
+            raise httpx.ConnectError("refused", request=request)
+        chunk = {
+            "model": "qwen3:latest",
+            "message": {"role": "assistant", "content": f"from {request.url.host}"},
+            "done": True,
+            "done_reason": "stop",
+        }
+        return httpx.Response(200, content=json.dumps(chunk) + "\n")
+
+    return httpx.MockTransport(handler)
+
+
+def _balanced(pool, transport: httpx.MockTransport):
+    from src.models.load_balancer import BalancedChatOllama
+
+    return BalancedChatOllama(
+        pool,
+        model="qwen3:latest",
+        sync_client_kwargs={"transport": transport},
+        async_client_kwargs={"transport": transport},
+    )
+
+
+@pytest.mark.unit
+class TestBalancedChatOllama:
+    """Chat model calls are routed through the pool."""
+
+    def test_invoke_and_ainvoke_spread_across_hosts(self) -> None:
+        """Sync and async calls both go through the pool."""
+        seen: list[str] = []
+        llm = _balanced(_pool(_host("http://a:11434"), _host("http://b:11434")), _fake_ollama(seen))
+
+        answers = {llm.invoke("q").content, asyncio.run(llm.ainvoke("q")).content}
+
+        assert answers == {"from a", "from b"}
+        assert sorted(seen) == ["a", "b"]
+
+    def test_bound_tools_and_streaming_use_the_pool(self) -> None:
+        """Tool-bound and streamed calls are balanced too."""
+        seen: list[str] = []
+        llm = _balanced(_pool(_host("http://a:11434"), _host("http://b:11434")), _fake_ollama(seen))
+
+        llm.bind_tools([]).invoke("q")
+        "".join(str(chunk.content) for chunk in llm.stream("q"))
+
+        assert sorted(seen) == ["a", "b"]
+
+    def test_unreachable_host_is_ejected_and_avoided(self) -> None:
+        """Connection errors from a host eject it; later calls go to the healthy one."""
+        seen: list[str] = []
+        pool = _pool(_host("http://a:11434"), _host("http://b:11434"), failure_threshold=1)
+        llm = _balanced(pool, _fake_ollama(seen, down=frozenset({"a"})))
+
+        outcomes = []
+        for _ in range(4):
+            try:
+                outcomes.append(llm.invoke("q").content)
+            except httpx.ConnectError:
+                outcomes.append("error")
+
+        assert outcomes.count("error") <= 1
+        assert seen.count("a") == 1
+        assert pool.snapshot()["http://a:11434"]["ejected"]
+
+    def test_model_without_host_raises(self) -> None:
+        """Creating a balanced model for an unplaced model fails fast."""
+        from src.models.load_balancer import NoOllamaHostError
+
+        pool = _pool(_host("http://a:11434", models=("medgemma:4b",)))
+
+        with pytest.raises(NoOllamaHostError):
+            _balanced(pool, _fake_ollama([]))
+
+
+@pytest.mark.unit
+class TestCreateOllamaPool:
+    """The pool follows the ollama_hosts setting."""
+
+    def test_no_hosts_returns_none(self) -> None:
+        """Without ollama_hosts the models use ollama_base_url."""
+        from src.models.clients import create_orchestrator_llm
+        from src.models.load_balancer import create_ollama_pool
+
+        settings = make_mock_settings()
+
+        assert create_ollama_pool(settings) is None
+        assert type(create_orchestrator_llm(settings)).__name__ == "ChatOllama"
+
+    def test_hosts_from_settings_with_normalized_placement(self) -> None:
+        """Weights, placement and health limits come from settings."""
+        from src.config.settings import OllamaHostSettings
+        from src.models.clients import create_medical_llm_with_fallback, create_orchestrator_llm
+        from src.models.load_balancer import BalancedChatOllama, create_ollama_pool
+
+        settings = make_mock_settings()
+        settings.ollama_hosts = [
+            OllamaHostSettings(url="http://gpu:11434", weight=2, models=["qwen3"]),
+            OllamaHostSettings(url="http://cpu:11434"),
+        ]
+
+        pool = create_ollama_pool(settings)
+
+        assert pool is not None
+        assert [h.url for h in pool.hosts_for(TEST_ORCHESTRATOR_MODEL)] == [
+            "http://gpu:11434",
+            "http://cpu:11434",
+        ]
+        assert [h.url for h in pool.hosts_for(TEST_MEDICAL_MODEL)] == ["http://cpu:11434"]
+        orchestrator = create_orchestrator_llm(settings, pool)
+        assert isinstance(orchestrator, BalancedChatOllama)
+        assert isinstance(
+            create_medical_llm_with_fallback(settings, orchestrator, pool), BalancedChatOllama
+        )
+
+    def test_settings_parse_hosts_from_json_env(
+        self, env_minimal_settings: None, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """OLLAMA_HOSTS is a JSON list of hosts with optional weight and models."""
+        from src.config.settings import Settings
+
+        monkeypatch.setenv(
+            "OLLAMA_HOSTS",
+            '[{"url": "http://a:11434", "weight": 2}, {"url": "http://b:11434", "models": ["m"]}]',
+        )
+
+        hosts = Settings().ollama_hosts
+
+        assert [(h.url, h.weight, h.models) for h in hosts] == [
+            ("http://a:11434", 2.0, None),
+            ("http://b:11434", 1.0, ["m"]),
+        ]
+
+    def test_health_reports_pooled_hosts(self) -> None:
+        """/api/health lists each host's load, ejection and health check state."""
+        from fastapi.testclient import TestClient
+
+        from src.api.app import create_app
+        from src.config.settings import OllamaHostSettings
+
+        settings = make_mock_settings()
+        settings.ollama_hosts = [OllamaHostSettings(url="http://gpu:11434")]
+        with (
+            patch("src.api.app.load_settings", return_value=settings),
+            patch("src.api.app.configure_logging"),
+            patch("src.api.app.create_research_agent") as mock_create_agent,
+            patch("src.api.app.create_report_synthesizer"),
+        ):
+            app = create_app()
+            data = TestClient(app).get("/api/health").json()
+
+        assert data["ollama_hosts"]["http://gpu:11434"]["in_flight"] == 0
+        assert not data["ollama_hosts"]["http://gpu:11434"]["ejected"]
+        assert data["ollama_hosts"]["http://gpu:11434"]["available"] is False
+        assert data["ollama_hosts"]["http://gpu:11434"]["models_available"] == {}
+        assert mock_create_agent.call_args.kwargs["ollama_pool"] is not None
@@ -0,0 +1,220 @@
+"""Unit tests for the offline BM25 local search backend.
+
+Tests cover:
+- Index build from a JSONL abstract dump
+- A rebuild replaces the index only once it is complete
+- BM25-ranked queries return TavilySearch-shaped results
+- Documents matching every query term lead the candidate pool
+- The LangChain tool works with format_search_results and safe_search
+- Backend selection through Settings
+"""
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+CORPUS = [
+    {
+        "pmid": "101",
+        "title": "Statin-associated myopathy: a review",
+        "abstract": "Statin therapy can cause myopathy and muscle pain in some patients.",
+    },
+    {
+        "pmid": "102",
+        "title": "CRISPR gene editing in oncology",
+        "abstract": "Gene editing with CRISPR shows promise for cancer therapy.",
+    },
+    {
+        "pmid": "103",
+        "title": "Cardiovascular outcomes of statins",
+        "abstract": "Statins reduce cardiovascular events in patients at risk.",
+        "url": "https://example.org/statins",
+    },
+]
+
+
+@pytest.fixture()
+def index_path(tmp_path: Path) -> str:
+    """Build a small index from CORPUS and return its path."""
+    from src.tools.local_search import build_local_index
+
+    corpus = tmp_path / "corpus.jsonl"
+    lines = [json.dumps(record) for record in CORPUS]
+    corpus.write_text("\n".join([*lines, "not json", ""]))
+    path = str(tmp_path / "index" / "pubmed.sqlite3")
+    build_local_index(str(corpus), path)
+    return path
+
+
+@pytest.mark.unit
+class TestBuildLocalIndex:
+    """The index is built from a JSONL dump."""
+
+    def test_returns_document_count_and_skips_bad_lines(self, tmp_path: Path) -> None:
+        """Malformed and empty lines are skipped."""
+        from src.tools.local_search import build_local_index
+
+        corpus = tmp_path / "corpus.jsonl"
+        corpus.write_text(json.dumps(CORPUS[0]) + "\n{broken\n\n" + json.dumps({"pmid": "9"}))
+
+        count = build_local_index(str(corpus), str(tmp_path / "i.sqlite3"))
+
+        assert count == 1
+
+    def test_rebuild_replaces_existing_index(self, index_path: str, tmp_path: Path) -> None:
+        """Building onto an existing path starts from scratch."""
+        from src.tools.local_search import build_local_index, search_local_index
+
+        corpus = tmp_path / "small.jsonl"
+        corpus.write_text(json.dumps(CORPUS[1]))
+
+        build_local_index(str(corpus), index_path)
+
+        assert search_local_index(index_path, "statin", 5)["results"] == []
+
+    def test_failed_rebuild_keeps_existing_index(self, index_path: str, tmp_path: Path) -> None:
+        """A build that fails leaves the old index in place and no temporary file behind."""
+        from src.tools.local_search import build_local_index, search_local_index
+
+        with pytest.raises(FileNotFoundError):
+            build_local_index(str(tmp_path / "missing.jsonl"), index_path)
+
+        assert search_local_index(index_path, "statin", 5)["results"]
+        assert [path.name for path in Path(index_path).parent.iterdir()] == ["pubmed.sqlite3"]
+
+
+@pytest.mark.unit
+class TestSearchLocalIndex:
+    """Queries are BM25-ranked and shaped like Tavily results."""
+
+    def test_results_have_tavily_shape(self, index_path: str) -> None:
+        """Each result carries title, url, content, and score."""
+        from src.tools.local_search import search_local_index
+
+        raw = search_local_index(index_path, "statin myopathy", 5)
+
+        assert raw["query"] == "statin myopathy"
+        assert set(raw["results"][0]) == {"title", "url", "content", "score"}
+
+    def test_best_match_ranks_first(self, index_path: str) -> None:
+        """The document matching all terms, including in its title, ranks first."""
+        from src.tools.local_search import search_local_index
+
+        raw = search_local_index(index_path, "statin myopathy", 5)
+
+        assert raw["results"][0]["url"] == "https://pubmed.ncbi.nlm.nih.gov/101/"
+
+    def test_explicit_url_is_preserved(self, index_path: str) -> None:
+        """Records with a url field keep it."""
+        from src.tools.local_search import search_local_index
+
+        raw = search_local_index(index_path, "cardiovascular", 5)
+
+        assert raw["results"][0]["url"] == "https://example.org/statins"
+
+    def test_respects_max_results(self, index_path: str) -> None:
+        """No more than max_results are returned."""
+        from src.tools.local_search import search_local_index
+
+        raw = search_local_index(index_path, "patients statins gene", 1)
+
+        assert len(raw["results"]) == 1
+
+    def test_query_syntax_is_treated_as_text(self, index_path: str) -> None:
+        """FTS operators and quotes in the query do not raise."""
+        from src.tools.local_search import search_local_index
+
+        raw = search_local_index(index_path, 'CRISPR" AND (NEAR* -', 5)
+
+        assert raw["results"][0]["url"].endswith("/102/")
+
+    def test_document_matching_every_term_beats_newer_partial_matches(self, tmp_path: Path) -> None:
+        """An old document with all terms is found even when every term is too common."""
+        from unittest.mock import patch
+
+        from src.tools.local_search import build_local_index, search_local_index
+
+        records = [{"pmid": "1", "title": "Breast cancer treatment", "abstract": "Outcomes."}]
+        for i, pair in enumerate(["breast cancer", "cancer treatment", "breast treatment"] * 30):
+            records.append({"pmid": str(i + 2), "title": f"Study of {pair}", "abstract": "Data."})
+        corpus = tmp_path / "corpus.jsonl"
+        corpus.write_text("\n".join(json.dumps(record) for record in records))
+        path = str(tmp_path / "i.sqlite3")
+        build_local_index(str(corpus), path)
+
+        with (
+            patch("src.tools.local_search.CANDIDATE_DF_BUDGET", 20),
+            patch("src.tools.local_search.CANDIDATE_POOL_SIZE", 10),
+        ):
+            raw = search_local_index(path, "breast cancer treatment", 1)
+
+        assert raw["results"][0]["url"].endswith("/1/")
+
+    def test_unknown_terms_return_no_results(self, index_path: str) -> None:
+        """Queries with no indexed terms return an empty result list."""
+        from src.tools.local_search import search_local_index
+
+        assert search_local_index(index_path, "zzzz qqqq", 5)["results"] == []
+
+    def test_missing_index_raises(self, tmp_path: Path) -> None:
+        """A missing index file raises LocalIndexNotFoundError."""
+        from src.tools.local_search import LocalIndexNotFoundError, search_local_index
+
+        with pytest.raises(LocalIndexNotFoundError):
+            search_local_index(str(tmp_path / "missing.sqlite3"), "q", 5)
+
+
+@pytest.mark.unit
+class TestLocalSearchTool:
+    """The tool is a drop-in for TavilySearch."""
+
+    def test_invoke_works_with_safe_search(self, index_path: str) -> None:
+        """safe_search formats local results like Tavily results."""
+        from src.tools.local_search import LocalSearch
+        from src.tools.search import safe_search
+
+        tool = LocalSearch(index_path=index_path)
+
+        formatted = safe_search(tool, "crispr oncology")
+
+        assert formatted.startswith("[1] CRISPR gene editing in oncology")
+        assert "URL: https://pubmed.ncbi.nlm.nih.gov/102/" in formatted
+
+    def test_create_search_tool_selects_local_backend(
+        self, settings_fixture: MagicMock, index_path: str
+    ) -> None:
+        """search_backend='local' returns the local index tool."""
+        from src.tools.local_search import LocalSearch
+        from src.tools.search import create_search_cache, create_search_tool
+
+        settings_fixture.search_backend = "local"
+        settings_fixture.search_cache_enabled = True
+        settings_fixture.local_search_index_path = index_path
+
+        tool = create_search_tool(settings_fixture)
+
+        assert isinstance(tool, LocalSearch)
+        assert tool.index_path == index_path
+        assert create_search_cache(settings_fixture) is None
+
+
+@pytest.mark.unit
+class TestLocalSearchCli:
+    """The CLI builds and queries indexes."""
+
+    def test_build_and_query(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """build writes an index that query can read."""
+        from src.tools.local_search import main
+
+        corpus = tmp_path / "corpus.jsonl"
+        corpus.write_text("\n".join(json.dumps(r) for r in CORPUS))
+        index = str(tmp_path / "cli.sqlite3")
+
+        assert main(["build", str(corpus), index]) == 0
+        assert main(["query", index, "crispr"]) == 0
+
+        output = capsys.readouterr().out
+        assert "Indexed 3 documents" in output
+        assert "CRISPR gene editing in oncology" in output
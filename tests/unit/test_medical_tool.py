@@ -5,10 +5,21 @@ Tests cover:
 - AC-2: Disclaimer is always appended
 - AC-3: Fallback to Qwen3 when MedGemma unavailable
 - AC-4: Timeout handling for long queries
+- Deadlines enforced on slow model calls
+- Hedged fallback requests when MedGemma is slower than usual
+- A hedged call neither model answers is not retried on the fallback
+- Waits are abandoned when the research run is cancelled
+- Calls on worker threads count against the run's token budget
+- Consultations and medical model failures are recorded as metrics
+- Answers are cached, with fallback answers kept apart from MedGemma answers
+- Fallback and failed answers are told apart from MedGemma answers
+- The async variant awaits ainvoke under the same deadline, hedging and fallback rules
 """
 
+import asyncio
 import logging
-from unittest.mock import MagicMock
+import threading
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -316,3 +327,773 @@ class TestFallbackEdgeCases:
 
         assert "failed" in result.lower()
         assert result.endswith(MEDICAL_DISCLAIMER)
+
+    def test_is_primary_answer_rejects_fallback_and_errors(self) -> None:
+        """Only MedGemma answers count as primary; fallback, timeout and failure do not."""
+        from src.tools.medical import consult_medical_expert, is_primary_answer
+
+        medical_llm = MagicMock()
+        medical_llm.invoke.return_value = MagicMock(content="Analysis")
+        fallback = MagicMock()
+        fallback.invoke.return_value = MagicMock(content="General analysis")
+        answered = consult_medical_expert("q", medical_llm, fallback)
+        medical_llm.invoke.side_effect = ConnectionError("unavailable")
+        fell_back = consult_medical_expert("q", medical_llm, fallback)
+        fallback.invoke.side_effect = RuntimeError("also broken")
+        failed = consult_medical_expert("q", medical_llm, fallback)
+        fallback.invoke.side_effect = TimeoutError()
+        timed_out = consult_medical_expert("q", medical_llm, fallback)
+
+        assert is_primary_answer(answered)
+        assert not any(is_primary_answer(output) for output in (fell_back, failed, timed_out))
+
+
+@pytest.mark.unit
+class TestMedicalCircuitBreaker:
+    """The circuit breaker skips MedGemma while it keeps failing."""
+
+    def _make_breaker(self):
+        from src.models.circuit_breaker import CircuitBreaker
+
+        return CircuitBreaker(name="medical", failure_threshold=2, cooldown_seconds=60)
+
+    def test_open_circuit_goes_straight_to_fallback(self) -> None:
+        """After N failures the medical model is no longer called."""
+        from src.tools.medical import FALLBACK_WARNING, consult_medical_expert
+
+        breaker = self._make_breaker()
+        mock_medical_llm = MagicMock()
+        mock_medical_llm.invoke.side_effect = ConnectionError("down")
+        mock_fallback = MagicMock()
+        mock_fallback.invoke.return_value = MagicMock(content="Fallback analysis")
+
+        for _ in range(3):
+            result = consult_medical_expert(
+                query="test",
+                medical_llm=mock_medical_llm,
+                fallback_llm=mock_fallback,
+                breaker=breaker,
+            )
+
+        assert mock_medical_llm.invoke.call_count == 2
+        assert mock_fallback.invoke.call_count == 3
+        assert result.startswith(FALLBACK_WARNING)
+
+    def test_timeouts_count_as_failures(self) -> None:
+        """Timeouts from the medical model open the circuit too."""
+        from src.models.circuit_breaker import CircuitState
+        from src.tools.medical import consult_medical_expert
+
+        breaker = self._make_breaker()
+        mock_medical_llm = MagicMock()
+        mock_medical_llm.invoke.side_effect = TimeoutError("timed out")
+
+        for _ in range(2):
+            consult_medical_expert(
+                query="test",
+                medical_llm=mock_medical_llm,
+                fallback_llm=MagicMock(),
+                breaker=breaker,
+            )
+
+        assert breaker.state == CircuitState.OPEN
+
+    def test_success_is_recorded(self) -> None:
+        """A successful medical call resets the failure count."""
+        from src.tools.medical import consult_medical_expert
+
+        breaker = self._make_breaker()
+        breaker.record_failure()
+        mock_medical_llm = MagicMock()
+        mock_medical_llm.invoke.return_value = MagicMock(content="ok")
+
+        consult_medical_expert(
+            query="test",
+            medical_llm=mock_medical_llm,
+            fallback_llm=MagicMock(),
+            breaker=breaker,
+        )
+
+        assert breaker.snapshot()["consecutive_failures"] == 0
+
+
+def _slow_llm(content: str, release: threading.Event) -> MagicMock:
+    """Return a mock LLM whose invoke blocks until release is set."""
+    llm = MagicMock()
+
+    def _invoke(_messages: object) -> MagicMock:
+        release.wait(5)
+        return MagicMock(content=content)
+
+    llm.invoke.side_effect = _invoke
+    return llm
+
+
+@pytest.mark.unit
+class TestMedicalDeadline:
+    """Calls that exceed timeout_seconds are abandoned."""
+
+    def test_slow_medical_model_falls_back_at_deadline(self) -> None:
+        """A hung medical call is treated as a timeout and the fallback answers."""
+        from src.tools.medical import FALLBACK_WARNING, consult_medical_expert
+
+        release = threading.Event()
+        mock_fallback = MagicMock()
+        mock_fallback.invoke.return_value = MagicMock(content="Fallback analysis")
+
+        try:
+            result = consult_medical_expert(
+                query="test",
+                medical_llm=_slow_llm("late", release),
+                fallback_llm=mock_fallback,
+                timeout_seconds=0.05,
+            )
+        finally:
+            release.set()
+
+        assert result.startswith(FALLBACK_WARNING)
+        assert "Fallback analysis" in result
+
+    def test_both_models_slow_returns_timeout_msg(self) -> None:
+        """The fallback call is held to the same deadline."""
+        from src.tools.medical import TIMEOUT_ERROR_MSG, consult_medical_expert
+
+        release = threading.Event()
+        try:
+            result = consult_medical_expert(
+                query="test",
+                medical_llm=_slow_llm("late", release),
+                fallback_llm=_slow_llm("late too", release),
+                timeout_seconds=0.05,
+            )
+        finally:
+            release.set()
+
+        assert result == TIMEOUT_ERROR_MSG
+
+
+@pytest.mark.unit
+class TestMedicalHedging:
+    """A backup request races a slow medical model."""
+
+    def _warm_hedger(self, latency: float):
+        from src.models.hedging import LatencyHedger
+
+        hedger = LatencyHedger(percentile=0.9, min_samples=2)
+        hedger.record(latency)
+        hedger.record(latency)
+        return hedger
+
+    def test_hedge_wins_when_medical_model_is_slow(self) -> None:
+        """The fallback answer is returned, without counting a breaker failure."""
+        from src.models.circuit_breaker import CircuitBreaker
+        from src.tools.medical import FALLBACK_WARNING, consult_medical_expert
+
+        release = threading.Event()
+        breaker = CircuitBreaker(name="medical", failure_threshold=1)
+        mock_fallback = MagicMock()
+        mock_fallback.invoke.return_value = MagicMock(content="Hedged analysis")
+
+        try:
+            result = consult_medical_expert(
+                query="test",
+                medical_llm=_slow_llm("late", release),
+                fallback_llm=mock_fallback,
+                breaker=breaker,
+                timeout_seconds=5,
+                hedger=self._warm_hedger(0.01),
+            )
+        finally:
+            release.set()
+
+        assert result.startswith(FALLBACK_WARNING)
+        assert "Hedged analysis" in result
+        assert breaker.snapshot()["consecutive_failures"] == 0
+
+    def test_hedge_win_releases_half_open_probe(self) -> None:
+        """After a hedge beats a half-open probe, the next call probes MedGemma again."""
+        from src.models.circuit_breaker import CircuitBreaker, CircuitState
+        from src.tools.medical import FALLBACK_WARNING, consult_medical_expert
+
+        breaker = CircuitBreaker(name="medical", failure_threshold=1, cooldown_seconds=0.0)
+        breaker.record_failure()
+        assert breaker.state == CircuitState.HALF_OPEN
+        mock_fallback = MagicMock()
+        mock_fallback.invoke.return_value = MagicMock(content="Hedged analysis")
+        release = threading.Event()
+
+        try:
+            hedged = consult_medical_expert(
+                query="test",
+                medical_llm=_slow_llm("late", release),
+                fallback_llm=mock_fallback,
+                breaker=breaker,
+                timeout_seconds=5,
+                hedger=self._warm_hedger(0.01),
+            )
+        finally:
+            release.set()
+        mock_medical_llm = MagicMock()
+        mock_medical_llm.invoke.return_value = MagicMock(content="Medical analysis")
+        recovered = consult_medical_expert(
+            query="test", medical_llm=mock_medical_llm, fallback_llm=mock_fallback, breaker=breaker
+        )
+
+        assert hedged.startswith(FALLBACK_WARNING)
+        mock_medical_llm.invoke.assert_called_once()
+        assert recovered.startswith("Medical analysis")
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_hedge_after_medical_failure_counts_the_failure(self) -> None:
+        """A hedge answering after MedGemma raised still records the MedGemma failure."""
+        import time
+
+        from src.models.circuit_breaker import CircuitBreaker, CircuitState
+        from src.tools.medical import FALLBACK_WARNING, consult_medical_expert
+
+        def _fail_late(_messages: object) -> None:
+            time.sleep(0.05)
+            raise ConnectionError("medical down")
+
+        def _answer_later(_messages: object) -> MagicMock:
+            time.sleep(0.2)
+            return MagicMock(content="Hedged analysis")
+
+        breaker = CircuitBreaker(name="medical", failure_threshold=1)
+        mock_medical_llm = MagicMock()
+        mock_medical_llm.invoke.side_effect = _fail_late
+        mock_fallback = MagicMock()
+        mock_fallback.invoke.side_effect = _answer_later
+
+        result = consult_medical_expert(
+            query="test",
+            medical_llm=mock_medical_llm,
+            fallback_llm=mock_fallback,
+            breaker=breaker,
+            timeout_seconds=5,
+            hedger=self._warm_hedger(0.01),
+        )
+
+        assert result.startswith(FALLBACK_WARNING)
+        assert breaker.state == CircuitState.OPEN
+
+    def test_both_failing_does_not_call_fallback_again(self) -> None:
+        """When MedGemma and the hedge both fail, the hedge's failure is the answer."""
+        import time
+
+        from src.tools.medical import MEDICAL_FAILED_PREFIX, consult_medical_expert
+
+        def _fail_late(_messages: object) -> None:
+            time.sleep(0.05)
+            raise ConnectionError("medical down")
+
+        mock_medical_llm = MagicMock()
+        mock_medical_llm.invoke.side_effect = _fail_late
+        mock_fallback = MagicMock()
+        mock_fallback.invoke.side_effect = ConnectionError("fallback down")
+
+        result = consult_medical_expert(
+            query="test",
+            medical_llm=mock_medical_llm,
+            fallback_llm=mock_fallback,
+            timeout_seconds=5,
+            hedger=self._warm_hedger(0.01),
+        )
+
+        assert result.startswith(f"{MEDICAL_FAILED_PREFIX}: medical down")
+        mock_fallback.invoke.assert_called_once()
+
+    def test_both_timing_out_stops_at_one_deadline(self) -> None:
+        """A hedged call neither model answers times out once, not once per model."""
+        import time
+
+        from src.tools.medical import TIMEOUT_ERROR_MSG, consult_medical_expert
+
+        release = threading.Event()
+        mock_fallback = _slow_llm("late too", release)
+        started = time.monotonic()
+        try:
+            result = consult_medical_expert(
+                query="test",
+                medical_llm=_slow_llm("late", release),
+                fallback_llm=mock_fallback,
+                timeout_seconds=0.3,
+                hedger=self._warm_hedger(0.01),
+            )
+        finally:
+            release.set()
+
+        assert result == TIMEOUT_ERROR_MSG
+        assert time.monotonic() - started < 0.55
+        assert mock_fallback.invoke.call_count == 1
+
+    def test_fast_medical_model_is_not_hedged(self) -> None:
+        """A medical answer within the hedge delay never starts the backup."""
+        from src.tools.medical import FALLBACK_WARNING, consult_medical_expert
+
+        mock_medical_llm = MagicMock()
+        mock_medical_llm.invoke.return_value = MagicMock(content="Medical analysis")
+        mock_fallback = MagicMock()
+        hedger = self._warm_hedger(5.0)
+
+        result = consult_medical_expert(
+            query="test",
+            medical_llm=mock_medical_llm,
+            fallback_llm=mock_fallback,
+            timeout_seconds=10,
+            hedger=hedger,
+        )
+
+        assert result.startswith("Medical analysis")
+        assert not result.startswith(FALLBACK_WARNING)
+        mock_fallback.invoke.assert_not_called()
+
+    def test_no_hedging_before_min_samples(self) -> None:
+        """Without a latency baseline the medical model is awaited normally."""
+        from src.models.hedging import LatencyHedger
+        from src.tools.medical import consult_medical_expert
+
+        mock_medical_llm = MagicMock()
+        mock_medical_llm.invoke.return_value = MagicMock(content="Medical analysis")
+        mock_fallback = MagicMock()
+        hedger = LatencyHedger(min_samples=5)
+
+        consult_medical_expert(
+            query="test",
+            medical_llm=mock_medical_llm,
+            fallback_llm=mock_fallback,
+            hedger=hedger,
+        )
+
+        mock_fallback.invoke.assert_not_called()
+        assert hedger.hedge_delay() is None
+
+
+@pytest.mark.unit
+class TestMedicalCancellation:
+    """Cancelling the research run abandons the medical call."""
+
+    def test_cancel_during_call_raises_without_fallback(self) -> None:
+        """A cancelled run stops waiting and does not consult the fallback."""
+        from src.services.cancellation import RunCancelledError, cancel_scope
+        from src.tools.medical import consult_medical_expert
+
+        release = threading.Event()
+        cancel = threading.Event()
+        fallback = MagicMock()
+        threading.Timer(0.05, cancel.set).start()
+
+        try:
+            with cancel_scope(cancel), pytest.raises(RunCancelledError):
+                consult_medical_expert(
+                    query="q",
+                    medical_llm=_slow_llm("late", release),
+                    fallback_llm=fallback,
+                    timeout_seconds=30,
+                )
+        finally:
+            release.set()
+
+        fallback.invoke.assert_not_called()
+
+    def test_cancelled_probe_frees_breaker(self) -> None:
+        """A half-open probe abandoned by cancellation lets the next call probe again."""
+        from src.models.circuit_breaker import CircuitBreaker, CircuitState
+        from src.services.cancellation import RunCancelledError, cancel_scope
+        from src.tools.medical import consult_medical_expert
+
+        breaker = CircuitBreaker(name="medical", failure_threshold=1, cooldown_seconds=0.0)
+        breaker.record_failure()
+        release = threading.Event()
+        cancel = threading.Event()
+        threading.Timer(0.05, cancel.set).start()
+
+        try:
+            with cancel_scope(cancel), pytest.raises(RunCancelledError):
+                consult_medical_expert(
+                    query="q",
+                    medical_llm=_slow_llm("late", release),
+                    fallback_llm=MagicMock(),
+                    breaker=breaker,
+                    timeout_seconds=30,
+                )
+        finally:
+            release.set()
+
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request()
+
+    def test_cancelled_async_probe_frees_breaker(self) -> None:
+        """A task cancelled mid-probe releases the slot on the async path too."""
+        from src.models.circuit_breaker import CircuitBreaker
+        from src.tools.medical import aconsult_medical_expert
+
+        breaker = CircuitBreaker(name="medical", failure_threshold=1, cooldown_seconds=0.0)
+        breaker.record_failure()
+
+        async def main() -> None:
+            task = asyncio.create_task(
+                aconsult_medical_expert(
+                    "q", _async_llm("late", delay=5), _async_llm("unused"), breaker=breaker
+                )
+            )
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+
+        assert breaker.allow_request()
+
+
+@pytest.mark.unit
+class TestMedicalMetrics:
+    """Consultations are measured for the metrics endpoint."""
+
+    def test_consultation_is_timed(self) -> None:
+        """Each consultation adds a duration observation."""
+        from src.services.metrics import TOOL_CALL_DURATION
+        from src.tools.medical import MEDICAL_TOOL_LABEL, consult_medical_expert
+
+        before = TOOL_CALL_DURATION.count(tool=MEDICAL_TOOL_LABEL)
+        medical_llm = MagicMock()
+        medical_llm.invoke.return_value = MagicMock(content="Analysis")
+
+        consult_medical_expert(query="q", medical_llm=medical_llm, fallback_llm=MagicMock())
+
+        assert TOOL_CALL_DURATION.count(tool=MEDICAL_TOOL_LABEL) == before + 1
+
+    def test_medical_model_failure_is_counted(self) -> None:
+        """A failed MedGemma call is counted even when the fallback answers."""
+        from src.services.metrics import TOOL_CALL_ERRORS
+        from src.tools.medical import MEDICAL_TOOL_LABEL, consult_medical_expert
+
+        before = TOOL_CALL_ERRORS.value(tool=MEDICAL_TOOL_LABEL)
+        medical_llm = MagicMock()
+        medical_llm.invoke.side_effect = ConnectionError("Connection refused")
+        fallback = MagicMock()
+        fallback.invoke.return_value = MagicMock(content="Fallback result")
+
+        consult_medical_expert(query="q", medical_llm=medical_llm, fallback_llm=fallback)
+
+        assert TOOL_CALL_ERRORS.value(tool=MEDICAL_TOOL_LABEL) == before + 1
+
+
+def _usage_llm(content: str):
+    """Return a real chat model reporting 10 input and 5 output tokens, so callbacks fire."""
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.messages import AIMessage
+    from langchain_core.outputs import ChatGeneration, ChatResult
+
+    class UsageModel(BaseChatModel):
+        @property
+        def _llm_type(self) -> str:
+            return "usage"
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            message = AIMessage(
+                content=content,
+                usage_metadata={"input_tokens": 10, "output_tokens": 5, "total_tokens": 15},
+            )
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+    return UsageModel()
+
+
+@pytest.mark.unit
+class TestMedicalBudget:
+    """Medical model calls made on worker threads count against the run's budget."""
+
+    def _consult_in_run(self, budget, medical_llm, breaker=None) -> str:
+        from langchain_core.runnables import RunnableLambda
+
+        from src.services.budgets import BudgetCallbackHandler
+        from src.tools.medical import consult_medical_expert
+
+        def body(_input: object) -> str:
+            return consult_medical_expert("q", medical_llm, _usage_llm("fallback"), breaker)
+
+        return RunnableLambda(body).invoke(None, {"callbacks": [BudgetCallbackHandler(budget)]})
+
+    def test_sync_call_counts_tokens(self) -> None:
+        """The worker thread sees the run's callbacks, so MedGemma tokens are counted."""
+        from src.services.budgets import BudgetLimits, RunBudget
+
+        budget = RunBudget(BudgetLimits())
+
+        answer = self._consult_in_run(budget, _usage_llm("Analysis"))
+
+        assert answer.startswith("Analysis")
+        assert budget.tokens == 15
+
+    def test_spent_budget_stops_call_without_breaker_failure(self) -> None:
+        """A call refused by the budget stops the run instead of counting against MedGemma."""
+        from src.models.circuit_breaker import CircuitBreaker
+        from src.services.budgets import BudgetExhaustedError, BudgetLimits, RunBudget
+
+        budget = RunBudget(BudgetLimits(max_tokens=10))
+        budget.record_tokens(10)
+        breaker = CircuitBreaker(name="medical", failure_threshold=1)
+
+        with pytest.raises(BudgetExhaustedError):
+            self._consult_in_run(budget, _usage_llm("Analysis"), breaker)
+
+        assert breaker.snapshot()["consecutive_failures"] == 0
+
+
+def _medical_cache(tmp_path):
+    from src.tools.medical import create_medical_cache
+    from tests.conftest import make_mock_settings
+
+    settings = make_mock_settings()
+    settings.medical_cache_enabled = True
+    settings.medical_cache_path = str(tmp_path / "medical.sqlite3")
+    cache = create_medical_cache(settings)
+    assert cache is not None
+    return cache
+
+
+def _llm(model: str, content: str) -> MagicMock:
+    llm = MagicMock(model=model)
+    llm.invoke.return_value = MagicMock(content=content)
+    return llm
+
+
+@pytest.mark.unit
+class TestMedicalResponseCache:
+    """Repeated questions are answered from the cache."""
+
+    def test_key_ignores_case_and_spacing_but_not_model_or_prompt(self) -> None:
+        """Keys match on normalized queries and differ by model and system prompt."""
+        from src.tools.medical import build_medical_cache_key
+
+        base = build_medical_cache_key("medgemma", "prompt", "Statin myopathy")
+
+        assert base == build_medical_cache_key("medgemma", "prompt", "  statin   MYOPATHY ")
+        assert base != build_medical_cache_key("qwen3", "prompt", "Statin myopathy")
+        assert base != build_medical_cache_key("medgemma", "other prompt", "Statin myopathy")
+
+    def test_repeated_question_skips_model(self, tmp_path) -> None:
+        """A cached MedGemma answer is returned without calling any model."""
+        from src.tools.medical import consult_medical_expert
+
+        cache = _medical_cache(tmp_path)
+        medical_llm = _llm("medgemma", "Analysis")
+
+        first = consult_medical_expert("Q?", medical_llm, MagicMock(), cache=cache)
+        second = consult_medical_expert("q?", medical_llm, MagicMock(), cache=cache)
+
+        assert first == second
+        medical_llm.invoke.assert_called_once()
+
+    def test_fallback_answer_is_not_served_when_medgemma_is_healthy(self, tmp_path) -> None:
+        """A cached degraded answer does not replace a later MedGemma call."""
+        from src.tools.medical import FALLBACK_WARNING, consult_medical_expert
+
+        cache = _medical_cache(tmp_path)
+        medical_llm = _llm("medgemma", "Specialist analysis")
+        medical_llm.invoke.side_effect = [ConnectionError("down"), medical_llm.invoke.return_value]
+        fallback = _llm("qwen3", "General analysis")
+
+        degraded = consult_medical_expert("q", medical_llm, fallback, cache=cache)
+        healthy = consult_medical_expert("q", medical_llm, fallback, cache=cache)
+        cached = consult_medical_expert("q", medical_llm, fallback, cache=cache)
+
+        assert degraded.startswith(FALLBACK_WARNING)
+        assert healthy.startswith("Specialist analysis")
+        assert cached == healthy
+        assert medical_llm.invoke.call_count == 2
+
+    def test_fallback_answer_is_reused_while_medgemma_is_unavailable(self, tmp_path) -> None:
+        """With the circuit open, a cached fallback answer saves the fallback call."""
+        from src.models.circuit_breaker import CircuitBreaker
+        from src.tools.medical import FALLBACK_WARNING, consult_medical_expert
+
+        cache = _medical_cache(tmp_path)
+        breaker = CircuitBreaker(name="medical", failure_threshold=1, cooldown_seconds=60)
+        breaker.record_failure()
+        fallback = _llm("qwen3", "General analysis")
+
+        for _ in range(2):
+            result = consult_medical_expert(
+                "q", _llm("medgemma", "unused"), fallback, breaker=breaker, cache=cache
+            )
+
+        assert result.startswith(FALLBACK_WARNING)
+        fallback.invoke.assert_called_once()
+
+    def test_failures_are_not_cached(self, tmp_path) -> None:
+        """A consultation that failed on both models is retried next time."""
+        from src.tools.medical import consult_medical_expert
+
+        cache = _medical_cache(tmp_path)
+        medical_llm = _llm("medgemma", "Analysis")
+        medical_llm.invoke.side_effect = [ConnectionError("down"), medical_llm.invoke.return_value]
+        fallback = _llm("qwen3", "unused")
+        fallback.invoke.side_effect = RuntimeError("also down")
+
+        failed = consult_medical_expert("q", medical_llm, fallback, cache=cache)
+        answered = consult_medical_expert("q", medical_llm, fallback, cache=cache)
+
+        assert failed.startswith("Medical analysis failed")
+        assert answered.startswith("Analysis")
+
+    def test_disabled_cache_is_none(self) -> None:
+        """No cache is created when medical_cache_enabled is off."""
+        from src.tools.medical import create_medical_cache
+        from tests.conftest import make_mock_settings
+
+        assert create_medical_cache(make_mock_settings()) is None
+
+
+def _async_llm(content: str, delay: float = 0.0) -> MagicMock:
+    """Return a mock LLM whose ainvoke answers content after delay seconds."""
+    llm = MagicMock(model=f"model-{content}")
+
+    async def _ainvoke(_messages: object) -> MagicMock:
+        await asyncio.sleep(delay)
+        return MagicMock(content=content)
+
+    llm.ainvoke = AsyncMock(side_effect=_ainvoke)
+    return llm
+
+
+@pytest.mark.unit
+class TestAsyncConsultMedicalExpert:
+    """aconsult_medical_expert awaits the models instead of blocking threads."""
+
+    def test_awaits_medical_llm_and_appends_disclaimer(self) -> None:
+        """The medical model is awaited with the system prompt; invoke is not used."""
+        from src.tools.medical import MEDICAL_DISCLAIMER, aconsult_medical_expert
+
+        medical_llm = _async_llm("Analysis")
+
+        result = asyncio.run(aconsult_medical_expert("Q?", medical_llm, _async_llm("Backup")))
+
+        assert result.startswith("Analysis")
+        assert result.endswith(MEDICAL_DISCLAIMER)
+        medical_llm.ainvoke.assert_awaited_once()
+        medical_llm.invoke.assert_not_called()
+
+    def test_connection_error_falls_back(self) -> None:
+        """A failed medical call is answered by the fallback model."""
+        from src.tools.medical import FALLBACK_WARNING, aconsult_medical_expert
+
+        medical_llm = MagicMock()
+        medical_llm.ainvoke = AsyncMock(side_effect=ConnectionError("refused"))
+
+        result = asyncio.run(aconsult_medical_expert("Q?", medical_llm, _async_llm("Backup")))
+
+        assert result.startswith(FALLBACK_WARNING)
+        assert "Backup" in result
+
+    def test_slow_models_hit_the_deadline(self) -> None:
+        """Both calls are held to timeout_seconds."""
+        from src.tools.medical import TIMEOUT_ERROR_MSG, aconsult_medical_expert
+
+        result = asyncio.run(
+            aconsult_medical_expert(
+                "Q?", _async_llm("late", 5.0), _async_llm("late too", 5.0), timeout_seconds=0.05
+            )
+        )
+
+        assert result == TIMEOUT_ERROR_MSG
+
+    def test_hedge_wins_when_medical_model_is_slow(self) -> None:
+        """The backup request answers first and the slow call is cancelled."""
+        from src.models.hedging import LatencyHedger
+        from src.tools.medical import FALLBACK_WARNING, aconsult_medical_expert
+
+        hedger = LatencyHedger(percentile=0.9, min_samples=2)
+        hedger.record(0.01)
+        hedger.record(0.01)
+
+        result = asyncio.run(
+            aconsult_medical_expert(
+                "Q?",
+                _async_llm("late", 5.0),
+                _async_llm("Hedged analysis"),
+                timeout_seconds=5,
+                hedger=hedger,
+            )
+        )
+
+        assert result.startswith(FALLBACK_WARNING)
+        assert "Hedged analysis" in result
+
+    def test_hedge_failures_are_final(self) -> None:
+        """Both hedged calls failing answers with the failure; a late hedge win opens the breaker."""
+        from src.models.circuit_breaker import CircuitBreaker, CircuitState
+        from src.models.hedging import LatencyHedger
+        from src.tools.medical import (
+            FALLBACK_WARNING,
+            MEDICAL_FAILED_PREFIX,
+            aconsult_medical_expert,
+        )
+
+        def _failing_llm(delay: float) -> MagicMock:
+            llm = MagicMock()
+
+            async def _ainvoke(_messages: object) -> None:
+                await asyncio.sleep(delay)
+                raise ConnectionError("down")
+
+            llm.ainvoke = AsyncMock(side_effect=_ainvoke)
+            return llm
+
+        hedger = LatencyHedger(percentile=0.9, min_samples=2)
+        hedger.record(0.01)
+        hedger.record(0.01)
+        fallback = _failing_llm(0.0)
+        breaker = CircuitBreaker(name="medical", failure_threshold=1)
+
+        failed = asyncio.run(
+            aconsult_medical_expert(
+                "Q?", _failing_llm(0.05), fallback, timeout_seconds=5, hedger=hedger
+            )
+        )
+        hedged = asyncio.run(
+            aconsult_medical_expert(
+                "Q?",
+                _failing_llm(0.05),
+                _async_llm("Hedged analysis", 0.2),
+                breaker=breaker,
+                timeout_seconds=5,
+                hedger=hedger,
+            )
+        )
+
+        assert failed.startswith(MEDICAL_FAILED_PREFIX)
+        fallback.ainvoke.assert_awaited_once()
+        assert hedged.startswith(FALLBACK_WARNING)
+        assert breaker.state == CircuitState.OPEN
+
+    def test_cancel_during_call_raises_without_fallback(self) -> None:
+        """A cancelled run stops awaiting and does not consult the fallback."""
+        from src.services.cancellation import RunCancelledError, cancel_scope
+        from src.tools.medical import aconsult_medical_expert
+
+        cancel = threading.Event()
+        fallback = _async_llm("Backup")
+        threading.Timer(0.05, cancel.set).start()
+
+        with cancel_scope(cancel), pytest.raises(RunCancelledError):
+            asyncio.run(
+                aconsult_medical_expert("Q?", _async_llm("late", 5.0), fallback, timeout_seconds=30)
+            )
+
+        fallback.ainvoke.assert_not_awaited()
+
+    def test_repeated_question_is_served_from_cache(self, tmp_path) -> None:
+        """The async path shares the response cache with the sync one."""
+        from src.tools.medical import aconsult_medical_expert, consult_medical_expert
+
+        cache = _medical_cache(tmp_path)
+        medical_llm = _async_llm("Analysis")
+        first = asyncio.run(aconsult_medical_expert("Q?", medical_llm, MagicMock(), cache=cache))
+        second = consult_medical_expert("q?", medical_llm, MagicMock(), cache=cache)
+
+        assert first == second
+        medical_llm.ainvoke.assert_awaited_once()
+        medical_llm.invoke.assert_not_called()
@@ -0,0 +1,154 @@
+"""Unit tests for in-process application metrics.
+
+Tests cover:
+- Counters accumulate per label set
+- Label names are validated
+- The registry returns one metric per name
+- Histograms count observations into cumulative buckets and time blocks
+- The registry renders the Prometheus text exposition format
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.mark.unit
+class TestCounter:
+    """Labelled counters."""
+
+    def test_counts_per_label_values(self) -> None:
+        """Each label combination has its own count."""
+        from src.services.metrics import Counter
+
+        counter = Counter("runs_total", "Runs", ("reason",))
+        counter.inc(reason="a")
+        counter.inc(2, reason="a")
+        counter.inc(reason="b")
+
+        assert counter.value(reason="a") == 3
+        assert counter.value(reason="b") == 1
+        assert counter.value(reason="c") == 0
+        assert counter.samples() == {("a",): 3, ("b",): 1}
+
+    def test_rejects_wrong_labels(self) -> None:
+        """Label names must match the declared ones."""
+        from src.services.metrics import Counter
+
+        counter = Counter("runs_total", "Runs", ("reason",))
+
+        with pytest.raises(ValueError, match="expects labels"):
+            counter.inc(cause="a")
+
+
+@pytest.mark.unit
+class TestMetricsRegistry:
+    """Metrics are registered once by name."""
+
+    def test_same_name_returns_same_counter(self) -> None:
+        """Registering a name twice returns the existing counter."""
+        from src.services.metrics import MetricsRegistry
+
+        registry = MetricsRegistry()
+
+        assert registry.counter("x_total", "X") is registry.counter("x_total", "X")
+
+
+@pytest.mark.unit
+class TestHistogram:
+    """Labelled histograms."""
+
+    def test_observations_fill_cumulative_buckets(self) -> None:
+        """Each observation counts in every bucket whose bound it does not exceed."""
+        from src.services.metrics import Histogram
+
+        histogram = Histogram("latency_seconds", "Latency", ("tool",), buckets=(1.0, 5.0))
+        histogram.observe(0.5, tool="a")
+        histogram.observe(3.0, tool="a")
+        histogram.observe(9.0, tool="a")
+
+        assert histogram.count(tool="a") == 3
+        assert histogram.sum(tool="a") == 12.5
+        assert histogram.count(tool="b") == 0
+        assert histogram.render() == [
+            'latency_seconds_bucket{tool="a",le="1"} 1',
+            'latency_seconds_bucket{tool="a",le="5"} 2',
+            'latency_seconds_bucket{tool="a",le="+Inf"} 3',
+            'latency_seconds_sum{tool="a"} 12.5',
+            'latency_seconds_count{tool="a"} 3',
+        ]
+
+    def test_time_observes_block_duration_even_on_error(self) -> None:
+        """time() records the elapsed seconds when the block raises."""
+        from src.services.metrics import Histogram
+
+        histogram = Histogram("latency_seconds", "Latency")
+        with (
+            patch("src.services.metrics._monotonic", side_effect=[10.0, 12.5]),
+            pytest.raises(RuntimeError),
+            histogram.time(),
+        ):
+            raise RuntimeError("boom")
+
+        assert histogram.count() == 1
+        assert histogram.sum() == 2.5
+
+    def test_rejects_wrong_labels(self) -> None:
+        """Label names must match the declared ones."""
+        from src.services.metrics import Histogram
+
+        with pytest.raises(ValueError, match="expects labels"):
+            Histogram("latency_seconds", "Latency", ("tool",)).observe(1.0)
+
+
+@pytest.mark.unit
+class TestPrometheusRendering:
+    """The registry renders every metric for scraping."""
+
+    def test_render_includes_help_type_and_samples(self) -> None:
+        """Metrics are rendered by name with HELP and TYPE lines."""
+        from src.services.metrics import MetricsRegistry
+
+        registry = MetricsRegistry()
+        registry.counter("runs_total", "Runs").inc(2)
+        registry.histogram("latency_seconds", "Latency", buckets=(1.0,)).observe(0.25)
+
+        assert registry.render() == (
+            "# HELP latency_seconds Latency\n"
+            "# TYPE latency_seconds histogram\n"
+            'latency_seconds_bucket{le="1"} 1\n'
+            'latency_seconds_bucket{le="+Inf"} 1\n'
+            "latency_seconds_sum 0.25\n"
+            "latency_seconds_count 1\n"
+            "# HELP runs_total Runs\n"
+            "# TYPE runs_total counter\n"
+            "runs_total 2\n"
+        )
+
+    def test_unlabelled_counter_renders_zero_before_first_increment(self) -> None:
+        """A counter without labels is always exposed."""
+        from src.services.metrics import MetricsRegistry
+
+        registry = MetricsRegistry()
+        registry.counter("runs_total", "Runs")
+
+        assert "runs_total 0\n" in registry.render()
+
+    def test_label_values_are_escaped(self) -> None:
+        """Quotes, backslashes and newlines in label values are escaped."""
+        from src.services.metrics import Counter
+
+        counter = Counter("errors_total", "Errors", ("model",))
+        counter.inc(model='a"b\\c\nd')
+
+        assert counter.render() == ['errors_total{model="a\\"b\\\\c\\nd"} 1']
+
+    def test_name_registered_as_other_type_is_rejected(self) -> None:
+        """A counter name cannot be reused for a histogram."""
+        from src.services.metrics import MetricsRegistry
+
+        registry = MetricsRegistry()
+        registry.counter("x_total", "X")
+
+        with pytest.raises(ValueError, match="already registered as a counter"):
+            registry.histogram("x_total", "X")
@@ -5,10 +5,12 @@ Tests cover:
 - AC-2: MedGemma medical client for text completion
 - AC-3: Connection errors handled gracefully with ModelConnectionError
 - AC-4: MedGemma unavailability triggers fallback to Qwen3
+- Async invocation wraps errors the same way
 """
 
+import asyncio
 import logging
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -31,6 +33,7 @@ class TestCreateOrchestratorLlm:
         mock_chat_ollama.assert_called_once_with(
             model="qwen3:latest",
             base_url="http://localhost:11434",
+            keep_alive="30m",
         )
 
     @patch("src.models.clients.ChatOllama")
@@ -62,6 +65,7 @@ class TestCreateOrchestratorLlm:
         mock_chat_ollama.assert_called_once_with(
             model="qwen3:8b",
             base_url="http://localhost:11434",
+            keep_alive="30m",
         )
 
 
@@ -83,6 +87,7 @@ class TestCreateMedicalLlm:
         mock_chat_ollama.assert_called_once_with(
             model="MedAIBase/MedGemma1.0:4b",
             base_url="http://localhost:11434",
+            keep_alive="30m",
         )
 
     @patch("src.models.clients.ChatOllama")
@@ -114,6 +119,7 @@ class TestCreateMedicalLlm:
         mock_chat_ollama.assert_called_once_with(
             model="MedAIBase/MedGemma1.5:4b",
             base_url="http://localhost:11434",
+            keep_alive="30m",
         )
 
 
@@ -193,6 +199,28 @@ class TestModelConnectionError:
 
         assert result is mock_response
 
+    def test_ainvoke_wraps_connection_error(self) -> None:
+        """ainvoke_llm wraps connection errors into ModelConnectionError."""
+        from src.models.clients import ModelConnectionError, ainvoke_llm
+
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(side_effect=ConnectionError("Connection refused"))
+
+        with pytest.raises(ModelConnectionError, match="Ollama"):
+            asyncio.run(ainvoke_llm(mock_llm, "test prompt"))
+
+    def test_ainvoke_returns_response_on_success(self) -> None:
+        """ainvoke_llm awaits the model and returns its response."""
+        from src.models.clients import ainvoke_llm
+
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(return_value=MagicMock(content="Analysis"))
+
+        result = asyncio.run(ainvoke_llm(mock_llm, "What causes headaches?"))
+
+        assert result is mock_llm.ainvoke.return_value
+        mock_llm.invoke.assert_not_called()
+
 
 @pytest.mark.unit
 class TestMedicalLlmFallback:
@@ -0,0 +1,453 @@
+"""Unit tests for the SQLite report metadata index.
+
+Tests cover:
+- save_report updates the index and list_reports reads from it
+- Reports added or deleted outside save_report are picked up by mtime sync
+- Front matter and body parsing, including models_used and sources_count
+- The rebuild command indexes existing directories
+- Cursor pagination with date-range, substring and order filters
+- Full-text rows are keyed by the report rowid and follow saves and deletions
+- Recent-report lookup by normalized query, skipping partial reports
+- Indexes built by an older schema are recreated
+"""
+
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+
+def _save(output_dir: Path, query: str, day: int, **kwargs: object) -> Path:
+    from src.services.report_service import save_report
+
+    with patch(
+        "src.services.report_service._now",
+        return_value=datetime(2026, 3, day, 12, 0, 0, tzinfo=UTC),
+    ):
+        return save_report(
+            query=query, content="# Report\n\nBody", output_dir=str(output_dir), **kwargs
+        )
+
+
+def _write_report(path: Path, query: str, timestamp: str) -> None:
+    path.write_text(f"---\nquery: {query}\ntimestamp: {timestamp}\nsources_count: 2\n---\n# Body")
+
+
+@pytest.mark.unit
+class TestIndexUpdatedOnSave:
+    """save_report writes the metadata row."""
+
+    def test_saved_report_metadata_is_indexed(self, tmp_path: Path) -> None:
+        """All metadata fields are stored in the index."""
+        from src.services.report_index import get_report_index
+
+        _save(tmp_path, "statins", 1, models_used=["qwen3", "medgemma"], sources_count=4)
+
+        reports, _cursor = get_report_index(str(tmp_path)).list_page(limit=10)
+
+        assert reports == [
+            {
+                "filename": "2026-03-01_statins.md",
+                "query": "statins",
+                "timestamp": "2026-03-01T12:00:00+00:00",
+                "models_used": ["qwen3", "medgemma"],
+                "sources_count": 4,
+            }
+        ]
+
+    def test_list_reports_does_not_read_report_files(self, tmp_path: Path) -> None:
+        """Once indexed, listing never opens the report files."""
+        from src.services.report_service import list_reports
+
+        _save(tmp_path, "first", 1)
+        _save(tmp_path, "second", 2)
+
+        with patch("src.services.report_index.read_report_document") as mock_read:
+            reports = list_reports(str(tmp_path))
+
+        mock_read.assert_not_called()
+        assert [r["query"] for r in reports] == ["second", "first"]
+
+    def test_resaving_same_report_replaces_row(self, tmp_path: Path) -> None:
+        """Saving the same query on the same day overwrites the file and its row."""
+        from src.services.report_service import list_reports
+
+        _save(tmp_path, "statins", 1, sources_count=1)
+        _save(tmp_path, "statins", 1, sources_count=9)
+
+        assert len(list_reports(str(tmp_path))) == 1
+
+
+@pytest.mark.unit
+class TestDirectorySync:
+    """Out-of-band changes are reconciled when the directory changes."""
+
+    def test_copied_in_report_is_indexed(self, tmp_path: Path) -> None:
+        """A report file written without save_report still appears."""
+        from src.services.report_service import list_reports
+
+        _save(tmp_path, "saved", 1)
+        _write_report(tmp_path / "2026-03-05_manual.md", "manual", "2026-03-05T00:00:00+00:00")
+
+        assert [r["query"] for r in list_reports(str(tmp_path))] == ["manual", "saved"]
+
+    def test_deleted_report_is_dropped(self, tmp_path: Path) -> None:
+        """Removing a report file removes it from the listing."""
+        from src.services.report_service import list_reports
+
+        path = _save(tmp_path, "gone", 1)
+        _save(tmp_path, "kept", 2)
+        path.unlink()
+
+        assert [r["query"] for r in list_reports(str(tmp_path))] == ["kept"]
+
+    def test_files_without_front_matter_are_skipped(self, tmp_path: Path) -> None:
+        """Markdown files that are not reports are ignored."""
+        from src.services.report_service import list_reports
+
+        (tmp_path / "README.md").write_text("# Not a report")
+
+        assert list_reports(str(tmp_path)) == []
+
+
+@pytest.mark.unit
+class TestReadReportDocument:
+    """Report files are split into parsed front matter and body."""
+
+    def test_parses_models_and_sources(self, tmp_path: Path) -> None:
+        """models_used list items and sources_count are extracted."""
+        from src.services.report_index import read_report_document
+
+        path = _save(tmp_path, "q", 1, models_used=["a", "b"], sources_count=3)
+
+        document = read_report_document(path)
+
+        assert document is not None
+        metadata, body = document
+        assert body == "# Report\n\nBody"
+        assert metadata == {
+            "query": "q",
+            "timestamp": "2026-03-01T12:00:00+00:00",
+            "models_used": ["a", "b"],
+            "sources_count": 3,
+            "partial": False,
+        }
+
+    def test_unterminated_front_matter_returns_none(self, tmp_path: Path) -> None:
+        """A front matter block without a closing delimiter is not a report."""
+        from src.services.report_index import read_report_document
+
+        path = tmp_path / "broken.md"
+        path.write_text("---\nquery: x\n# never closed")
+
+        assert read_report_document(path) is None
+
+
+@pytest.mark.unit
+class TestRebuildCommand:
+    """The CLI rebuilds indexes for existing directories."""
+
+    def test_rebuild_indexes_existing_reports(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Reports written before the index existed are indexed."""
+        from src.services.report_index import get_report_index, main
+
+        _write_report(tmp_path / "a.md", "a", "2026-01-01T00:00:00+00:00")
+        _write_report(tmp_path / "b.md", "b", "2026-01-02T00:00:00+00:00")
+
+        assert main(["rebuild", str(tmp_path)]) == 0
+
+        assert "Indexed 2 reports" in capsys.readouterr().out
+        assert [r["query"] for r in get_report_index(str(tmp_path)).list_page(limit=10)[0]] == [
+            "b",
+            "a",
+        ]
+
+    def test_rebuild_rejects_missing_directory(self, tmp_path: Path) -> None:
+        """A path that is not a directory fails with a non-zero exit code."""
+        from src.services.report_index import main
+
+        assert main(["rebuild", str(tmp_path / "missing")]) == 1
+
+
+@pytest.mark.unit
+class TestListReportPage:
+    """Pages are cursor based and filterable."""
+
+    def _seed(self, tmp_path: Path) -> None:
+        for day, query in enumerate(["alpha", "beta", "gamma", "delta", "Beta blockers"], 1):
+            _save(tmp_path, query, day)
+
+    def _page(self, tmp_path: Path, **kwargs: object):
+        from src.services.report_service import list_report_page
+
+        reports, cursor = list_report_page(str(tmp_path), **kwargs)
+        return [r["query"] for r in reports], cursor
+
+    def test_walks_all_pages_newest_first(self, tmp_path: Path) -> None:
+        """Following cursors visits every report exactly once."""
+        self._seed(tmp_path)
+
+        first, cursor = self._page(tmp_path, limit=2)
+        second, cursor = self._page(tmp_path, limit=2, cursor=cursor)
+        third, cursor = self._page(tmp_path, limit=2, cursor=cursor)
+
+        assert first + second + third == ["Beta blockers", "delta", "gamma", "beta", "alpha"]
+        assert cursor is None
+
+    def test_cursor_is_stable_when_new_reports_arrive(self, tmp_path: Path) -> None:
+        """A report saved after the first page does not shift later pages."""
+        self._seed(tmp_path)
+
+        _, cursor = self._page(tmp_path, limit=2)
+        _save(tmp_path, "newest", 20)
+        second, _ = self._page(tmp_path, limit=2, cursor=cursor)
+
+        assert second == ["gamma", "beta"]
+
+    def test_ascending_order(self, tmp_path: Path) -> None:
+        """order='asc' returns oldest first."""
+        self._seed(tmp_path)
+
+        first, cursor = self._page(tmp_path, limit=2, order="asc")
+        second, _ = self._page(tmp_path, limit=2, order="asc", cursor=cursor)
+
+        assert first + second == ["alpha", "beta", "gamma", "delta"]
+
+    def test_date_range_filter(self, tmp_path: Path) -> None:
+        """since is inclusive and until exclusive; naive datetimes are UTC."""
+        self._seed(tmp_path)
+
+        queries, _ = self._page(
+            tmp_path,
+            limit=10,
+            since=datetime(2026, 3, 2, 12, 0, 0),
+            until=datetime(2026, 3, 4, 12, 0, 0, tzinfo=UTC),
+        )
+
+        assert queries == ["gamma", "beta"]
+
+    def test_query_substring_is_case_insensitive(self, tmp_path: Path) -> None:
+        """q matches anywhere in the query, ignoring case."""
+        self._seed(tmp_path)
+
+        queries, _ = self._page(tmp_path, limit=10, query_contains="BETA")
+
+        assert queries == ["Beta blockers", "beta"]
+
+    def test_like_wildcards_are_literal(self, tmp_path: Path) -> None:
+        """% and _ in the substring do not act as wildcards."""
+        self._seed(tmp_path)
+
+        queries, _ = self._page(tmp_path, limit=10, query_contains="%")
+
+        assert queries == []
+
+    def test_malformed_cursor_raises(self, tmp_path: Path) -> None:
+        """Undecodable cursors raise InvalidCursorError."""
+        from src.services.report_index import InvalidCursorError
+
+        self._seed(tmp_path)
+
+        with pytest.raises(InvalidCursorError):
+            self._page(tmp_path, limit=2, cursor="not-a-cursor")
+
+    def test_missing_directory_returns_empty_page(self, tmp_path: Path) -> None:
+        """A missing output directory yields no reports and no cursor."""
+        assert self._page(tmp_path / "missing", limit=5) == ([], None)
+
+
+@pytest.mark.unit
+class TestSearchReports:
+    """Full-text search over report bodies and queries."""
+
+    def _seed(self, tmp_path: Path) -> None:
+        from src.services.report_service import save_report
+
+        reports = [
+            ("statin myopathy", "Statins can cause muscle pain and myopathy in older adults."),
+            ("CRISPR oncology", "Gene editing trials in oncology, with a note on statins."),
+            ("sleep apnea", "CPAP therapy improves outcomes."),
+        ]
+        for day, (query, body) in enumerate(reports, 1):
+            with patch(
+                "src.services.report_service._now",
+                return_value=datetime(2026, 4, day, tzinfo=UTC),
+            ):
+                save_report(query=query, content=body, output_dir=str(tmp_path))
+
+    def test_ranks_query_matches_first_with_snippets(self, tmp_path: Path) -> None:
+        """A term in the query outranks the same term only in the body."""
+        from src.services.report_service import search_reports
+
+        self._seed(tmp_path)
+
+        hits = search_reports(str(tmp_path), "statin", 10)
+
+        assert [hit["query"] for hit in hits] == ["statin myopathy", "CRISPR oncology"]
+        assert hits[0]["score"] <= hits[1]["score"]
+        assert "<mark>" in hits[1]["snippet"]
+
+    def test_all_words_must_match_with_stemming(self, tmp_path: Path) -> None:
+        """Multi-word queries are ANDed; 'editing' matches 'edit'."""
+        from src.services.report_service import search_reports
+
+        self._seed(tmp_path)
+
+        hits = search_reports(str(tmp_path), "edit oncology", 10)
+
+        assert [hit["query"] for hit in hits] == ["CRISPR oncology"]
+
+    def test_fts_syntax_is_treated_as_text(self, tmp_path: Path) -> None:
+        """Quotes and operators in the query do not raise."""
+        from src.services.report_service import search_reports
+
+        self._seed(tmp_path)
+
+        assert search_reports(str(tmp_path), 'CPAP" (therapy*', 10)[0]["query"] == "sleep apnea"
+        assert search_reports(str(tmp_path), "***", 10) == []
+
+    def test_out_of_band_reports_are_searchable(self, tmp_path: Path) -> None:
+        """Files added without save_report are indexed with their body."""
+        from src.services.report_service import search_reports
+
+        self._seed(tmp_path)
+        _write_report(tmp_path / "manual.md", "manual", "2026-05-01T00:00:00+00:00")
+
+        assert [hit["filename"] for hit in search_reports(str(tmp_path), "body", 10)] == [
+            "manual.md"
+        ]
+
+    def test_resaved_report_replaces_its_text(self, tmp_path: Path) -> None:
+        """Overwriting a report drops its old body from the index."""
+        from src.services.report_service import save_report, search_reports
+
+        _save(tmp_path, "statins", 1)
+        with patch(
+            "src.services.report_service._now",
+            return_value=datetime(2026, 3, 1, 12, 0, 0, tzinfo=UTC),
+        ):
+            save_report(query="statins", content="Rewritten", output_dir=str(tmp_path))
+
+        assert search_reports(str(tmp_path), "body", 10) == []
+        assert len(search_reports(str(tmp_path), "rewritten", 10)) == 1
+
+    def test_full_text_rows_follow_report_rowids(self, tmp_path: Path) -> None:
+        """Resaved and deleted reports update their full-text row by rowid, leaving no orphans."""
+        import sqlite3
+
+        from src.services.report_index import get_report_index
+
+        path = _save(tmp_path, "gone", 1)
+        _save(tmp_path, "kept", 2)
+        _save(tmp_path, "kept", 2)
+        path.unlink()
+        index = get_report_index(str(tmp_path))
+        index.sync_if_stale()
+
+        conn = sqlite3.connect(index.path)
+        reports = conn.execute("SELECT id, query FROM reports").fetchall()
+        fts_rows = conn.execute("SELECT rowid, query FROM reports_fts").fetchall()
+        conn.close()
+        assert reports == fts_rows == [(reports[0][0], "kept")]
+
+    def test_older_index_is_rebuilt_with_bodies(self, tmp_path: Path) -> None:
+        """Indexes from before full-text search are re-indexed on open."""
+        import sqlite3
+
+        from src.services.report_index import ReportIndex
+
+        _write_report(tmp_path / "old.md", "old", "2026-01-01T00:00:00+00:00")
+        index = ReportIndex(str(tmp_path))
+        index.sync_if_stale()
+        index.close()
+        conn = sqlite3.connect(index.path)
+        conn.execute("DELETE FROM reports_fts")
+        conn.execute("DELETE FROM index_meta WHERE key = 'schema_version'")
+        conn.commit()
+        conn.close()
+
+        reopened = ReportIndex(str(tmp_path))
+
+        assert [hit["filename"] for hit in reopened.search("body", 10)] == ["old.md"]
+
+
+def _cached_lookup(output_dir: Path, query: str, day: int, max_age_seconds: float):
+    from src.services.report_service import find_recent_report
+
+    with patch(
+        "src.services.report_service._now",
+        return_value=datetime(2026, 3, day, 18, 0, 0, tzinfo=UTC),
+    ):
+        return find_recent_report(str(output_dir), query, max_age_seconds)
+
+
+@pytest.mark.unit
+class TestFindRecentReport:
+    """A repeated query finds the newest fresh, complete report."""
+
+    def test_repeat_within_window_returns_report_content(self, tmp_path: Path) -> None:
+        """Case and trailing punctuation are ignored; content excludes front matter."""
+        _save(tmp_path, "What is CPAP?", 1)
+
+        report = _cached_lookup(tmp_path, "what is cpap", 1, max_age_seconds=86400)
+
+        assert report is not None
+        assert report["filename"] == "2026-03-01_what-is-cpap.md"
+        assert report["content"] == "# Report\n\nBody"
+
+    def test_report_older_than_window_is_ignored(self, tmp_path: Path) -> None:
+        """Reports saved before the freshness window do not match."""
+        _save(tmp_path, "statins", 1)
+
+        assert _cached_lookup(tmp_path, "statins", 3, max_age_seconds=86400) is None
+
+    def test_newest_matching_report_wins(self, tmp_path: Path) -> None:
+        """With several fresh matches, the newest is returned."""
+        _save(tmp_path, "statins", 1)
+        _save(tmp_path, "Statins", 2)
+
+        report = _cached_lookup(tmp_path, "statins", 2, max_age_seconds=7 * 86400)
+
+        assert report is not None
+        assert report["filename"] == "2026-03-02_statins.md"
+
+    def test_partial_reports_never_match(self, tmp_path: Path) -> None:
+        """Reports saved from cancelled runs are flagged and skipped."""
+        path = _save(tmp_path, "statins", 1, partial=True)
+
+        assert "partial: true" in path.read_text()
+        assert _cached_lookup(tmp_path, "statins", 1, max_age_seconds=86400) is None
+
+    def test_missing_output_dir_returns_none(self, tmp_path: Path) -> None:
+        """No output directory means no cached report."""
+        assert _cached_lookup(tmp_path / "missing", "q", 1, max_age_seconds=86400) is None
+
+
+@pytest.mark.unit
+class TestSchemaMigration:
+    """Indexes from older schema versions are rebuilt."""
+
+    def test_old_schema_is_recreated_and_resynced(self, tmp_path: Path) -> None:
+        """A version 2 index without query keys is dropped and filled from the files."""
+        import sqlite3
+
+        from src.services.report_index import INDEX_DIRNAME, INDEX_FILENAME, ReportIndex
+
+        _write_report(tmp_path / "2026-03-01_q.md", "q", "2026-03-01T12:00:00+00:00")
+        (tmp_path / INDEX_DIRNAME).mkdir()
+        conn = sqlite3.connect(tmp_path / INDEX_DIRNAME / INDEX_FILENAME)
+        conn.executescript(
+            "CREATE TABLE reports (filename TEXT PRIMARY KEY, query TEXT NOT NULL, "
+            "timestamp TEXT NOT NULL, models_used TEXT NOT NULL, sources_count INTEGER NOT NULL);"
+            "CREATE TABLE index_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+            "INSERT INTO index_meta VALUES ('schema_version', '2');"
+        )
+        conn.close()
+
+        index = ReportIndex(str(tmp_path))
+
+        assert index.find_recent("Q", "2026-03-01T00:00:00+00:00") is not None
+        index.close()
@@ -254,6 +254,20 @@ class TestListReports:
 
         assert len(reports) == 1
 
+    def test_reads_every_page(self, tmp_path: Path) -> None:
+        """list_reports follows the page cursor until the last report."""
+        from src.services.report_service import list_reports, save_report
+
+        for day, query in enumerate(["first", "second", "third"], start=1):
+            fake_now = datetime(2026, 2, day, 0, 0, 0, tzinfo=UTC)
+            with patch("src.services.report_service._now", return_value=fake_now):
+                save_report(query=query, content="# Report", output_dir=str(tmp_path))
+
+        with patch("src.services.report_service.LIST_ALL_PAGE_SIZE", 2):
+            reports = list_reports(output_dir=str(tmp_path))
+
+        assert [r["query"] for r in reports] == ["third", "second", "first"]
+
 
 # ---- AC-4: A specific report can be retrieved ----
 
@@ -5,6 +5,8 @@ Tests cover:
 - AC-2: Get report endpoint returns full report content
 - AC-3: Missing report returns 404
 - AC-4: Empty reports directory returns empty list
+- Cursor pagination and filters on the list endpoint
+- Full-text search endpoint
 """
 
 from unittest.mock import patch
@@ -41,7 +43,7 @@ class TestListReportsEndpoint:
         app = _create_reports_app()
         client = TestClient(app)
 
-        with patch("src.api.routes.reports.list_reports", return_value=[]):
+        with patch("src.api.routes.reports.list_report_page", return_value=([], None)):
             response = client.get("/api/reports")
 
         assert response.status_code == 200
@@ -66,7 +68,7 @@ class TestListReportsEndpoint:
         app = _create_reports_app()
         client = TestClient(app)
 
-        with patch("src.api.routes.reports.list_reports", return_value=mock_reports):
+        with patch("src.api.routes.reports.list_report_page", return_value=(mock_reports, None)):
             response = client.get("/api/reports")
 
         data = response.json()
@@ -88,7 +90,7 @@ class TestListReportsEndpoint:
         app = _create_reports_app()
         client = TestClient(app)
 
-        with patch("src.api.routes.reports.list_reports", return_value=mock_reports):
+        with patch("src.api.routes.reports.list_report_page", return_value=(mock_reports, None)):
             response = client.get("/api/reports")
 
         report = response.json()[0]
@@ -111,7 +113,7 @@ class TestListReportsEndpoint:
         app = _create_reports_app()
         client = TestClient(app)
 
-        with patch("src.api.routes.reports.list_reports", return_value=mock_reports):
+        with patch("src.api.routes.reports.list_report_page", return_value=(mock_reports, None)):
             response = client.get("/api/reports")
 
         report = response.json()[0]
@@ -142,7 +144,7 @@ class TestListReportsEndpoint:
         app = _create_reports_app()
         client = TestClient(app)
 
-        with patch("src.api.routes.reports.list_reports", return_value=mock_reports):
+        with patch("src.api.routes.reports.list_report_page", return_value=(mock_reports, None)):
             response = client.get("/api/reports")
 
         data = response.json()
@@ -150,16 +152,16 @@ class TestListReportsEndpoint:
         assert timestamps == sorted(timestamps, reverse=True)
 
     def test_list_reports_calls_service_with_output_dir(self) -> None:
-        """list_reports is called with the settings output_dir."""
+        """list_report_page is called with the settings output_dir."""
         from fastapi.testclient import TestClient
 
         app = _create_reports_app()
         client = TestClient(app)
 
-        with patch("src.api.routes.reports.list_reports", return_value=[]) as mock_list:
+        with patch("src.api.routes.reports.list_report_page", return_value=([], None)) as mock_list:
             client.get("/api/reports")
 
-        mock_list.assert_called_once_with(TEST_OUTPUT_DIR)
+        assert mock_list.call_args.args == (TEST_OUTPUT_DIR,)
 
 
 # ---- AC-2: Get report endpoint returns full report content ----
@@ -295,7 +297,7 @@ class TestEmptyReportsDirectory:
         app = _create_reports_app()
         client = TestClient(app)
 
-        with patch("src.api.routes.reports.list_reports", return_value=[]):
+        with patch("src.api.routes.reports.list_report_page", return_value=([], None)):
             response = client.get("/api/reports")
 
         assert response.status_code == 200
@@ -307,12 +309,159 @@ class TestEmptyReportsDirectory:
         app = _create_reports_app()
         client = TestClient(app)
 
-        with patch("src.api.routes.reports.list_reports", return_value=[]):
+        with patch("src.api.routes.reports.list_report_page", return_value=([], None)):
             response = client.get("/api/reports")
 
         assert response.json() == []
 
 
+# ---- Pagination and filters ----
+
+
+@pytest.mark.unit
+class TestReportsPagination:
+    """GET /api/reports is cursor paginated and filterable."""
+
+    def test_next_cursor_header_when_more_pages(self) -> None:
+        """The next-page cursor is returned in X-Next-Cursor."""
+        from fastapi.testclient import TestClient
+
+        app = _create_reports_app()
+
+        with patch("src.api.routes.reports.list_report_page", return_value=([], "abc")):
+            response = TestClient(app).get("/api/reports")
+
+        assert response.headers["X-Next-Cursor"] == "abc"
+
+    def test_no_cursor_header_on_last_page(self) -> None:
+        """The header is omitted when there are no more reports."""
+        from fastapi.testclient import TestClient
+
+        app = _create_reports_app()
+
+        with patch("src.api.routes.reports.list_report_page", return_value=([], None)):
+            response = TestClient(app).get("/api/reports")
+
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_query_parameters_are_passed_to_service(self) -> None:
+        """limit, cursor, date range, substring and order reach the service."""
+        from datetime import UTC, datetime
+
+        from fastapi.testclient import TestClient
+
+        app = _create_reports_app()
+
+        with patch("src.api.routes.reports.list_report_page", return_value=([], None)) as mock_page:
+            TestClient(app).get(
+                "/api/reports",
+                params={
+                    "limit": 10,
+                    "cursor": "abc",
+                    "since": "2026-01-01T00:00:00Z",
+                    "q": "statin",
+                    "order": "asc",
+                },
+            )
+
+        kwargs = mock_page.call_args.kwargs
+        assert kwargs["limit"] == 10
+        assert kwargs["cursor"] == "abc"
+        assert kwargs["since"] == datetime(2026, 1, 1, tzinfo=UTC)
+        assert kwargs["until"] is None
+        assert kwargs["query_contains"] == "statin"
+        assert kwargs["order"] == "asc"
+
+    def test_limit_above_maximum_is_rejected(self) -> None:
+        """Page sizes above MAX_PAGE_SIZE return 422."""
+        from fastapi.testclient import TestClient
+
+        from src.api.routes.reports import MAX_PAGE_SIZE
+
+        app = _create_reports_app()
+
+        response = TestClient(app).get("/api/reports", params={"limit": MAX_PAGE_SIZE + 1})
+
+        assert response.status_code == 422
+
+    def test_invalid_cursor_returns_400(self) -> None:
+        """A malformed cursor is a client error."""
+        from fastapi.testclient import TestClient
+
+        from src.services.report_index import InvalidCursorError
+
+        app = _create_reports_app()
+
+        with patch(
+            "src.api.routes.reports.list_report_page",
+            side_effect=InvalidCursorError("Invalid cursor: x"),
+        ):
+            response = TestClient(app).get("/api/reports", params={"cursor": "x"})
+
+        assert response.status_code == 400
+
+
+# ---- Full-text search ----
+
+
+@pytest.mark.unit
+class TestReportsSearchEndpoint:
+    """GET /api/reports/search returns ranked hits with snippets."""
+
+    def test_returns_hits_with_ids_and_snippets(self) -> None:
+        """Hits are mapped to ids and keep their rank order."""
+        from fastapi.testclient import TestClient
+
+        hits = [
+            {
+                "filename": "2026-02-08_statins.md",
+                "query": "statins",
+                "timestamp": "2026-02-08T14:30:00+00:00",
+                "score": -2.5,
+                "snippet": "<mark>statin</mark> myopathy",
+            }
+        ]
+        app = _create_reports_app()
+
+        with patch("src.api.routes.reports.search_reports", return_value=hits) as mock_search:
+            response = TestClient(app).get("/api/reports/search", params={"q": "statin"})
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {
+                "id": "2026-02-08_statins",
+                "query": "statins",
+                "timestamp": "2026-02-08T14:30:00+00:00",
+                "score": -2.5,
+                "snippet": "<mark>statin</mark> myopathy",
+            }
+        ]
+        mock_search.assert_called_once_with(TEST_OUTPUT_DIR, "statin", 20)
+
+    def test_search_is_not_treated_as_report_id(self) -> None:
+        """The search route takes precedence over /reports/{report_id}."""
+        from fastapi.testclient import TestClient
+
+        app = _create_reports_app()
+
+        with (
+            patch("src.api.routes.reports.search_reports", return_value=[]),
+            patch("src.api.routes.reports.get_report") as mock_get,
+        ):
+            response = TestClient(app).get("/api/reports/search", params={"q": "x"})
+
+        assert response.json() == []
+        mock_get.assert_not_called()
+
+    def test_missing_query_is_rejected(self) -> None:
+        """q is required."""
+        from fastapi.testclient import TestClient
+
+        app = _create_reports_app()
+
+        assert TestClient(app).get("/api/reports/search").status_code == 422
+
+
 # ---- Pydantic schemas ----
 
 
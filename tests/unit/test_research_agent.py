@@ -6,11 +6,20 @@ Tests cover:
 - AC-3: System prompt enforces structured report format
 - AC-4: System prompt enforces research-only behavior (no diagnosis)
 - AC-5: Agent handles tool failures without crashing
+- The checkpointer is passed to the compiled graph
+- Tool calls of one turn run concurrently under per-tool limits, in call order
+- Repeated tool calls within a run reuse the earlier result; failures are retried
+- Budget-stopped runs are synthesized from their findings without tools
 """
 
+import asyncio
+import threading
+import time
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
 
 
 @pytest.mark.unit
@@ -58,12 +67,38 @@ class TestCreateResearchAgent:
             patch("src.agent.research_agent.create_search_tool") as mock_search,
         ):
             mock_search.return_value = MagicMock()
+            mock_search.return_value.invoke.return_value = {
+                "results": [{"title": "T", "url": "https://example.com", "content": "C"}]
+            }
             mock_create.return_value = MagicMock()
             create_research_agent(settings_fixture)
 
         call_kwargs = mock_create.call_args
         tools = call_kwargs.kwargs.get("tools", [])
-        assert any(t is mock_search.return_value for t in tools)
+        search = next(t for t in tools if t.name == "tavily_search")
+        result = search.invoke({"query": "statins"})
+
+        mock_search.return_value.invoke.assert_called_once_with({"query": "statins"})
+        assert "https://example.com" in result
+
+    def test_binds_batch_search_tool(self, settings_fixture: MagicMock) -> None:
+        """Agent has a batch search tool that shares the Tavily client."""
+        from src.agent.research_agent import create_research_agent
+
+        with (
+            patch("src.agent.research_agent.create_deep_agent") as mock_create,
+            patch("src.agent.research_agent.create_orchestrator_llm"),
+            patch("src.agent.research_agent.create_search_tool") as mock_search,
+        ):
+            mock_search.return_value.invoke.return_value = {"results": []}
+            mock_create.return_value = MagicMock()
+            create_research_agent(settings_fixture)
+
+        tools = mock_create.call_args.kwargs.get("tools", [])
+        batch = next(t for t in tools if t.name == "tavily_batch_search")
+        batch.invoke({"queries": ["a", "b"]})
+
+        assert mock_search.return_value.invoke.call_count == 2
 
     def test_binds_medical_consultation_tool(self, settings_fixture: MagicMock) -> None:
         """Agent has a medical consultation tool bound."""
@@ -97,6 +132,22 @@ class TestCreateResearchAgent:
         call_kwargs = mock_create.call_args
         assert call_kwargs.kwargs.get("system_prompt") == RESEARCH_SYSTEM_PROMPT
 
+    def test_passes_checkpointer(self, settings_fixture: MagicMock) -> None:
+        """The given checkpointer is compiled into the agent; none by default."""
+        from src.agent.research_agent import create_research_agent
+
+        checkpointer = MagicMock()
+        with (
+            patch("src.agent.research_agent.create_deep_agent") as mock_create,
+            patch("src.agent.research_agent.create_orchestrator_llm"),
+            patch("src.agent.research_agent.create_search_tool"),
+        ):
+            create_research_agent(settings_fixture)
+            create_research_agent(settings_fixture, checkpointer=checkpointer)
+
+        assert mock_create.call_args_list[0].kwargs["checkpointer"] is None
+        assert mock_create.call_args_list[1].kwargs["checkpointer"] is checkpointer
+
 
 @pytest.mark.unit
 class TestResearchSystemPrompt:
@@ -185,6 +236,198 @@ class TestMedicalConsultationToolCreation:
         mock_med.assert_called_once()
 
 
+class _ToolCallingFakeModel(GenericFakeChatModel):
+    """Fake chat model that accepts bound tools and replays scripted messages."""
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "_ToolCallingFakeModel":
+        return self
+
+
+@pytest.mark.unit
+class TestToolConcurrency:
+    """The tool calls of one turn run concurrently, capped per tool, in call order."""
+
+    def _turn(self) -> Any:
+        from langchain_core.messages import AIMessage
+
+        calls = [
+            {"name": "consult_medical_expert_tool", "args": {"query": f"q{i}"}, "id": f"c{i}"}
+            for i in range(4)
+        ]
+        return iter([AIMessage(content="", tool_calls=calls), AIMessage(content="Report")])
+
+    def _run_turn(self, settings_fixture: MagicMock, use_async: bool) -> tuple[list[str], int]:
+        """Run one turn of four medical consultations; return tool outputs and peak concurrency."""
+        from langchain_core.messages import HumanMessage, ToolMessage
+
+        from src.agent.research_agent import create_research_agent
+
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def track(delta: int) -> None:
+            with lock:
+                active[0] += delta
+                active[1] = max(active[1], active[0])
+
+        def consult(query: str, **kwargs: Any) -> str:
+            track(1)
+            time.sleep(0.1 if query != "q0" else 0.2)
+            track(-1)
+            return f"answer {query}"
+
+        async def aconsult(query: str, **kwargs: Any) -> str:
+            track(1)
+            await asyncio.sleep(0.1 if query != "q0" else 0.2)
+            track(-1)
+            return f"answer {query}"
+
+        with (
+            patch(
+                "src.agent.research_agent.create_orchestrator_llm",
+                return_value=_ToolCallingFakeModel(messages=self._turn()),
+            ),
+            patch("src.agent.research_agent.create_medical_llm_with_fallback"),
+            patch("src.agent.research_agent.create_search_tool"),
+            patch("src.agent.research_agent.consult_medical_expert", consult),
+            patch("src.agent.research_agent.aconsult_medical_expert", aconsult),
+        ):
+            agent = create_research_agent(settings_fixture)
+            inputs = {"messages": [HumanMessage("question")]}
+            result = asyncio.run(agent.ainvoke(inputs)) if use_async else agent.invoke(inputs)
+
+        outputs = [m.text for m in result["messages"] if isinstance(m, ToolMessage)]
+        return outputs, active[1]
+
+    def test_sync_calls_run_concurrently_up_to_limit(self, settings_fixture: MagicMock) -> None:
+        """Four calls run two at a time and their results keep the call order."""
+        outputs, peak = self._run_turn(settings_fixture, use_async=False)
+
+        assert outputs == [f"answer q{i}" for i in range(4)]
+        assert peak == 2
+
+    def test_async_calls_run_concurrently_up_to_limit(self, settings_fixture: MagicMock) -> None:
+        """Awaited tool calls are capped the same way."""
+        outputs, peak = self._run_turn(settings_fixture, use_async=True)
+
+        assert outputs == [f"answer q{i}" for i in range(4)]
+        assert peak == 2
+
+    def test_medical_limit_scales_with_pooled_hosts(self, settings_fixture: MagicMock) -> None:
+        """The medical tool's limit applies per pooled host serving the medical model."""
+        from src.agent.research_agent import MEDICAL_TOOL_NAME, _create_tool_limiters
+        from src.models.load_balancer import OllamaHost, OllamaHostPool
+
+        pool = OllamaHostPool(
+            [
+                OllamaHost("http://a:11434"),
+                OllamaHost("http://b:11434"),
+                OllamaHost("http://c:11434", models=frozenset({"other"})),
+            ],
+            failure_threshold=3,
+            ejection_seconds=30.0,
+        )
+        settings_fixture.tool_concurrency_limits = {MEDICAL_TOOL_NAME: 2, "tavily_search": 3}
+
+        limiters = _create_tool_limiters(
+            settings_fixture, [MEDICAL_TOOL_NAME, "tavily_search"], pool
+        )
+
+        assert limiters[MEDICAL_TOOL_NAME].max_concurrent == 4
+        assert limiters["tavily_search"].max_concurrent == 3
+
+    def test_unknown_and_unlisted_tools_are_not_limited(self, settings_fixture: MagicMock) -> None:
+        """Limits for tools the agent lacks are ignored; unlisted tools get no limiter."""
+        from src.agent.research_agent import _create_tool_limiters
+
+        settings_fixture.tool_concurrency_limits = {"no_such_tool": 1}
+
+        assert _create_tool_limiters(settings_fixture, ["tavily_search"]) == {}
+
+
+@pytest.mark.unit
+class TestToolMemoization:
+    """Repeated identical tool calls within a run reuse the earlier result."""
+
+    def _tools(self, settings_fixture: MagicMock, mock_search: MagicMock) -> dict[str, Any]:
+        from src.agent.research_agent import create_research_agent
+
+        with (
+            patch("src.agent.research_agent.create_deep_agent") as mock_create,
+            patch("src.agent.research_agent.create_orchestrator_llm"),
+            patch("src.agent.research_agent.create_search_tool", return_value=mock_search),
+        ):
+            create_research_agent(settings_fixture)
+        return {tool.name: tool for tool in mock_create.call_args.kwargs["tools"]}
+
+    def test_repeated_search_is_answered_from_memo(self, settings_fixture: MagicMock) -> None:
+        """The second identical search returns the first result with a note, sync and async."""
+        from src.services.tool_memo import REPEATED_CALL_NOTE, RunToolMemo, tool_memo_scope
+
+        mock_search = MagicMock()
+        mock_search.invoke.return_value = {
+            "results": [{"title": "T", "url": "https://example.com", "content": "C"}]
+        }
+        search = self._tools(settings_fixture, mock_search)["tavily_search"]
+        memo = RunToolMemo()
+
+        with tool_memo_scope(memo):
+            first = search.invoke({"query": "Statins"})
+            again = search.invoke({"query": "statins "})
+            awaited = asyncio.run(search.ainvoke({"query": "statins"}))
+
+        assert again == REPEATED_CALL_NOTE + first
+        assert awaited == again
+        mock_search.invoke.assert_called_once()
+        assert memo.deduplicated == 2
+
+    def test_failed_calls_are_retried(self, settings_fixture: MagicMock) -> None:
+        """A failed search is not remembered, so repeating it searches again."""
+        from src.services.tool_memo import RunToolMemo, tool_memo_scope
+
+        mock_search = MagicMock()
+        mock_search.invoke.side_effect = [RuntimeError("down"), {"results": []}]
+        search = self._tools(settings_fixture, mock_search)["tavily_search"]
+        memo = RunToolMemo()
+
+        with tool_memo_scope(memo):
+            failed = search.invoke({"query": "statins"})
+            retried = search.invoke({"query": "statins"})
+
+        assert failed.startswith("Search failed")
+        assert not retried.startswith("Search failed")
+        assert mock_search.invoke.call_count == 2
+        assert memo.deduplicated == 0
+
+    def test_error_payloads_are_not_remembered(self, settings_fixture: MagicMock) -> None:
+        """Error payloads returned instead of raised, even empty ones, are searched again."""
+        from src.services.tool_memo import RunToolMemo, tool_memo_scope
+
+        mock_search = MagicMock()
+        mock_search.invoke.return_value = {"error": ""}
+        tools = self._tools(settings_fixture, mock_search)
+        memo = RunToolMemo()
+
+        with tool_memo_scope(memo):
+            for _ in range(2):
+                tools["tavily_search"].invoke({"query": "statins"})
+                tools["tavily_batch_search"].invoke({"queries": ["statins", "myopathy"]})
+
+        assert mock_search.invoke.call_count == 6
+        assert memo.deduplicated == 0
+
+    def test_calls_outside_a_run_are_not_memoized(self, settings_fixture: MagicMock) -> None:
+        """Without a run's memo every call reaches the tool."""
+        mock_search = MagicMock()
+        mock_search.invoke.return_value = {"results": []}
+        search = self._tools(settings_fixture, mock_search)["tavily_search"]
+
+        search.invoke({"query": "statins"})
+        search.invoke({"query": "statins"})
+
+        assert mock_search.invoke.call_count == 2
+
+
 @pytest.mark.unit
 class TestAgentToolFailureHandling:
     """AC-5: Agent handles tool failures without crashing."""
@@ -231,16 +474,54 @@ class TestAgentConstants:
         assert isinstance(RESEARCH_SYSTEM_PROMPT, str)
         assert len(RESEARCH_SYSTEM_PROMPT) > 0
 
-    def test_max_agent_iterations_is_defined(self) -> None:
-        """MAX_AGENT_ITERATIONS constant is defined."""
-        from src.agent.research_agent import MAX_AGENT_ITERATIONS
-
-        assert isinstance(MAX_AGENT_ITERATIONS, int)
-        assert MAX_AGENT_ITERATIONS > 0
-
     def test_agent_name_is_defined(self) -> None:
         """AGENT_NAME constant is defined."""
         from src.agent.research_agent import AGENT_NAME
 
         assert isinstance(AGENT_NAME, str)
         assert len(AGENT_NAME) > 0
+
+
+@pytest.mark.unit
+class TestReportSynthesis:
+    """Forced final reports are written from the findings gathered so far."""
+
+    def test_synthesis_prompt_includes_findings(self) -> None:
+        """Tool results and orchestrator notes reach the model; tool calls do not."""
+        from langchain_core.messages import AIMessage, ToolMessage
+
+        from src.agent.research_agent import RESEARCH_SYSTEM_PROMPT, synthesize_report
+
+        llm = MagicMock()
+        llm.invoke.return_value = AIMessage(content="# Report")
+        messages = [
+            AIMessage(content="", tool_calls=[{"name": "s", "args": {}, "id": "1"}]),
+            ToolMessage(content="Statins lower LDL", tool_call_id="1", name="tavily_search"),
+            AIMessage(content="Need outcome data"),
+        ]
+
+        report = synthesize_report(llm, "statins", messages, "time budget of 60s reached")
+
+        system, prompt = llm.invoke.call_args.args[0]
+        assert report == "# Report"
+        assert system.content == RESEARCH_SYSTEM_PROMPT
+        assert "Research query: statins" in prompt.content
+        assert "time budget of 60s reached" in prompt.content
+        assert "### Result from tavily_search\nStatins lower LDL" in prompt.content
+        assert "### Research notes\nNeed outcome data" in prompt.content
+
+    def test_findings_keep_most_recent_text(self) -> None:
+        """Findings longer than the limit are cut from the front."""
+        from langchain_core.messages import ToolMessage
+
+        from src.agent.research_agent import MAX_SYNTHESIS_FINDINGS_CHARS, _format_findings
+
+        messages = [
+            ToolMessage(content="a" * MAX_SYNTHESIS_FINDINGS_CHARS, tool_call_id="1"),
+            ToolMessage(content="latest", tool_call_id="2"),
+        ]
+
+        findings = _format_findings(messages)
+
+        assert len(findings) == MAX_SYNTHESIS_FINDINGS_CHARS
+        assert findings.endswith("latest")
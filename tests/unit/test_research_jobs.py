@@ -0,0 +1,662 @@
+"""Unit tests for the in-process research job queue.
+
+Tests cover:
+- Submitted jobs run on worker threads and record their outcome
+- Streams replay past events and follow live ones until the job ends
+- The worker pool caps concurrent runs
+- Finished jobs beyond the retention limit are pruned
+- The last subscriber detaching cancels disconnect-bound jobs
+- Async waits return new events without blocking a thread
+- Events are numbered and buffered up to a bound for resumption
+- Identical in-flight queries coalesce onto one job
+- Admission control: queue positions, wait estimates and rejection when full
+- Coroutine runners run concurrently on one event loop thread
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from tests.conftest import collect_job_events
+
+
+def _wait_finished(job) -> None:
+    collect_job_events(job)
+    assert job.is_finished
+
+
+@pytest.mark.unit
+class TestJobExecution:
+    """Jobs run in the background and record their outcome."""
+
+    def test_successful_job_records_filename(self) -> None:
+        """The runner's return value is the job's report filename."""
+        from src.services.research_jobs import JobStatus, ResearchJobManager
+
+        manager = ResearchJobManager(runner=lambda job: f"{job.query}.md")
+
+        job = manager.submit("statins")
+        _wait_finished(job)
+
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.filename == "statins.md"
+        assert manager.get(job.id) is job
+
+    def test_runner_exception_marks_job_failed(self) -> None:
+        """Exceptions from the runner are recorded, not raised."""
+        from src.services.research_jobs import JobStatus, ResearchJobManager
+
+        def runner(job):
+            raise RuntimeError("agent crashed")
+
+        job = ResearchJobManager(runner=runner).submit("q")
+        _wait_finished(job)
+
+        assert job.status == JobStatus.FAILED
+        assert job.error == "agent crashed"
+
+    def test_unknown_job_is_none(self) -> None:
+        """get returns None for unknown ids."""
+        from src.services.research_jobs import ResearchJobManager
+
+        assert ResearchJobManager(runner=lambda job: None).get("missing") is None
+
+    def test_status_summary(self) -> None:
+        """to_dict reports status, timestamps, and event count."""
+        from src.services.research_jobs import ResearchJobManager
+
+        def runner(job):
+            job.publish({"type": "progress", "data": "working"})
+            return "r.md"
+
+        job = ResearchJobManager(runner=runner).submit("q")
+        _wait_finished(job)
+        summary = job.to_dict()
+
+        assert summary["status"] == "succeeded"
+        assert summary["event_count"] == 1
+        assert summary["started_at"] is not None
+        assert summary["finished_at"] is not None
+
+
+@pytest.mark.unit
+class TestJobStreams:
+    """Streams can attach at any time."""
+
+    def test_late_attach_replays_all_events(self) -> None:
+        """A stream opened after the job finished replays every event."""
+        from src.services.research_jobs import ResearchJobManager
+
+        def runner(job):
+            for i in range(3):
+                job.publish({"type": "progress", "data": str(i)})
+            return None
+
+        job = ResearchJobManager(runner=runner).submit("q")
+        _wait_finished(job)
+
+        assert [event["data"] for event in collect_job_events(job)] == ["0", "1", "2"]
+        assert [event["data"] for event in collect_job_events(job, after_id=2)] == ["2"]
+
+    def test_live_stream_follows_running_job(self) -> None:
+        """A stream attached while running receives later events."""
+        from src.services.research_jobs import ResearchJobManager
+
+        release = threading.Event()
+
+        def runner(job):
+            job.publish({"type": "progress", "data": "first"})
+            release.wait(5)
+            job.publish({"type": "result", "data": "done"})
+            return "r.md"
+
+        job = ResearchJobManager(runner=runner).submit("q")
+        [first] = collect_job_events(job, count=1)
+        release.set()
+
+        assert first["data"] == "first"
+        assert [event["data"] for event in collect_job_events(job, after_id=1)] == ["done"]
+
+
+@pytest.mark.unit
+class TestWorkerPool:
+    """The pool bounds concurrency and retention."""
+
+    def test_runs_at_most_max_workers_at_once(self) -> None:
+        """With one worker, a second job waits in the queue."""
+        from src.services.research_jobs import JobStatus, ResearchJobManager
+
+        release = threading.Event()
+        started = threading.Event()
+
+        def runner(job):
+            started.set()
+            release.wait(5)
+            return None
+
+        manager = ResearchJobManager(runner=runner, max_workers=1)
+        first = manager.submit("a")
+        second = manager.submit("b")
+        assert started.wait(5)
+
+        assert first.status == JobStatus.RUNNING
+        assert second.status == JobStatus.QUEUED
+
+        release.set()
+        _wait_finished(second)
+
+    def test_prunes_oldest_finished_jobs(self) -> None:
+        """Only max_jobs_retained finished jobs are kept."""
+        from src.services.research_jobs import ResearchJobManager
+
+        manager = ResearchJobManager(runner=lambda job: None, max_jobs_retained=1)
+        first = manager.submit("a")
+        _wait_finished(first)
+        second = manager.submit("b")
+        _wait_finished(second)
+        manager.submit("c")
+
+        assert manager.get(first.id) is None
+        assert manager.get(second.id) is second
+
+
+@pytest.mark.unit
+class TestDisconnectCancellation:
+    """Jobs started from a stream are cancelled when it goes away."""
+
+    def test_last_detach_cancels_job(self) -> None:
+        """Without a grace period, the last detach requests cancellation."""
+        from src.services.research_jobs import CANCEL_REASON_DISCONNECT, ResearchJob
+
+        job = ResearchJob("q", cancel_on_disconnect=True)
+        job.attach()
+        job.attach()
+        job.detach()
+        assert not job.cancel_requested
+
+        job.detach()
+
+        assert job.cancel_requested
+        assert job.cancel_reason == CANCEL_REASON_DISCONNECT
+
+    def test_detach_without_cancel_on_disconnect_keeps_running(self) -> None:
+        """Jobs submitted without cancel_on_disconnect survive disconnects."""
+        from src.services.research_jobs import ResearchJob
+
+        job = ResearchJob("q")
+        job.attach()
+        job.detach()
+
+        assert not job.cancel_requested
+
+    def test_reattach_within_grace_period_prevents_cancel(self) -> None:
+        """A subscriber re-attaching before the grace period ends keeps the job."""
+        from src.services.research_jobs import ResearchJob
+
+        job = ResearchJob("q", cancel_on_disconnect=True, disconnect_grace_seconds=0.05)
+        job.attach()
+        job.detach()
+        job.attach()
+        threading.Event().wait(0.15)
+
+        assert not job.cancel_requested
+
+    def test_grace_period_expiry_cancels(self) -> None:
+        """With no re-attach, cancellation follows the grace period."""
+        from src.services.research_jobs import ResearchJob
+
+        job = ResearchJob("q", cancel_on_disconnect=True, disconnect_grace_seconds=0.05)
+        job.attach()
+        job.detach()
+
+        assert job.cancel_event.wait(5)
+
+    def test_cancelled_run_is_recorded_as_cancelled(self) -> None:
+        """A runner that stops after cancellation leaves the job cancelled, not failed."""
+        from src.services.research_jobs import JobStatus, ResearchJobManager
+
+        def runner(job):
+            job.request_cancel("test")
+            raise RuntimeError("interrupted")
+
+        job = ResearchJobManager(runner=runner).submit("q")
+        _wait_finished(job)
+
+        assert job.status == JobStatus.CANCELLED
+        assert job.error is None
+        assert job.to_dict()["cancel_reason"] == "test"
+
+    def test_job_cancelled_while_queued_never_runs(self) -> None:
+        """A job cancelled before a worker picks it up is skipped."""
+        from src.services.research_jobs import JobStatus, ResearchJobManager
+
+        release = threading.Event()
+        ran: list[str] = []
+
+        def runner(job):
+            ran.append(job.query)
+            release.wait(5)
+            return None
+
+        manager = ResearchJobManager(runner=runner, max_workers=1)
+        first = manager.submit("a")
+        second = manager.submit("b")
+        second.request_cancel("test")
+        release.set()
+        _wait_finished(first)
+        _wait_finished(second)
+
+        assert second.status == JobStatus.CANCELLED
+        assert ran == ["a"]
+
+
+@pytest.mark.unit
+class TestAsyncEvents:
+    """next_events waits on the event loop for published events."""
+
+    def test_returns_published_event(self) -> None:
+        """An event published from another thread wakes the waiter."""
+        from src.services.research_jobs import ResearchJob
+
+        job = ResearchJob("q")
+
+        async def wait_for_event():
+            threading.Timer(0.05, job.publish, args=[{"type": "progress"}]).start()
+            return await job.next_events(0, timeout=5)
+
+        events, finished = asyncio.run(wait_for_event())
+
+        assert events == [(1, {"type": "progress"})]
+        assert not finished
+
+    def test_timeout_returns_nothing(self) -> None:
+        """With no new events, the wait times out empty."""
+        from src.services.research_jobs import ResearchJob
+
+        job = ResearchJob("q")
+
+        assert asyncio.run(job.next_events(0, timeout=0.01)) == ([], False)
+
+
+@pytest.mark.unit
+class TestEventBuffer:
+    """Events carry increasing ids and are kept in a bounded buffer."""
+
+    def test_publish_returns_increasing_ids(self) -> None:
+        """Ids start at 1 and count every published event."""
+        from src.services.research_jobs import ResearchJob
+
+        job = ResearchJob("q")
+
+        assert [job.publish({"n": i}) for i in range(3)] == [1, 2, 3]
+        assert job.last_event_id == 3
+        assert job.to_dict()["event_count"] == 3
+
+    def test_resume_after_id_returns_only_missed_events(self) -> None:
+        """next_events after an id skips everything up to it."""
+        from src.services.research_jobs import ResearchJob
+
+        job = ResearchJob("q")
+        for i in range(5):
+            job.publish({"n": i})
+
+        events, _ = asyncio.run(job.next_events(3, timeout=0))
+
+        assert events == [(4, {"n": 3}), (5, {"n": 4})]
+
+    def test_buffer_evicts_oldest_events(self) -> None:
+        """Resuming from an evicted id continues from the oldest buffered event."""
+        from src.services.research_jobs import ResearchJob
+
+        job = ResearchJob("q", event_buffer_size=2)
+        for i in range(5):
+            job.publish({"n": i})
+
+        events, _ = asyncio.run(job.next_events(0, timeout=0))
+
+        assert [event_id for event_id, _ in events] == [4, 5]
+        assert job.to_dict()["event_count"] == 5
+
+
+@pytest.mark.unit
+class TestQueryCoalescing:
+    """Concurrent identical queries share one run."""
+
+    def test_normalize_query(self) -> None:
+        """Case, spacing and trailing punctuation do not distinguish queries."""
+        from src.services.research_jobs import normalize_query
+
+        assert normalize_query("  What is  CPAP? ") == normalize_query("what is cpap")
+        assert normalize_query("CPAP for kids") != normalize_query("CPAP for adults")
+
+    def test_identical_in_flight_query_joins_running_job(self) -> None:
+        """A second submission while the first runs returns the same job and filename."""
+        from src.services.metrics import RESEARCH_RUNS_COALESCED
+        from src.services.research_jobs import ResearchJobManager
+
+        release = threading.Event()
+        runs: list[str] = []
+
+        def runner(job):
+            runs.append(job.query)
+            release.wait(5)
+            return "shared.md"
+
+        manager = ResearchJobManager(runner=runner, coalesce=True)
+        before = RESEARCH_RUNS_COALESCED.value()
+        first = manager.submit("What is CPAP?")
+        second = manager.submit("what is  cpap")
+        release.set()
+        _wait_finished(first)
+
+        assert second is first
+        assert runs == ["What is CPAP?"]
+        assert second.filename == "shared.md"
+        assert RESEARCH_RUNS_COALESCED.value() == before + 1
+
+    def test_finished_job_is_not_joined(self) -> None:
+        """Once a run finishes, the same query starts a new run."""
+        from src.services.research_jobs import ResearchJobManager
+
+        manager = ResearchJobManager(runner=lambda job: None, coalesce=True)
+        first = manager.submit("q")
+        _wait_finished(first)
+
+        assert manager.submit("q") is not first
+
+    def test_cancelled_job_is_not_joined(self) -> None:
+        """A job being cancelled does not absorb new requests."""
+        from src.services.research_jobs import ResearchJobManager
+
+        release = threading.Event()
+        manager = ResearchJobManager(runner=lambda job: release.wait(5), coalesce=True)
+        first = manager.submit("q")
+        first.request_cancel("test")
+        second = manager.submit("q")
+        release.set()
+
+        assert second is not first
+
+    def test_joined_job_keeps_strictest_disconnect_policy(self) -> None:
+        """A requester that must not be cancelled by disconnects protects the shared job."""
+        from src.services.research_jobs import ResearchJobManager
+
+        release = threading.Event()
+        manager = ResearchJobManager(runner=lambda job: release.wait(5), coalesce=True)
+        job = manager.submit("q", cancel_on_disconnect=True)
+        manager.submit("q", cancel_on_disconnect=False)
+        release.set()
+
+        assert job.cancel_on_disconnect is False
+
+    def test_coalescing_disabled_starts_separate_runs(self) -> None:
+        """Without coalesce, every submission is its own job."""
+        from src.services.research_jobs import ResearchJobManager
+
+        release = threading.Event()
+        manager = ResearchJobManager(runner=lambda job: release.wait(5))
+        first = manager.submit("q")
+        second = manager.submit("q")
+        release.set()
+
+        assert second is not first
+
+
+def _blocking_manager(release: threading.Event, **kwargs):
+    """Manager whose runs block until release is set, with one worker."""
+    from src.services.research_jobs import ResearchJobManager
+
+    started = threading.Semaphore(0)
+
+    def runner(job):
+        started.release()
+        release.wait(5)
+        return None
+
+    manager = ResearchJobManager(runner=runner, max_workers=1, **kwargs)
+    return manager, started
+
+
+@pytest.mark.unit
+class TestAdmissionControl:
+    """Runs beyond the worker limit wait in a bounded queue."""
+
+    def test_waiting_job_gets_queue_position_event(self) -> None:
+        """A job submitted while every worker is busy is told its position and wait."""
+        from src.services.research_jobs import EVENT_TYPE_QUEUED
+
+        release = threading.Event()
+        manager, started = _blocking_manager(release)
+        first = manager.submit("a")
+        assert started.acquire(timeout=5)
+        second = manager.submit("b")
+
+        event = collect_job_events(second, count=1)[0]
+        release.set()
+        _wait_finished(second)
+
+        assert first.to_dict()["queue_position"] is None
+        assert event["type"] == EVENT_TYPE_QUEUED
+        assert event["queue_position"] == 1
+        assert event["estimated_wait_seconds"] > 0
+
+    def test_positions_advance_as_jobs_start(self) -> None:
+        """When the head of the queue starts, the next job learns it moved up."""
+        release = threading.Event()
+        manager, started = _blocking_manager(release)
+        manager.submit("a")
+        assert started.acquire(timeout=5)
+        manager.submit("b")
+        third = manager.submit("c")
+
+        release.set()
+        positions = [
+            event["queue_position"]
+            for event in collect_job_events(third)
+            if event["type"] == "queued"
+        ]
+
+        assert positions[:2] == [2, 1]
+
+    def test_full_queue_rejects_with_retry_after(self) -> None:
+        """Once max_queued jobs wait, submit raises with a retry hint."""
+        from src.services.metrics import RESEARCH_REQUESTS_REJECTED
+        from src.services.research_jobs import ResearchQueueFullError
+
+        release = threading.Event()
+        manager, started = _blocking_manager(release, max_queued=1)
+        manager.submit("a")
+        assert started.acquire(timeout=5)
+        manager.submit("b")
+        before = RESEARCH_REQUESTS_REJECTED.value()
+
+        with pytest.raises(ResearchQueueFullError) as exc_info:
+            manager.submit("c")
+        release.set()
+
+        assert exc_info.value.retry_after_seconds >= 1
+        assert RESEARCH_REQUESTS_REJECTED.value() == before + 1
+
+    def test_wait_estimate_uses_observed_durations(self) -> None:
+        """Estimates follow the mean of recent successful run durations."""
+        from unittest.mock import patch
+
+        from src.services.research_jobs import ResearchJobManager
+
+        clock = [100.0]
+        release = threading.Event()
+
+        def runner(job):
+            clock[0] += 40.0
+            return None
+
+        with patch("src.services.research_jobs._monotonic", side_effect=lambda: clock[0]):
+            manager = ResearchJobManager(runner=runner, max_workers=1)
+            _wait_finished(manager.submit("warm-up"))
+
+            manager._runner = lambda job: release.wait(5)
+            manager.submit("a")
+            while not manager._running:
+                threading.Event().wait(0.01)
+            clock[0] += 10.0
+            second = manager.submit("b")
+            event = collect_job_events(second, count=1)[0]
+            release.set()
+            _wait_finished(second)
+
+        assert event["estimated_wait_seconds"] == 30.0
+
+
+@pytest.mark.unit
+class TestCachedJobs:
+    """Jobs answered from a saved report."""
+
+    def test_add_cached_records_finished_job(self) -> None:
+        """The cached job replays its result and reports success without a run."""
+        from src.services.research_jobs import JobStatus, ResearchJobManager
+
+        runs: list[str] = []
+        manager = ResearchJobManager(runner=lambda job: runs.append(job.query))
+        result = {"type": "result", "data": "# Report", "cached": True}
+
+        job = manager.add_cached("q", result, "r.md")
+
+        assert manager.get(job.id) is job
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.to_dict()["cached"] is True
+        assert collect_job_events(job) == [result]
+        assert runs == []
+
+
+@pytest.mark.unit
+class TestResumedJobs:
+    """Runs interrupted by a restart are queued again."""
+
+    def test_resume_keeps_job_id_and_bypasses_queue_limit(self) -> None:
+        """A resumed job reuses its id, is flagged resumed, and is admitted when full."""
+        from src.services.research_jobs import JobStatus
+
+        release = threading.Event()
+        manager, started = _blocking_manager(release, max_queued=0)
+        manager.submit("running")
+        assert started.acquire(timeout=5)
+
+        job = manager.resume("job-1", "interrupted")
+
+        assert manager.get("job-1") is job
+        assert job.resumed
+        assert job.to_dict()["resumed"] is True
+        release.set()
+        collect_job_events(job)
+        assert job.status == JobStatus.SUCCEEDED
+
+    def test_resume_restores_run_terms(self) -> None:
+        """A resumed job keeps its limits, disconnect flag and used budget."""
+        from src.services.budgets import BudgetLimits, BudgetUsage
+
+        release = threading.Event()
+        release.set()
+        manager, _started = _blocking_manager(release)
+        limits = BudgetLimits(max_tokens=100)
+        used = BudgetUsage(iterations=1)
+
+        job = manager.resume(
+            "job-1", "q", cancel_on_disconnect=True, limits=limits, budget_used=used
+        )
+
+        assert (job.cancel_on_disconnect, job.limits, job.budget_used) == (True, limits, used)
+
+
+@pytest.mark.unit
+class TestBudgetLimitsOnJobs:
+    """Jobs carry their own budget limits."""
+
+    def test_only_jobs_with_equal_limits_coalesce(self) -> None:
+        """A query with different limits starts its own run."""
+        from src.services.budgets import BudgetLimits
+
+        release = threading.Event()
+        manager, _ = _blocking_manager(release, coalesce=True)
+        limits = BudgetLimits(max_iterations=3)
+
+        first = manager.submit("q", limits=limits)
+        same = manager.submit("Q", limits=BudgetLimits(max_iterations=3))
+        other = manager.submit("q")
+        release.set()
+
+        assert same is first
+        assert other is not first
+        assert first.limits == limits
+        assert other.limits is None
+
+
+@pytest.mark.unit
+class TestAsyncRunner:
+    """Coroutine-function runners are awaited by async workers."""
+
+    def test_runs_share_one_event_loop_thread(self) -> None:
+        """Many runs wait concurrently on the loop thread instead of one thread each."""
+        from src.services.research_jobs import (
+            EVENT_LOOP_THREAD_NAME,
+            JobStatus,
+            ResearchJobManager,
+        )
+
+        threads: set[str] = set()
+        running = 0
+        peak = 0
+
+        async def runner(job):
+            nonlocal running, peak
+            threads.add(threading.current_thread().name)
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return f"{job.query}.md"
+
+        manager = ResearchJobManager(runner=runner, max_workers=20, max_queued=0)
+        jobs = [manager.submit(f"q{i}") for i in range(20)]
+        for job in jobs:
+            _wait_finished(job)
+
+        assert {job.status for job in jobs} == {JobStatus.SUCCEEDED}
+        assert jobs[3].filename == "q3.md"
+        assert threads == {EVENT_LOOP_THREAD_NAME}
+        assert peak == 20
+
+    def test_async_runner_error_fails_job(self) -> None:
+        """An exception from an async runner marks the job failed."""
+        from src.services.research_jobs import JobStatus, ResearchJobManager
+
+        async def runner(job):
+            raise RuntimeError("boom")
+
+        job = ResearchJobManager(runner=runner).submit("q")
+        _wait_finished(job)
+
+        assert job.status == JobStatus.FAILED
+        assert job.error == "boom"
+
+    def test_async_workers_cap_concurrent_runs(self) -> None:
+        """At most max_workers async runs are in progress at once."""
+        from src.services.research_jobs import ResearchJobManager
+
+        running = 0
+        peak = 0
+
+        async def runner(job):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return None
+
+        manager = ResearchJobManager(runner=runner, max_workers=2)
+        jobs = [manager.submit(f"q{i}") for i in range(5)]
+        for job in jobs:
+            _wait_finished(job)
+
+        assert peak == 2
@@ -6,15 +6,31 @@ Tests cover:
 - AC-3: Report auto-saved after completion
 - AC-4: Invalid requests return 422
 - AC-5: Agent errors streamed as error events
+- Research runs as background jobs with status polling and re-attach
+- Cancelled runs stop at node boundaries and optionally save partial reports
+- Orchestrator tokens stream as delta events before the final result
+- Events carry SSE ids and streams resume after Last-Event-ID
+- Identical concurrent queries share one run and report
+- A full research queue is answered with 503 and Retry-After
+- Repeated queries are answered from the report cache unless force_refresh is set
+- Checkpointed runs interrupted by a restart resume from their last completed step
+- Runs of a process that stops renewing its lease are resumed by a running app
+  on app startup, keeping their limits and the budget already used
+- Step and token budgets stop the run and force a report from findings so far
+- Node durations and LLM calls of each run are recorded as metrics
+- Async runs stream the agent with astream and resume from checkpoints
+- Repeated tool calls of a run are deduplicated per run and counted in the job status
 """
 
+import asyncio
+import contextlib
 import json
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from tests.conftest import make_mock_settings
+from tests.conftest import collect_job_events, make_mock_settings
 
 
 def _create_test_app():
@@ -396,3 +412,1079 @@ class TestResearchSchemas:
         for event_type in ("progress", "result", "error"):
             event = StreamEvent(type=event_type, data="test")
             assert event.type == event_type
+
+
+# ---- Background research jobs ----
+
+
+def _create_job_app(content: str = "Job report"):
+    """Create a test app whose agent returns one final message."""
+    from fastapi import FastAPI
+
+    from src.api.routes.research import create_research_router
+
+    mock_agent = MagicMock()
+    mock_agent.stream.side_effect = lambda *_args, **_kwargs: iter(
+        [{"model": {"messages": [MagicMock(content=content)]}}]
+    )
+    app = FastAPI()
+    router = create_research_router(settings=make_mock_settings(), agent=mock_agent)
+    app.include_router(router, prefix="/api")
+    return app
+
+
+def _parse_events(text: str) -> list[dict]:
+    return [
+        json.loads(line.removeprefix("data: "))
+        for line in text.strip().split("\n")
+        if line.startswith("data:")
+    ]
+
+
+@pytest.mark.unit
+class TestResearchJobs:
+    """Research runs as a job that can be polled and re-attached."""
+
+    def test_stream_response_carries_job_id(self) -> None:
+        """POST /api/research returns the job id in X-Job-Id."""
+        from fastapi.testclient import TestClient
+
+        client = TestClient(_create_job_app())
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_job.md")
+            response = client.post("/api/research", json={"query": "test"})
+
+        job_id = response.headers["X-Job-Id"]
+        status = client.get(f"/api/research/jobs/{job_id}").json()
+        assert status["status"] == "succeeded"
+        assert status["filename"] == "2026-02-08_job.md"
+        assert status["report_url"] == "/api/reports/2026-02-08_job"
+
+    def test_submit_returns_202_and_events_can_be_attached(self) -> None:
+        """POST /api/research/jobs queues a job whose events stream on attach."""
+        from fastapi.testclient import TestClient
+
+        client = TestClient(_create_job_app("Attached report"))
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_attached.md")
+            response = client.post("/api/research/jobs", json={"query": "test"})
+            job_id = response.json()["job_id"]
+            events = _parse_events(client.get(f"/api/research/jobs/{job_id}/events").text)
+
+        assert response.status_code == 202
+        assert events[-1]["type"] == "result"
+        assert events[-1]["data"] == "Attached report"
+
+    def test_reattach_replays_completed_run(self) -> None:
+        """Attaching twice yields the same events without rerunning the agent."""
+        from fastapi.testclient import TestClient
+
+        client = TestClient(_create_job_app())
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_job.md")
+            job_id = client.post("/api/research", json={"query": "test"}).headers["X-Job-Id"]
+            first = client.get(f"/api/research/jobs/{job_id}/events").text
+            second = client.get(f"/api/research/jobs/{job_id}/events").text
+
+        assert first == second
+        mock_save.assert_called_once()
+
+    def test_failed_job_status_has_error(self) -> None:
+        """Agent errors mark the job failed."""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from src.api.routes.research import create_research_router
+
+        mock_agent = MagicMock()
+        mock_agent.stream.side_effect = RuntimeError("Agent crashed")
+        app = FastAPI()
+        app.include_router(
+            create_research_router(settings=make_mock_settings(), agent=mock_agent),
+            prefix="/api",
+        )
+        client = TestClient(app)
+
+        job_id = client.post("/api/research", json={"query": "test"}).headers["X-Job-Id"]
+        status = client.get(f"/api/research/jobs/{job_id}").json()
+
+        assert status["status"] == "failed"
+        assert status["error"] == "Agent crashed"
+
+    def test_unknown_job_returns_404(self) -> None:
+        """Status and events for unknown ids return 404."""
+        from fastapi.testclient import TestClient
+
+        client = TestClient(_create_job_app())
+
+        assert client.get("/api/research/jobs/missing").status_code == 404
+        assert client.get("/api/research/jobs/missing/events").status_code == 404
+
+
+def _cancellable_agent(job_holder: list):
+    """Mock agent whose stream requests cancellation after its first chunk."""
+    mock_agent = MagicMock()
+
+    def stream(*_args, **_kwargs):
+        yield {"model": {"messages": [MagicMock(content="Partial findings")]}}
+        job_holder[0].request_cancel("client_disconnected")
+        yield {"tools": {"messages": [MagicMock(content="never published")]}}
+
+    mock_agent.stream.side_effect = stream
+    return mock_agent
+
+
+@pytest.mark.unit
+class TestResearchCancellation:
+    """Cancellation stops the run and is recorded."""
+
+    def test_cancel_stops_at_next_node_boundary(self) -> None:
+        """Chunks after cancellation are not processed and no report is saved."""
+        from src.api.routes.research import _run_research
+        from src.services.metrics import RESEARCH_RUNS_CANCELLED
+        from src.services.research_jobs import ResearchJob
+
+        job = ResearchJob("q")
+        before = RESEARCH_RUNS_CANCELLED.value(reason="client_disconnected")
+
+        with patch("src.api.routes.research.save_report") as mock_save:
+            filename = _run_research(job, _cancellable_agent([job]), make_mock_settings())
+
+        events = [event for _, event in job._events]
+        assert filename is None
+        mock_save.assert_not_called()
+        assert "Processing: tools" not in [event["data"] for event in events]
+        assert events[-1]["type"] == "cancelled"
+        assert RESEARCH_RUNS_CANCELLED.value(reason="client_disconnected") == before + 1
+
+    def test_partial_report_saved_when_enabled(self) -> None:
+        """With partial reports enabled, content so far is saved with a note."""
+        from src.api.routes.research import PARTIAL_REPORT_NOTE, _run_research
+        from src.services.research_jobs import ResearchJob
+
+        settings = make_mock_settings()
+        settings.research_save_partial_reports = True
+        job = ResearchJob("q")
+
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_q.md")
+            filename = _run_research(job, _cancellable_agent([job]), settings)
+
+        assert filename == "2026-02-08_q.md"
+        assert mock_save.call_args.kwargs["content"] == PARTIAL_REPORT_NOTE + "Partial findings"
+        assert job._events[-1][1]["filename"] == "2026-02-08_q.md"
+
+    def test_agent_runs_with_cancellation_callback(self) -> None:
+        """The agent stream receives the cancellation callback handler."""
+        from src.api.routes.research import _run_research
+        from src.services.cancellation import CancellationCallbackHandler
+        from src.services.research_jobs import ResearchJob
+
+        mock_agent = MagicMock()
+        mock_agent.stream.return_value = iter([])
+
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/r.md")
+            _run_research(ResearchJob("q"), mock_agent, make_mock_settings())
+
+        callbacks = mock_agent.stream.call_args.kwargs["config"]["callbacks"]
+        assert isinstance(callbacks[0], CancellationCallbackHandler)
+
+    def test_closing_stream_detaches_subscriber(self) -> None:
+        """Closing the SSE generator cancels a disconnect-bound job."""
+        import asyncio
+
+        from src.api.routes.research import _research_stream_generator
+        from src.services.research_jobs import ResearchJob
+
+        job = ResearchJob("q", cancel_on_disconnect=True)
+        job.publish({"type": "progress", "data": "Starting research..."})
+
+        async def read_one_then_disconnect():
+            stream = _research_stream_generator(job)
+            first = await anext(stream)
+            await stream.aclose()
+            return first
+
+        first = asyncio.run(read_one_then_disconnect())
+
+        assert "Starting research" in first
+        assert job.cancel_requested
+
+
+def _token_stream_agent():
+    """Mock agent yielding (mode, payload) parts like LangGraph's multi-mode stream."""
+    from langchain_core.messages import AIMessageChunk, ToolMessage
+
+    orchestrator = {"langgraph_node": "model", "langgraph_checkpoint_ns": "model:1"}
+    mock_agent = MagicMock()
+    mock_agent.stream.return_value = iter(
+        [
+            ("messages", (AIMessageChunk(content="# Rep", id="m1"), orchestrator)),
+            (
+                "messages",
+                (ToolMessage(content="search hit", tool_call_id="t1"), {"langgraph_node": "tools"}),
+            ),
+            (
+                "messages",
+                (
+                    AIMessageChunk(content="subagent text", id="s1"),
+                    {"langgraph_node": "model", "langgraph_checkpoint_ns": "tools:2|model:3"},
+                ),
+            ),
+            ("messages", (AIMessageChunk(content="ort", id="m1"), orchestrator)),
+            ("updates", {"model": {"messages": [MagicMock(content="# Report")]}}),
+        ]
+    )
+    return mock_agent
+
+
+@pytest.mark.unit
+class TestDeltaStreaming:
+    """Report text streams incrementally as delta events."""
+
+    def test_orchestrator_tokens_become_delta_events(self) -> None:
+        """Only top-level orchestrator text is streamed, in order, before the result."""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from src.api.routes.research import create_research_router
+
+        app = FastAPI()
+        app.include_router(
+            create_research_router(settings=make_mock_settings(), agent=_token_stream_agent()),
+            prefix="/api",
+        )
+        client = TestClient(app)
+
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_test.md")
+            events = _parse_events(client.post("/api/research", json={"query": "q"}).text)
+
+        deltas = [event for event in events if event["type"] == "delta"]
+        assert [event["data"] for event in deltas] == ["# Rep", "ort"]
+        assert {event["message_id"] for event in deltas} == {"m1"}
+        assert events[-1]["type"] == "result"
+        assert events[-1]["data"] == "# Report"
+
+    def test_agent_streams_updates_and_messages(self) -> None:
+        """The agent is streamed in updates and messages modes."""
+        from src.api.routes.research import _run_research
+        from src.services.research_jobs import ResearchJob
+
+        mock_agent = _token_stream_agent()
+
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/r.md")
+            _run_research(ResearchJob("q"), mock_agent, make_mock_settings())
+
+        assert mock_agent.stream.call_args.kwargs["stream_mode"] == ["updates", "messages"]
+
+
+@pytest.mark.unit
+class TestResumableStreams:
+    """SSE events carry ids and reconnects replay only missed events."""
+
+    def test_every_event_has_increasing_id(self) -> None:
+        """Each data line is preceded by an id line counting from 1."""
+        from fastapi.testclient import TestClient
+
+        client = TestClient(_create_job_app())
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_job.md")
+            text = client.post("/api/research", json={"query": "test"}).text
+
+        blocks = [block.split("\n") for block in text.strip().split("\n\n")]
+        ids = [int(lines[0].removeprefix("id: ")) for lines in blocks]
+        assert ids == list(range(1, len(blocks) + 1))
+        assert all(lines[1].startswith("data: ") for lines in blocks)
+
+    def test_last_event_id_replays_only_missed_events(self) -> None:
+        """Reconnecting with Last-Event-ID skips events already received."""
+        from fastapi.testclient import TestClient
+
+        client = TestClient(_create_job_app("Resumed report"))
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_job.md")
+            response = client.post("/api/research", json={"query": "test"})
+            all_events = _parse_events(response.text)
+            job_id = response.headers["X-Job-Id"]
+            resumed = client.get(
+                f"/api/research/jobs/{job_id}/events", headers={"Last-Event-ID": "2"}
+            )
+
+        assert _parse_events(resumed.text) == all_events[2:]
+        assert resumed.text.startswith("id: 3\n")
+        mock_save.assert_called_once()
+
+    def test_invalid_last_event_id_returns_422(self) -> None:
+        """A non-numeric Last-Event-ID is rejected."""
+        from fastapi.testclient import TestClient
+
+        client = TestClient(_create_job_app())
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_job.md")
+            job_id = client.post("/api/research", json={"query": "test"}).headers["X-Job-Id"]
+            response = client.get(
+                f"/api/research/jobs/{job_id}/events", headers={"Last-Event-ID": "abc"}
+            )
+
+        assert response.status_code == 422
+
+
+@pytest.mark.unit
+class TestCoalescedResearch:
+    """Concurrent identical requests subscribe to one run."""
+
+    def test_concurrent_identical_queries_share_job_and_filename(self) -> None:
+        """The second request gets the first request's job id and report filename."""
+        import threading
+
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from src.api.routes.research import create_research_router
+
+        release = threading.Event()
+
+        def stream(*_args, **_kwargs):
+            release.wait(5)
+            yield {"model": {"messages": [MagicMock(content="Shared report")]}}
+
+        mock_agent = MagicMock()
+        mock_agent.stream.side_effect = stream
+        app = FastAPI()
+        app.include_router(
+            create_research_router(settings=make_mock_settings(), agent=mock_agent),
+            prefix="/api",
+        )
+        client = TestClient(app)
+
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_shared.md")
+            first = client.post("/api/research/jobs", json={"query": "Statins?"}).json()
+            second = client.post("/api/research/jobs", json={"query": "statins"}).json()
+            release.set()
+            events = _parse_events(client.get(f"/api/research/jobs/{second['job_id']}/events").text)
+
+        assert second["job_id"] == first["job_id"]
+        assert events[-1]["filename"] == "2026-02-08_shared.md"
+        mock_agent.stream.assert_called_once()
+        mock_save.assert_called_once()
+
+
+@pytest.mark.unit
+class TestAdmissionControlEndpoints:
+    """Requests beyond queue capacity are shed quickly."""
+
+    def test_full_queue_returns_503_with_retry_after(self) -> None:
+        """Both submit endpoints answer 503 with Retry-After when the queue is full."""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from src.api.routes.research import create_research_router
+        from src.services.research_jobs import ResearchQueueFullError
+
+        job_manager = MagicMock()
+        job_manager.submit.side_effect = ResearchQueueFullError(42)
+        app = FastAPI()
+        app.include_router(
+            create_research_router(
+                settings=make_mock_settings(), agent=MagicMock(), job_manager=job_manager
+            ),
+            prefix="/api",
+        )
+        client = TestClient(app)
+
+        for path in ("/api/research", "/api/research/jobs"):
+            response = client.post(path, json={"query": "q"})
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "42"
+
+
+def _create_cache_app(cache_enabled: bool = True):
+    """Create a test app with the report cache toggled and a counting agent."""
+    from fastapi import FastAPI
+
+    from src.api.routes.research import create_research_router
+
+    settings = make_mock_settings()
+    settings.research_cache_enabled = cache_enabled
+    mock_agent = MagicMock()
+    mock_agent.stream.side_effect = lambda *_args, **_kwargs: iter(
+        [{"model": {"messages": [MagicMock(content="Fresh report")]}}]
+    )
+    app = FastAPI()
+    app.include_router(create_research_router(settings=settings, agent=mock_agent), prefix="/api")
+    return app, mock_agent
+
+
+CACHED_REPORT = {
+    "filename": "2026-02-07_statins.md",
+    "query": "Statins",
+    "timestamp": "2026-02-07T10:00:00+00:00",
+    "content": "# Cached report",
+}
+
+
+@pytest.mark.unit
+class TestReportCache:
+    """Repeated questions are served from recent reports."""
+
+    def test_cache_hit_returns_cached_result_without_running_agent(self) -> None:
+        """A hit streams one result event marked cached, and the job is finished."""
+        from fastapi.testclient import TestClient
+
+        app, mock_agent = _create_cache_app()
+        client = TestClient(app)
+        with (
+            patch("src.api.routes.research.find_recent_report", return_value=CACHED_REPORT),
+            patch("src.api.routes.research.save_report") as mock_save,
+        ):
+            response = client.post("/api/research", json={"query": "statins"})
+
+        events = _parse_events(response.text)
+        assert events == [
+            {
+                "type": "result",
+                "data": "# Cached report",
+                "filename": "2026-02-07_statins.md",
+                "cached": True,
+                "message_id": None,
+                "queue_position": None,
+                "estimated_wait_seconds": None,
+            }
+        ]
+        status = client.get(f"/api/research/jobs/{response.headers['X-Job-Id']}").json()
+        assert status["status"] == "succeeded"
+        assert status["cached"] is True
+        mock_agent.stream.assert_not_called()
+        mock_save.assert_not_called()
+
+    def test_force_refresh_bypasses_cache(self) -> None:
+        """force_refresh runs the agent even when a cached report exists."""
+        from fastapi.testclient import TestClient
+
+        app, mock_agent = _create_cache_app()
+        with (
+            patch(
+                "src.api.routes.research.find_recent_report", return_value=CACHED_REPORT
+            ) as mock_find,
+            patch("src.api.routes.research.save_report") as mock_save,
+        ):
+            mock_save.return_value = Path("/tmp/2026-02-08_statins.md")
+            response = TestClient(app).post(
+                "/api/research", json={"query": "statins", "force_refresh": True}
+            )
+
+        events = _parse_events(response.text)
+        assert events[-1]["data"] == "Fresh report"
+        assert events[-1]["cached"] is False
+        mock_find.assert_not_called()
+        mock_agent.stream.assert_called_once()
+
+    def test_cache_miss_runs_agent(self) -> None:
+        """Without a fresh report, the agent runs as usual."""
+        from fastapi.testclient import TestClient
+
+        app, _ = _create_cache_app()
+        with (
+            patch("src.api.routes.research.find_recent_report", return_value=None),
+            patch("src.api.routes.research.save_report") as mock_save,
+        ):
+            mock_save.return_value = Path("/tmp/2026-02-08_statins.md")
+            response = TestClient(app).post("/api/research/jobs", json={"query": "statins"})
+
+        assert response.status_code == 202
+        assert response.json()["cached"] is False
+
+    def test_cache_disabled_skips_lookup(self) -> None:
+        """The cache is opt-in."""
+        from fastapi.testclient import TestClient
+
+        app, _ = _create_cache_app(cache_enabled=False)
+        with (
+            patch("src.api.routes.research.find_recent_report") as mock_find,
+            patch("src.api.routes.research.save_report") as mock_save,
+        ):
+            mock_save.return_value = Path("/tmp/2026-02-08_statins.md")
+            TestClient(app).post("/api/research", json={"query": "statins"})
+
+        mock_find.assert_not_called()
+
+
+# ---- Checkpointed runs ----
+
+
+def _two_step_graph(store, calls: dict[str, int], fail_first_model_call: bool):
+    """A real graph whose "research" step precedes the orchestrator "model" step."""
+    from langchain_core.messages import AIMessage
+    from langgraph.graph import END, START, MessagesState, StateGraph
+
+    def research(_state: MessagesState) -> dict:
+        calls["research"] += 1
+        return {"messages": [AIMessage(content="notes")]}
+
+    def model(_state: MessagesState) -> dict:
+        calls["model"] += 1
+        if fail_first_model_call and calls["model"] == 1:
+            raise RuntimeError("process killed")
+        return {"messages": [AIMessage(content="Final report")]}
+
+    graph = StateGraph(MessagesState)
+    graph.add_node("research", research)
+    graph.add_node("model", model)
+    graph.add_edge(START, "research")
+    graph.add_edge("research", "model")
+    graph.add_edge("model", END)
+    return graph.compile(checkpointer=store.saver)
+
+
+def _restart_after_interrupt(
+    tmp_path: Path,
+    calls: dict[str, int],
+    fail_first_model_call: bool,
+    limits=None,
+    cancel_on_disconnect: bool = False,
+    used=None,
+):
+    """Start "job-1" the way the runner does, lose the process, and open the store again.
+
+    Returns the new process's store and the agent compiled with its saver.
+    """
+    from langchain_core.messages import HumanMessage
+
+    from src.services.checkpoints import ResearchCheckpointStore, thread_config
+
+    path = str(tmp_path / "runs.sqlite3")
+    lost = ResearchCheckpointStore(path, max_age_seconds=3600)
+    agent = _two_step_graph(lost, calls, fail_first_model_call)
+    lost.start_run("job-1", "statins", limits, cancel_on_disconnect)
+    with contextlib.suppress(RuntimeError):
+        agent.invoke(
+            {"messages": [HumanMessage(content="statins")]},
+            config={"configurable": thread_config("job-1")},
+        )
+    if used is not None:
+        lost.record_usage("job-1", used)
+    lost.close()
+
+    store = ResearchCheckpointStore(path, max_age_seconds=3600)
+    return store, _two_step_graph(store, calls, fail_first_model_call)
+
+
+def _run_row(store, thread_id: str) -> tuple:
+    """(status, iterations) recorded for a run in the store's run table."""
+    import sqlite3
+
+    conn = sqlite3.connect(store.path)
+    row = conn.execute(
+        "SELECT status, iterations FROM research_runs WHERE thread_id = ?", (thread_id,)
+    ).fetchone()
+    conn.close()
+    return row
+
+
+def _resume_job(settings, agent, store):
+    """Create the job manager and resume the single interrupted run."""
+    from src.api.routes.research import create_job_manager, resume_interrupted_runs
+
+    [job] = resume_interrupted_runs(create_job_manager(settings, agent, store), store)
+    return job
+
+
+@pytest.mark.unit
+class TestCheckpointedRuns:
+    """Runs checkpoint their steps and resume after a restart."""
+
+    def test_interrupted_run_resumes_from_last_completed_step(self, tmp_path: Path) -> None:
+        """On startup the run is requeued under its id and completed steps are not redone."""
+        calls = {"research": 0, "model": 0}
+        store, agent = _restart_after_interrupt(tmp_path, calls, fail_first_model_call=True)
+
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_statins.md")
+            job = _resume_job(make_mock_settings(), agent, store)
+            events = collect_job_events(job)
+
+        assert job.id == "job-1"
+        assert job.resumed
+        assert job.to_dict()["status"] == "succeeded"
+        assert events[0]["data"] == "Resuming research..."
+        assert events[-1]["data"] == "Final report"
+        assert calls == {"research": 1, "model": 2}
+        assert _run_row(store, "job-1")[0] == "succeeded"
+        store.close()
+
+    def test_run_finished_before_save_uses_checkpointed_report(self, tmp_path: Path) -> None:
+        """A run lost after its last step saves the report from its checkpointed state."""
+        calls = {"research": 0, "model": 0}
+        store, agent = _restart_after_interrupt(tmp_path, calls, fail_first_model_call=False)
+
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_statins.md")
+            job = _resume_job(make_mock_settings(), agent, store)
+            events = collect_job_events(job)
+
+        assert events[-1]["data"] == "Final report"
+        assert mock_save.call_args.kwargs["content"] == "Final report"
+        assert calls == {"research": 1, "model": 1}
+        store.close()
+
+    def test_resumed_run_keeps_limits_and_used_budget(self, tmp_path: Path) -> None:
+        """The resumed job has its original limits and flag, and its budget continues."""
+        from src.services.budgets import BudgetLimits, BudgetUsage
+
+        calls = {"research": 0, "model": 0}
+        limits = BudgetLimits(max_iterations=5)
+        store, agent = _restart_after_interrupt(
+            tmp_path,
+            calls,
+            fail_first_model_call=True,
+            limits=limits,
+            cancel_on_disconnect=True,
+            used=BudgetUsage(iterations=2, tokens=40, elapsed_seconds=3.0),
+        )
+
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_statins.md")
+            job = _resume_job(make_mock_settings(), agent, store)
+            collect_job_events(job)
+
+        assert job.limits == limits
+        assert job.cancel_on_disconnect
+        assert _run_row(store, "job-1") == ("succeeded", 3)
+        store.close()
+
+    def test_router_resumes_runs_when_app_starts(self, tmp_path: Path) -> None:
+        """Creating the router claims nothing; the app's startup resumes the run."""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from src.api.routes.research import create_job_manager, create_research_router
+
+        calls = {"research": 0, "model": 0}
+        store, agent = _restart_after_interrupt(tmp_path, calls, fail_first_model_call=True)
+        settings = make_mock_settings()
+        jobs = create_job_manager(settings, agent, store)
+        app = FastAPI()
+        app.include_router(
+            create_research_router(settings, agent, job_manager=jobs, checkpoints=store),
+            prefix="/api",
+        )
+        assert jobs.get("job-1") is None
+
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_statins.md")
+            with TestClient(app):
+                job = jobs.get("job-1")
+                assert job is not None
+                collect_job_events(job)
+
+        assert job.to_dict()["status"] == "succeeded"
+        store.close()
+
+    def test_lapsed_lease_is_resumed_while_app_runs(self, tmp_path: Path) -> None:
+        """A run whose process stops renewing its lease is taken over after startup."""
+        import time
+
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from src.api.routes.research import create_job_manager, create_research_router
+        from src.services.checkpoints import ResearchCheckpointStore
+
+        path = str(tmp_path / "runs.sqlite3")
+        crashed = ResearchCheckpointStore(path, max_age_seconds=3600)
+        store = ResearchCheckpointStore(path, max_age_seconds=3600, lease_seconds=0.3)
+        calls = {"research": 0, "model": 0}
+        agent = _two_step_graph(store, calls, fail_first_model_call=False)
+        settings = make_mock_settings()
+        jobs = create_job_manager(settings, agent, store)
+        app = FastAPI()
+        app.include_router(
+            create_research_router(settings, agent, job_manager=jobs, checkpoints=store),
+            prefix="/api",
+        )
+
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_statins.md")
+            with TestClient(app):
+                crashed.start_run("job-1", "statins")
+                deadline = time.monotonic() + 5.0
+                while jobs.get("job-1") is None and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                job = jobs.get("job-1")
+                assert job is not None
+                collect_job_events(job)
+
+        assert job.resumed
+        assert job.to_dict()["status"] == "succeeded"
+        assert _run_row(store, "job-1")[0] == "succeeded"
+        crashed.close()
+        store.close()
+
+    def test_new_run_records_outcome_under_job_id(self, tmp_path: Path) -> None:
+        """A fresh run uses its job id as thread_id and is no longer running afterwards."""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from src.api.routes.research import create_research_router
+        from src.services.checkpoints import ResearchCheckpointStore
+
+        store = ResearchCheckpointStore(str(tmp_path / "runs.sqlite3"), max_age_seconds=3600)
+        calls = {"research": 0, "model": 0}
+        app = FastAPI()
+        app.include_router(
+            create_research_router(
+                settings=make_mock_settings(),
+                agent=_two_step_graph(store, calls, fail_first_model_call=False),
+                checkpoints=store,
+            ),
+            prefix="/api",
+        )
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_statins.md")
+            response = TestClient(app).post("/api/research", json={"query": "statins"})
+
+        assert store.has_checkpoint(response.headers["X-Job-Id"])
+        assert _run_row(store, response.headers["X-Job-Id"])[0] == "succeeded"
+        assert _parse_events(response.text)[-1]["data"] == "Final report"
+        store.close()
+
+
+# ---- Run budgets ----
+
+
+def _looping_agent(consumed: list[int]):
+    """An agent whose orchestrator calls a tool on every turn, forever."""
+    from langchain_core.messages import AIMessage, ToolMessage
+
+    def stream(*_args, **_kwargs):
+        turn = 0
+        while True:
+            turn += 1
+            consumed.append(turn)
+            call = {"name": "tavily_search", "args": {"query": f"q{turn}"}, "id": f"c{turn}"}
+            yield {"model": {"messages": [AIMessage(content="", tool_calls=[call])]}}
+            yield {
+                "tools": {
+                    "messages": [
+                        ToolMessage(content=f"finding {turn}", tool_call_id=f"c{turn}", name="s")
+                    ]
+                }
+            }
+
+    agent = MagicMock()
+    agent.stream.side_effect = stream
+    return agent
+
+
+def _create_budget_app(agent, synthesizer=None):
+    """Create a test app with a real job manager that tests can inspect."""
+    from fastapi import FastAPI
+
+    from src.api.routes.research import create_job_manager, create_research_router
+
+    settings = make_mock_settings()
+    jobs = create_job_manager(settings, agent, synthesizer=synthesizer)
+    app = FastAPI()
+    app.include_router(
+        create_research_router(
+            settings=settings, agent=agent, job_manager=jobs, synthesizer=synthesizer
+        ),
+        prefix="/api",
+    )
+    return app, jobs
+
+
+@pytest.mark.unit
+class TestRunBudgets:
+    """Budgets stop runaway runs and force a final report."""
+
+    def test_step_budget_stops_run_and_synthesizes_report(self) -> None:
+        """After max_iterations turns the run stops and the report is synthesized."""
+        from fastapi.testclient import TestClient
+
+        consumed: list[int] = []
+        synthesizer = MagicMock(return_value="# Synthesized report")
+        app, _ = _create_budget_app(_looping_agent(consumed), synthesizer)
+        client = TestClient(app)
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_loop.md")
+            response = client.post("/api/research", json={"query": "loop", "max_iterations": 2})
+
+        events = _parse_events(response.text)
+        result = events[-1]
+        assert result["type"] == "result"
+        assert result["data"].startswith("> Research stopped early (step budget of 2")
+        assert result["data"].endswith("# Synthesized report")
+        assert consumed == [1, 2]
+        query, messages, reason = synthesizer.call_args.args
+        assert query == "loop"
+        assert [m.content for m in messages if m.type == "tool"] == ["finding 1"]
+        assert "step budget" in reason
+        assert mock_save.call_args.kwargs["partial"] is True
+        status = client.get(f"/api/research/jobs/{response.headers['X-Job-Id']}").json()
+        assert status["status"] == "succeeded"
+        assert status["budget_exhausted"] == "steps"
+
+    def test_budget_error_from_callbacks_forces_report(self) -> None:
+        """A run refused further calls by the budget handler still produces a report."""
+        from fastapi.testclient import TestClient
+        from langchain_core.messages import ToolMessage
+
+        from src.services.budgets import BudgetExhaustedError
+
+        def stream(*_args, **_kwargs):
+            yield {"tools": {"messages": [ToolMessage(content="finding", tool_call_id="c")]}}
+            raise BudgetExhaustedError("Research tokens budget exhausted")
+
+        agent = MagicMock()
+        agent.stream.side_effect = stream
+        synthesizer = MagicMock(return_value="# From findings")
+        app, _ = _create_budget_app(agent, synthesizer)
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_tokens.md")
+            response = TestClient(app).post("/api/research", json={"query": "tokens"})
+
+        result = _parse_events(response.text)[-1]
+        assert result["type"] == "result"
+        assert result["data"].endswith("# From findings")
+
+    def test_final_answer_within_budget_is_not_resynthesized(self) -> None:
+        """A run whose last allowed turn is its final answer keeps that answer."""
+        from fastapi.testclient import TestClient
+        from langchain_core.messages import AIMessage
+
+        agent = MagicMock()
+        agent.stream.side_effect = lambda *_a, **_k: iter(
+            [{"model": {"messages": [AIMessage(content="Complete report")]}}]
+        )
+        synthesizer = MagicMock()
+        app, _ = _create_budget_app(agent, synthesizer)
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_done.md")
+            response = TestClient(app).post(
+                "/api/research", json={"query": "done", "max_iterations": 1}
+            )
+
+        assert _parse_events(response.text)[-1]["data"] == "Complete report"
+        synthesizer.assert_not_called()
+        assert mock_save.call_args.kwargs["partial"] is False
+
+    def test_overrides_cannot_raise_configured_limits(self) -> None:
+        """Request limits above the settings are capped; the recursion limit follows."""
+        from fastapi.testclient import TestClient
+
+        agent = MagicMock()
+        agent.stream.side_effect = lambda *_a, **_k: iter([])
+        app, jobs = _create_budget_app(agent)
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_cap.md")
+            response = TestClient(app).post(
+                "/api/research",
+                json={"query": "cap", "max_iterations": 500, "max_tokens": 1000},
+            )
+
+        job = jobs.get(response.headers["X-Job-Id"])
+        assert job is not None
+        assert job.limits.max_iterations == 20
+        assert job.limits.max_tokens == 1000
+        assert agent.stream.call_args.kwargs["config"]["recursion_limit"] == 42
+
+    def test_non_positive_override_returns_422(self) -> None:
+        """Budget overrides must be positive."""
+        from fastapi.testclient import TestClient
+
+        app, _ = _create_budget_app(MagicMock())
+        response = TestClient(app).post("/api/research", json={"query": "q", "max_seconds": 0})
+
+        assert response.status_code == 422
+
+
+@pytest.mark.unit
+class TestRunMetrics:
+    """Research runs feed the metrics endpoint."""
+
+    def test_node_durations_are_recorded_per_update(self) -> None:
+        """Every node update observes the time since the previous one."""
+        from src.api.routes.research import _run_research
+        from src.services.metrics import RESEARCH_NODE_DURATION
+        from src.services.research_jobs import ResearchJob
+
+        before = RESEARCH_NODE_DURATION.count(node="model")
+
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/r.md")
+            _run_research(ResearchJob("q"), _token_stream_agent(), make_mock_settings())
+
+        assert RESEARCH_NODE_DURATION.count(node="model") == before + 1
+
+    def test_agent_runs_with_llm_metrics_callback(self) -> None:
+        """LLM calls inside the graph are measured by a callback handler."""
+        from src.api.routes.research import _run_research
+        from src.services.instrumentation import LLMMetricsCallbackHandler
+        from src.services.research_jobs import ResearchJob
+
+        mock_agent = _token_stream_agent()
+
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/r.md")
+            _run_research(ResearchJob("q"), mock_agent, make_mock_settings())
+
+        callbacks = mock_agent.stream.call_args.kwargs["config"]["callbacks"]
+        assert any(isinstance(handler, LLMMetricsCallbackHandler) for handler in callbacks)
+
+    def test_forced_synthesis_is_timed(self) -> None:
+        """The synthesis after a spent budget is recorded as its own node."""
+        from fastapi.testclient import TestClient
+
+        from src.api.routes.research import SYNTHESIS_NODE
+        from src.services.metrics import RESEARCH_NODE_DURATION
+
+        before = RESEARCH_NODE_DURATION.count(node=SYNTHESIS_NODE)
+        app, _ = _create_budget_app(_looping_agent([]), MagicMock(return_value="# Report"))
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_loop.md")
+            TestClient(app).post("/api/research", json={"query": "loop", "max_iterations": 1})
+
+        assert RESEARCH_NODE_DURATION.count(node=SYNTHESIS_NODE) == before + 1
+
+
+# ---- Async runs ----
+
+
+def _async_token_agent():
+    """Mock agent whose astream yields the same parts as _token_stream_agent."""
+    parts = list(_token_stream_agent().stream.return_value)
+
+    async def astream(*_args, **_kwargs):
+        for part in parts:
+            yield part
+
+    mock_agent = MagicMock()
+    mock_agent.astream.side_effect = astream
+    return mock_agent
+
+
+def _async_settings():
+    settings = make_mock_settings()
+    settings.research_async_runs = True
+    return settings
+
+
+@pytest.mark.unit
+class TestAsyncRuns:
+    """With research_async_runs the agent is streamed with astream."""
+
+    def test_async_run_streams_deltas_and_result(self) -> None:
+        """Deltas and the final result arrive; the sync stream is never used."""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from src.api.routes.research import create_research_router
+
+        mock_agent = _async_token_agent()
+        app = FastAPI()
+        app.include_router(
+            create_research_router(settings=_async_settings(), agent=mock_agent), prefix="/api"
+        )
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_q.md")
+            response = TestClient(app).post("/api/research", json={"query": "q"})
+
+        events = _parse_events(response.text)
+        assert [e["data"] for e in events if e["type"] == "delta"] == ["# Rep", "ort"]
+        assert events[-1] == {**events[-1], "type": "result", "data": "# Report"}
+        mock_agent.stream.assert_not_called()
+        assert mock_save.call_args.kwargs["content"] == "# Report"
+
+    def test_async_agent_error_fails_job(self) -> None:
+        """An exception from astream becomes an error event."""
+        from src.api.routes.research import _arun_research
+        from src.services.research_jobs import ResearchJob
+
+        async def astream(*_args, **_kwargs):
+            raise RuntimeError("ollama down")
+            yield  # pragma: no cover
+
+        mock_agent = MagicMock()
+        mock_agent.astream.side_effect = astream
+        job = ResearchJob("q")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(_arun_research(job, mock_agent, _async_settings()))
+
+        assert job._events[-1][1]["type"] == "error"
+
+    def test_interrupted_run_resumes_on_async_path(self, tmp_path: Path) -> None:
+        """The async checkpointer resumes a run without redoing completed steps."""
+        calls = {"research": 0, "model": 0}
+        store, agent = _restart_after_interrupt(tmp_path, calls, fail_first_model_call=True)
+
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_statins.md")
+            job = _resume_job(_async_settings(), agent, store)
+            events = collect_job_events(job)
+
+        assert job.to_dict()["status"] == "succeeded"
+        assert events[-1]["data"] == "Final report"
+        assert calls == {"research": 1, "model": 2}
+        assert _run_row(store, "job-1") == ("succeeded", 1)
+        store.close()
+
+
+def _repeating_tool_agent():
+    """Mock agent whose stream and astream make the same tool call twice through the run's memo."""
+    from src.services.tool_memo import current_tool_memo
+
+    def call_tool_twice():
+        memo = current_tool_memo()
+        assert memo is not None
+        for _ in range(2):
+            if memo.lookup("tavily_search", {"query": "statins"}) is None:
+                memo.store("tavily_search", {"query": "statins"}, "results")
+        return {"model": {"messages": [MagicMock(content="# Report")]}}
+
+    def stream(*_args, **_kwargs):
+        yield call_tool_twice()
+
+    async def astream(*_args, **_kwargs):
+        yield call_tool_twice()
+
+    mock_agent = MagicMock()
+    mock_agent.stream.side_effect = stream
+    mock_agent.astream.side_effect = astream
+    return mock_agent
+
+
+@pytest.mark.unit
+class TestToolMemo:
+    """Each run has its own tool memo, and its repeated calls are counted in the job status."""
+
+    def test_sync_run_reports_deduplicated_calls(self) -> None:
+        """A repeated call answered from the memo is reported in the job status."""
+        from src.api.routes.research import _run_research
+        from src.services.research_jobs import ResearchJob
+
+        job = ResearchJob("statins")
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_statins.md")
+            _run_research(job, _repeating_tool_agent(), make_mock_settings())
+
+        assert job.to_dict()["deduplicated_tool_calls"] == 1
+
+    def test_async_runs_do_not_share_a_memo(self) -> None:
+        """Every async run starts with an empty memo."""
+        from src.api.routes.research import _arun_research
+        from src.services.research_jobs import ResearchJob
+
+        agent = _repeating_tool_agent()
+        jobs = [ResearchJob("statins"), ResearchJob("statins")]
+        with patch("src.api.routes.research.save_report") as mock_save:
+            mock_save.return_value = Path("/tmp/2026-02-08_statins.md")
+            for job in jobs:
+                asyncio.run(_arun_research(job, agent, _async_settings()))
+
+        assert [job.deduplicated_tool_calls for job in jobs] == [1, 1]
@@ -5,10 +5,13 @@ Tests cover:
 - AC-2: Search returns structured results
 - AC-3: Search handles API errors gracefully
 - AC-4: Domain filtering is configurable
+- Search calls, failures and cache lookups are recorded as metrics
+- Async searches await the tool and run batches concurrently on the event loop
 """
 
+import asyncio
 import logging
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -192,6 +195,53 @@ class TestSearchErrorHandling:
         assert "Test Result" in result
         assert "https://example.com" in result
 
+    def test_is_failed_search_detects_whole_and_partial_failures(self) -> None:
+        """Single-search errors and failed batch queries are recognized; results are not."""
+        from src.tools.search import is_failed_search, safe_batch_search, safe_search
+
+        def search(args: dict) -> dict:
+            if args["query"] == "bad":
+                raise RuntimeError("down")
+            return {"results": [{"title": "T", "url": "https://a.org", "content": "C"}]}
+
+        tool = MagicMock()
+        tool.invoke.side_effect = search
+
+        assert is_failed_search(safe_search(tool, "bad"))
+        assert is_failed_search(safe_batch_search(tool, ["good", "bad"]))
+        assert not is_failed_search(safe_search(tool, "good"))
+        assert not is_failed_search(safe_batch_search(tool, ["good"]))
+
+    def test_error_payloads_are_failed_searches(self) -> None:
+        """An error payload, even with an empty error, is a failure rather than no results."""
+        from src.tools.search import (
+            NO_RESULTS_MESSAGE,
+            is_failed_search,
+            safe_batch_search,
+            safe_search,
+        )
+
+        tool = MagicMock()
+        tool.invoke.side_effect = lambda args: (
+            {"error": ""} if args["query"] == "bad" else {"results": []}
+        )
+
+        single = safe_search(tool, "bad")
+        batch = safe_batch_search(tool, ["good", "bad"])
+
+        assert is_failed_search(single)
+        assert single != NO_RESULTS_MESSAGE
+        assert single.startswith("Search failed")
+        assert is_failed_search(batch)
+        assert "Search failed for 'bad'" in batch
+        assert not is_failed_search(safe_search(tool, "good"))
+
+    def test_only_search_outputs_count_as_successful(self) -> None:
+        """Text not produced by the search helpers is never treated as a successful search."""
+        from src.tools.search import is_failed_search
+
+        assert is_failed_search("[1] Title\n    URL: https://a.org\n    Content")
+
 
 @pytest.mark.unit
 class TestConfigurableDomains:
@@ -229,3 +279,312 @@ class TestConfigurableDomains:
 
         call_kwargs = mock_tavily.call_args[1]
         assert call_kwargs["include_domains"] == DEFAULT_MEDICAL_DOMAINS
+
+
+@pytest.mark.unit
+class TestSearchResultCache:
+    """Search results are cached on disk behind safe_search."""
+
+    def _make_tool(self) -> MagicMock:
+        tool = MagicMock()
+        tool.include_domains = ["nih.gov"]
+        tool.search_depth = "advanced"
+        tool.max_results = 5
+        tool.invoke.return_value = {
+            "results": [{"title": "Cached", "url": "https://nih.gov/a", "content": "Body"}]
+        }
+        return tool
+
+    def _make_cache(self, tmp_path):
+        from src.services.disk_cache import DiskCache
+
+        return DiskCache(path=str(tmp_path / "search.sqlite3"), ttl_seconds=60, max_entries=10)
+
+    def test_hit_skips_network_and_returns_same_output(self, tmp_path) -> None:
+        """A repeated query is served from the cache with identical formatting."""
+        from src.tools.search import safe_search
+
+        tool = self._make_tool()
+        cache = self._make_cache(tmp_path)
+
+        first = safe_search(tool, "Statin myopathy", cache=cache)
+        second = safe_search(tool, "  statin   MYOPATHY ", cache=cache)
+
+        assert first == second
+        tool.invoke.assert_called_once()
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_key_includes_search_options(self) -> None:
+        """Different domains, depth, or result counts produce different keys."""
+        from src.tools.search import build_search_cache_key
+
+        base = build_search_cache_key("q", ["nih.gov"], "advanced", 5)
+
+        assert base == build_search_cache_key("Q ", ["nih.gov"], "advanced", 5)
+        assert base != build_search_cache_key("q", ["who.int"], "advanced", 5)
+        assert base != build_search_cache_key("q", ["nih.gov"], "basic", 5)
+        assert base != build_search_cache_key("q", ["nih.gov"], "advanced", 10)
+
+    def test_errors_are_not_cached(self, tmp_path) -> None:
+        """Failed searches are retried on the next call."""
+        from src.tools.search import safe_search
+
+        tool = self._make_tool()
+        tool.invoke.side_effect = [Exception("Rate limited"), tool.invoke.return_value]
+        cache = self._make_cache(tmp_path)
+
+        failed = safe_search(tool, "query", cache=cache)
+        succeeded = safe_search(tool, "query", cache=cache)
+
+        assert "failed" in failed.lower()
+        assert "Cached" in succeeded
+        assert tool.invoke.call_count == 2
+
+    def test_error_payloads_are_not_cached(self, tmp_path) -> None:
+        """Error dicts returned by TavilySearch are not stored."""
+        from src.tools.search import fetch_search_results
+
+        tool = self._make_tool()
+        tool.invoke.return_value = {"error": "boom"}
+        cache = self._make_cache(tmp_path)
+
+        fetch_search_results(tool, "query", cache=cache)
+
+        assert cache.stats()["entries"] == 0
+
+    def test_create_search_cache_disabled_returns_none(self, settings_fixture: MagicMock) -> None:
+        """No cache is created when search_cache_enabled is false."""
+        from src.tools.search import create_search_cache
+
+        settings_fixture.search_cache_enabled = False
+
+        assert create_search_cache(settings_fixture) is None
+
+    def test_create_search_cache_uses_settings(self, settings_fixture: MagicMock, tmp_path) -> None:
+        """The cache is built from the configured path, TTL, and size cap."""
+        from src.tools.search import create_search_cache
+
+        settings_fixture.search_cache_enabled = True
+        settings_fixture.search_cache_path = str(tmp_path / "c.sqlite3")
+
+        cache = create_search_cache(settings_fixture)
+
+        assert cache is not None
+        assert cache.ttl_seconds == settings_fixture.search_cache_ttl_seconds
+        assert cache.max_entries == settings_fixture.search_cache_max_entries
+
+
+@pytest.mark.unit
+class TestBatchSearch:
+    """Several sub-questions are searched concurrently with URL-level dedupe."""
+
+    def _make_tool(self, results_by_query: dict[str, list[dict[str, str]]]) -> MagicMock:
+        tool = MagicMock()
+        tool.invoke.side_effect = lambda payload: {"results": results_by_query[payload["query"]]}
+        return tool
+
+    def test_merges_results_and_drops_duplicate_urls(self) -> None:
+        """A URL returned by several queries appears once in the output."""
+        from src.tools.search import safe_batch_search
+
+        shared = {"title": "Shared", "url": "https://nih.gov/shared", "content": "A"}
+        tool = self._make_tool(
+            {
+                "q1": [shared, {"title": "One", "url": "https://nih.gov/1", "content": "B"}],
+                "q2": [
+                    {"title": "Shared again", "url": "https://NIH.gov/shared/", "content": "A"},
+                    {"title": "Two", "url": "https://nih.gov/2", "content": "C"},
+                ],
+            }
+        )
+
+        result = safe_batch_search(tool, ["q1", "q2"])
+
+        assert result.count("nih.gov/shared") == 1
+        assert "Shared again" not in result
+        assert "One" in result
+        assert "Two" in result
+
+    def test_runs_each_unique_query_once(self) -> None:
+        """Queries that normalize to the same text are searched once."""
+        from src.tools.search import safe_batch_search
+
+        tool = self._make_tool({"statins": [], "aspirin": []})
+
+        safe_batch_search(tool, ["statins", "  STATINS", "aspirin"])
+
+        assert tool.invoke.call_count == 2
+
+    def test_runs_queries_concurrently(self) -> None:
+        """Queries overlap in time on the worker pool."""
+        import threading
+
+        from src.tools.search import safe_batch_search
+
+        barrier = threading.Barrier(2, timeout=5)
+
+        def invoke(payload: dict[str, str]) -> dict[str, object]:
+            barrier.wait()
+            return {"results": []}
+
+        tool = MagicMock()
+        tool.invoke.side_effect = invoke
+
+        result = safe_batch_search(tool, ["a", "b"], max_workers=2)
+
+        assert "no results" in result.lower()
+
+    def test_failed_query_does_not_drop_others(self, caplog: pytest.LogCaptureFixture) -> None:
+        """One failing query is reported while other results are still returned."""
+        from src.tools.search import safe_batch_search
+
+        def invoke(payload: dict[str, str]) -> dict[str, object]:
+            if payload["query"] == "bad":
+                raise Exception("Rate limited")
+            return {"results": [{"title": "Good", "url": "https://a.org", "content": "x"}]}
+
+        tool = MagicMock()
+        tool.invoke.side_effect = invoke
+
+        with caplog.at_level(logging.ERROR):
+            result = safe_batch_search(tool, ["good", "bad"])
+
+        assert "Good" in result
+        assert "Search failed for 'bad'" in result
+
+    def test_empty_batch_returns_no_results(self) -> None:
+        """An empty query list returns the no-results message."""
+        from src.tools.search import NO_RESULTS_MESSAGE, safe_batch_search
+
+        assert safe_batch_search(MagicMock(), []) == NO_RESULTS_MESSAGE
+
+
+@pytest.mark.unit
+class TestSearchMetrics:
+    """Search calls are measured for the metrics endpoint."""
+
+    def test_failed_search_is_timed_and_counted(self) -> None:
+        """A failed search adds a duration observation and an error."""
+        from src.services.metrics import TOOL_CALL_DURATION, TOOL_CALL_ERRORS
+        from src.tools.search import SEARCH_TOOL_LABEL, safe_search
+
+        calls_before = TOOL_CALL_DURATION.count(tool=SEARCH_TOOL_LABEL)
+        errors_before = TOOL_CALL_ERRORS.value(tool=SEARCH_TOOL_LABEL)
+        tool = MagicMock()
+        tool.invoke.side_effect = Exception("Rate limited")
+
+        safe_search(tool, "query")
+
+        assert TOOL_CALL_DURATION.count(tool=SEARCH_TOOL_LABEL) == calls_before + 1
+        assert TOOL_CALL_ERRORS.value(tool=SEARCH_TOOL_LABEL) == errors_before + 1
+
+    def test_cache_lookups_are_counted(self, tmp_path) -> None:
+        """Cache misses and hits are counted separately."""
+        from src.services.disk_cache import DiskCache
+        from src.services.metrics import SEARCH_CACHE_LOOKUPS
+        from src.tools.search import CACHE_HIT, CACHE_MISS, safe_search
+
+        hits_before = SEARCH_CACHE_LOOKUPS.value(result=CACHE_HIT)
+        misses_before = SEARCH_CACHE_LOOKUPS.value(result=CACHE_MISS)
+        cache = DiskCache(path=str(tmp_path / "search.sqlite3"), ttl_seconds=60, max_entries=10)
+        tool = MagicMock()
+        tool.include_domains = ["nih.gov"]
+        tool.search_depth = "advanced"
+        tool.max_results = 5
+        tool.invoke.return_value = {"results": []}
+
+        safe_search(tool, "query", cache=cache)
+        safe_search(tool, "query", cache=cache)
+
+        assert SEARCH_CACHE_LOOKUPS.value(result=CACHE_MISS) == misses_before + 1
+        assert SEARCH_CACHE_LOOKUPS.value(result=CACHE_HIT) == hits_before + 1
+
+
+@pytest.mark.unit
+class TestAsyncSearch:
+    """The async variants await the tool instead of blocking a thread."""
+
+    def test_asafe_search_uses_ainvoke_and_cache(self, tmp_path) -> None:
+        """The search is awaited once; the repeated query is a cache hit."""
+        from src.services.disk_cache import DiskCache
+        from src.tools.search import asafe_search
+
+        cache = DiskCache(path=str(tmp_path / "search.sqlite3"), ttl_seconds=60, max_entries=10)
+        tool = MagicMock()
+        tool.include_domains = ["nih.gov"]
+        tool.search_depth = "advanced"
+        tool.max_results = 5
+        tool.ainvoke = AsyncMock(
+            return_value={"results": [{"title": "Async", "url": "https://a.org", "content": "x"}]}
+        )
+
+        first = asyncio.run(asafe_search(tool, "statins", cache=cache))
+        second = asyncio.run(asafe_search(tool, "STATINS", cache=cache))
+
+        assert "Async" in first
+        assert first == second
+        tool.ainvoke.assert_awaited_once_with({"query": "statins"})
+        tool.invoke.assert_not_called()
+
+    def test_asafe_search_returns_error_message_on_failure(self) -> None:
+        """A failing search returns the same message as safe_search."""
+        from src.tools.search import asafe_search
+
+        tool = MagicMock()
+        tool.ainvoke = AsyncMock(side_effect=Exception("Rate limited"))
+
+        result = asyncio.run(asafe_search(tool, "query"))
+
+        assert result.startswith("Search failed: Rate limited")
+
+    def test_asafe_batch_search_awaits_queries_concurrently(self) -> None:
+        """All unique queries are in flight together and failures are listed."""
+        from src.tools.search import asafe_batch_search
+
+        in_flight = 0
+        peak = 0
+
+        async def ainvoke(payload: dict[str, str]) -> dict[str, object]:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if payload["query"] == "bad":
+                raise Exception("Rate limited")
+            url = f"https://nih.gov/{payload['query']}"
+            return {"results": [{"title": payload["query"], "url": url, "content": "x"}]}
+
+        tool = MagicMock()
+        tool.ainvoke.side_effect = ainvoke
+
+        result = asyncio.run(asafe_batch_search(tool, ["A ", "b", "a", "bad"], max_workers=3))
+
+        assert peak == 3
+        assert tool.ainvoke.call_count == 3
+        assert "nih.gov/a" in result
+        assert "nih.gov/b" in result
+        assert "Search failed for 'bad'" in result
+
+    def test_asafe_batch_search_caps_concurrency(self) -> None:
+        """No more than max_workers searches are awaited at once."""
+        from src.tools.search import asafe_batch_search
+
+        in_flight = 0
+        peak = 0
+
+        async def ainvoke(payload: dict[str, str]) -> dict[str, object]:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"results": []}
+
+        tool = MagicMock()
+        tool.ainvoke.side_effect = ainvoke
+
+        asyncio.run(asafe_batch_search(tool, ["a", "b", "c", "d"], max_workers=2))
+
+        assert peak == 2
@@ -115,3 +115,40 @@ class TestLoggingConfiguration:
 
         root_logger = logging.getLogger()
         assert root_logger.handlers  # At least one handler configured
+
+
+@pytest.mark.unit
+class TestSearchBackendSettings:
+    """The search backend is selectable and the Tavily key is only required for Tavily."""
+
+    def test_default_backend_is_tavily(self, env_minimal_settings: None) -> None:
+        """Settings defaults to the Tavily backend."""
+        from src.config.settings import Settings
+
+        assert Settings().search_backend == "tavily"
+
+    def test_local_backend_does_not_require_tavily_key(
+        self, env_no_settings: None, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Air-gapped deployments can run without TAVILY_API_KEY."""
+        from src.config.settings import Settings
+
+        monkeypatch.setenv("SEARCH_BACKEND", "local")
+
+        settings = Settings()
+
+        assert settings.search_backend == "local"
+        assert settings.tavily_api_key == ""
+
+    def test_rejects_unknown_backend(
+        self, env_minimal_settings: None, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Only 'tavily' and 'local' are accepted."""
+        from pydantic import ValidationError
+
+        from src.config.settings import Settings
+
+        monkeypatch.setenv("SEARCH_BACKEND", "bing")
+
+        with pytest.raises(ValidationError):
+            Settings()
@@ -0,0 +1,165 @@
+"""Unit tests for per-tool concurrency limits.
+
+Tests cover:
+- Sync and awaited calls never exceed the limit and all eventually run
+- A slot freed by a worker thread wakes a caller waiting on an event loop
+- Callers waiting for a slot give up once their run is cancelled
+- Time spent waiting is recorded per tool
+- TOOL_CONCURRENCY_LIMITS is parsed from JSON and rejects non-positive limits
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+import pytest
+
+
+class _PeakTracker:
+    """Counts concurrent holders and remembers the highest count seen."""
+
+    def __init__(self) -> None:
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def enter(self) -> None:
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def exit(self) -> None:
+        with self._lock:
+            self.current -= 1
+
+
+@pytest.mark.unit
+class TestConcurrencyLimiter:
+    """Calls beyond the limit wait for a slot."""
+
+    def test_rejects_non_positive_limit(self) -> None:
+        """A limiter must allow at least one call."""
+        from src.services.tool_concurrency import ConcurrencyLimiter
+
+        with pytest.raises(ValueError, match="at least 1"):
+            ConcurrencyLimiter("tool", 0)
+
+    def test_sync_calls_respect_limit(self) -> None:
+        """Threads holding the limiter never exceed max_concurrent."""
+        from src.services.tool_concurrency import ConcurrencyLimiter
+
+        limiter = ConcurrencyLimiter(f"t-{uuid4()}", 2)
+        tracker = _PeakTracker()
+
+        def call(i: int) -> int:
+            with limiter.hold():
+                tracker.enter()
+                time.sleep(0.05)
+                tracker.exit()
+            return i
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = list(pool.map(call, range(6)))
+
+        assert results == list(range(6))
+        assert tracker.peak == 2
+        assert limiter.active == 0
+
+    def test_async_calls_respect_limit(self) -> None:
+        """Coroutines holding the limiter never exceed max_concurrent."""
+        from src.services.tool_concurrency import ConcurrencyLimiter
+
+        limiter = ConcurrencyLimiter(f"t-{uuid4()}", 2)
+        tracker = _PeakTracker()
+
+        async def call(i: int) -> int:
+            async with limiter.ahold():
+                tracker.enter()
+                await asyncio.sleep(0.05)
+                tracker.exit()
+            return i
+
+        async def main() -> list[int]:
+            return await asyncio.gather(*(call(i) for i in range(6)))
+
+        assert asyncio.run(main()) == list(range(6))
+        assert tracker.peak == 2
+        assert limiter.active == 0
+
+    def test_thread_release_wakes_async_waiter(self) -> None:
+        """A slot freed by a worker thread is handed to a coroutine promptly."""
+        from src.services.tool_concurrency import CANCEL_POLL_SECONDS, ConcurrencyLimiter
+
+        limiter = ConcurrencyLimiter(f"t-{uuid4()}", 1)
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold_in_thread() -> None:
+            with limiter.hold():
+                held.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=hold_in_thread)
+        thread.start()
+        held.wait(5)
+
+        async def main() -> float:
+            asyncio.get_running_loop().call_later(0.05, release.set)
+            started = time.monotonic()
+            async with limiter.ahold():
+                return time.monotonic() - started
+
+        waited = asyncio.run(main())
+        thread.join(5)
+
+        assert waited < CANCEL_POLL_SECONDS
+
+    def test_cancelled_run_stops_waiting(self) -> None:
+        """Sync and async waiters raise RunCancelledError once the run is cancelled."""
+        from src.services.cancellation import RunCancelledError, cancel_scope
+        from src.services.tool_concurrency import ConcurrencyLimiter
+
+        limiter = ConcurrencyLimiter(f"t-{uuid4()}", 1)
+        cancelled = threading.Event()
+        cancelled.set()
+
+        async def await_slot() -> None:
+            async with limiter.ahold():
+                pass
+
+        with limiter.hold(), cancel_scope(cancelled):
+            with pytest.raises(RunCancelledError), limiter.hold():
+                pass
+            with pytest.raises(RunCancelledError):
+                asyncio.run(await_slot())
+
+        assert limiter.active == 0
+
+    def test_records_wait_time(self) -> None:
+        """Every acquired slot records how long the call waited for it."""
+        from src.services.metrics import TOOL_CONCURRENCY_WAIT
+        from src.services.tool_concurrency import ConcurrencyLimiter
+
+        name = f"t-{uuid4()}"
+        limiter = ConcurrencyLimiter(name, 1)
+        with limiter.hold():
+            pass
+
+        assert TOOL_CONCURRENCY_WAIT.count(tool=name) == 1
+
+    def test_settings_parse_limits_from_json_env(
+        self, env_minimal_settings: None, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """TOOL_CONCURRENCY_LIMITS is a JSON map; the medical tool is limited by default."""
+        from pydantic import ValidationError
+
+        from src.config.settings import Settings
+
+        assert Settings().tool_concurrency_limits == {"consult_medical_expert_tool": 2}
+        monkeypatch.setenv("TOOL_CONCURRENCY_LIMITS", '{"tavily_search": 3}')
+        assert Settings().tool_concurrency_limits == {"tavily_search": 3}
+        monkeypatch.setenv("TOOL_CONCURRENCY_LIMITS", '{"tavily_search": 0}')
+        with pytest.raises(ValidationError):
+            Settings()
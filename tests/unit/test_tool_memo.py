@@ -0,0 +1,70 @@
+"""Unit tests for per-run memoization of tool calls.
+
+Tests cover:
+- Call keys ignore case, spacing and the order of batch queries
+- Repeated calls return the earlier result with a note and are counted
+- The memo is only visible inside its scope
+"""
+
+from uuid import uuid4
+
+import pytest
+
+
+@pytest.mark.unit
+class TestToolCallKey:
+    """Identical calls map to the same key."""
+
+    def test_normalizes_strings_and_query_lists(self) -> None:
+        """Case, whitespace and batch order do not change the key; the tool does."""
+        from src.services.tool_memo import build_tool_call_key
+
+        assert build_tool_call_key("search", {"query": "Statin  Myopathy?"}) == (
+            build_tool_call_key("search", {"query": "statin myopathy"})
+        )
+        assert build_tool_call_key("batch", {"queries": ["b", "A", " "]}) == (
+            build_tool_call_key("batch", {"queries": ["a", "B", "a"]})
+        )
+        assert build_tool_call_key("search", {"query": "x"}) != (
+            build_tool_call_key("medical", {"query": "x"})
+        )
+
+
+@pytest.mark.unit
+class TestRunToolMemo:
+    """Results are reused within one memo."""
+
+    def test_repeated_call_returns_noted_result(self) -> None:
+        """A stored result comes back with the note, and the reuse is counted."""
+        from src.services.metrics import TOOL_CALLS_DEDUPLICATED
+        from src.services.tool_memo import REPEATED_CALL_NOTE, RunToolMemo
+
+        tool = f"t-{uuid4()}"
+        memo = RunToolMemo()
+        assert memo.lookup(tool, {"query": "q"}) is None
+        memo.store(tool, {"query": "q"}, "answer")
+
+        assert memo.lookup(tool, {"query": "Q "}) == REPEATED_CALL_NOTE + "answer"
+        assert memo.lookup(tool, {"query": "q"}) == REPEATED_CALL_NOTE + "answer"
+        assert memo.deduplicated == 2
+        assert TOOL_CALLS_DEDUPLICATED.value(tool=tool) == 2
+
+    def test_misses_are_not_counted(self) -> None:
+        """Looking up a call not made before counts nothing."""
+        from src.services.tool_memo import RunToolMemo
+
+        memo = RunToolMemo()
+        memo.store("search", {"query": "a"}, "answer")
+
+        assert memo.lookup("search", {"query": "b"}) is None
+        assert memo.deduplicated == 0
+
+    def test_scope_sets_current_memo(self) -> None:
+        """current_tool_memo is the scoped memo inside the scope and None outside."""
+        from src.services.tool_memo import RunToolMemo, current_tool_memo, tool_memo_scope
+
+        memo = RunToolMemo()
+        with tool_memo_scope(memo):
+            assert current_tool_memo() is memo
+
+        assert current_tool_memo() is None
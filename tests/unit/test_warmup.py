@@ -0,0 +1,216 @@
+"""Unit tests for Ollama model warm-up and residency tracking.
+
+Tests cover:
+- Warm-up sends an empty generate request with keep_alive per model
+- Failed warm-ups are recorded without raising
+- Residency is read from /api/ps with implicit ':latest' tags
+- Readiness combines warm-up state and residency
+- Every pooled host is warmed up and checked for the models placed on it
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+MODELS = {"orchestrator": "qwen3", "medical": "MedAIBase/MedGemma1.0:4b"}
+
+
+def _make_warmup(handler):
+    from src.models.warmup import ModelWarmup
+
+    return ModelWarmup(
+        base_url="http://ollama:11434",
+        models=MODELS,
+        keep_alive="30m",
+        transport=httpx.MockTransport(handler),
+    )
+
+
+GPU = "http://gpu:11434"
+CPU = "http://cpu:11434"
+
+
+def _make_pooled_warmup(handler):
+    from src.models.warmup import ModelWarmup
+
+    return ModelWarmup(
+        base_url="http://ollama:11434",
+        models=MODELS,
+        keep_alive="30m",
+        transport=httpx.MockTransport(handler),
+        hosts={GPU: {"orchestrator": "qwen3"}, CPU: MODELS},
+    )
+
+
+def _ps_response(*names: str) -> httpx.Response:
+    return httpx.Response(200, json={"models": [{"name": name} for name in names]})
+
+
+@pytest.mark.unit
+class TestWarmUp:
+    """Warm-up preloads each configured model."""
+
+    def test_posts_generate_with_keep_alive(self) -> None:
+        """Each model gets an empty generate request carrying keep_alive."""
+        requests: list[dict[str, object]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, json={"done": True})
+
+        warmup = _make_warmup(handler)
+        asyncio.run(warmup.warm_up())
+
+        assert sorted(r["model"] for r in requests) == sorted(MODELS.values())
+        assert all(r["keep_alive"] == "30m" for r in requests)
+        assert all("prompt" not in r for r in requests)
+
+    def test_failure_is_recorded_not_raised(self) -> None:
+        """A model that fails to load is marked failed with the error."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/api/ps":
+                return _ps_response("qwen3:latest")
+            if json.loads(request.content)["model"] == "qwen3":
+                return httpx.Response(200, json={"done": True})
+            return httpx.Response(404, json={"error": "model not found"})
+
+        warmup = _make_warmup(handler)
+        asyncio.run(warmup.warm_up())
+        report = asyncio.run(warmup.readiness())
+
+        assert report["orchestrator"]["warmup"] == "loaded"
+        assert report["medical"]["warmup"] == "failed"
+        assert "404" in str(report["medical"]["error"])
+
+
+@pytest.mark.unit
+class TestReadiness:
+    """Readiness reports which models are resident."""
+
+    def test_resident_models_match_implicit_latest_tag(self) -> None:
+        """'qwen3' is resident when Ollama lists 'qwen3:latest'."""
+        warmup = _make_warmup(lambda _: _ps_response("qwen3:latest"))
+
+        report = asyncio.run(warmup.readiness())
+
+        assert report["orchestrator"]["resident"] is True
+        assert report["medical"]["resident"] is False
+        assert report["medical"]["warmup"] == "pending"
+
+    def test_unreachable_ollama_reports_nothing_resident(self) -> None:
+        """Connection errors yield resident=False rather than raising."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        warmup = _make_warmup(handler)
+
+        assert asyncio.run(warmup.resident_models()) is None
+        report = asyncio.run(warmup.readiness())
+        assert not any(entry["resident"] for entry in report.values())
+
+    def test_normalize_model_name(self) -> None:
+        """Only untagged names gain ':latest'; namespaced tags are kept."""
+        from src.models.warmup import normalize_model_name
+
+        assert normalize_model_name("qwen3") == "qwen3:latest"
+        assert normalize_model_name("qwen3:8b") == "qwen3:8b"
+        assert normalize_model_name("MedAIBase/MedGemma1.0:4b") == "MedAIBase/MedGemma1.0:4b"
+        assert normalize_model_name("library/llama3") == "library/llama3:latest"
+
+
+@pytest.mark.unit
+class TestPooledHosts:
+    """With a host pool, each host warms up and reports the models placed on it."""
+
+    def test_each_host_warms_up_its_models(self) -> None:
+        """Models are only sent to hosts they are placed on."""
+        requests: list[tuple[str, str]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append((request.url.host, json.loads(request.content)["model"]))
+            return httpx.Response(200, json={"done": True})
+
+        asyncio.run(_make_pooled_warmup(handler).warm_up())
+
+        assert sorted(requests) == [
+            ("cpu", "MedAIBase/MedGemma1.0:4b"),
+            ("cpu", "qwen3"),
+            ("gpu", "qwen3"),
+        ]
+
+    def test_readiness_reports_each_host(self) -> None:
+        """A model is ready once any host serving it has it loaded."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/api/ps":
+                if request.url.host == "gpu":
+                    return _ps_response("qwen3:latest")
+                return _ps_response()
+            if request.url.host == "gpu":
+                return httpx.Response(200, json={"done": True})
+            return httpx.Response(500, json={"error": "out of memory"})
+
+        warmup = _make_pooled_warmup(handler)
+        asyncio.run(warmup.warm_up())
+        report = asyncio.run(warmup.readiness())
+
+        orchestrator = report["orchestrator"]
+        assert orchestrator["warmup"] == "loaded"
+        assert orchestrator["resident"] is True
+        assert "error" not in orchestrator
+        assert orchestrator["hosts"][GPU] == {"warmup": "loaded", "resident": True}
+        assert orchestrator["hosts"][CPU]["warmup"] == "failed"
+        assert orchestrator["hosts"][CPU]["resident"] is False
+        medical = report["medical"]
+        assert list(medical["hosts"]) == [CPU]
+        assert medical["warmup"] == "failed"
+        assert medical["resident"] is False
+        assert "500" in str(medical["error"])
+
+    def test_model_on_no_host_is_failed(self) -> None:
+        """A model no host serves can never become ready."""
+        from src.models.warmup import NO_HOST_ERROR, ModelWarmup
+
+        warmup = ModelWarmup(
+            base_url="http://ollama:11434",
+            models=MODELS,
+            keep_alive="30m",
+            transport=httpx.MockTransport(lambda _: _ps_response("qwen3:latest")),
+            hosts={GPU: {"orchestrator": "qwen3"}},
+        )
+
+        report = asyncio.run(warmup.readiness())
+
+        assert report["medical"] == {
+            "model": MODELS["medical"],
+            "warmup": "failed",
+            "resident": False,
+            "hosts": {},
+            "error": NO_HOST_ERROR,
+        }
+
+    def test_placements_follow_pool_settings(self) -> None:
+        """Hosts get the models placed on them; without a pool, ollama_base_url gets both."""
+        from src.config.settings import OllamaHostSettings
+        from src.models.warmup import create_model_warmup, model_placements
+        from tests.conftest import make_mock_settings
+
+        settings = make_mock_settings()
+        settings.orchestrator_model = "qwen3"
+        models = {"orchestrator": settings.orchestrator_model, "medical": settings.medical_model}
+        assert model_placements(settings) == {settings.ollama_base_url: models}
+
+        settings.ollama_hosts = [
+            OllamaHostSettings(url=GPU, models=["qwen3:latest"]),
+            OllamaHostSettings(url=CPU),
+        ]
+
+        assert model_placements(settings) == {
+            GPU: {"orchestrator": "qwen3"},
+            CPU: models,
+        }
+        assert create_model_warmup(settings).hosts == model_placements(settings)